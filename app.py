@@ -44,12 +44,23 @@ src_path = Path(__file__).parent / "src"
 sys.path.insert(0, str(src_path))
 log_step("Configuração de imports", step_start)
 
-# Imports locais
+# Profiler de imports (DOJO_IMPORT_PROFILE=1): breakdown no estilo -X importtime
+from src.utils.startup_profiler import instalar_profiler_imports, medir_imports, marcar_renderizacao
+instalar_profiler_imports()
+
+# Latência dos serviços em formato Prometheus (DOJO_METRICS_PORT / DOJO_METRICS_FILE)
+from src.utils.metrics import iniciar_exportacao_metricas
+iniciar_exportacao_metricas()
+
+# Rastreio de alocações para o relatório de memória (DOJO_TRACEMALLOC=1)
+from src.utils.memory_report import iniciar_tracemalloc
+iniciar_tracemalloc()
+
+# Imports locais (firebase_admin/firestore e as páginas só quando usados)
 step_start = log_step("Imports de módulos locais")
 try:
-    from utils.auth import AuthManager
-    from utils.firebase_config import FirebaseConfig
-    from utils.ui import render_brand_header
+    with medir_imports("Imports de módulos locais"):
+        from utils.auth import AuthManager
     log_step("Imports de módulos locais", step_start)
 except Exception as e:
     logger.error(f"❌ ERRO nos imports: {str(e)}")
@@ -144,6 +155,7 @@ def main():
     # Header principal (somente após login)
     step_start = log_step("Renderização do header")
     try:
+        from utils.ui import render_brand_header
         root_dir = Path(__file__).parent
         pranch_path = root_dir / "pranch.png"
         render_brand_header(
@@ -192,7 +204,9 @@ def main():
             
             logger.info("🔄 Conectando ao Firebase...")
             
-            firebase_config = FirebaseConfig()
+            with medir_imports("Inicialização do Firebase"):
+                from utils.firebase_config import FirebaseConfig
+                firebase_config = FirebaseConfig()
             
             if firebase_config.is_connected():
                 logger.info("✅ Firebase conectado com sucesso!")
@@ -223,6 +237,11 @@ def main():
         # Guard rail: histórico é somente dashboard
         if st.session_state.data_mode == 'historico' and st.session_state.current_page != "🏠 Dashboard":
             st.session_state.current_page = "🏠 Dashboard"
+
+        # Contexto da requisição: modo, data de referência e usuário resolvidos
+        # uma única vez por rerun (lidos pelos serviços via contextvar)
+        from src.utils.request_context import iniciar_contexto_streamlit
+        iniciar_contexto_streamlit(usuario=auth_manager.get_current_user())
         
         with st.sidebar:
             st.markdown("### 📋 Navegação")
@@ -231,10 +250,9 @@ def main():
             busca_termo = st.text_input("🔍 Buscar aluno", placeholder="Digite o nome...", key="sidebar_busca_aluno")
             if busca_termo and len(busca_termo.strip()) >= 2:
                 try:
-                    from services.alunos_service import AlunosService
-                    if 'alunos_service' not in st.session_state:
-                        st.session_state.alunos_service = AlunosService()
-                    resultados = st.session_state.alunos_service.buscar_alunos_por_nome(busca_termo)[:5]
+                    from src.services.alunos_service import AlunosService
+                    from src.services.registry import get_service
+                    resultados = get_service(AlunosService).buscar_alunos_por_nome(busca_termo)[:5]
                     if resultados:
                         for r in resultados:
                             label = f"{r.get('nome', '?')} ({r.get('turma', '—')})"
@@ -259,6 +277,16 @@ def main():
             
             st.divider()
             
+            # Painel de desempenho (somente admin)
+            if auth_manager.is_admin():
+                st.markdown("#### Administração")
+                if st.button("📈 Desempenho", use_container_width=True,
+                            type="primary" if st.session_state.current_page == "📈 Desempenho" else "secondary"):
+                    st.session_state.current_page = "📈 Desempenho"
+                    st.session_state.data_mode = 'operacional'
+                    st.rerun()
+                st.divider()
+            
             # Navegação por páginas (oculta - acesso via Dashboard)
             if st.session_state.data_mode == 'historico':
                 st.info("Modo histórico ativo: apenas consulta")
@@ -292,24 +320,24 @@ def main():
     # Roteamento de páginas
     step_start = log_step(f"Carregamento da página: {page}")
     try:
-        if page == "🏠 Dashboard":
-            from pages.dashboard import show_dashboard
-            mode = st.session_state.get('data_mode', 'operacional')
-            show_dashboard(mode=mode)
-        elif page == "👥 Alunos":
-            from pages.alunos import show_alunos
-            show_alunos()
-        elif page == "💰 Pagamentos":
-            from pages.pagamentos import show_pagamentos
-            show_pagamentos()
-        elif page == "🥋 Graduações":
-            from pages.graduacoes import show_graduacoes
-            show_graduacoes()
-        elif page == "👨‍👩‍👧‍👦 Turmas":
-            from pages.turmas import show_turmas
-            show_turmas()
+        # Perfil do rerun sob demanda (DOJO_PROFILE=1 ou ?profile=1 para admins)
+        from src.utils.rerun_profiler import perfil_solicitado, perfilar_rerun
+        perfilar = perfil_solicitado(is_admin=auth_manager.is_admin())
+        with medir_imports(f"Carregamento da página: {page}"), \
+                perfilar_rerun(page, st.session_state.get('data_mode', 'operacional'), perfilar):
+            _renderizar_pagina(page, auth_manager)
         
         log_step(f"Carregamento da página: {page}", step_start)
+        marcar_renderizacao(page, step_start)
+        
+        # Leituras/escritas do Firestore neste rerun (e maiores consumidores)
+        from src.utils.firestore_metrics import registrar_resumo_render
+        from src.utils.metrics import registrar_render
+        from src.utils.request_context import get_request_context
+        registrar_resumo_render()
+        contexto = get_request_context()
+        registrar_render(page, st.session_state.get('data_mode', 'operacional'),
+                         time.time() - step_start, contexto.leituras if contexto else 0)
         
         # Log final
         total_time = time.time() - start_total
@@ -320,5 +348,29 @@ def main():
         st.error(f"Erro ao carregar página: {str(e)}")
         return
 
+
+def _renderizar_pagina(page, auth_manager):
+    """Importa (sob demanda) e renderiza a página selecionada"""
+    if page == "🏠 Dashboard":
+        from pages.dashboard import show_dashboard
+        mode = st.session_state.get('data_mode', 'operacional')
+        show_dashboard(mode=mode)
+    elif page == "👥 Alunos":
+        from pages.alunos import show_alunos
+        show_alunos()
+    elif page == "💰 Pagamentos":
+        from pages.pagamentos import show_pagamentos
+        show_pagamentos(is_admin=auth_manager.is_admin())
+    elif page == "🥋 Graduações":
+        from pages.graduacoes import show_graduacoes
+        show_graduacoes()
+    elif page == "👨‍👩‍👧‍👦 Turmas":
+        from pages.turmas import show_turmas
+        show_turmas()
+    elif page == "📈 Desempenho":
+        from pages.desempenho import show_desempenho
+        show_desempenho(is_admin=auth_manager.is_admin())
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
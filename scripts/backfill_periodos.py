@@ -0,0 +1,53 @@
+"""
+Script para preencher o índice /meta/periodos
+Lê o campo ym de todos os pagamentos UMA vez e grava os meses encontrados.
+Rodar após o deploy do índice; depois disso criar_pagamento e o importador
+mantêm o documento atualizado.
+"""
+import sys
+import os
+
+# Adicionar diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.periodos_service import PeriodosService, invalidar_cache_periodos
+from src.utils.firebase_config import get_firestore_client
+
+
+def backfill_periodos():
+    """Varre /pagamentos (apenas o campo ym) e registra os meses em /meta/periodos"""
+
+    print("=" * 80)
+    print("BACKFILL - ÍNDICE DE PERÍODOS (/meta/periodos)")
+    print("=" * 80)
+    print()
+
+    try:
+        db = get_firestore_client()
+
+        print("🔍 Lendo meses dos pagamentos...")
+        meses = set()
+        total = 0
+        for doc in db.collection('pagamentos').select(['ym', 'ano', 'mes']).stream():
+            dados = doc.to_dict() or {}
+            total += 1
+            ym = dados.get('ym')
+            if not ym and dados.get('ano') and dados.get('mes'):
+                ym = f"{int(dados['ano']):04d}-{int(dados['mes']):02d}"
+            if ym:
+                meses.add(ym)
+
+        print(f"✅ {total} pagamentos lidos, {len(meses)} meses distintos")
+
+        invalidar_cache_periodos()
+        PeriodosService(db).registrar_periodos('pagamentos', sorted(meses))
+
+        print(f"🗓️  Índice atualizado: {', '.join(sorted(meses)) or '(vazio)'}")
+
+    except Exception as e:
+        print(f"❌ Erro no backfill: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    backfill_periodos()
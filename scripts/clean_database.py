@@ -49,8 +49,9 @@ class DatabaseCleaner:
     def count_documents_in_collection(self, collection_name):
         """Conta documentos em uma coleção"""
         try:
-            docs = list(self.db.collection(collection_name).stream())
-            return len(docs)
+            # Agregação no servidor: não transfere os documentos
+            resultado = self.db.collection(collection_name).count().get()
+            return int(resultado[0][0].value)
         except Exception as e:
             print(f"❌ Erro ao contar documentos em {collection_name}: {e}")
             return 0
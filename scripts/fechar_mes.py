@@ -0,0 +1,45 @@
+"""
+Script para fechar (ou reabrir) um mês: grava o snapshot final de pagamentos
+e presenças em /fechamentos/{YYYY-MM}
+
+Uso:
+    python scripts/fechar_mes.py 2025-12
+    python scripts/fechar_mes.py 2025-12 --reabrir
+"""
+import sys
+import os
+
+# Adicionar diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.fechamentos_service import FechamentosService
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    ym = sys.argv[1]
+    fechamentos_service = FechamentosService()
+
+    try:
+        if '--reabrir' in sys.argv[2:]:
+            if fechamentos_service.reabrir_mes(ym):
+                print(f"🔓 Mês {ym} reaberto")
+            else:
+                print(f"⚠️  Mês {ym} não estava fechado")
+            return
+
+        snapshot = fechamentos_service.fechar_mes(ym)
+        pagamentos, presencas = snapshot['pagamentos'], snapshot['presencas']
+        print(f"🔒 Mês {ym} fechado")
+        print(f"   💰 {pagamentos['total_pagamentos']} pagamentos - receita R$ {pagamentos['receita_total']:.2f}")
+        print(f"   📋 {presencas['total_registros']} registros de presença")
+    except Exception as e:
+        print(f"❌ {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
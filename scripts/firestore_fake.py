@@ -0,0 +1,239 @@
+"""
+Firestore em memória para os smoke tests
+Documentos por collection, queries imutáveis (where/order_by/limit/start_after),
+batch e as transformações de escrita usadas pelos serviços (merge, ArrayUnion,
+ArrayRemove, Increment, DELETE_FIELD, SERVER_TIMESTAMP).
+
+Registra o custo para os testes conferirem:
+    leituras  - documentos lidos (get conta 1, stream conta os devolvidos)
+    escritas  - (caminho, dados) de cada set/update, na ordem de commit
+    consultas - queries executadas (stream), com .filtros, .ordenacao e .limite
+"""
+
+import functools
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from google.api_core.exceptions import NotFound
+from google.cloud import firestore
+from google.cloud.firestore_v1 import transforms
+
+_OPERADORES = {
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b,
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+    'in': lambda a, b: a in b,
+    'not-in': lambda a, b: a not in b,
+    'array_contains': lambda a, b: b in (a or []),
+}
+
+
+def _aplicar_escrita(atual: Dict[str, Any], dados: Dict[str, Any]) -> Dict[str, Any]:
+    """Aplica campos e sentinelas do Firestore sobre o documento atual"""
+    novo = dict(atual)
+    for campo, valor in dados.items():
+        if valor is firestore.DELETE_FIELD:
+            novo.pop(campo, None)
+        elif valor is firestore.SERVER_TIMESTAMP:
+            novo[campo] = datetime.now(timezone.utc)
+        elif isinstance(valor, transforms.ArrayUnion):
+            existentes = list(novo.get(campo) or [])
+            novo[campo] = existentes + [v for v in valor.values if v not in existentes]
+        elif isinstance(valor, transforms.ArrayRemove):
+            novo[campo] = [v for v in novo.get(campo) or [] if v not in valor.values]
+        elif isinstance(valor, transforms.Increment):
+            novo[campo] = (novo.get(campo) or 0) + valor.value
+        else:
+            novo[campo] = valor
+    return novo
+
+
+class SnapshotFake:
+    """DocumentSnapshot: id, exists, to_dict() e reference"""
+
+    def __init__(self, doc_id: str, dados: Optional[Dict[str, Any]], reference=None):
+        self.id = doc_id
+        self.exists = dados is not None
+        self.reference = reference
+        self._dados = dados
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        return dict(self._dados) if self._dados is not None else None
+
+    def get(self, campo: str) -> Any:
+        return (self._dados or {}).get(campo)
+
+
+class DocumentFake:
+    """DocumentReference em memória"""
+
+    def __init__(self, db: 'FirestoreFake', colecao: str, doc_id: str):
+        self.db, self.colecao, self.id = db, colecao, doc_id
+
+    @property
+    def path(self) -> str:
+        return f"{self.colecao}/{self.id}"
+
+    def get(self, **kwargs) -> SnapshotFake:
+        self.db.leituras += 1
+        return SnapshotFake(self.id, self.db.documento(self.path), reference=self)
+
+    def set(self, dados: Dict[str, Any], merge: bool = False) -> None:
+        atual = (self.db.documento(self.path) or {}) if merge else {}
+        self.db._gravar(self.path, dados, _aplicar_escrita(atual, dados))
+
+    def update(self, dados: Dict[str, Any]) -> None:
+        atual = self.db.documento(self.path)
+        if atual is None:
+            raise NotFound(f"No document to update: {self.path}")
+        self.db._gravar(self.path, dados, _aplicar_escrita(atual, dados))
+
+    def delete(self) -> None:
+        self.db.colecoes.get(self.colecao, {}).pop(self.id, None)
+
+
+class QueryFake:
+    """Query imutável: cada where/order_by/limit/start_after devolve uma nova"""
+
+    def __init__(self, db: 'FirestoreFake', colecao: str, filtros=(), ordenacao=(),
+                 limite: Optional[int] = None, cursor=None):
+        self.db, self.colecao = db, colecao
+        self.filtros: List[tuple] = list(filtros)
+        self.ordenacao: List[tuple] = list(ordenacao)
+        self.limite = limite
+        self.cursor = cursor
+
+    def _com(self, **kwargs) -> 'QueryFake':
+        atual = dict(filtros=self.filtros, ordenacao=self.ordenacao,
+                     limite=self.limite, cursor=self.cursor)
+        atual.update(kwargs)
+        return QueryFake(self.db, self.colecao, **atual)
+
+    def where(self, campo=None, op=None, valor=None, filter=None) -> 'QueryFake':
+        if filter is not None:
+            campo, op, valor = filter.field_path, filter.op_string, filter.value
+        return self._com(filtros=self.filtros + [(campo, op, valor)])
+
+    def order_by(self, campo: str, direction: str = firestore.Query.ASCENDING) -> 'QueryFake':
+        return self._com(ordenacao=self.ordenacao + [(campo, direction)])
+
+    def limit(self, n: int) -> 'QueryFake':
+        return self._com(limite=n)
+
+    def start_after(self, cursor) -> 'QueryFake':
+        """Cursor por snapshot ou por dict campo → valor ('__name__' = ID)"""
+        return self._com(cursor=cursor)
+
+    def _campos_ordem(self) -> List[tuple]:
+        campos = list(self.ordenacao)
+        if not any(campo == '__name__' for campo, _ in campos):
+            direcao = campos[-1][1] if campos else firestore.Query.ASCENDING
+            campos.append(('__name__', direcao))
+        return campos
+
+    def _comparar(self, chave_a: list, chave_b: list) -> int:
+        for (_, direcao), a, b in zip(self._campos_ordem(), chave_a, chave_b):
+            if a != b:
+                menor = -1 if a < b else 1
+                return -menor if direcao == firestore.Query.DESCENDING else menor
+        return 0
+
+    def _chave(self, doc_id: str, dados: Dict[str, Any]) -> list:
+        return [doc_id if campo == '__name__' else dados.get(campo)
+                for campo, _ in self._campos_ordem()]
+
+    def _chave_cursor(self) -> list:
+        if isinstance(self.cursor, dict):
+            return [self.cursor.get(campo) for campo, _ in self._campos_ordem()]
+        return self._chave(self.cursor.id, self.cursor.to_dict() or {})
+
+    def _aceita(self, dados: Dict[str, Any]) -> bool:
+        for campo, op, valor in self.filtros:
+            # Como no Firestore: documento sem o campo não entra no filtro
+            if campo not in dados or not _OPERADORES[op](dados[campo], valor):
+                return False
+        return True
+
+    def stream(self, **kwargs):
+        self.db.consultas.append(self)
+        docs = [(doc_id, dados) for doc_id, dados in self.db.colecoes.get(self.colecao, {}).items()
+                if self._aceita(dados)]
+        docs.sort(key=functools.cmp_to_key(
+            lambda a, b: self._comparar(self._chave(*a), self._chave(*b))))
+        if self.cursor is not None:
+            cursor = self._chave_cursor()
+            docs = [d for d in docs if self._comparar(self._chave(*d), cursor) > 0]
+        if self.limite is not None:
+            docs = docs[:self.limite]
+
+        self.db.leituras += len(docs)
+        return iter([SnapshotFake(doc_id, dict(dados), reference=DocumentFake(self.db, self.colecao, doc_id))
+                     for doc_id, dados in docs])
+
+
+class CollectionFake(QueryFake):
+    """CollectionReference: query sem filtros que também cria DocumentReference"""
+
+    @property
+    def id(self) -> str:
+        return self.colecao
+
+    def document(self, doc_id: str) -> DocumentFake:
+        return DocumentFake(self.db, self.colecao, doc_id)
+
+
+class BatchFake:
+    """WriteBatch: operações aplicadas só no commit"""
+
+    def __init__(self):
+        self.operacoes = []
+
+    def set(self, doc_ref: DocumentFake, dados: Dict[str, Any], merge: bool = False) -> None:
+        self.operacoes.append(lambda: doc_ref.set(dados, merge=merge))
+
+    def update(self, doc_ref: DocumentFake, dados: Dict[str, Any]) -> None:
+        self.operacoes.append(lambda: doc_ref.update(dados))
+
+    def delete(self, doc_ref: DocumentFake) -> None:
+        self.operacoes.append(doc_ref.delete)
+
+    def commit(self) -> None:
+        for operacao in self.operacoes:
+            operacao()
+
+
+class FirestoreFake:
+    """
+    Cliente Firestore em memória
+
+    Args:
+        colecoes: collection → {doc_id: dados} iniciais
+    """
+
+    def __init__(self, colecoes: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None):
+        self.colecoes: Dict[str, Dict[str, Dict[str, Any]]] = {
+            nome: {doc_id: dict(dados) for doc_id, dados in docs.items()}
+            for nome, docs in (colecoes or {}).items()
+        }
+        self.leituras = 0
+        self.escritas: List[tuple] = []
+        self.consultas: List[QueryFake] = []
+
+    def collection(self, nome: str) -> CollectionFake:
+        return CollectionFake(self, nome)
+
+    def batch(self) -> BatchFake:
+        return BatchFake()
+
+    def documento(self, caminho: str) -> Optional[Dict[str, Any]]:
+        """Dados gravados em 'collection/id' (None se não existe), sem contar leitura"""
+        colecao, doc_id = caminho.split('/', 1)
+        return self.colecoes.get(colecao, {}).get(doc_id)
+
+    def _gravar(self, caminho: str, dados: Dict[str, Any], novo: Dict[str, Any]) -> None:
+        colecao, doc_id = caminho.split('/', 1)
+        self.colecoes.setdefault(colecao, {})[doc_id] = novo
+        self.escritas.append((caminho, dados))
@@ -13,7 +13,7 @@ src_path = Path(__file__).parent.parent / "src"
 sys.path.insert(0, str(src_path))
 
 from utils.firebase_config import FirebaseConfig
-from google.cloud.firestore_v1 import SERVER_TIMESTAMP
+from google.cloud.firestore_v1 import SERVER_TIMESTAMP, ArrayUnion
 
 class PagamentosImporter:
     """Classe para importação de pagamentos do CSV para Firestore"""
@@ -146,6 +146,16 @@ class PagamentosImporter:
             print(f"❌ Erro ao importar pagamento {doc_id}: {e}")
             return False
     
+    def registrar_periodos(self, meses):
+        """Acrescenta os meses importados ao índice /meta/periodos (ArrayUnion)"""
+        try:
+            self.db.collection('meta').document('periodos').set(
+                {'pagamentos': ArrayUnion(sorted(meses))}, merge=True
+            )
+            print(f"🗓️  Índice de períodos atualizado ({len(meses)} meses)")
+        except Exception as e:
+            print(f"⚠️  Erro ao atualizar índice de períodos: {e}")
+    
     def import_all_pagamentos(self, csv_path='Docs/PAGAMENTOS_NORMALIZED.csv'):
         """Importa todos os pagamentos do CSV"""
         print("🚀 Iniciando importação de pagamentos...")
@@ -172,6 +182,7 @@ class PagamentosImporter:
             print(f"   {ano}: {count} pagamentos")
         
         print(f"\n📊 Processando {total_pagamentos} pagamentos...")
+        meses_importados = set()
         
         for index, row in df.iterrows():
             doc_id = str(row['docId']).strip()
@@ -193,6 +204,7 @@ class PagamentosImporter:
                 # Importar pagamento
                 if self.import_pagamento(doc_id, doc_data):
                     sucessos += 1
+                    meses_importados.add(doc_data['ym'])
                     if sucessos % 25 == 0:  # Progress a cada 25
                         print(f"   ✅ {sucessos}/{total_pagamentos} pagamentos importados...")
                 else:
@@ -206,6 +218,10 @@ class PagamentosImporter:
                 erros_detalhes.append(erro_msg)
                 print(f"❌ {erro_msg}")
         
+        # Atualizar índice de períodos (/meta/periodos) usado pelo dashboard
+        if meses_importados:
+            self.registrar_periodos(meses_importados)
+        
         # Relatório final
         print(f"\n🎉 IMPORTAÇÃO CONCLUÍDA!")
         print(f"=" * 50)
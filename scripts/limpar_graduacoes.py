@@ -11,7 +11,7 @@ import os
 # Adicionar o diretório raiz ao path para imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.utils.firebase_config import get_firestore_client
+from src.utils.firebase_config import get_firestore_client, stream_em_lotes
 from google.cloud.firestore import SERVER_TIMESTAMP
 
 # Lista de graduações válidas (nova)
@@ -43,7 +43,7 @@ def limpar_graduacoes_antigas():
     
     # Buscar todos os alunos
     alunos_ref = db.collection('alunos')
-    alunos = alunos_ref.stream()
+    alunos = stream_em_lotes(alunos_ref)
     
     alunos_atualizados = 0
     alunos_sem_alteracao = 0
@@ -109,7 +109,7 @@ def listar_graduacoes_atuais():
     
     # Buscar todos os alunos
     alunos_ref = db.collection('alunos')
-    alunos = alunos_ref.stream()
+    alunos = stream_em_lotes(alunos_ref)
     
     graduacoes_encontradas = {}
     
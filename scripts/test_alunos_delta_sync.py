@@ -0,0 +1,126 @@
+"""
+Smoke Test - Sync Incremental da Lista de Alunos
+Valida que, após a carga inicial, o cache lê apenas os alunos alterados
+(updatedAt > watermark) e que a reconciliação periódica pega exclusões.
+"""
+
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Adicionar o diretório raiz ao path para imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.cache_service import CacheManager
+
+T0 = datetime(2026, 3, 1, 10, 0, 0)
+
+
+class _AlunosServiceFake:
+    """Coleção de alunos em memória que conta documentos lidos"""
+
+    def __init__(self, total: int):
+        self.docs = {
+            f"a{i}": {'id': f"a{i}", 'nome': f"Aluno {i:04d}", 'updatedAt': T0}
+            for i in range(total)
+        }
+        self.lidos = 0
+
+    def listar_alunos(self):
+        self.lidos += len(self.docs)
+        return sorted((dict(d) for d in self.docs.values()), key=lambda a: a['nome'])
+
+    def listar_alunos_atualizados_desde(self, desde):
+        alterados = [dict(d) for d in self.docs.values() if d['updatedAt'] > desde]
+        self.lidos += len(alterados)
+        return alterados
+
+
+def test_delta_le_apenas_alterados():
+    """Refresh após alteração lê só os documentos alterados"""
+    print("🧪 Teste 1: Refresh incremental lê apenas alterados...")
+    manager = CacheManager()
+    service = _AlunosServiceFake(total=2000)
+
+    assert len(manager.get_alunos_cached(service)) == 2000
+    assert service.lidos == 2000
+
+    service.docs['a5']['nome'] = "Aluno 0005 (editado)"
+    service.docs['a5']['updatedAt'] = T0 + timedelta(minutes=5)
+    service.lidos = 0
+    manager.invalidate_aluno_cache('a5')
+
+    alunos = manager.get_alunos_cached(service)
+    assert len(alunos) == 2000
+    assert any(a['nome'] == "Aluno 0005 (editado)" for a in alunos)
+    assert service.lidos == 1, f"Esperado 1 documento lido, lidos {service.lidos}"
+    print(f"   ✅ Refresh leu {service.lidos} documento(s) em vez de 2000")
+
+
+def test_novo_aluno_entra_na_lista():
+    """Aluno criado depois da carga aparece via sync incremental"""
+    print("🧪 Teste 2: Novo aluno entra via delta...")
+    manager = CacheManager()
+    service = _AlunosServiceFake(total=3)
+    manager.get_alunos_cached(service)
+
+    service.docs['novo'] = {'id': 'novo', 'nome': 'Aaron', 'updatedAt': T0 + timedelta(minutes=1)}
+    manager.invalidate_aluno_cache('novo')
+
+    alunos = manager.get_alunos_cached(service)
+    assert [a['id'] for a in alunos][0] == 'novo', "Lista deveria continuar ordenada por nome"
+    assert len(alunos) == 4
+    print("   ✅ Novo aluno mesclado e lista ordenada")
+
+
+def test_reconciliacao_remove_excluidos():
+    """Reconciliação completa remove documentos excluídos"""
+    print("🧪 Teste 3: Reconciliação completa pega exclusões...")
+    manager = CacheManager()
+    service = _AlunosServiceFake(total=3)
+    manager.get_alunos_cached(service)
+
+    del service.docs['a1']
+    manager.ALUNOS_RECONCILIACAO = -1  # força reconciliação
+
+    alunos = manager.get_alunos_cached(service)
+    assert 'a1' not in [a['id'] for a in alunos]
+    print("   ✅ Aluno excluído removido na reconciliação")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🔥 SMOKE TEST - Sync Incremental da Lista de Alunos")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_delta_le_apenas_alterados,
+        test_novo_aluno_entra_na_lista,
+        test_reconciliacao_remove_excluidos,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"   ❌ FALHOU: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"   ❌ ERRO: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"📊 RESULTADO: {passed}/{len(tests)} testes passaram")
+
+    if failed > 0:
+        print(f"❌ {failed} TESTE(S) FALHARAM!")
+        sys.exit(1)
+
+    print("✅ TODOS OS TESTES PASSARAM!")
+    print("=" * 60)
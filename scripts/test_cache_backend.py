@@ -0,0 +1,188 @@
+"""
+Smoke Test - Cache L1 + L2 Compartilhado
+Simula duas réplicas (dois CacheService) sobre o mesmo backend: a segunda lê
+do L2 o que a primeira carregou, invalidações chegam ao L1 da outra pelo
+canal, e com o L2 fora do ar o cache segue só local. O backend Redis é
+testado com fakeredis quando disponível.
+"""
+
+import sys
+import os
+import time
+
+# Adicionar o diretório raiz ao path para imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.cache_backends import MemoriaCacheBackend, RedisCacheBackend
+from src.utils.cache_service import CacheManager, CacheService
+
+
+def _replicas():
+    backend = MemoriaCacheBackend()
+    return backend, CacheService(backend=backend), CacheService(backend=backend)
+
+
+def test_leitura_compartilhada():
+    """Réplica B lê do L2 o que a réplica A carregou (uma ida ao Firestore)"""
+    print("🧪 Teste 1: Leitura compartilhada entre réplicas...")
+    _, replica_a, replica_b = _replicas()
+    chamadas = []
+
+    def carregar(ym):
+        chamadas.append(ym)
+        return {'ym': ym, 'total': 10}
+
+    assert replica_a.cached_call(carregar, 'pagamentos_stats', ttl=120, ym='2026-03')['total'] == 10
+    assert replica_b.cached_call(carregar, 'pagamentos_stats', ttl=120, ym='2026-03')['total'] == 10
+    assert chamadas == ['2026-03'], chamadas
+
+    # L1 da réplica B herdou o TTL restante do L2
+    entrada = next(iter(replica_b.cache.values()))
+    assert 115 < entrada['expires_at'] - time.time() <= 120
+    print("   ✅ 1 carga para 2 réplicas")
+
+
+def test_invalidacao_propagada():
+    """delete, tag e clear em A removem as cópias do L1 de B"""
+    print("🧪 Teste 2: Invalidação propagada...")
+    _, replica_a, replica_b = _replicas()
+    replica_a.set('pagamentos_stats:x', {'total': 1})
+    replica_a.set('aluno_perfil:1', {'nome': 'Ana'}, tags=['aluno:1'])
+    replica_a.set('aluno_perfil:2', {'nome': 'Bia'}, tags=['aluno:2'])
+    for key in ('pagamentos_stats:x', 'aluno_perfil:1', 'aluno_perfil:2'):
+        assert replica_b.get(key) is not None  # copia para o L1 de B
+
+    replica_a.delete('pagamentos_stats:x')
+    assert 'pagamentos_stats:x' not in replica_b.cache
+    assert replica_b.get('pagamentos_stats:x') is None
+
+    assert replica_a.invalidate_tag('aluno:1') == 1
+    assert 'aluno_perfil:1' not in replica_b.cache
+    assert replica_b.get('aluno_perfil:2') == {'nome': 'Bia'}
+
+    replica_a.clear()
+    assert replica_b.cache == {} and replica_b.get('aluno_perfil:2') is None
+    print("   ✅ delete, tag e clear chegam à outra réplica")
+
+
+def test_set_atualiza_outras_replicas():
+    """Novo valor gravado em A substitui a cópia antiga no L1 de B"""
+    print("🧪 Teste 3: set publica a troca de valor...")
+    _, replica_a, replica_b = _replicas()
+    replica_a.set('graduacoes:stats', {'total': 1})
+    assert replica_b.get('graduacoes:stats') == {'total': 1}
+    replica_a.set('graduacoes:stats', {'total': 2})
+    assert replica_b.get('graduacoes:stats') == {'total': 2}
+    print("   ✅ Réplica B vê o valor novo")
+
+
+def test_invalidacao_por_padrao_inclui_l2():
+    """invalidate_pagamento_cache() alcança chaves que só existem no L2"""
+    print("🧪 Teste 4: Invalidação por padrão no L2...")
+    backend, replica_a, replica_b = _replicas()
+    replica_a.set('pagamentos_stats:abc', {'total': 1})
+    manager_b = CacheManager()
+    manager_b.cache = replica_b
+    assert 'pagamentos_stats:abc' not in replica_b.cache
+
+    manager_b.invalidate_pagamento_cache()
+    assert backend.keys() == []
+    assert replica_a.get('pagamentos_stats:abc') is None
+    print("   ✅ Chave só do L2 removida")
+
+
+def test_l2_fora_do_ar():
+    """Erros do backend abrem o circuito e o cache segue só com o L1"""
+    print("🧪 Teste 5: L2 indisponível...")
+
+    class _BackendQuebrado(MemoriaCacheBackend):
+        def get(self, *args):
+            raise ConnectionError("redis fora do ar")
+        set = delete = publicar = get
+
+    backend = _BackendQuebrado()
+    cache = CacheService(backend=backend)
+    cache.set('alunos:list', [1, 2])
+    assert cache.get('alunos:list') == [1, 2]
+    assert cache.get('nao_existe:1') is None
+    assert cache._circuito.estado == 'aberto'
+    print("   ✅ Circuito aberto, L1 funcionando")
+
+
+def test_redis_backend():
+    """Mesmo fluxo sobre o protocolo Redis (fakeredis)"""
+    print("🧪 Teste 6: Backend Redis...")
+    try:
+        import fakeredis
+    except ImportError:
+        print("   ⏭️ fakeredis não instalado - pulando")
+        return
+
+    servidor = fakeredis.FakeServer()
+    backend_a = RedisCacheBackend(cliente=fakeredis.FakeRedis(server=servidor), namespace='teste')
+    backend_b = RedisCacheBackend(cliente=fakeredis.FakeRedis(server=servidor), namespace='teste')
+    replica_a = CacheService(backend=backend_a)
+    replica_b = CacheService(backend=backend_b)
+    try:
+        # Aguarda as duas assinaturas do canal (threads dojo-cache-pubsub)
+        prazo = time.time() + 5
+        while backend_a.cliente.pubsub_numsub(backend_a.canal)[0][1] < 2 and time.time() < prazo:
+            time.sleep(0.05)
+
+        replica_a.set('aluno_perfil:1', {'nome': 'Ana'}, ttl=90, tags=['aluno:1'])
+        valor, restante = backend_b.get('aluno_perfil:1')
+        assert valor == {'nome': 'Ana'} and 85 < restante <= 90
+        assert backend_b.cliente.ttl('teste:tag:aluno:1') > 0
+        assert replica_b.get('aluno_perfil:1') == {'nome': 'Ana'}
+
+        replica_a.invalidate_tag('aluno:1')
+        prazo = time.time() + 5
+        while 'aluno_perfil:1' in replica_b.cache and time.time() < prazo:
+            time.sleep(0.05)
+        assert 'aluno_perfil:1' not in replica_b.cache, "Mensagem do canal não chegou"
+        assert backend_a.keys() == []
+    finally:
+        backend_a.fechar()
+        backend_b.fechar()
+    print("   ✅ L2 e pub/sub sobre o protocolo Redis")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🔥 SMOKE TEST - Cache L1 + L2 Compartilhado")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_leitura_compartilhada,
+        test_invalidacao_propagada,
+        test_set_atualiza_outras_replicas,
+        test_invalidacao_por_padrao_inclui_l2,
+        test_l2_fora_do_ar,
+        test_redis_backend,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"   ❌ FALHOU: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"   ❌ ERRO: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"📊 RESULTADO: {passed}/{len(tests)} testes passaram")
+
+    if failed > 0:
+        print(f"❌ {failed} TESTE(S) FALHARAM!")
+        sys.exit(1)
+
+    print("✅ TODOS OS TESTES PASSARAM!")
+    print("=" * 60)
@@ -22,10 +22,10 @@ def test_cache_invalidation_by_ym():
     # Limpar cache antes do teste
     cache.clear()
     
-    # A chave usada pelo sistema é gerada via _generate_key com prefixo "pagamentos_stats"
+    # A chave usada pelo sistema é gerada via chave_mensal com prefixo "pagamentos_stats"
     # Simular dados em cache para diferentes meses usando a mesma convenção
-    key_jan = cache._generate_key("pagamentos_stats", ym="2026-01")
-    key_fev = cache._generate_key("pagamentos_stats", ym="2026-02")
+    key_jan = manager.chave_mensal("pagamentos_stats", "2026-01")
+    key_fev = manager.chave_mensal("pagamentos_stats", "2026-02")
     
     cache.set(key_jan, {"total": 1000, "pagos": 5})
     cache.set(key_fev, {"total": 2000, "pagos": 10})
@@ -122,7 +122,7 @@ def test_invalidation_workflow():
     
     # Simular cache existente (como se dashboard tivesse carregado)
     # Usar a mesma chave que seria gerada pelo sistema
-    key_stats = cache._generate_key("pagamentos_stats", ym="2026-01")
+    key_stats = cache_manager.chave_mensal("pagamentos_stats", "2026-01")
     
     cache.set(key_stats, {"total": 5000, "pagos": 10, "pendentes": 5})
     
@@ -143,34 +143,66 @@ def test_invalidation_workflow():
     print("   ✅ Workflow de invalidação funcionando!")
 
 
-def test_import_in_pagamentos():
-    """Verifica que o import foi adicionado corretamente em pagamentos.py"""
-    print("🧪 Teste 6: Import em pagamentos.py...")
+def test_invalidate_prefix_and_flush():
+    """Testa as ações do painel de desempenho: invalidar prefixo e esvaziar"""
+    print("🧪 Teste 6: Invalidação por prefixo e esvaziamento...")
+    
+    manager = CacheManager()
+    cache = manager.cache
+    cache.clear()
+    
+    cache.set("pagamentos_stats:abc123", {"total": 1000})
+    cache.set("pagamentos_stats:def456", {"total": 2000})
+    cache.set("presencas_relatorio:abc123", {"total": 3})
+    manager._alunos_sync['operacional'] = {'lista': [], 'sujo': False}
+    
+    # Prefixo exato: "pagamentos" não casa com "pagamentos_stats"
+    assert manager.invalidate_prefix("pagamentos") == 0
+    assert manager.invalidate_prefix("pagamentos_stats") == 2
+    assert cache.get("presencas_relatorio:abc123") is not None, "Outro prefixo deveria permanecer"
+    
+    assert manager.flush_cache() == 1
+    assert cache.cache == {} and manager._alunos_sync == {}, "Cache deveria estar vazio"
+    
+    print("   ✅ Prefixo invalidado e cache esvaziado!")
+
+
+def test_marcar_como_pago_atualiza_estatisticas():
+    """Escrita corrige o pagamentos_stats em cache (write-through, sem invalidação na página)"""
+    print("🧪 Teste 7: Estatísticas corrigidas ao marcar como pago...")
+    from scripts.firestore_fake import FirestoreFake
+    from src.services.pagamentos_service import PagamentosService
     
     pagamentos_path = os.path.join(
         os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
         "src", "pages", "pagamentos.py"
     )
-    
     with open(pagamentos_path, 'r', encoding='utf-8') as f:
         content = f.read()
+    assert "invalidate_pagamento_cache" not in content, \
+        "A página não deveria invalidar o cache: o serviço corrige no lugar"
+    
+    manager = get_cache_manager()
+    manager.cache.clear()
+    service = PagamentosService.__new__(PagamentosService)
+    service.collection_name = 'pagamentos'
+    service.db = FirestoreFake({'pagamentos': {
+        'a1_2026_03': {'alunoId': 'a1', 'ym': '2026-03', 'ano': 2026, 'mes': 3, 'status': 'devedor', 'valor': 150.0},
+        'a2_2026_03': {'alunoId': 'a2', 'ym': '2026-03', 'ano': 2026, 'mes': 3, 'status': 'pago', 'valor': 120.0},
+    }})
     
-    # Verificar import
-    assert "from src.utils.cache_service import get_cache_manager" in content, \
-        "Import de get_cache_manager deveria existir"
+    antes = manager.get_estatisticas_pagamentos_cached(service, '2026-03')
+    consultas = len(service.db.consultas)
+    assert antes['total_pagos'] == 1 and antes['receita_total'] == 120.0
     
-    # Verificar chamadas de invalidação
-    invalidation_count = content.count("cache_manager.invalidate_pagamento_cache")
-    assert invalidation_count >= 5, \
-        f"Deveria haver pelo menos 5 chamadas de invalidação, encontrou {invalidation_count}"
+    service.marcar_como_pago('a1_2026_03')
+    depois = manager.get_estatisticas_pagamentos_cached(service, '2026-03')
     
-    # Verificar que estão nos lugares certos
-    assert "Pagamento atualizado com sucesso" in content and "invalidate_pagamento_cache" in content, \
-        "Invalidação após atualização deveria existir"
-    assert "Pagamento excluído com sucesso" in content and "invalidate_pagamento_cache" in content, \
-        "Invalidação após exclusão deveria existir"
+    assert len(service.db.consultas) == consultas, "Mês não deveria ser relido"
+    assert depois['total_pagos'] == 2 and depois['total_devedores'] == 0
+    assert depois['receita_total'] == 270.0
     
-    print(f"   ✅ Import e {invalidation_count} chamadas de invalidação encontradas!")
+    print("   ✅ pagamentos_stats corrigido sem reler o mês")
 
 
 if __name__ == "__main__":
@@ -185,7 +217,8 @@ if __name__ == "__main__":
         test_get_cache_manager_singleton,
         test_cache_ttl,
         test_invalidation_workflow,
-        test_import_in_pagamentos,
+        test_invalidate_prefix_and_flush,
+        test_marcar_como_pago_atualiza_estatisticas,
     ]
     
     passed = 0
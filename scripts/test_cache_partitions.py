@@ -0,0 +1,158 @@
+"""
+Smoke Test - Cache Particionado por Modo de Dados
+Valida que operacional e histórico ficam em cache lado a lado (chaves e tags
+com a partição), que meses legados ficam fixados com TTL longo e que
+escritas corrigem só as partições que enxergam o mês.
+"""
+
+import sys
+import os
+import time
+
+# Adicionar o diretório raiz ao path para imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.cache_service import CacheManager, get_cache_manager, tag_aluno
+from src.utils.request_context import request_context
+
+
+class _ServicoFake:
+    """Estatísticas que dependem do escopo ativo (como os serviços reais)"""
+
+    def __init__(self):
+        self.chamadas = []
+
+    def obter_estatisticas_mes(self, ym):
+        from src.utils.operational_scope import cache_partition
+        self.chamadas.append((ym, cache_partition()))
+        return {'ym': ym, 'particao': cache_partition()}
+
+
+def test_modos_lado_a_lado():
+    """Operacional e histórico do mesmo mês são entradas distintas"""
+    print("🧪 Teste 1: Dois modos em cache ao mesmo tempo...")
+    manager = get_cache_manager()
+    manager.cache.clear()
+    servico = _ServicoFake()
+
+    for _ in range(2):
+        with request_context(data_mode='operacional'):
+            assert manager.get_estatisticas_pagamentos_cached(servico, '2026-03')['particao'] == 'operacional'
+        with request_context(data_mode='historico'):
+            assert manager.get_estatisticas_pagamentos_cached(servico, '2026-03')['particao'] == 'historico'
+
+    assert servico.chamadas == [('2026-03', 'operacional'), ('2026-03', 'historico')], servico.chamadas
+    print("   ✅ Uma carga por modo, trocar de modo não recarrega")
+
+
+def test_mes_legado_ttl_longo():
+    """Mês legado (< 2026) é imutável: TTL_HISTORICO"""
+    print("🧪 Teste 2: TTL longo para meses legados...")
+    manager = get_cache_manager()
+    manager.cache.clear()
+    servico = _ServicoFake()
+
+    with request_context(data_mode='historico'):
+        manager.get_estatisticas_pagamentos_cached(servico, '2025-06')
+        manager.get_estatisticas_pagamentos_cached(servico, '2026-03')
+        legado = manager.cache.cache[manager.chave_mensal('pagamentos_stats', '2025-06')]
+        atual = manager.cache.cache[manager.chave_mensal('pagamentos_stats', '2026-03')]
+
+    assert legado['ttl'] == CacheManager.TTL_HISTORICO
+    assert atual['ttl'] == 120
+    print("   ✅ Legado fixado, mês corrente com TTL curto")
+
+
+def test_invalidacao_alcanca_todas_particoes():
+    """invalidate_pagamento_cache(ym) remove o mês nas duas partições"""
+    print("🧪 Teste 3: Invalidação por mês em todas as partições...")
+    manager = get_cache_manager()
+    manager.cache.clear()
+    for particao in ('operacional', 'historico'):
+        manager.cache.set(manager.chave_mensal('pagamentos_stats', '2026-03', particao), {'total': 1})
+
+    manager.invalidate_pagamento_cache('2026-03')
+    assert manager.cache.cache == {}, list(manager.cache.cache)
+    print("   ✅ Nenhuma partição ficou com valor antigo")
+
+
+def test_patch_respeita_visibilidade():
+    """Escrita em mês legado corrige só a ficha histórica"""
+    print("🧪 Teste 4: Patch só onde o mês é visível...")
+    manager = get_cache_manager()
+    manager.cache.clear()
+    for particao in ('operacional', 'historico'):
+        manager.cache.set(f'aluno_perfil:{particao}', {'pagamentos': []}, tags=[tag_aluno('a1', particao)])
+
+    def patch(perfil):
+        return {**perfil, 'pagamentos': perfil['pagamentos'] + [{'ym': '2025-06'}]}
+
+    assert manager.patch_perfil_aluno('a1', patch, ym='2025-06') == 1
+    assert manager.cache.get('aluno_perfil:operacional') == {'pagamentos': []}
+    assert manager.cache.get('aluno_perfil:historico') == {'pagamentos': [{'ym': '2025-06'}]}
+
+    assert manager.patch_perfil_aluno('a1', patch, ym='2026-03') == 2
+    manager.invalidate_perfil_aluno('a1')
+    assert manager.cache.cache == {}
+    print("   ✅ Ficha operacional intacta, invalidação cobre as duas")
+
+
+def test_patch_aluno_por_particao():
+    """Aluno que sai do escopo some só da lista operacional"""
+    print("🧪 Teste 5: Lista de alunos por partição...")
+    from src.models.aluno import Aluno
+
+    manager = get_cache_manager()
+    manager.cache.clear()
+    aluno = Aluno.from_dict({'id': 'a1', 'nome': 'Bruno', 'ativoDesde': '2026-01-05'})
+    for particao in ('operacional', 'historico'):
+        manager._alunos_sync[particao] = {
+            'por_id': {'a1': aluno}, 'lista': [aluno], 'watermark': None,
+            'ultimo_full': time.time(), 'ultimo_delta': time.time(), 'sujo': False,
+        }
+
+    manager.patch_aluno('a1', {'ativoDesde': '2025-06-01'})
+    assert manager._alunos_sync['operacional']['lista'] == []
+    assert [a.to_dict()['ativoDesde'] for a in manager._alunos_sync['historico']['lista']] == ['2025-06-01']
+    manager._alunos_sync.clear()
+    print("   ✅ Escopo aplicado só na partição operacional")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🔥 SMOKE TEST - Cache Particionado por Modo de Dados")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_modos_lado_a_lado,
+        test_mes_legado_ttl_longo,
+        test_invalidacao_alcanca_todas_particoes,
+        test_patch_respeita_visibilidade,
+        test_patch_aluno_por_particao,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"   ❌ FALHOU: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"   ❌ ERRO: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"📊 RESULTADO: {passed}/{len(tests)} testes passaram")
+
+    if failed > 0:
+        print(f"❌ {failed} TESTE(S) FALHARAM!")
+        sys.exit(1)
+
+    print("✅ TODOS OS TESTES PASSARAM!")
+    print("=" * 60)
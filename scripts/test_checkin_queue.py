@@ -0,0 +1,212 @@
+"""
+Smoke Test - Fila Write-Behind de Check-ins
+Valida confirmação imediata, envio em lote com deduplicação e
+reprocessamento do journal após restart.
+"""
+
+import sys
+import os
+import tempfile
+import time
+
+# Adicionar o diretório raiz ao path para imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import date
+
+from scripts.firestore_fake import FirestoreFake
+from src.services import presencas_service as presencas_module
+from src.services.presencas_service import PresencasService
+from src.utils.checkin_queue import CheckinQueue
+from src.utils.request_context import request_context
+
+
+class _EscritorFake:
+    """Escritor falso que guarda os lotes recebidos"""
+
+    def __init__(self, falhar: bool = False):
+        self.lotes = []
+        self.falhar = falhar
+
+    def __call__(self, registros):
+        if self.falhar:
+            raise Exception("Firestore indisponível")
+        self.lotes.append(list(registros))
+
+
+def _journal_temporario() -> str:
+    return os.path.join(tempfile.mkdtemp(), "checkins.jsonl")
+
+
+def test_flush_em_lote_com_deduplicacao():
+    """Check-ins em rajada viram um único lote deduplicado"""
+    print("🧪 Teste 1: Flush em lote com deduplicação...")
+    escritor = _EscritorFake()
+    fila = CheckinQueue(journal_path=_journal_temporario(), escritor=escritor, intervalo=0.05)
+
+    fila.enfileirar('a1', '2026-03-02', '2026-03')
+    fila.enfileirar('a2', '2026-03-02', '2026-03')
+    fila.enfileirar('a1', '2026-03-02', '2026-03')  # duplicado
+
+    prazo = time.monotonic() + 2.0
+    while fila.total_pendentes() and time.monotonic() < prazo:
+        time.sleep(0.02)
+    fila.parar()
+
+    enviados = [reg['id'] for lote in escritor.lotes for reg in lote]
+    assert sorted(enviados) == ['a1_2026-03-02', 'a2_2026-03-02'], enviados
+    assert fila.total_pendentes() == 0
+    print(f"   ✅ {len(enviados)} registros enviados em {len(escritor.lotes)} lote(s)")
+
+
+def test_reprocessa_journal_apos_restart():
+    """Pendentes não enviados são reenviados por uma nova instância"""
+    print("🧪 Teste 2: Reprocessamento do journal após restart...")
+    journal = _journal_temporario()
+
+    fila = CheckinQueue(journal_path=journal, escritor=_EscritorFake(falhar=True), intervalo=0.05)
+    fila.enfileirar('a1', '2026-03-02', '2026-03')
+    fila._parar.set()  # simula queda do processo antes do flush
+
+    escritor = _EscritorFake()
+    nova_fila = CheckinQueue(journal_path=journal, escritor=escritor, intervalo=0.05)
+    assert nova_fila.status_conhecido('a1_2026-03-02') is True
+    nova_fila.parar()
+
+    enviados = [reg['id'] for lote in escritor.lotes for reg in lote]
+    assert 'a1_2026-03-02' in enviados
+    assert os.path.getsize(journal) == 0, "Journal deveria ser compactado após envio"
+    print("   ✅ Check-in pendente reenviado após restart")
+
+
+def test_ack_nao_reenviado():
+    """Check-ins confirmados não são reenviados em um restart"""
+    print("🧪 Teste 3: Check-ins confirmados não são reenviados...")
+    journal = _journal_temporario()
+
+    fila = CheckinQueue(journal_path=journal, escritor=_EscritorFake(), intervalo=0.05)
+    fila.enfileirar('a1', '2026-03-02', '2026-03')
+    fila.parar()
+
+    escritor = _EscritorFake()
+    nova_fila = CheckinQueue(journal_path=journal, escritor=escritor, intervalo=0.05)
+    nova_fila.parar()
+
+    assert escritor.lotes == []
+    print("   ✅ Nenhum reenvio após ack")
+
+
+def test_falta_nao_sobrescrita_pelo_check_in():
+    """Falta gravada fora da fila (ou antes do restart) bloqueia o check-in"""
+    print("🧪 Teste 4: Check-in respeita faltas já gravadas...")
+    fila = CheckinQueue(journal_path=_journal_temporario(), escritor=_EscritorFake(), intervalo=0.05)
+    servico = PresencasService.__new__(PresencasService)
+    servico.db = FirestoreFake()  # mês corrente: garantir_mes_aberto não consulta
+    consultas = []
+
+    def buscar_dia(data_presenca):
+        consultas.append(data_presenca)
+        data_str = f"{data_presenca:%Y-%m-%d}"
+        return {'a1': {'id': f"a1_{data_str}", 'alunoId': 'a1', 'data': data_str, 'presente': False}}
+    servico.buscar_presencas_por_data = buscar_dia
+
+    def buscar_pontual(*args):
+        raise AssertionError("Dia carregado: check-in não deveria ler o Firestore")
+    servico.buscar_presenca_por_aluno_data = servico.buscar_presenca = buscar_pontual
+
+    original = presencas_module.get_checkin_queue
+    presencas_module.get_checkin_queue = lambda: fila
+    try:
+        with request_context(data_referencia=date(2026, 3, 2)):
+            # Fila vazia (processo recém-iniciado): a falta vem da query do dia
+            resultado = servico.check_in_rapido('a1')
+            assert not resultado['sucesso'] and resultado['status_atual'] == 'ausente', resultado
+            assert servico.check_in_rapido('a3')['sucesso']
+            assert servico.check_in_rapido('a3')['status_atual'] == 'presente'
+            assert consultas == [date(2026, 3, 2)], "Uma query por dia, nenhuma por aluno"
+            assert servico.db.leituras == 0, "Mês corrente não pode estar fechado"
+
+            # Falta gravada direto (página de presenças) alimenta a fila
+            PresencasService.atualizar_caches({'a2_2026-03-02': {
+                'alunoId': 'a2', 'data': '2026-03-02', 'ym': '2026-03', 'presente': False}})
+            assert servico.check_in_rapido('a2')['status_atual'] == 'ausente'
+
+        # Virada do dia: estado anterior descartado, nova query
+        with request_context(data_referencia=date(2026, 3, 3)):
+            assert servico.check_in_rapido('a3')['sucesso']
+        assert fila.status_conhecido('a3_2026-03-02') is None
+        assert len(consultas) == 2
+    finally:
+        presencas_module.get_checkin_queue = original
+        fila.parar()
+    print("   ✅ Nenhuma falta sobrescrita por 'presente', estado só do dia corrente")
+
+
+def test_flush_corrige_relatorio_com_anterior():
+    """Check-in sem registro anterior soma no relatório em cache (sem recarregar)"""
+    print("🧪 Teste 5: Relatório do mês corrigido no flush...")
+    from src.utils.cache_service import get_cache_manager
+
+    manager = get_cache_manager()
+    manager.cache.clear()
+    falta = {'id': 'a1_2026-03-02', 'alunoId': 'a1', 'data': '2026-03-02', 'presente': False}
+    chave = manager.chave_mensal('presencas_relatorio', '2026-03')
+    manager.cache.set(chave, PresencasService.montar_relatorio_mensal('2026-03', [falta]))
+
+    fila = CheckinQueue(journal_path=_journal_temporario(), escritor=_EscritorFake(), intervalo=0.05)
+    fila.enfileirar('a2', '2026-03-02', '2026-03', anterior=None)
+    fila.enfileirar('a2', '2026-03-02', '2026-03', anterior=True)  # pendente: mantém o anterior do Firestore
+    fila.enfileirar('a1', '2026-03-02', '2026-03', anterior=False)
+    fila.parar()
+
+    relatorio = manager.cache.get(chave)
+    assert relatorio is not None, "Relatório não deveria ser descartado"
+    assert relatorio['total_registros'] == 2 and relatorio['total_presencas'] == 2
+    assert relatorio['presencas_por_dia']['2026-03-02'] == {'presentes': 2, 'faltas': 0}
+
+    # Journal de uma versão anterior (sem 'anterior'): estado desconhecido, recarregar
+    fila = CheckinQueue(journal_path=_journal_temporario(), escritor=_EscritorFake(), intervalo=0.05)
+    fila.enfileirar('a3', '2026-03-02', '2026-03')
+    fila.parar()
+    assert manager.cache.get(chave) is None
+    print("   ✅ Totais corrigidos com o anterior; desconhecido recarrega")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🔥 SMOKE TEST - Fila Write-Behind de Check-ins")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_flush_em_lote_com_deduplicacao,
+        test_reprocessa_journal_apos_restart,
+        test_ack_nao_reenviado,
+        test_falta_nao_sobrescrita_pelo_check_in,
+        test_flush_corrige_relatorio_com_anterior,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"   ❌ FALHOU: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"   ❌ ERRO: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"📊 RESULTADO: {passed}/{len(tests)} testes passaram")
+
+    if failed > 0:
+        print(f"❌ {failed} TESTE(S) FALHARAM!")
+        sys.exit(1)
+
+    print("✅ TODOS OS TESTES PASSARAM!")
+    print("=" * 60)
@@ -0,0 +1,106 @@
+"""
+Smoke Test - Carregamento Paralelo
+Valida que o carregador executa chamadas em paralelo, respeita timeouts
+e isola falhas por chamada.
+"""
+
+import sys
+import os
+import time
+
+# Adicionar o diretório raiz ao path para imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.concurrent_loader import carregar_em_paralelo
+
+
+def test_chamadas_em_paralelo():
+    """Latência total deve ser a da chamada mais lenta, não a soma"""
+    print("🧪 Teste 1: Chamadas executadas em paralelo...")
+
+    def lenta(valor):
+        time.sleep(0.2)
+        return valor
+
+    inicio = time.monotonic()
+    resultados = carregar_em_paralelo({
+        'a': lambda: lenta(1),
+        'b': lambda: lenta(2),
+        'c': lambda: lenta(3),
+    })
+    duracao = time.monotonic() - inicio
+
+    assert [resultados[n].valor for n in ('a', 'b', 'c')] == [1, 2, 3]
+    assert duracao < 0.5, f"Esperado < 0.5s, levou {duracao:.2f}s"
+    print(f"   ✅ 3 chamadas de 0.2s em {duracao:.2f}s")
+
+
+def test_timeout_por_chamada():
+    """Chamada lenta expira sem bloquear as demais"""
+    print("🧪 Teste 2: Timeout por chamada...")
+
+    resultados = carregar_em_paralelo(
+        {
+            'rapida': lambda: 'ok',
+            'lenta': lambda: time.sleep(1.0),
+        },
+        timeouts={'lenta': 0.1},
+    )
+
+    assert resultados['rapida'].ok and resultados['rapida'].valor == 'ok'
+    assert not resultados['lenta'].ok
+    assert isinstance(resultados['lenta'].erro, TimeoutError)
+    print("   ✅ Timeout isolado na chamada lenta")
+
+
+def test_falha_isolada():
+    """Exceção em uma chamada não afeta as outras"""
+    print("🧪 Teste 3: Falha isolada...")
+
+    def falha():
+        raise Exception("Erro ao buscar pagamentos")
+
+    resultados = carregar_em_paralelo({'alunos': lambda: [1, 2], 'pagamentos': falha})
+
+    assert resultados['alunos'].valor_ou([]) == [1, 2]
+    assert resultados['pagamentos'].valor_ou([]) == []
+    assert "pagamentos" in str(resultados['pagamentos'].erro)
+    print("   ✅ Falha contida no resultado da própria chamada")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🔥 SMOKE TEST - Carregamento Paralelo")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_chamadas_em_paralelo,
+        test_timeout_por_chamada,
+        test_falha_isolada,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"   ❌ FALHOU: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"   ❌ ERRO: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"📊 RESULTADO: {passed}/{len(tests)} testes passaram")
+
+    if failed > 0:
+        print(f"❌ {failed} TESTE(S) FALHARAM!")
+        sys.exit(1)
+
+    print("✅ TODOS OS TESTES PASSARAM!")
+    print("=" * 60)
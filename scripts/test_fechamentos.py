@@ -0,0 +1,190 @@
+"""
+Smoke Test - Fechamento Mensal
+Valida que fechar um mês grava o snapshot, que estatísticas e relatório passam
+a vir dele (sem reagregar, TTL longo no cache), que escritas no mês fechado
+são bloqueadas e que reabrir descarta o snapshot.
+"""
+
+import sys
+import os
+from datetime import date
+
+# Adicionar o diretório raiz ao path para imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.firestore_fake import FirestoreFake
+from src.services.fechamentos_service import (
+    CHAVE_MESES_FECHADOS, TTL_MESES_FECHADOS, FechamentosService, MesFechadoError,
+)
+from src.services.pagamentos_service import PagamentosService
+from src.services.presencas_service import PresencasService
+from src.utils.cache_service import CacheManager, get_cache_manager
+from src.utils.request_context import request_context
+
+YM = '2026-03'
+
+
+class _FilaFake:
+    """Fila write-behind de check-ins (DOJO_CHECKIN_QUEUE=1)"""
+
+    def __init__(self):
+        self.itens = []
+
+    def enfileirar(self, aluno_id, data, ym, presente=True):
+        self.itens.append((aluno_id, data, ym, presente))
+        return f"{aluno_id}_{data}"
+
+
+def _servicos():
+    db = FirestoreFake({
+        'pagamentos': {'a1_2026_03': {'alunoId': 'a1', 'ym': YM, 'ano': 2026, 'mes': 3,
+                                      'status': 'pago', 'valor': 150.0}},
+        'presencas': {'a1_2026-03-02': {'alunoId': 'a1', 'data': '2026-03-02', 'ym': YM, 'presente': True}},
+    })
+    pagamentos = PagamentosService.__new__(PagamentosService)
+    pagamentos.db, pagamentos.collection_name = db, 'pagamentos'
+    presencas = PresencasService.__new__(PresencasService)
+    presencas.db, presencas.collection_name = db, 'presencas'
+    return db, pagamentos, presencas
+
+
+def _fechar(db, pagamentos, presencas):
+    with request_context(data_mode='operacional', data_referencia=date(2026, 4, 10)):
+        return FechamentosService(db).fechar_mes(YM, pagamentos, presencas)
+
+
+def test_fechar_serve_snapshot():
+    """Mês fechado vem do snapshot, sem listar pagamentos/presenças"""
+    print("🧪 Teste 1: Estatísticas e relatório do snapshot...")
+    get_cache_manager().cache.clear()
+    db, pagamentos, presencas = _servicos()
+    _fechar(db, pagamentos, presencas)
+    assert db.documento('meta/fechamentos')['meses'] == [YM]
+    snapshot = db.documento(f'fechamentos/{YM}')
+    assert snapshot['pagamentos']['receita_total'] == 150.0
+    # Só agregados no documento: listas por registro estourariam 1 MiB em meses grandes
+    assert set(snapshot) == {'ym', 'pagamentos', 'presencas', 'fechadoEm'}, set(snapshot)
+
+    def falhar(filtros=None):
+        raise AssertionError("Mês fechado não deveria ser reagregado")
+    iter_pagamentos, iter_presencas = pagamentos.iter_pagamentos, presencas.iter_presencas
+    pagamentos.iter_pagamentos = presencas.iter_presencas = falhar
+    pagamentos.listar_pagamentos = presencas.listar_presencas = falhar
+
+    stats = pagamentos.obter_estatisticas_mes(YM)
+    assert stats['fechado'] and stats['total_pagos'] == 1
+    assert presencas.obter_relatorio_mensal(YM)['total_presencas'] == 1
+
+    # Listas remontadas do próprio mês (imutável), lidas por completo em lotes
+    pagamentos.iter_pagamentos, presencas.iter_presencas = iter_pagamentos, iter_presencas
+    detalhes = pagamentos.obter_detalhes_mes(YM)
+    assert detalhes['fechado'] and [p['id'] for p in detalhes['pagos']] == ['a1_2026_03']
+    assert len(presencas.obter_detalhes_mes(YM)['presentes']) == 1
+    print("   ✅ Snapshot servido, listas remontadas sob demanda")
+
+
+def test_cache_ttl_fechado():
+    """Agregado de mês fechado fica em cache com TTL_FECHADO"""
+    print("🧪 Teste 2: TTL do cache para mês fechado...")
+    manager = get_cache_manager()
+    manager.cache.clear()
+    db, pagamentos, presencas = _servicos()
+    _fechar(db, pagamentos, presencas)
+
+    manager.get_estatisticas_pagamentos_cached(pagamentos, YM)
+    entrada = manager.cache.cache[manager.chave_mensal('pagamentos_stats', YM)]
+    assert entrada['ttl'] == CacheManager.TTL_FECHADO
+    manager.get_detalhes_pagamentos_cached(pagamentos, YM)
+    assert manager.cache.cache[manager.chave_mensal('pagamentos_detalhes', YM)]['ttl'] == CacheManager.TTL_FECHADO
+    # A lista de meses fechados muda fora do processo (script): TTL curto
+    assert manager.cache.cache[CHAVE_MESES_FECHADOS]['ttl'] == TTL_MESES_FECHADOS
+    print("   ✅ Snapshot fixado até a reabertura, lista de meses com TTL curto")
+
+
+def test_escrita_bloqueada_e_reabertura():
+    """Escritas exigem reabrir; reabrir remove o snapshot e o cache"""
+    print("🧪 Teste 3: Bloqueio de escrita e reabertura...")
+    manager = get_cache_manager()
+    manager.cache.clear()
+    db, pagamentos, presencas = _servicos()
+    _fechar(db, pagamentos, presencas)
+    manager.get_estatisticas_pagamentos_cached(pagamentos, YM)
+
+    fila = _FilaFake()
+    for escrita in (lambda: pagamentos.marcar_como_devedor('a1_2026_03'),
+                    lambda: presencas.registrar_presenca('a1', date(2026, 3, 9)),
+                    lambda: presencas._enfileirar_presenca(fila, 'a1', date(2026, 3, 9))):
+        try:
+            escrita()
+            raise AssertionError("Escrita em mês fechado deveria falhar")
+        except Exception as e:
+            assert 'fechado' in str(e), str(e)
+    assert fila.itens == [], "Check-in na fila não pode entrar em mês fechado"
+
+    assert FechamentosService(db).reabrir_mes(YM)
+    assert db.documento(f'fechamentos/{YM}') is None and db.documento('meta/fechamentos')['meses'] == []
+    assert manager.cache.get(manager.chave_mensal('pagamentos_stats', YM)) is None
+    FechamentosService(db).garantir_mes_aberto(YM)
+    assert not pagamentos.obter_estatisticas_mes(YM).get('fechado')
+    print("   ✅ Bloqueado enquanto fechado, liberado após reabrir")
+
+
+def test_validacoes():
+    """Mês corrente e mês já fechado não podem ser fechados"""
+    print("🧪 Teste 4: Validações do fechamento...")
+    get_cache_manager().cache.clear()
+    db, pagamentos, presencas = _servicos()
+    with request_context(data_mode='operacional', data_referencia=date(2026, 3, 20)):
+        try:
+            FechamentosService(db).fechar_mes(YM, pagamentos, presencas)
+            raise AssertionError("Mês corrente não pode ser fechado")
+        except ValueError:
+            pass
+    _fechar(db, pagamentos, presencas)
+    try:
+        _fechar(db, pagamentos, presencas)
+        raise AssertionError("Mês já fechado")
+    except MesFechadoError:
+        raise AssertionError("Deveria ser a validação de fechamento, não o bloqueio de escrita")
+    except ValueError:
+        pass
+    print("   ✅ Validações aplicadas")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🔥 SMOKE TEST - Fechamento Mensal")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_fechar_serve_snapshot,
+        test_cache_ttl_fechado,
+        test_escrita_bloqueada_e_reabertura,
+        test_validacoes,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"   ❌ FALHOU: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"   ❌ ERRO: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"📊 RESULTADO: {passed}/{len(tests)} testes passaram")
+
+    if failed > 0:
+        print(f"❌ {failed} TESTE(S) FALHARAM!")
+        sys.exit(1)
+
+    print("✅ TODOS OS TESTES PASSARAM!")
+    print("=" * 60)
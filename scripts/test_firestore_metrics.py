@@ -0,0 +1,188 @@
+"""
+Smoke Test - Contabilidade do Firestore
+Valida a contagem de leituras/escritas/round trips por rerun, a atribuição
+ao método de serviço e à página e o aviso de orçamento de leituras.
+"""
+
+import sys
+import os
+import logging
+
+# Adicionar o diretório raiz ao path para imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils import firestore_metrics
+from src.utils.firestore_metrics import (
+    instalar_metricas_firestore,
+    registrar_resumo_render,
+    resetar_metricas,
+    top_operacoes,
+    top_paginas,
+)
+from src.utils.request_context import request_context
+
+
+class _QueryFake:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def _make_stream(self):
+        for doc in self.docs:
+            yield doc
+
+    def stream(self):
+        return self._make_stream()
+
+
+class _BatchFake:
+    def __init__(self, n):
+        self._write_pbs = [object()] * n
+
+    def commit(self):
+        return []
+
+
+firestore_metrics._instrumentar_stream(_QueryFake, por_documento=True)
+firestore_metrics._instrumentar_commit(_BatchFake)
+
+# "Serviço" compilado com caminho de src/services para a atribuição pela pilha
+_SERVICO = '''
+class AlunosServiceFake:
+    def listar(self, query):
+        return list(query.stream())
+
+    def gravar(self, batch):
+        batch.commit()
+'''
+_namespace = {}
+exec(compile(_SERVICO, '/app/src/services/alunos_fake.py', 'exec'), _namespace)
+AlunosServiceFake = _namespace['AlunosServiceFake']
+
+
+class _ColetorLog(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.registros = []
+
+    def emit(self, record):
+        self.registros.append(record)
+
+
+def test_contagem_por_rerun():
+    """Documentos lidos, query vazia conta 1, commit conta escritas"""
+    print("🧪 Teste 1: Contagem por rerun...")
+    resetar_metricas()
+    servico = AlunosServiceFake()
+
+    with request_context(pagina="👥 Alunos") as contexto:
+        assert len(servico.listar(_QueryFake([1, 2, 3]))) == 3
+        servico.listar(_QueryFake([]))
+        servico.gravar(_BatchFake(4))
+
+    assert (contexto.leituras, contexto.escritas, contexto.round_trips) == (4, 4, 3)
+    assert contexto.por_operacao == {
+        'AlunosServiceFake.listar': [4, 0, 2],
+        'AlunosServiceFake.gravar': [0, 4, 1],
+    }
+    print("   ✅ 4 leituras, 4 escritas, 3 round trips")
+
+
+def test_totais_do_processo():
+    """Top offenders por método e por página acumulam entre reruns"""
+    print("🧪 Teste 2: Maiores consumidores...")
+    resetar_metricas()
+    servico = AlunosServiceFake()
+
+    for _ in range(2):
+        with request_context(pagina="🏠 Dashboard"):
+            servico.listar(_QueryFake(list(range(10))))
+    with request_context(pagina="👥 Alunos"):
+        servico.listar(_QueryFake([1]))
+
+    assert top_operacoes(1) == [('AlunosServiceFake.listar', 21, 0, 3)]
+    assert [p[0] for p in top_paginas()] == ["🏠 Dashboard", "👥 Alunos"]
+    print("   ✅ Dashboard lidera com 20 leituras")
+
+
+def test_orcamento_excedido():
+    """Estouro do orçamento gera UM aviso e o resumo sai como warning"""
+    print("🧪 Teste 3: Orçamento de leituras...")
+    coletor = _ColetorLog()
+    firestore_metrics.logger.addHandler(coletor)
+    nivel = firestore_metrics.logger.level
+    firestore_metrics.logger.setLevel(logging.INFO)
+    try:
+        with request_context(pagina="💰 Pagamentos", orcamento_leituras=5) as contexto:
+            servico = AlunosServiceFake()
+            servico.listar(_QueryFake(list(range(4))))
+            servico.listar(_QueryFake(list(range(4))))
+            servico.listar(_QueryFake(list(range(4))))
+            registrar_resumo_render(contexto)
+    finally:
+        firestore_metrics.logger.removeHandler(coletor)
+        firestore_metrics.logger.setLevel(nivel)
+
+    avisos = [r for r in coletor.registros if 'Orçamento de leituras excedido' in r.getMessage()]
+    assert contexto.orcamento_excedido
+    assert len(avisos) == 1
+    assert 'AlunosServiceFake.listar' in avisos[0].getMessage()
+    resumo = [r for r in coletor.registros if r.getMessage().startswith('📊 Firestore')]
+    assert resumo and resumo[0].levelno == logging.WARNING
+    assert '12 leituras / orçamento 5' in resumo[0].getMessage()
+    print("   ✅ Um aviso, resumo em WARNING")
+
+
+def test_instalacao_idempotente():
+    """Instrumentação do cliente real aplicada uma única vez"""
+    print("🧪 Teste 4: Instalação idempotente...")
+    try:
+        from google.cloud.firestore_v1.query import Query
+    except ImportError:
+        print("   ⏭️ google-cloud-firestore não instalado")
+        return
+
+    os.environ.pop('DOJO_FIRESTORE_METRICS', None)
+    assert instalar_metricas_firestore()
+    instrumentado = Query._make_stream
+    assert instalar_metricas_firestore()
+    assert Query._make_stream is instrumentado
+    print("   ✅ Sem dupla contagem")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🔥 SMOKE TEST - Contabilidade do Firestore")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_contagem_por_rerun,
+        test_totais_do_processo,
+        test_orcamento_excedido,
+        test_instalacao_idempotente,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"   ❌ FALHOU: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"   ❌ ERRO: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"📊 RESULTADO: {passed}/{len(tests)} testes passaram")
+
+    if failed > 0:
+        print(f"❌ {failed} TESTE(S) FALHARAM!")
+        sys.exit(1)
+
+    print("✅ TODOS OS TESTES PASSARAM!")
+    print("=" * 60)
@@ -0,0 +1,138 @@
+"""
+Smoke Test - Iteradores em Lotes
+Valida que os iter_* leem a collection em lotes encadeados por cursor,
+decodificam e filtram sob demanda, devolvem o mesmo conteúdo das listagens
+e ficam fora da instrumentação (que mediria só a criação do gerador).
+"""
+
+import sys
+import os
+
+# Adicionar o diretório raiz ao path para imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.firestore_fake import FirestoreFake
+from src.services.pagamentos_service import PagamentosService
+from src.services.turmas_service import TurmasService
+from src.utils.firebase_config import stream_em_lotes
+from src.utils.metrics import instrumentar_servico
+from src.utils.request_context import request_context
+
+
+def _pagamentos():
+    docs = {}
+    for i in range(7):
+        ym = '2025-12' if i == 0 else '2026-03'
+        docs[f'p{i}'] = {'alunoId': f'a{i}', 'ym': ym, 'ano': int(ym[:4]),
+                         'status': 'pago' if i % 2 else 'pendente', 'valor': 100.0}
+    db = FirestoreFake({'pagamentos': docs})
+    servico = PagamentosService.__new__(PagamentosService)
+    servico.db, servico.collection_name = db, 'pagamentos'
+    return db, servico
+
+
+def test_lotes_por_cursor():
+    """stream_em_lotes encadeia lotes até um lote incompleto"""
+    print("🧪 Teste 1: Lotes encadeados por cursor...")
+    db = FirestoreFake({'docs': {f'd{i:02d}': {} for i in range(7)}})
+
+    docs = stream_em_lotes(db.collection('docs'), tamanho_lote=3)
+    assert db.consultas == [], "Nada deve ser lido antes do primeiro next()"
+    assert [d.id for d in docs] == [f'd{i:02d}' for i in range(7)]
+    assert [c.limite for c in db.consultas] == [3, 3, 3]
+    assert db.leituras == 7
+    print("   ✅ 3 lotes de até 3 documentos, sem repetição")
+
+
+def test_filtros_sob_demanda():
+    """iter_pagamentos aplica escopo e filtros de cliente ao percorrer"""
+    print("🧪 Teste 2: Escopo e filtros aplicados no gerador...")
+    db, servico = _pagamentos()
+
+    with request_context(data_mode='operacional'):
+        iterador = servico.iter_pagamentos({'status': 'pago'}, tamanho_lote=2)
+        primeiro = next(iterador)
+        assert primeiro['id'] == 'p1' and [c.limite for c in db.consultas] == [2]
+        restantes = [p['id'] for p in iterador]
+
+    assert restantes == ['p3', 'p5'], restantes
+    with request_context(data_mode='operacional'):
+        assert list(servico.iter_pagamentos({'ym': '2025-12'})) == []
+    print("   ✅ Legado e status fora do filtro descartados lote a lote")
+
+
+def test_listar_igual_iter():
+    """listar_* é o iter_* ordenado (mesmo decodificador)"""
+    print("🧪 Teste 3: Listagem e iterador com o mesmo conteúdo...")
+    _, servico = _pagamentos()
+    with request_context(data_mode='historico'):
+        lista = servico.listar_pagamentos(ordenar_por='alunoId', ordem='asc')
+        iterados = sorted(servico.iter_pagamentos(tamanho_lote=4), key=lambda p: p['alunoId'])
+    assert lista == iterados and len(lista) == 7
+
+    turmas = TurmasService.__new__(TurmasService)
+    turmas.collection = FirestoreFake({'turmas': {
+        't1': {'nome': 'Noite', 'ativo': True},
+        't2': {'nome': 'Kids', 'ativo': False},
+        't3': {'nome': 'Manhã', 'ativo': True},
+    }}).collection('turmas')
+    assert [t['nome'] for t in turmas.listar_turmas()] == ['Manhã', 'Noite']
+    assert sorted(t['id'] for t in turmas.iter_turmas(apenas_ativas=False, tamanho_lote=1)) == ['t1', 't2', 't3']
+    print("   ✅ Mesmos registros, só a ordenação muda")
+
+
+def test_geradores_fora_da_instrumentacao():
+    """instrumentar_servico não embrulha métodos geradores"""
+    print("🧪 Teste 4: Geradores não instrumentados...")
+
+    @instrumentar_servico
+    class _Servico:
+        def listar(self):
+            return [1]
+
+        def iter_itens(self):
+            yield 1
+
+    assert getattr(_Servico.listar, '__wrapped__', None) is not None
+    assert getattr(_Servico.iter_itens, '__wrapped__', None) is None
+    assert list(_Servico().iter_itens()) == [1]
+    print("   ✅ Só os métodos que retornam valor são medidos")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🔥 SMOKE TEST - Iteradores em Lotes")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_lotes_por_cursor,
+        test_filtros_sob_demanda,
+        test_listar_igual_iter,
+        test_geradores_fora_da_instrumentacao,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"   ❌ FALHOU: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"   ❌ ERRO: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"📊 RESULTADO: {passed}/{len(tests)} testes passaram")
+
+    if failed > 0:
+        print(f"❌ {failed} TESTE(S) FALHARAM!")
+        sys.exit(1)
+
+    print("✅ TODOS OS TESTES PASSARAM!")
+    print("=" * 60)
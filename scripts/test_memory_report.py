@@ -0,0 +1,142 @@
+"""
+Smoke Test - Relatório de Memória
+Valida a medição profunda, a quebra por prefixo do cache, o tamanho por
+sessão (maiores chaves primeiro), os sítios do tracemalloc e o dump em disco.
+"""
+
+import sys
+import os
+import json
+import tempfile
+import tracemalloc
+
+# Adicionar o diretório raiz ao path para imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.cache_service import get_cache_manager
+from src.utils.memory_report import (
+    formatar_relatorio_memoria,
+    gerar_relatorio_memoria,
+    gravar_relatorio_memoria,
+    medir_caches,
+    medir_sessoes,
+    tamanho_profundo,
+    top_alocacoes,
+)
+
+
+class _ComSlots:
+    __slots__ = ('dados',)
+
+    def __init__(self, dados):
+        self.dados = dados
+
+
+def test_tamanho_profundo():
+    """Conta o conteúdo (dicts, listas, __slots__) uma vez só"""
+    print("🧪 Teste 1: Tamanho profundo...")
+    texto = 'x' * 100_000
+    assert tamanho_profundo({'a': texto}) > 100_000
+    assert tamanho_profundo(_ComSlots([texto])) > 100_000
+    assert tamanho_profundo([texto, texto]) < 2 * 100_000  # mesma string uma vez
+    print("   ✅ Conteúdo contado, referências repetidas não")
+
+
+def test_caches_por_prefixo():
+    """Entradas agrupadas pelo prefixo da chave"""
+    print("🧪 Teste 2: Caches por prefixo...")
+    cache = get_cache_manager().cache
+    cache.clear()
+    try:
+        cache.set('pagamentos_stats:2026-03', {'itens': ['p' * 50_000]})
+        cache.set('pagamentos_stats:2026-04', {'itens': []})
+        cache.set('graduacoes:stats', {'total': 3})
+
+        linhas = {linha['cache']: linha for linha in medir_caches()}
+        assert linhas['pagamentos_stats']['entradas'] == 2
+        assert linhas['graduacoes']['entradas'] == 1
+        assert linhas['pagamentos_stats']['bytes'] > 50_000
+        assert medir_caches()[0]['cache'] == 'pagamentos_stats'
+    finally:
+        cache.clear()
+    print("   ✅ 2 prefixos, maior primeiro")
+
+
+def test_sessoes():
+    """Tamanho por sessão com as maiores chaves"""
+    print("🧪 Teste 3: Sessões...")
+    estados = [
+        ('sessao-a', {'df_alunos': ['a' * 80_000], 'page': 'Dashboard'}),
+        ('sessao-b', {'page': 'Alunos'}),
+    ]
+    sessoes = medir_sessoes(estados)
+    assert [s['sessao'] for s in sessoes] == ['sessao-a', 'sessao-b']
+    assert sessoes[0]['chaves'] == 2
+    assert sessoes[0]['maiores'][0][0] == 'df_alunos'
+    assert medir_sessoes() == []  # fora do Streamlit não há Runtime
+    print("   ✅ sessao-a maior, df_alunos no topo")
+
+
+def test_tracemalloc_e_dump():
+    """Sítios de alocação com tracemalloc ligado e dump .txt/.json"""
+    print("🧪 Teste 4: tracemalloc e dump...")
+    assert not tracemalloc.is_tracing() and top_alocacoes() == []
+    tracemalloc.start()
+    try:
+        retido = [bytearray(1024) for _ in range(2000)]
+        alocacoes = top_alocacoes(5)
+        assert alocacoes and alocacoes[0]['bytes'] >= 2000 * 1024
+        assert 'test_memory_report.py' in alocacoes[0]['local']
+
+        relatorio = gerar_relatorio_memoria(5)
+        assert relatorio['tracemalloc']['ativo']
+        assert 'Maiores sítios de alocação' in formatar_relatorio_memoria(relatorio)
+
+        with tempfile.TemporaryDirectory() as diretorio:
+            base = gravar_relatorio_memoria(diretorio)
+            with open(f"{base}.json", encoding='utf-8') as arquivo:
+                assert json.load(arquivo)['pid'] == os.getpid()
+            assert os.path.exists(f"{base}.txt")
+        del retido
+    finally:
+        tracemalloc.stop()
+    print("   ✅ Alocação do teste no topo, dump gravado")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🔥 SMOKE TEST - Relatório de Memória")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_tamanho_profundo,
+        test_caches_por_prefixo,
+        test_sessoes,
+        test_tracemalloc_e_dump,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"   ❌ FALHOU: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"   ❌ ERRO: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"📊 RESULTADO: {passed}/{len(tests)} testes passaram")
+
+    if failed > 0:
+        print(f"❌ {failed} TESTE(S) FALHARAM!")
+        sys.exit(1)
+
+    print("✅ TODOS OS TESTES PASSARAM!")
+    print("=" * 60)
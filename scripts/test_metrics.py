@@ -0,0 +1,218 @@
+"""
+Smoke Test - Métricas de Latência (Prometheus)
+Valida o decorador de classe dos serviços, a estimativa de p50/p95/p99, a
+contagem de erros, a taxa de acerto do cache e a exposição em texto.
+"""
+
+import sys
+import os
+import tempfile
+import urllib.request
+
+# Adicionar o diretório raiz ao path para imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils import metrics
+from src.utils.cache_service import CacheService
+from src.utils.metrics import (
+    Histograma,
+    escrever_arquivo_metricas,
+    gerar_exposicao_prometheus,
+    iniciar_servidor_metricas,
+    instrumentar_servico,
+    observar,
+    resetar_metricas,
+    resumo_latencias,
+    taxa_acerto_cache,
+)
+
+
+@instrumentar_servico
+class _ServicoFake:
+    def listar(self):
+        return [1, 2]
+
+    def falhar(self):
+        raise ValueError("erro de negócio")
+
+    def _interno(self):
+        return 'privado'
+
+    @staticmethod
+    def utilitario():
+        return 'estático'
+
+
+def test_decorador_de_classe():
+    """Métodos públicos medidos; privados e estáticos intactos"""
+    print("🧪 Teste 1: @instrumentar_servico...")
+    resetar_metricas()
+    servico = _ServicoFake()
+
+    assert servico.listar() == [1, 2]
+    assert servico.listar() == [1, 2]
+    try:
+        servico.falhar()
+        assert False, "Deveria propagar a exceção"
+    except ValueError:
+        pass
+    assert servico._interno() == 'privado'
+    assert _ServicoFake.utilitario() == 'estático'
+
+    resumo = resumo_latencias()
+    assert set(resumo) == {'_ServicoFake.listar', '_ServicoFake.falhar'}
+    assert resumo['_ServicoFake.listar']['chamadas'] == 2
+    assert resumo['_ServicoFake.falhar']['erros'] == 1
+    assert _ServicoFake.listar.__name__ == 'listar'
+    print("   ✅ 2 operações medidas, 1 erro contado")
+
+
+def test_quantis():
+    """p50/p95/p99 caem nos buckets certos"""
+    print("🧪 Teste 2: Quantis estimados...")
+    histograma = Histograma()
+    for _ in range(90):
+        histograma.observar(0.005)   # bucket (0.004, 0.006]
+    for _ in range(9):
+        histograma.observar(0.3)     # bucket (0.25, 0.4]
+    histograma.observar(45.0)        # +Inf
+
+    assert 0.004 < histograma.quantil(0.5) <= 0.006
+    assert 0.25 < histograma.quantil(0.95) <= 0.4
+    assert 0.25 < histograma.quantil(0.99) <= 0.4
+    assert histograma.quantil(1.0) == metrics.BUCKETS[-1]
+    assert Histograma().quantil(0.5) is None
+    print("   ✅ p50≈5ms, p95/p99≈300ms")
+
+
+def test_taxa_acerto_cache():
+    """CacheService.get registra acertos e faltas por prefixo"""
+    print("🧪 Teste 3: Taxa de acerto do cache...")
+    resetar_metricas()
+    cache = CacheService()
+    chamadas = []
+
+    def carregar(ym):
+        chamadas.append(ym)
+        return {'ym': ym}
+
+    for _ in range(4):
+        cache.cached_call(carregar, 'pagamentos_stats', ym='2026-03')
+
+    taxa = taxa_acerto_cache()['pagamentos_stats']
+    assert (taxa['acertos'], taxa['faltas']) == (3, 1)
+    assert taxa['taxa'] == 0.75
+    assert chamadas == ['2026-03']
+    print("   ✅ 3 acertos / 1 falta")
+
+
+def test_exposicao_prometheus():
+    """Texto com histograma cumulativo, quantis, erros e cache"""
+    print("🧪 Teste 4: Exposição Prometheus...")
+    resetar_metricas()
+    observar('AlunosService.listar_alunos', 0.02)
+    observar('AlunosService.listar_alunos', 0.5, erro=True)
+    metrics.registrar_cache('alunos', acerto=True)
+
+    texto = gerar_exposicao_prometheus()
+    linhas = texto.splitlines()
+    op = 'operacao="AlunosService.listar_alunos"'
+
+    assert '# TYPE dojo_service_latency_seconds histogram' in linhas
+    assert f'dojo_service_latency_seconds_bucket{{{op},le="0.025"}} 1' in linhas
+    assert f'dojo_service_latency_seconds_bucket{{{op},le="+Inf"}} 2' in linhas
+    assert f'dojo_service_latency_seconds_count{{{op}}} 2' in linhas
+    assert f'dojo_service_errors_total{{{op}}} 1' in linhas
+    assert any(l.startswith(f'dojo_service_latency_quantile_seconds{{{op},quantile="0.95"}}') for l in linhas)
+    assert 'dojo_cache_hit_ratio{cache="alunos"} 1.0' in linhas
+    assert texto.endswith('\n')
+    print("   ✅ Histograma, quantis, erros e cache expostos")
+
+
+def test_exportacao_http_e_arquivo():
+    """Endpoint /metrics e arquivo atômico servem o mesmo texto"""
+    print("🧪 Teste 5: Exportação HTTP e arquivo...")
+    resetar_metricas()
+    observar('TurmasService.listar_turmas', 0.01)
+
+    servidor = iniciar_servidor_metricas(0)
+    try:
+        url = f"http://127.0.0.1:{servidor.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as resposta:
+            assert resposta.status == 200
+            assert 'TurmasService.listar_turmas' in resposta.read().decode('utf-8')
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, 'dojo.prom')
+        escrever_arquivo_metricas(caminho)
+        with open(caminho, encoding='utf-8') as arquivo:
+            assert 'TurmasService.listar_turmas' in arquivo.read()
+        assert not os.path.exists(f"{caminho}.tmp")
+    print("   ✅ HTTP 200 e arquivo gravado")
+
+
+def test_renders_recentes():
+    """Mais novo primeiro; apenas_lentos respeita DOJO_SLOW_RENDER"""
+    print("🧪 Teste 6: Renders recentes...")
+    resetar_metricas()
+    metrics.registrar_render('🏠 Dashboard', 'operacional', 0.3, leituras=40)
+    metrics.registrar_render('💰 Pagamentos', 'operacional', 2.5, leituras=900)
+    metrics.registrar_render('👥 Alunos', 'operacional', 1.2)
+
+    assert [r['pagina'] for r in metrics.renders_recentes()] == ['👥 Alunos', '💰 Pagamentos', '🏠 Dashboard']
+    assert len(metrics.renders_recentes(apenas_lentos=True)) == 2
+    os.environ['DOJO_SLOW_RENDER'] = '2'
+    try:
+        lentos = metrics.renders_recentes(apenas_lentos=True)
+    finally:
+        os.environ.pop('DOJO_SLOW_RENDER')
+    assert [(r['pagina'], r['leituras']) for r in lentos] == [('💰 Pagamentos', 900)]
+
+    for _ in range(metrics.LIMITE_RENDERS + 10):
+        metrics.registrar_render('🏠 Dashboard', 'operacional', 0.1)
+    assert len(metrics.renders_recentes()) == metrics.LIMITE_RENDERS
+    print("   ✅ 2 lentos acima de 1s, 1 acima de 2s, histórico limitado")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🔥 SMOKE TEST - Métricas de Latência")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_decorador_de_classe,
+        test_quantis,
+        test_taxa_acerto_cache,
+        test_exposicao_prometheus,
+        test_exportacao_http_e_arquivo,
+        test_renders_recentes,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"   ❌ FALHOU: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"   ❌ ERRO: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"📊 RESULTADO: {passed}/{len(tests)} testes passaram")
+
+    if failed > 0:
+        print(f"❌ {failed} TESTE(S) FALHARAM!")
+        sys.exit(1)
+
+    print("✅ TODOS OS TESTES PASSARAM!")
+    print("=" * 60)
@@ -0,0 +1,139 @@
+"""
+Smoke Test - Modelos de Domínio
+Valida a decodificação única (datas convertidas, enums internados), a
+compatibilidade com dict e o menor uso de memória das listas em cache.
+"""
+
+import sys
+import os
+import tracemalloc
+from datetime import date
+
+# Adicionar o diretório raiz ao path para imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models import Aluno, Graduacao, Pagamento, Presenca, Turma
+
+
+ALUNO = {
+    'id': 'a1',
+    'nome': 'Fulano',
+    'status': 'ativo',
+    'turma': 'KIDS',
+    'vencimentoDia': 15,
+    'ativoDesde': '2026-01-10',
+    'contato': {'telefone': '11999990000', 'email': ''},
+    'graduacao': 'Sem graduação',
+    'campoNovo': 'x',
+}
+
+
+def test_decodificacao_e_compatibilidade():
+    """Atributos tipados + get/[]/in como no dict antigo"""
+    print("🧪 Teste 1: Decodificação e API compatível com dict...")
+    aluno = Aluno.from_dict(ALUNO)
+
+    assert aluno.ativo_desde == date(2026, 1, 10)
+    assert aluno.ativo and aluno.telefone == '11999990000'
+    assert aluno.get('ativoDesde') == '2026-01-10'
+    assert aluno['id'] == 'a1' and aluno.get('inativoDesde', '-') == '-'
+    assert 'turma' in aluno and 'inativoDesde' not in aluno
+    assert aluno.get('campoNovo') == 'x', "Campos não declarados devem ser preservados"
+    assert aluno.to_dict() == ALUNO
+    print("   ✅ to_dict() devolve o documento original")
+
+
+def test_enums_internados():
+    """Status e turma repetidos compartilham o mesmo objeto"""
+    print("🧪 Teste 2: Enums internados...")
+    a = Aluno.from_dict(dict(ALUNO, turma=''.join(['KI', 'DS'])))
+    b = Aluno.from_dict(dict(ALUNO, turma=''.join(['K', 'IDS'])))
+
+    assert a.turma is b.turma
+    print("   ✅ Mesma string para a mesma turma")
+
+
+def test_pagamento_vencimento():
+    """ano/mes e vencimento calculados uma vez, inclusive a partir de ym"""
+    print("🧪 Teste 3: Datas derivadas do pagamento...")
+    pagamento = Pagamento.from_dict({'ym': '2026-03', 'dataVencimento': 10, 'status': 'devedor'}, 'a1_2026_03')
+
+    assert (pagamento.ano, pagamento.mes) == (2026, 3)
+    assert pagamento.vencimento == date(2026, 3, 10)
+    assert pagamento.pendente
+    assert Pagamento.from_dict({'ym': 'inválido'}).vencimento is None
+    print("   ✅ vencimento = 2026-03-10")
+
+
+def test_datas_invalidas_preservadas():
+    """Data inválida não quebra a decodificação e volta igual no to_dict()"""
+    print("🧪 Teste 4: Datas inválidas preservadas...")
+    graduacao = Graduacao.from_dict({'nivel': 'Azul', 'data': 'sem data'})
+    presenca = Presenca.from_dict({'alunoId': 'a1', 'data': '2026-02-03', 'presente': True})
+
+    assert graduacao.data == 'sem data' and graduacao.to_dict()['data'] == 'sem data'
+    assert presenca.data == date(2026, 2, 3)
+    assert Turma.from_dict({'nome': 'KIDS', 'diasSemana': ['segunda']}).dias_semana == ['segunda']
+    print("   ✅ Valores fora do formato mantidos")
+
+
+def test_memoria_menor_que_dicts():
+    """Lista de modelos ocupa menos memória que a lista de dicts"""
+    print("🧪 Teste 5: Memória da lista em cache...")
+    origem = [dict(ALUNO, id=f"a{i}", nome=f"Aluno {i}") for i in range(2000)]
+    for dados in origem:
+        dados.pop('campoNovo')
+
+    tracemalloc.start()
+    dicts = [dict(d) for d in origem]
+    memoria_dicts = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    modelos = [Aluno.from_dict(d) for d in origem]
+    memoria_modelos = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    assert len(dicts) == len(modelos)
+    assert memoria_modelos < memoria_dicts, f"{memoria_modelos} >= {memoria_dicts}"
+    print(f"   ✅ {memoria_modelos // 1024} KiB vs {memoria_dicts // 1024} KiB em dicts")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🔥 SMOKE TEST - Modelos de Domínio")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_decodificacao_e_compatibilidade,
+        test_enums_internados,
+        test_pagamento_vencimento,
+        test_datas_invalidas_preservadas,
+        test_memoria_menor_que_dicts,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"   ❌ FALHOU: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"   ❌ ERRO: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"📊 RESULTADO: {passed}/{len(tests)} testes passaram")
+
+    if failed > 0:
+        print(f"❌ {failed} TESTE(S) FALHARAM!")
+        sys.exit(1)
+
+    print("✅ TODOS OS TESTES PASSARAM!")
+    print("=" * 60)
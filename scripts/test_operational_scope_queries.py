@@ -0,0 +1,138 @@
+"""
+Smoke Test - Escopo Operacional nas Queries
+Valida que, no modo operacional, o filtro de escopo vai para o Firestore
+(ano >= 2026 / ativoDesde >= '2026') e que meses legados nem são lidos.
+"""
+
+import sys
+import os
+
+# Adicionar o diretório raiz ao path para imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.firestore_fake import FirestoreFake
+from src.services import alunos_service as alunos_module
+from src.services import pagamentos_service as pagamentos_module
+from src.services.alunos_service import AlunosService
+from src.services.pagamentos_service import PagamentosService
+
+
+def _pagamentos_service(docs):
+    service = PagamentosService.__new__(PagamentosService)
+    service.db = FirestoreFake({'pagamentos': docs})
+    service.collection_name = 'pagamentos'
+    return service
+
+
+def test_pagamentos_escopo_no_servidor():
+    """Sem filtro de mês, ano >= 2026 é aplicado na query"""
+    print("🧪 Teste 1: Escopo de pagamentos aplicado no servidor...")
+    pagamentos_module.should_apply_operational_scope = lambda: True
+    docs = {
+        'a1_2026_01': {'alunoId': 'a1', 'ano': 2026, 'ym': '2026-01', 'status': 'devedor'},
+        'a1_2025_12': {'alunoId': 'a1', 'ano': 2025, 'ym': '2025-12', 'status': 'devedor'},
+    }
+    service = _pagamentos_service(docs)
+
+    resultado = service.listar_pagamentos(filtros={'status': 'devedor'})
+
+    filtros = service.db.consultas[0].filtros
+    assert ('ano', '>=', 2026) in filtros, filtros
+    assert not any(f[0] == 'status' for f in filtros), "status deveria ficar no cliente (sem índice composto)"
+    assert [p['id'] for p in resultado] == ['a1_2026_01']
+    print("   ✅ ano >= 2026 na query, status no cliente")
+
+
+def test_mes_legado_nao_le_firestore():
+    """Mês legado no modo operacional retorna vazio sem consultar"""
+    print("🧪 Teste 2: Mês legado não consulta o Firestore...")
+    pagamentos_module.should_apply_operational_scope = lambda: True
+    service = _pagamentos_service({})
+
+    assert service.obter_devedores(ym='2025-11') == []
+    assert service.listar_pagamentos(filtros={'ym': '2025-11'}) == []
+    assert service.db.consultas == []
+    print("   ✅ Nenhuma query disparada")
+
+
+def test_alunos_escopo_no_servidor():
+    """listar_alunos aplica ativoDesde >= '2026' e filtra status no cliente"""
+    print("🧪 Teste 3: Escopo de alunos aplicado no servidor...")
+    alunos_module.should_apply_operational_scope = lambda: True
+    db = FirestoreFake({'alunos': {
+        'a1': {'nome': 'Bia', 'status': 'ativo', 'ativoDesde': '2026-02-01'},
+        'a2': {'nome': 'Ana', 'status': 'inativo', 'ativoDesde': '2026-01-10'},
+    }})
+    service = AlunosService.__new__(AlunosService)
+    service.collection = db.collection('alunos')
+
+    resultado = service.listar_alunos(status='ativo')
+
+    assert ('ativoDesde', '>=', '2026') in db.consultas[0].filtros
+    assert [a['id'] for a in resultado] == ['a1']
+    print("   ✅ ativoDesde >= '2026' na query, status no cliente")
+
+
+def test_pagamentos_do_aluno_no_servidor():
+    """Extrato e ficha: alunoId == + ym >= '2026-01' ordenados e limitados na query"""
+    print("🧪 Teste 4: Pagamentos do aluno com escopo no servidor...")
+    pagamentos_module.should_apply_operational_scope = lambda: True
+    docs = {f'a1_{ym.replace("-", "_")}': {'alunoId': 'a1', 'ym': ym, 'ano': int(ym[:4])}
+            for ym in ('2025-11', '2025-12', '2026-01', '2026-02', '2026-03')}
+    docs['a2_2026_03'] = {'alunoId': 'a2', 'ym': '2026-03', 'ano': 2026}
+    service = _pagamentos_service(docs)
+
+    extrato = service.obter_extrato_aluno('a1', limite_meses=2)
+    consulta = service.db.consultas[0]
+    assert ('ym', '>=', '2026-01') in consulta.filtros and consulta.limite == 2, consulta.filtros
+    assert [p['ym'] for p in extrato] == ['2026-03', '2026-02']
+    assert service.db.leituras == 2, "Só os meses pedidos deveriam ser lidos"
+
+    assert [p['ym'] for p in service.listar_pagamentos_por_aluno('a1')] == ['2026-03', '2026-02', '2026-01']
+    assert service.db.leituras == 5, "Meses legados não deveriam ser lidos"
+    print("   ✅ Legado fora da query, ordem e limite no servidor")
+
+
+def teardown_module(module):
+    from src.utils.operational_scope import should_apply_operational_scope
+    pagamentos_module.should_apply_operational_scope = should_apply_operational_scope
+    alunos_module.should_apply_operational_scope = should_apply_operational_scope
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🔥 SMOKE TEST - Escopo Operacional nas Queries")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_pagamentos_escopo_no_servidor,
+        test_mes_legado_nao_le_firestore,
+        test_alunos_escopo_no_servidor,
+        test_pagamentos_do_aluno_no_servidor,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"   ❌ FALHOU: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"   ❌ ERRO: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"📊 RESULTADO: {passed}/{len(tests)} testes passaram")
+
+    if failed > 0:
+        print(f"❌ {failed} TESTE(S) FALHARAM!")
+        sys.exit(1)
+
+    print("✅ TODOS OS TESTES PASSARAM!")
+    print("=" * 60)
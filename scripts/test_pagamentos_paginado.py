@@ -0,0 +1,153 @@
+"""
+Smoke Test - Pagamentos Paginados
+Valida que a listagem paginada lê apenas a página pedida, segue o cursor
+e leva filtros e ordenação para a query do Firestore.
+"""
+
+import sys
+import os
+
+# Adicionar o diretório raiz ao path para imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.firestore_fake import FirestoreFake
+from src.services import pagamentos_service as pagamentos_module
+from src.services.pagamentos_service import PagamentosService
+
+
+def _service(docs):
+    pagamentos_module.should_apply_operational_scope = lambda: True
+    service = PagamentosService.__new__(PagamentosService)
+    service.db = FirestoreFake({'pagamentos': docs})
+    service.collection_name = 'pagamentos'
+    return service
+
+
+def _mes(total, ym='2026-03', status='devedor'):
+    ano, mes = ym.split('-')
+    return {
+        f"a{i:04d}_{ano}_{mes}": {'alunoId': f"a{i:04d}", 'ym': ym, 'status': status, 'valor': 150}
+        for i in range(total)
+    }
+
+
+def test_le_apenas_a_pagina():
+    """Mês grande: custo proporcional à página, não ao mês"""
+    print("🧪 Teste 1: Leitura limitada à página...")
+    service = _service(_mes(2000))
+
+    resultado = service.listar_pagamentos_paginado(filtros={'ym': '2026-03'}, tamanho_pagina=50)
+
+    assert len(resultado['pagamentos']) == 50
+    assert resultado['proximo_cursor'] is not None
+    assert service.db.leituras == 51, f"Esperado 51 documentos lidos, leu {service.db.leituras}"
+    print(f"   ✅ 50 pagamentos exibidos com {service.db.leituras} leituras (mês com 2000)")
+
+
+def test_cursor_percorre_todas_as_paginas():
+    """Seguindo o cursor, cada pagamento aparece exatamente uma vez"""
+    print("🧪 Teste 2: Cursor percorre todas as páginas...")
+    service = _service(_mes(120))
+
+    vistos = []
+    cursor = None
+    paginas = 0
+    while True:
+        resultado = service.listar_pagamentos_paginado(filtros={'ym': '2026-03'}, tamanho_pagina=50, cursor=cursor)
+        vistos.extend(p['id'] for p in resultado['pagamentos'])
+        paginas += 1
+        cursor = resultado['proximo_cursor']
+        if cursor is None:
+            break
+
+    assert paginas == 3
+    assert len(vistos) == 120 and len(set(vistos)) == 120
+    print("   ✅ 3 páginas, 120 pagamentos sem repetição")
+
+
+def test_filtros_no_servidor():
+    """status e alunoIds (até 30) viram filtros da query"""
+    print("🧪 Teste 3: Filtros enviados ao Firestore...")
+    docs = {**_mes(10), **_mes(10, ym='2026-02', status='pago')}
+    service = _service(docs)
+
+    resultado = service.listar_pagamentos_paginado(
+        filtros={'status': 'pago', 'alunoIds': ['a0001', 'a0002']}, tamanho_pagina=50
+    )
+
+    filtros = service.db.consultas[0].filtros
+    assert ('ym', '>=', '2026-01') in filtros, filtros
+    assert ('status', '==', 'pago') in filtros, filtros
+    assert ('alunoId', 'in', ['a0001', 'a0002']) in filtros, filtros
+    assert len(resultado['pagamentos']) == 2
+    assert resultado['proximo_cursor'] is None
+    print("   ✅ Escopo, status e alunoId 'in' na query")
+
+
+def test_muitos_alunos_filtrados_no_cliente():
+    """Mais de 30 alunos: filtro no cliente com varredura limitada"""
+    print("🧪 Teste 4: Filtro de alunos acima do limite do 'in'...")
+    service = _service(_mes(200))
+    alunos_ids = [f"a{i:04d}" for i in range(0, 200, 4)]  # 50 alunos
+
+    resultado = service.listar_pagamentos_paginado(
+        filtros={'ym': '2026-03', 'alunoIds': alunos_ids}, tamanho_pagina=20
+    )
+
+    assert not any(f[1] == 'in' for f in service.db.consultas[0].filtros)
+    assert len(resultado['pagamentos']) == 20
+    assert all(p['alunoId'] in alunos_ids for p in resultado['pagamentos'])
+    assert resultado['proximo_cursor'] is not None
+    print("   ✅ Página completa apenas com os alunos pedidos")
+
+
+def test_mes_legado_sem_leitura():
+    """Mês fora do escopo operacional não consulta o Firestore"""
+    print("🧪 Teste 5: Mês legado sem leitura...")
+    service = _service(_mes(10, ym='2025-12'))
+
+    resultado = service.listar_pagamentos_paginado(filtros={'ym': '2025-12'})
+
+    assert resultado == {'pagamentos': [], 'proximo_cursor': None}
+    assert service.db.leituras == 0
+    print("   ✅ Nenhuma leitura para mês legado")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🔥 SMOKE TEST - Pagamentos Paginados")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_le_apenas_a_pagina,
+        test_cursor_percorre_todas_as_paginas,
+        test_filtros_no_servidor,
+        test_muitos_alunos_filtrados_no_cliente,
+        test_mes_legado_sem_leitura,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"   ❌ FALHOU: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"   ❌ ERRO: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"📊 RESULTADO: {passed}/{len(tests)} testes passaram")
+
+    if failed > 0:
+        print(f"❌ {failed} TESTE(S) FALHARAM!")
+        sys.exit(1)
+
+    print("✅ TODOS OS TESTES PASSARAM!")
+    print("=" * 60)
@@ -0,0 +1,152 @@
+"""
+Smoke Test - Índice de Períodos
+Valida que /meta/periodos é lido uma única vez por TTL, que meses novos são
+gravados com ArrayUnion e que meses já conhecidos não geram escrita.
+"""
+
+import sys
+import os
+
+# Adicionar o diretório raiz ao path para imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.firestore_fake import FirestoreFake
+from src.services import periodos_service as periodos_module
+from src.services.periodos_service import PeriodosService, invalidar_cache_periodos
+
+
+def _db(periodos=None):
+    """Firestore com /meta/periodos (ausente quando None)"""
+    return FirestoreFake({'meta': {'periodos': periodos}} if periodos is not None else {})
+
+
+def test_uma_leitura():
+    """Leituras seguintes usam o cache do processo"""
+    print("🧪 Teste 1: Índice lido uma única vez...")
+    invalidar_cache_periodos()
+    db = _db({'pagamentos': ['2026-02', '2026-01', '2025-12']})
+    service = PeriodosService(db)
+
+    for _ in range(5):
+        periodos = service.obter_periodos()
+
+    assert periodos == {'pagamentos': ['2025-12', '2026-01', '2026-02']}
+    assert db.leituras == 1, f"Esperado 1 leitura, foram {db.leituras}"
+    print("   ✅ 5 consultas, 1 leitura")
+
+
+def test_registrar_apenas_meses_novos():
+    """ArrayUnion só para meses que o índice ainda não tem"""
+    print("🧪 Teste 2: Registro de meses novos...")
+    invalidar_cache_periodos()
+    db = _db({'pagamentos': ['2026-01']})
+    service = PeriodosService(db)
+    service.obter_periodos()
+
+    service.registrar_periodo('pagamentos', '2026-01')
+    assert db.escritas == [], "Mês conhecido não deveria gerar escrita"
+
+    service.registrar_periodo('pagamentos', '2026-02')
+    assert len(db.escritas) == 1
+    assert db.escritas[0][1]['pagamentos'].values == ['2026-02']
+    assert service.obter_periodos()['pagamentos'] == ['2026-01', '2026-02']
+    assert db.leituras == 1
+    print("   ✅ Uma escrita para o mês novo, cache local atualizado")
+
+
+def test_cache_frio_le_antes_de_gravar():
+    """Sem cache (script, processo sem warm-up) o índice é lido uma vez antes do diff"""
+    print("🧪 Teste 3: Registro com cache frio...")
+    invalidar_cache_periodos()
+    db = _db({'pagamentos': ['2026-03']})
+    service = PeriodosService(db)
+
+    for _ in range(20):  # um criar_pagamento por aluno em gerar_pagamentos_mes
+        service.registrar_periodo('pagamentos', '2026-03')
+    service.registrar_periodo('pagamentos', '2026-04')
+    service.registrar_periodo('pagamentos', '2026-04')
+
+    assert db.leituras == 1
+    assert [dados['pagamentos'].values for _, dados in db.escritas] == [['2026-04']], db.escritas
+    print("   ✅ 1 leitura e 1 escrita para 22 registros")
+
+
+def test_meses_por_ano():
+    """Agrupamento usado pelos seletores do dashboard"""
+    print("🧪 Teste 4: Meses agrupados por ano...")
+    invalidar_cache_periodos()
+    service = PeriodosService(_db({'pagamentos': ['2025-11', '2026-03', '2026-01']}))
+
+    assert service.meses_por_ano('pagamentos') == {2025: [11], 2026: [1, 3]}
+    assert service.meses_por_ano('presencas') == {}
+    print("   ✅ {2025: [11], 2026: [1, 3]}")
+
+
+def test_documento_inexistente():
+    """Sem /meta/periodos (antes do backfill) o índice é vazio"""
+    print("🧪 Teste 5: Documento ainda não criado...")
+    invalidar_cache_periodos()
+    service = PeriodosService(_db(None))
+
+    assert service.obter_periodos() == {}
+    invalidar_cache_periodos()
+    print("   ✅ Índice vazio, sem erro")
+
+
+def test_meses_de_outra_replica():
+    """Depois do TTL, meses registrados por outro processo aparecem"""
+    print("🧪 Teste 6: Cache expira e relê o índice...")
+    invalidar_cache_periodos()
+    db = _db({'pagamentos': ['2026-01']})
+    service = PeriodosService(db)
+    service.obter_periodos()
+
+    # Outra réplica registra 2026-02 direto no documento
+    db.colecoes['meta']['periodos']['pagamentos'].append('2026-02')
+    assert service.obter_periodos()['pagamentos'] == ['2026-01'], "Dentro do TTL: cache"
+    periodos_module._periodos_expira_em = 0.0
+    assert service.obter_periodos()['pagamentos'] == ['2026-01', '2026-02']
+    assert db.leituras == 2
+    invalidar_cache_periodos()
+    print("   ✅ Mês da outra réplica visível após o TTL")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🔥 SMOKE TEST - Índice de Períodos")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_uma_leitura,
+        test_registrar_apenas_meses_novos,
+        test_cache_frio_le_antes_de_gravar,
+        test_meses_por_ano,
+        test_documento_inexistente,
+        test_meses_de_outra_replica,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"   ❌ FALHOU: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"   ❌ ERRO: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"📊 RESULTADO: {passed}/{len(tests)} testes passaram")
+
+    if failed > 0:
+        print(f"❌ {failed} TESTE(S) FALHARAM!")
+        sys.exit(1)
+
+    print("✅ TODOS OS TESTES PASSARAM!")
+    print("=" * 60)
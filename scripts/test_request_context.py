@@ -0,0 +1,98 @@
+"""
+Smoke Test - Contexto da Requisição
+Valida que o contexto define modo de dados e data de referência e que é
+propagado para as threads do carregador paralelo.
+"""
+
+import sys
+import os
+from datetime import date
+
+# Adicionar o diretório raiz ao path para imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.concurrent_loader import carregar_em_paralelo
+from src.utils.operational_scope import get_active_data_mode, should_apply_operational_scope
+from src.utils.request_context import data_de_hoje, get_request_context, request_context
+
+
+def test_modo_de_dados_do_contexto():
+    """Contexto histórico desliga o escopo operacional"""
+    print("🧪 Teste 1: Modo de dados vindo do contexto...")
+
+    with request_context(data_mode='historico'):
+        assert get_active_data_mode() == 'historico'
+        assert should_apply_operational_scope() is False
+
+    with request_context(data_mode='operacional'):
+        assert get_active_data_mode() == 'operacional'
+        assert should_apply_operational_scope() is True
+
+    assert get_request_context() is None
+    print("   ✅ Escopo segue o contexto e é restaurado na saída")
+
+
+def test_data_de_referencia():
+    """'Hoje' fica fixo durante a requisição"""
+    print("🧪 Teste 2: Data de referência...")
+
+    with request_context(data_referencia=date(2026, 3, 1)):
+        assert data_de_hoje() == date(2026, 3, 1)
+
+    assert data_de_hoje() == date.today()
+    print("   ✅ data_de_hoje() usa a data do contexto")
+
+
+def test_contexto_nas_threads_do_carregador():
+    """Workers do carregador enxergam o contexto de quem os chamou"""
+    print("🧪 Teste 3: Propagação para o carregador paralelo...")
+
+    with request_context(data_mode='historico', data_referencia=date(2026, 5, 10)) as contexto:
+        resultados = carregar_em_paralelo({
+            'modo': get_active_data_mode,
+            'data': data_de_hoje,
+            'leitura': lambda: contexto.registrar_leituras(3),
+        })
+
+    assert resultados['modo'].valor == 'historico'
+    assert resultados['data'].valor == date(2026, 5, 10)
+    assert contexto.leituras == 3
+    print("   ✅ Contexto propagado e contador de leituras compartilhado")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🔥 SMOKE TEST - Contexto da Requisição")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_modo_de_dados_do_contexto,
+        test_data_de_referencia,
+        test_contexto_nas_threads_do_carregador,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"   ❌ FALHOU: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"   ❌ ERRO: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"📊 RESULTADO: {passed}/{len(tests)} testes passaram")
+
+    if failed > 0:
+        print(f"❌ {failed} TESTE(S) FALHARAM!")
+        sys.exit(1)
+
+    print("✅ TODOS OS TESTES PASSARAM!")
+    print("=" * 60)
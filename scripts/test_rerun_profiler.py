@@ -0,0 +1,132 @@
+"""
+Smoke Test - Profiler por Rerun
+Valida que o perfil grava speedscope/collapsed/top com página e modo no nome,
+que a função lenta aparece no topo e que desligado nada é gravado.
+"""
+
+import sys
+import os
+import json
+import tempfile
+import time
+from collections import Counter
+
+# Adicionar o diretório raiz ao path para imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.rerun_profiler import gerar_speedscope, gerar_top, perfil_solicitado, perfilar_rerun
+
+
+def _funcao_lenta():
+    fim = time.perf_counter() + 0.15
+    while time.perf_counter() < fim:
+        pass
+
+
+def _pagina_fake():
+    _funcao_lenta()
+
+
+def test_grava_arquivos_do_rerun():
+    """Speedscope, collapsed e top com página/modo no nome"""
+    print("🧪 Teste 1: Arquivos do rerun...")
+    with tempfile.TemporaryDirectory() as diretorio:
+        with perfilar_rerun("💰 Pagamentos", "operacional", True, diretorio=diretorio):
+            _pagina_fake()
+
+        arquivos = sorted(os.listdir(diretorio))
+        assert len(arquivos) == 3, arquivos
+        assert all('_Pagamentos_operacional.' in nome for nome in arquivos)
+
+        base = os.path.join(diretorio, arquivos[0].rsplit('.', 2)[0])
+        with open(f"{base}.speedscope.json", encoding='utf-8') as f:
+            perfil = json.load(f)
+        nomes = {frame['name'] for frame in perfil['shared']['frames']}
+        assert '_funcao_lenta' in nomes
+        assert perfil['profiles'][0]['type'] == 'sampled'
+        assert len(perfil['profiles'][0]['samples']) == len(perfil['profiles'][0]['weights'])
+
+        with open(f"{base}.top.txt", encoding='utf-8') as f:
+            top = f.read().splitlines()
+        assert '_funcao_lenta' in top[3], top[:5]
+
+        with open(f"{base}.collapsed.txt", encoding='utf-8') as f:
+            assert '_pagina_fake' in f.read()
+    print("   ✅ 3 arquivos, _funcao_lenta no topo")
+
+
+def test_desligado_nao_grava():
+    """ativo=False: nenhum arquivo, nenhuma thread"""
+    print("🧪 Teste 2: Desligado...")
+    with tempfile.TemporaryDirectory() as diretorio:
+        with perfilar_rerun("🏠 Dashboard", "historico", False, diretorio=diretorio) as amostrador:
+            _pagina_fake()
+        assert amostrador is None
+        assert os.listdir(diretorio) == []
+    print("   ✅ Nada gravado")
+
+
+def test_top_proprio_e_total():
+    """Tempo próprio só na folha; recursão conta uma vez no total"""
+    print("🧪 Teste 3: Top próprio/total...")
+    a, b = ('a', 'x.py', 1), ('b', 'x.py', 5)
+    amostras = Counter({(a, b): 3, (a,): 1, (a, b, b): 2})
+
+    top = {nome: (proprio, total) for nome, proprio, total in gerar_top(amostras, 0.01)}
+    assert top['b (x.py:5)'] == (0.05, 0.05)
+    assert top['a (x.py:1)'] == (0.01, 0.06)
+
+    perfil = gerar_speedscope(amostras, 'teste', 0.01)
+    assert perfil['profiles'][0]['endValue'] == 60.0
+    print("   ✅ b: 50ms/50ms, a: 10ms/60ms")
+
+
+def test_solicitacao_por_env():
+    """DOJO_PROFILE liga para todos; sem ele, não-admin nunca perfila"""
+    print("🧪 Teste 4: Ativação...")
+    os.environ['DOJO_PROFILE'] = '1'
+    try:
+        assert perfil_solicitado(is_admin=False)
+    finally:
+        os.environ.pop('DOJO_PROFILE')
+    assert not perfil_solicitado(is_admin=False)
+    print("   ✅ env liga, não-admin sem env desliga")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🔥 SMOKE TEST - Profiler por Rerun")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_grava_arquivos_do_rerun,
+        test_desligado_nao_grava,
+        test_top_proprio_e_total,
+        test_solicitacao_por_env,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"   ❌ FALHOU: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"   ❌ ERRO: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"📊 RESULTADO: {passed}/{len(tests)} testes passaram")
+
+    if failed > 0:
+        print(f"❌ {failed} TESTE(S) FALHARAM!")
+        sys.exit(1)
+
+    print("✅ TODOS OS TESTES PASSARAM!")
+    print("=" * 60)
@@ -0,0 +1,167 @@
+"""
+Smoke Test - Camada Resiliente do Firestore
+Valida retries para erros transitórios, circuit breaker e valor "stale"
+(com orçamento de memória limitado).
+"""
+
+import sys
+import os
+
+# Adicionar o diretório raiz ao path para imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from google.api_core.exceptions import ServiceUnavailable
+
+from src.utils import resilience
+from src.utils.resilience import resiliente, is_stale, obter_metricas, get_circuit_breaker
+
+# Sem esperas reais entre tentativas
+resilience.BACKOFF_BASE = 0.0
+
+
+class _ServicoFake:
+    """Serviço que falha com erro transitório nas primeiras N chamadas"""
+
+    def __init__(self, falhas: int = 0):
+        self.falhas = falhas
+        self.chamadas = 0
+
+    def _executar(self):
+        self.chamadas += 1
+        try:
+            if self.chamadas <= self.falhas:
+                raise ServiceUnavailable("503 unavailable")
+            return [{'id': 'a1'}]
+        except Exception as e:
+            # Mesmo padrão dos serviços: re-embrulha em Exception genérica
+            raise Exception(f"Erro ao listar: {str(e)}")
+
+    @resiliente(circuito='teste_retry')
+    def listar_retry(self):
+        return self._executar()
+
+    @resiliente(circuito='teste_circuito', tentativas=1)
+    def listar_circuito(self):
+        return self._executar()
+
+    @resiliente(circuito='teste_negocio')
+    def buscar_invalido(self):
+        self.chamadas += 1
+        raise ValueError("Aluno não encontrado")
+
+
+def test_retry_erro_transitorio():
+    """Erro transitório é retentado até o sucesso"""
+    print("🧪 Teste 1: Retry em erro transitório...")
+    servico = _ServicoFake(falhas=2)
+
+    resultado = servico.listar_retry()
+
+    assert resultado == [{'id': 'a1'}]
+    assert servico.chamadas == 3
+    assert obter_metricas()['retries'].get('_ServicoFake.listar_retry') == 2
+    print("   ✅ Sucesso após 2 retries")
+
+
+def test_erro_de_negocio_nao_retenta():
+    """Erros não transitórios sobem na primeira tentativa"""
+    print("🧪 Teste 2: Erro de negócio não é retentado...")
+    servico = _ServicoFake()
+
+    try:
+        servico.buscar_invalido()
+        assert False, "Deveria ter lançado ValueError"
+    except ValueError:
+        pass
+
+    assert servico.chamadas == 1
+    assert get_circuit_breaker('teste_negocio').estado == 'fechado'
+    print("   ✅ Sem retry e circuito fechado")
+
+
+def test_circuito_serve_stale():
+    """Circuito aberto serve o último valor bom marcado como stale"""
+    print("🧪 Teste 3: Circuit breaker com valor stale...")
+    servico = _ServicoFake()
+    assert not is_stale(servico.listar_circuito())
+
+    servico.falhas = 10_000
+    for _ in range(resilience.LIMITE_FALHAS):
+        resultado = servico.listar_circuito()
+        assert is_stale(resultado) and resultado == [{'id': 'a1'}]
+
+    assert get_circuit_breaker('teste_circuito').estado == 'aberto'
+    chamadas_antes = servico.chamadas
+    assert is_stale(servico.listar_circuito())
+    assert servico.chamadas == chamadas_antes, "Circuito aberto não deveria chamar o Firestore"
+    assert obter_metricas()['trips'].get('teste_circuito') == 1
+    print("   ✅ Circuito aberto servindo último valor bom")
+
+
+def test_ultimos_valores_limitados():
+    """Fallback stale limitado pelo total de registros; leituras de escrita não guardam"""
+    print("🧪 Teste 4: Orçamento do último valor bom...")
+
+    class _Servico:
+        @resiliente(circuito='teste_orcamento')
+        def listar(self, n):
+            return [{'id': i} for i in range(n)]
+
+        @resiliente(circuito='teste_orcamento', servir_stale=False)
+        def buscar(self, doc_id):
+            return {'id': doc_id}
+
+    resilience._ultimos_valores.clear()
+    resilience._registros_ultimos.clear()
+    resilience._total_registros = 0
+    servico = _Servico()
+    limite = resilience.MAX_REGISTROS_ULTIMOS_VALORES
+    for n in (limite // 2, limite // 2, limite // 4 + 1):
+        servico.listar(n)
+    assert len(resilience._ultimos_valores) == 2, "Mais antiga deveria sair do orçamento"
+    assert resilience._total_registros <= limite
+
+    servico.listar(limite + 1)
+    assert not any('listar' in chave and str(limite + 1) in chave for chave in resilience._ultimos_valores)
+    servico.buscar('p1')
+    assert not any('buscar' in chave for chave in resilience._ultimos_valores)
+    print("   ✅ Total de registros limitado, getters de escrita fora do fallback")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🔥 SMOKE TEST - Camada Resiliente do Firestore")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_retry_erro_transitorio,
+        test_erro_de_negocio_nao_retenta,
+        test_circuito_serve_stale,
+        test_ultimos_valores_limitados,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"   ❌ FALHOU: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"   ❌ ERRO: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"📊 RESULTADO: {passed}/{len(tests)} testes passaram")
+
+    if failed > 0:
+        print(f"❌ {failed} TESTE(S) FALHARAM!")
+        sys.exit(1)
+
+    print("✅ TODOS OS TESTES PASSARAM!")
+    print("=" * 60)
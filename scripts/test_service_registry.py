@@ -0,0 +1,119 @@
+"""
+Smoke Test - Registro de Serviços
+Valida que cada classe de serviço tem uma única instância no processo, mesmo
+com várias threads (sessões) pedindo ao mesmo tempo, e que o loader da ficha
+360 reaproveita as instâncias do registro.
+"""
+
+import sys
+import os
+import threading
+
+# Adicionar o diretório raiz ao path para imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services import registry
+from src.services.registry import get_service, reset_services
+
+
+class _ServicoLento:
+    criados = 0
+
+    def __init__(self):
+        _ServicoLento.criados += 1
+        threading.Event().wait(0.05)  # janela para corrida entre threads
+
+
+class _OutroServico:
+    pass
+
+
+def test_instancia_unica():
+    """Mesma instância por classe; classes diferentes não se misturam"""
+    print("🧪 Teste 1: Instância única por classe...")
+    reset_services()
+    primeiro = get_service(_OutroServico)
+    assert get_service(_OutroServico) is primeiro
+    assert get_service(_ServicoLento) is not primeiro
+    reset_services()
+    assert get_service(_OutroServico) is not primeiro
+    print("   ✅ Reaproveitada até o reset")
+
+
+def test_concorrencia_entre_sessoes():
+    """Várias sessões simultâneas constroem o serviço uma vez só"""
+    print("🧪 Teste 2: Sessões concorrentes...")
+    reset_services()
+    _ServicoLento.criados = 0
+    instancias = []
+    threads = [threading.Thread(target=lambda: instancias.append(get_service(_ServicoLento)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert _ServicoLento.criados == 1, f"Construído {_ServicoLento.criados}x"
+    assert len({id(i) for i in instancias}) == 1
+    print("   ✅ 8 threads, 1 construção")
+
+
+def test_loader_usa_registro():
+    """StudentProfileLoader reaproveita os serviços do registro"""
+    print("🧪 Teste 3: Ficha 360 com serviços compartilhados...")
+    from src.services.alunos_service import AlunosService
+    from src.services.graduacoes_service import GraduacoesService
+    from src.services.pagamentos_service import PagamentosService
+    from src.services.presencas_service import PresencasService
+    from src.services.student_profile_loader import StudentProfileLoader
+
+    reset_services()
+    falsos = {classe: object() for classe in
+              (AlunosService, GraduacoesService, PagamentosService, PresencasService)}
+    registry._instancias.update(falsos)
+    try:
+        loader = get_service(StudentProfileLoader)
+        assert loader.pagamentos_service is falsos[PagamentosService]
+        assert loader.alunos_service is falsos[AlunosService]
+        assert get_service(StudentProfileLoader) is loader
+    finally:
+        reset_services()
+    print("   ✅ Loader sem cópias próprias dos serviços")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🔥 SMOKE TEST - Registro de Serviços")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_instancia_unica,
+        test_concorrencia_entre_sessoes,
+        test_loader_usa_registro,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"   ❌ FALHOU: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"   ❌ ERRO: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"📊 RESULTADO: {passed}/{len(tests)} testes passaram")
+
+    if failed > 0:
+        print(f"❌ {failed} TESTE(S) FALHARAM!")
+        sys.exit(1)
+
+    print("✅ TODOS OS TESTES PASSARAM!")
+    print("=" * 60)
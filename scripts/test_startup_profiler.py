@@ -0,0 +1,154 @@
+"""
+Smoke Test - Profiler de Inicialização
+Valida o breakdown no formato do -X importtime (self/cumulativo por módulo),
+que imports já carregados não são medidos e que as páginas não carregam
+pandas no import.
+"""
+
+import sys
+import os
+import logging
+import tempfile
+
+# Adicionar o diretório raiz ao path para imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils import startup_profiler
+from src.utils.startup_profiler import (
+    desinstalar_profiler_imports,
+    formatar_breakdown,
+    instalar_profiler_imports,
+    medir_imports,
+)
+
+
+class _ColetorLog(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.linhas = []
+
+    def emit(self, record):
+        self.linhas.append(record.getMessage())
+
+
+def _criar_modulos(diretorio):
+    with open(os.path.join(diretorio, 'perfil_filho_tmp.py'), 'w') as f:
+        f.write("import time\ntime.sleep(0.02)\n")
+    with open(os.path.join(diretorio, 'perfil_pai_tmp.py'), 'w') as f:
+        f.write("import time\nimport perfil_filho_tmp\ntime.sleep(0.01)\n")
+
+
+def test_breakdown_self_cumulativo():
+    """Pai importa filho: cumulativo do pai inclui o filho, self não"""
+    print("🧪 Teste 1: Breakdown self/cumulativo...")
+
+    coletor = _ColetorLog()
+    nivel = startup_profiler.logger.level
+    startup_profiler.logger.setLevel(logging.INFO)
+    startup_profiler.logger.addHandler(coletor)
+    with tempfile.TemporaryDirectory() as diretorio:
+        _criar_modulos(diretorio)
+        sys.path.insert(0, diretorio)
+        try:
+            assert instalar_profiler_imports(forcar=True)
+            with medir_imports("teste"):
+                import perfil_pai_tmp  # noqa: F401
+            registros = {nome: (proprio, cumulativo, prof)
+                         for nome, proprio, cumulativo, prof in startup_profiler._registros}
+        finally:
+            desinstalar_profiler_imports()
+            startup_profiler.logger.removeHandler(coletor)
+            startup_profiler.logger.setLevel(nivel)
+            sys.path.remove(diretorio)
+            sys.modules.pop('perfil_pai_tmp', None)
+            sys.modules.pop('perfil_filho_tmp', None)
+
+    pai, filho = registros['perfil_pai_tmp'], registros['perfil_filho_tmp']
+    assert filho[2] == pai[2] + 1, "Filho deveria estar um nível abaixo"
+    assert pai[1] >= filho[1] + 10_000, "Cumulativo do pai deveria incluir o filho"
+    assert pai[0] == pai[1] - filho[1], "Self do pai não deveria incluir o filho"
+    assert pai[0] >= 10_000 and filho[0] >= 20_000
+    assert 'time' not in registros, "Módulo já carregado não deveria ser medido"
+    assert any("Imports em 'teste'" in linha for linha in coletor.linhas)
+    assert any(linha.startswith("import time:") and "perfil_filho_tmp" in linha for linha in coletor.linhas)
+    print("   ✅ Pai/filho medidos, cache de sys.modules ignorado")
+
+
+def test_formato_importtime():
+    """Linhas ordenadas pelo cumulativo, com cabeçalho do -X importtime"""
+    print("🧪 Teste 2: Formato -X importtime...")
+
+    linhas = formatar_breakdown([('a', 10, 10, 1), ('b', 5, 500, 0), ('c', 7, 70, 0)], limite=2)
+
+    assert linhas[0] == "import time: self [us] | cumulative | imported package"
+    assert len(linhas) == 3
+    assert linhas[1].endswith("| b") and linhas[2].endswith("| c")
+    print("   ✅ Top-N pelo cumulativo")
+
+
+def test_sem_profiler_nao_loga():
+    """Desligado: medir_imports não mede nem escreve"""
+    print("🧪 Teste 3: Profiler desligado...")
+
+    os.environ.pop('DOJO_IMPORT_PROFILE', None)
+    assert not instalar_profiler_imports()
+    coletor = _ColetorLog()
+    startup_profiler.logger.addHandler(coletor)
+    try:
+        with medir_imports("desligado"):
+            import json  # noqa: F401
+    finally:
+        startup_profiler.logger.removeHandler(coletor)
+    assert coletor.linhas == []
+    print("   ✅ Nenhuma linha de log")
+
+
+def test_paginas_sem_pandas_no_import():
+    """Páginas importam pandas só no caminho que monta tabelas/gráficos"""
+    print("🧪 Teste 4: Páginas sem pandas no topo...")
+
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for pagina in ('dashboard', 'alunos', 'pagamentos', 'graduacoes', 'turmas', 'presencas'):
+        with open(os.path.join(raiz, 'src', 'pages', f'{pagina}.py'), encoding='utf-8') as f:
+            topo = [linha for linha in f if not linha.startswith((' ', '\t'))]
+        assert 'import pandas as pd\n' not in topo, f"{pagina}.py importa pandas no topo"
+    print("   ✅ Nenhuma página importa pandas no topo")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🔥 SMOKE TEST - Profiler de Inicialização")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_breakdown_self_cumulativo,
+        test_formato_importtime,
+        test_sem_profiler_nao_loga,
+        test_paginas_sem_pandas_no_import,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"   ❌ FALHOU: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"   ❌ ERRO: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"📊 RESULTADO: {passed}/{len(tests)} testes passaram")
+
+    if failed > 0:
+        print(f"❌ {failed} TESTE(S) FALHARAM!")
+        sys.exit(1)
+
+    print("✅ TODOS OS TESTES PASSARAM!")
+    print("=" * 60)
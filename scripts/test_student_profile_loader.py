@@ -0,0 +1,131 @@
+"""
+Smoke Test - Ficha 360 (StudentProfileLoader)
+Valida a carga agregada do perfil do aluno e a invalidação por tag.
+"""
+
+import sys
+import os
+
+# Adicionar o diretório raiz ao path para imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.student_profile_loader import StudentProfileLoader
+from src.utils.cache_service import CacheService, get_cache_manager, get_cache_service
+
+
+class _ServicoFake:
+    """Serviço falso que conta chamadas"""
+
+    def __init__(self, valor=None, erro=None):
+        self.valor = valor
+        self.erro = erro
+        self.chamadas = 0
+
+    def _chamar(self, *args, **kwargs):
+        self.chamadas += 1
+        if self.erro:
+            raise self.erro
+        return self.valor
+
+    buscar_aluno = _chamar
+    listar_pagamentos_por_aluno = _chamar
+    listar_graduacoes_aluno = _chamar
+    obter_presencas_aluno = _chamar
+
+
+def _criar_loader(**overrides):
+    servicos = {
+        'alunos_service': _ServicoFake({'id': 'a1', 'nome': 'Ana'}),
+        'pagamentos_service': _ServicoFake([{'id': 'a1_2026_01', 'ym': '2026-01'}]),
+        'graduacoes_service': _ServicoFake([{'nivel': 'Khan Amarelo'}]),
+        'presencas_service': _ServicoFake([{'data': '2026-01-10', 'presente': True}]),
+    }
+    servicos.update(overrides)
+    return StudentProfileLoader(**servicos), servicos
+
+
+def test_cache_tags():
+    """invalidate_tag remove apenas as chaves marcadas"""
+    print("🧪 Teste 1: Invalidação por tag...")
+    cache = CacheService()
+    cache.set("perfil:a1", {"x": 1}, tags=["aluno:a1"])
+    cache.set("perfil:a2", {"x": 2}, tags=["aluno:a2"])
+
+    assert cache.invalidate_tag("aluno:a1") == 1
+    assert cache.get("perfil:a1") is None
+    assert cache.get("perfil:a2") is not None
+    print("   ✅ Somente o aluno a1 foi invalidado")
+
+
+def test_perfil_completo_em_cache():
+    """Segunda carga vem do cache; invalidação do aluno força nova busca"""
+    print("🧪 Teste 2: Perfil agregado em cache...")
+    get_cache_service().clear()
+    loader, servicos = _criar_loader()
+
+    perfil = loader.carregar('a1')
+    assert perfil['aluno']['nome'] == 'Ana'
+    assert perfil['pagamentos'][0]['ym'] == '2026-01'
+    assert perfil['erros'] == {}
+
+    loader.carregar('a1')
+    assert servicos['pagamentos_service'].chamadas == 1, "Deveria usar o cache"
+
+    get_cache_manager().invalidate_perfil_aluno('a1')
+    loader.carregar('a1')
+    assert servicos['pagamentos_service'].chamadas == 2, "Deveria recarregar após invalidação"
+    print("   ✅ Cache reaproveitado e invalidado por aluno")
+
+
+def test_falha_parcial_nao_fica_em_cache():
+    """Falha em uma seção preserva as demais e não é cacheada"""
+    print("🧪 Teste 3: Falha parcial isolada...")
+    get_cache_service().clear()
+    loader, servicos = _criar_loader(graduacoes_service=_ServicoFake(erro=Exception("timeout")))
+
+    perfil = loader.carregar('a1')
+    assert 'graduacoes' in perfil['erros']
+    assert perfil['graduacoes'] == []
+    assert perfil['aluno']['nome'] == 'Ana'
+
+    loader.carregar('a1')
+    assert servicos['alunos_service'].chamadas == 2, "Perfil parcial não deveria ir para o cache"
+    print("   ✅ Seção com erro isolada e perfil não cacheado")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🔥 SMOKE TEST - Ficha 360 (StudentProfileLoader)")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_cache_tags,
+        test_perfil_completo_em_cache,
+        test_falha_parcial_nao_fica_em_cache,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"   ❌ FALHOU: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"   ❌ ERRO: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"📊 RESULTADO: {passed}/{len(tests)} testes passaram")
+
+    if failed > 0:
+        print(f"❌ {failed} TESTE(S) FALHARAM!")
+        sys.exit(1)
+
+    print("✅ TODOS OS TESTES PASSARAM!")
+    print("=" * 60)
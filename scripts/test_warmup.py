@@ -0,0 +1,159 @@
+"""
+Smoke Test - Warm-up e Prontidão
+Valida que o warm-up pré-carrega o CacheManager (alunos, estatísticas de
+pagamentos do mês atual/anterior e relatório de presenças), que falhas não
+impedem a prontidão e que o endpoint /ready responde 503 → 200.
+"""
+
+import sys
+import os
+import json
+import urllib.error
+import urllib.request
+from datetime import date, datetime
+
+# Adicionar o diretório raiz ao path para imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services import alunos_service, pagamentos_service, periodos_service, presencas_service
+from src.utils import warmup
+from src.utils.cache_service import get_cache_manager
+from src.utils.request_context import request_context
+
+
+class _PeriodosFake:
+    def obter_periodos(self):
+        return {'pagamentos': ['2026-03']}
+
+
+class _AlunosFake:
+    chamadas = 0
+
+    def listar_alunos(self):
+        _AlunosFake.chamadas += 1
+        return [{'id': 'a1', 'nome': 'Ana', 'status': 'ativo', 'updatedAt': datetime(2026, 3, 9)}]
+
+
+class _PagamentosFake:
+    meses = []
+
+    def obter_estatisticas_mes(self, ym):
+        _PagamentosFake.meses.append(ym)
+        return {'receita_total': 100.0}
+
+
+class _PresencasFake:
+    def obter_relatorio_mensal(self, ym):
+        raise RuntimeError("Firestore indisponível")
+
+
+def _reiniciar_estado():
+    warmup._pronto.clear()
+    warmup._estado.update({'status': 'pendente', 'etapas': {}, 'erros': {}, 'duracao': None})
+
+
+def _com_fakes(func):
+    originais = (periodos_service.PeriodosService, alunos_service.AlunosService,
+                 pagamentos_service.PagamentosService, presencas_service.PresencasService)
+    periodos_service.PeriodosService = _PeriodosFake
+    alunos_service.AlunosService = _AlunosFake
+    pagamentos_service.PagamentosService = _PagamentosFake
+    presencas_service.PresencasService = _PresencasFake
+    try:
+        return func()
+    finally:
+        (periodos_service.PeriodosService, alunos_service.AlunosService,
+         pagamentos_service.PagamentosService, presencas_service.PresencasService) = originais
+
+
+def test_warmup_preenche_cache():
+    """Warm-up deixa alunos e estatísticas no cache; erro parcial não bloqueia"""
+    print("🧪 Teste 1: Warm-up pré-carrega o cache...")
+    _reiniciar_estado()
+    get_cache_manager().cache.clear()
+
+    estado = _com_fakes(lambda: warmup.aquecer(data_referencia=date(2026, 3, 10)))
+
+    assert warmup.esta_pronto()
+    assert estado['status'] == 'pronto_com_erros'
+    assert set(estado['erros']) == {'presencas'}
+    assert sorted(_PagamentosFake.meses) == ['2026-02', '2026-03']
+
+    # Primeiro usuário: tudo vem do cache, nenhuma leitura nova
+    with request_context(data_mode='operacional', data_referencia=date(2026, 3, 10)):
+        alunos = get_cache_manager().get_alunos_cached(_AlunosFake())
+        stats = get_cache_manager().get_estatisticas_pagamentos_cached(_PagamentosFake(), '2026-03')
+    assert [a.id for a in alunos] == ['a1']
+    assert stats == {'receita_total': 100.0}
+    assert _AlunosFake.chamadas == 1
+    assert _PagamentosFake.meses.count('2026-03') == 1
+    print("   ✅ Cache quente, presenças com erro isolado")
+
+
+def test_endpoint_prontidao():
+    """/ready responde 503 enquanto aquece e 200 quando pronto"""
+    print("🧪 Teste 2: Endpoint de prontidão...")
+    _reiniciar_estado()
+    servidor = warmup.iniciar_endpoint_prontidao(porta=0)
+    url = f"http://127.0.0.1:{servidor.server_address[1]}/ready"
+    try:
+        try:
+            urllib.request.urlopen(url, timeout=5)
+            assert False, "Deveria responder 503 antes do warm-up"
+        except urllib.error.HTTPError as e:
+            assert e.code == 503
+
+        warmup._pronto.set()
+        with urllib.request.urlopen(url, timeout=5) as resposta:
+            assert resposta.status == 200
+            assert json.loads(resposta.read())['status'] == 'pendente'
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+    print("   ✅ 503 → 200")
+
+
+def test_endpoint_desativado_sem_env():
+    """Sem DOJO_READINESS_PORT o endpoint não sobe"""
+    print("🧪 Teste 3: Endpoint desativado por padrão...")
+    os.environ.pop('DOJO_READINESS_PORT', None)
+    assert warmup.iniciar_endpoint_prontidao() is None
+    print("   ✅ Nenhuma porta aberta")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🔥 SMOKE TEST - Warm-up e Prontidão")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_warmup_preenche_cache,
+        test_endpoint_prontidao,
+        test_endpoint_desativado_sem_env,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"   ❌ FALHOU: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"   ❌ ERRO: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"📊 RESULTADO: {passed}/{len(tests)} testes passaram")
+
+    if failed > 0:
+        print(f"❌ {failed} TESTE(S) FALHARAM!")
+        sys.exit(1)
+
+    print("✅ TODOS OS TESTES PASSARAM!")
+    print("=" * 60)
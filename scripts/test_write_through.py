@@ -0,0 +1,316 @@
+"""
+Smoke Test - Cache Write-Through
+Valida que escritas bem-sucedidas corrigem o cache no lugar: estatísticas do
+mês após marcar como pago, relatório de presenças após a chamada, lista de
+alunos e ficha 360 após editar o aluno — sem nova leitura do Firestore, e sem
+ler o documento anterior quando não há resumo em cache para corrigir.
+"""
+
+import sys
+import os
+import time
+
+# Adicionar o diretório raiz ao path para imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.firestore_fake import FirestoreFake
+from src.models.aluno import Aluno
+from src.services.pagamentos_service import PagamentosService
+from src.services.presencas_service import PresencasService
+from src.utils.cache_backends import MemoriaCacheBackend
+from src.utils.cache_service import CacheService, get_cache_manager, tag_aluno
+from src.utils.request_context import request_context
+
+YM = '2026-03'
+
+
+def _servico(classe, docs):
+    """Serviço sobre um Firestore em memória com os documentos do teste"""
+    servico = classe.__new__(classe)
+    servico.collection_name = 'pagamentos' if classe is PagamentosService else 'presencas'
+    servico.db = FirestoreFake({servico.collection_name: {
+        doc['id']: {k: v for k, v in doc.items() if k != 'id'} for doc in docs
+    }})
+    return servico
+
+
+def _carregador(valor):
+    chamadas = []
+
+    def carregar(ym):
+        chamadas.append(ym)
+        return valor
+    return carregar, chamadas
+
+
+def test_update_preserva_ttl_e_tags():
+    """update regrava com o TTL restante e as tags; None descarta"""
+    print("🧪 Teste 1: CacheService.update...")
+    cache = CacheService()
+    cache.set('aluno_perfil:x', {'v': 1}, ttl=100, tags=['aluno:a1'])
+    expira = cache.cache['aluno_perfil:x']['expires_at']
+
+    assert cache.update('aluno_perfil:x', lambda v: {'v': v['v'] + 1})
+    assert cache.get('aluno_perfil:x') == {'v': 2}
+    assert abs(cache.cache['aluno_perfil:x']['expires_at'] - expira) < 1
+    assert 'aluno_perfil:x' in cache.tags['aluno:a1']
+
+    assert not cache.update('nao_existe:1', lambda v: v)
+    assert not cache.update('aluno_perfil:x', lambda v: None)
+    assert cache.get('aluno_perfil:x') is None
+    print("   ✅ TTL e tags mantidos, None descarta")
+
+
+def test_update_tag_alcanca_l2():
+    """Réplica B corrige a ficha que só está no L2; A vê o valor novo"""
+    print("🧪 Teste 2: update_tag com L2...")
+    backend = MemoriaCacheBackend()
+    replica_a, replica_b = CacheService(backend=backend), CacheService(backend=backend)
+    replica_a.set('aluno_perfil:1', {'nome': 'Ana'}, ttl=60, tags=['aluno:1'])
+
+    assert replica_b.update_tag('aluno:1', lambda p: {**p, 'nome': 'Ana Maria'}) == 1
+    assert replica_a.get('aluno_perfil:1') == {'nome': 'Ana Maria'}
+    assert backend.tag_keys('aluno:1') == ['aluno_perfil:1']
+    print("   ✅ Patch propagado entre réplicas")
+
+
+def test_marcar_como_pago_corrige_estatisticas():
+    """Marcar como pago move o pagamento de lista sem reler o mês"""
+    print("🧪 Teste 3: Estatísticas do mês após marcar como pago...")
+    manager = get_cache_manager()
+    manager.cache.clear()
+    pagamentos = [
+        {'id': 'a1_2026_03', 'alunoId': 'a1', 'ym': YM, 'status': 'devedor', 'valor': 150.0},
+        {'id': 'a2_2026_03', 'alunoId': 'a2', 'ym': YM, 'status': 'pago', 'valor': 120.0},
+    ]
+    carregar, chamadas = _carregador(PagamentosService.montar_estatisticas(YM, pagamentos))
+    servico = _servico(PagamentosService, pagamentos)
+    servico.obter_estatisticas_mes = carregar
+    carregar_detalhes, chamadas_detalhes = _carregador(PagamentosService.montar_detalhes(YM, pagamentos))
+    servico.obter_detalhes_mes = carregar_detalhes
+    manager.cache.set('aluno_perfil:a1', {'aluno': {'id': 'a1'}, 'pagamentos': [dict(pagamentos[0])]},
+                      tags=[tag_aluno('a1')])
+
+    antes = manager.get_estatisticas_pagamentos_cached(servico, YM)
+    assert antes['total_devedores'] == 1 and antes['receita_total'] == 120.0
+    assert 'detalhes' not in antes, "Resumo não deve carregar as listas"
+    manager.get_detalhes_pagamentos_cached(servico, YM)
+
+    servico.marcar_como_pago('a1_2026_03')
+    depois = manager.get_estatisticas_pagamentos_cached(servico, YM)
+    assert chamadas == [YM], f"Mês relido: {chamadas}"
+    assert depois['total_pagos'] == 2 and depois['total_devedores'] == 0
+    assert depois['receita_total'] == 270.0
+    assert antes['total_devedores'] == 1, "Valor antigo não deve ser alterado no lugar"
+    detalhes = manager.get_detalhes_pagamentos_cached(servico, YM)
+    assert chamadas_detalhes == [YM] and detalhes['devedores'] == []
+    pago = next(p for p in detalhes['pagos'] if p['id'] == 'a1_2026_03')
+    assert hasattr(pago['paidAt'], 'year'), "SERVER_TIMESTAMP deveria virar datetime"
+
+    ficha = manager.cache.get('aluno_perfil:a1')
+    assert ficha['pagamentos'][0]['status'] == 'pago'
+
+    servico.deletar_pagamento('a2_2026_03')
+    depois = manager.get_estatisticas_pagamentos_cached(servico, YM)
+    assert chamadas == [YM] and depois['total_pagamentos'] == 1
+    assert [p['id'] for p in manager.get_detalhes_pagamentos_cached(servico, YM)['pagos']] == ['a1_2026_03']
+    print("   ✅ Pago e excluído sem reler o Firestore")
+
+
+def test_estatisticas_incompletas_recarregam():
+    """Resumo sem totais por status (formato antigo): entrada descartada (não inventa totais)"""
+    print("🧪 Teste 4: Fallback para invalidação...")
+    manager = get_cache_manager()
+    manager.cache.clear()
+    pagamento = {'id': 'a1_2026_03', 'alunoId': 'a1', 'ym': YM, 'status': 'devedor', 'valor': 150.0}
+    stats = PagamentosService.montar_estatisticas(YM, [pagamento])
+    del stats['por_status']  # ex.: gravado no L2 por uma versão anterior
+    carregar, chamadas = _carregador(stats)
+    servico = _servico(PagamentosService, [pagamento])
+    servico.obter_estatisticas_mes = carregar
+
+    manager.get_estatisticas_pagamentos_cached(servico, YM)
+    servico.marcar_como_pago('a1_2026_03')
+    manager.get_estatisticas_pagamentos_cached(servico, YM)
+    assert chamadas == [YM, YM], chamadas
+    print("   ✅ Recarregado na próxima leitura")
+
+
+def test_chamada_corrige_relatorio_presencas():
+    """Salvar a chamada atualiza o relatório do mês e a ficha do aluno"""
+    print("🧪 Teste 5: Relatório de presenças após salvar a chamada...")
+    from datetime import date
+
+    manager = get_cache_manager()
+    manager.cache.clear()
+    existente = {'id': 'a1_2026-03-02', 'alunoId': 'a1', 'data': '2026-03-02', 'ym': YM, 'presente': True}
+    carregar, chamadas = _carregador(PresencasService.montar_relatorio_mensal(YM, [existente]))
+    servico = _servico(PresencasService, [existente])
+    servico.obter_relatorio_mensal = carregar
+    manager.cache.set('aluno_perfil:a2', {'aluno': {'id': 'a2'}, 'presencas': []}, tags=[tag_aluno('a2')])
+
+    servico.obter_detalhes_mes = lambda ym: PresencasService.montar_detalhes(ym, [existente])
+    manager.get_relatorio_presencas_cached(servico, YM)
+    manager.get_detalhes_presencas_cached(servico, YM)
+    gravados = servico.registrar_presencas_batch(
+        [{'alunoId': 'a1', 'presente': False}, {'alunoId': 'a2', 'presente': True}],
+        date(2026, 3, 2)
+    )
+    assert gravados == 2
+
+    relatorio = manager.get_relatorio_presencas_cached(servico, YM)
+    assert chamadas == [YM], f"Mês relido: {chamadas}"
+    assert relatorio['total_registros'] == 2
+    assert relatorio['total_presencas'] == 1 and relatorio['total_faltas'] == 1
+    assert relatorio['presencas_por_dia']['2026-03-02'] == {'presentes': 1, 'faltas': 1}
+    detalhes = manager.get_detalhes_presencas_cached(servico, YM)
+    assert [p['id'] for p in detalhes['faltas']] == ['a1_2026-03-02']
+    assert [p['id'] for p in detalhes['presentes']] == ['a2_2026-03-02']
+    assert manager.cache.get('aluno_perfil:a2')['presencas'][0]['id'] == 'a2_2026-03-02'
+    print("   ✅ Relatório e ficha corrigidos")
+
+
+def test_resumo_compacto_equivale_a_reagregar():
+    """Resumos guardam só totais (sem registro a registro) e o patch bate com reagregar"""
+    print("🧪 Teste 6: Resumo compacto corrigido por valor antigo/novo...")
+    pagamentos = {f'a{i}_2026_03': {'id': f'a{i}_2026_03', 'status': 'devedor', 'valor': 100.0 + i}
+                  for i in range(300)}
+    stats = PagamentosService.montar_estatisticas(YM, list(pagamentos.values()))
+    assert 'indice' not in stats and len(stats['por_status']) == 4
+
+    escritas = [('a1_2026_03', {'status': 'pago', 'valor': 101.0}),
+                ('a2_2026_03', None),
+                ('a9_2026_04', {'status': 'inadimplente', 'valor': 90.0}),
+                ('a1_2026_03', {'status': 'pago', 'valor': 80.0})]
+    for pagamento_id, novo in escritas:
+        anterior = pagamentos.pop(pagamento_id, None)
+        if novo is not None:
+            pagamentos[pagamento_id] = {'id': pagamento_id, **novo}
+        stats = PagamentosService.aplicar_escrita_estatisticas(stats, anterior, pagamentos.get(pagamento_id))
+    assert stats == PagamentosService.montar_estatisticas(YM, list(pagamentos.values()))
+
+    presencas = {f'a{i % 10}_2026-03-{i // 10 + 1:02d}': {'alunoId': f'a{i % 10}', 'data': f'2026-03-{i // 10 + 1:02d}',
+                                                           'presente': i % 3 > 0} for i in range(200)}
+    relatorio = PresencasService.montar_relatorio_mensal(YM, [{'id': k, **v} for k, v in presencas.items()])
+    assert 'indice' not in relatorio and len(relatorio['por_aluno']) == 10
+
+    for presenca_id, novo in (('a0_2026-03-01', {'presente': True}), ('a3_2026-03-01', None),
+                              ('a7_2026-03-30', {'presente': False})):
+        anterior = presencas.pop(presenca_id, None)
+        if novo is not None:
+            aluno_id, data = presenca_id.rsplit('_', 1)
+            presencas[presenca_id] = {'alunoId': aluno_id, 'data': data, **novo}
+        relatorio = PresencasService.aplicar_escrita_relatorio(relatorio, presenca_id, anterior,
+                                                               presencas.get(presenca_id))
+    assert relatorio == PresencasService.montar_relatorio_mensal(YM, [{'id': k, **v} for k, v in presencas.items()])
+    print("   ✅ Totais por status/aluno/dia, iguais à reagregação após as escritas")
+
+
+def test_patch_aluno():
+    """Editar o aluno corrige a lista sincronizada e a ficha 360"""
+    print("🧪 Teste 7: Lista de alunos e ficha após editar...")
+    manager = get_cache_manager()
+    manager.cache.clear()
+    alunos = [Aluno.from_dict({'id': 'a1', 'nome': 'Bruno', 'ativoDesde': '2026-01-05'}),
+              Aluno.from_dict({'id': 'a2', 'nome': 'Carla', 'ativoDesde': '2026-01-05'})]
+    lista_antiga = list(alunos)
+    manager._alunos_sync['operacional'] = {
+        'por_id': {a.id: a for a in alunos}, 'lista': lista_antiga, 'watermark': None,
+        'ultimo_full': time.time(), 'ultimo_delta': time.time(), 'sujo': False,
+    }
+    manager.cache.set('aluno_perfil:a2', {'aluno': {'id': 'a2', 'nome': 'Carla'}}, tags=[tag_aluno('a2')])
+
+    manager.patch_aluno('a2', {'nome': 'Ana', 'inativoDesde': None})
+    estado = manager._alunos_sync['operacional']
+    assert [a.nome for a in estado['lista']] == ['Ana', 'Bruno'], "Lista deveria ser reordenada"
+    assert not estado['sujo'], "Patch não deveria forçar sync"
+    assert [a.nome for a in lista_antiga] == ['Bruno', 'Carla'], "Lista antiga não deve mudar"
+    assert manager.cache.get('aluno_perfil:a2')['aluno']['nome'] == 'Ana'
+
+    # ativoDesde decide o escopo: ficha recarregada
+    manager.patch_aluno('a2', {'ativoDesde': '2025-06-01'})
+    assert manager.cache.get('aluno_perfil:a2') is None
+    manager._alunos_sync.clear()
+    print("   ✅ Lista e ficha atualizadas no lugar")
+
+
+def test_upsert_so_le_anterior_com_resumo():
+    """Upserts só leem o documento anterior se há resumo do mês em cache para corrigir"""
+    print("🧪 Teste 8: Leitura antes da escrita só com resumo em cache...")
+    from datetime import date
+
+    manager = get_cache_manager()
+    manager.cache.clear()
+    pagamento = {'id': 'a1_2026_03', 'alunoId': 'a1', 'ym': YM, 'ano': 2026, 'mes': 3,
+                 'status': 'devedor', 'valor': 150.0, 'alunoNome': 'Ana'}
+    servico = _servico(PagamentosService, [pagamento])
+    lidos = []
+    buscar = servico.buscar_pagamento
+    servico.buscar_pagamento = lambda pagamento_id: lidos.append(pagamento_id) or buscar(pagamento_id)
+    manager.cache.set('aluno_perfil:a1', {'aluno': {'id': 'a1'}, 'pagamentos': [dict(pagamento)]},
+                      tags=[tag_aluno('a1')])
+    dados = {'alunoId': 'a1', 'ano': 2026, 'mes': 3, 'valor': 150.0}
+
+    with request_context(data_referencia=date(2026, 3, 10)):
+        servico.criar_pagamento({**dados, 'status': 'pago'})
+        assert lidos == [], "Sem resumo em cache: nenhuma leitura antes da escrita"
+        ficha = manager.cache.get('aluno_perfil:a1')['pagamentos'][0]
+        assert ficha['status'] == 'pago' and ficha['alunoNome'] == 'Ana', "Escrita mesclada à ficha em cache"
+
+        atual = {'id': 'a1_2026_03', **servico.db.documento('pagamentos/a1_2026_03')}
+        carregar, chamadas = _carregador(PagamentosService.montar_estatisticas(YM, [atual]))
+        servico.obter_estatisticas_mes = carregar
+        manager.get_estatisticas_pagamentos_cached(servico, YM)
+        servico.criar_pagamento({**dados, 'status': 'devedor'})
+        assert lidos == ['a1_2026_03']
+        stats = manager.get_estatisticas_pagamentos_cached(servico, YM)
+        assert chamadas == [YM] and stats['total_pagos'] == 0 and stats['total_devedores'] == 1
+
+        presencas = _servico(PresencasService, [])
+        presencas.buscar_presenca = lambda presenca_id: lidos.append(presenca_id)
+        presencas.registrar_presenca('a1', date(2026, 3, 2))
+        assert lidos == ['a1_2026_03'], "Sem relatório em cache: presença gravada sem leitura"
+    print("   ✅ Uma leitura só quando há totais a corrigir")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🔥 SMOKE TEST - Cache Write-Through")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_update_preserva_ttl_e_tags,
+        test_update_tag_alcanca_l2,
+        test_marcar_como_pago_corrige_estatisticas,
+        test_estatisticas_incompletas_recarregam,
+        test_chamada_corrige_relatorio_presencas,
+        test_resumo_compacto_equivale_a_reagregar,
+        test_patch_aluno,
+        test_upsert_so_le_anterior_com_resumo,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"   ❌ FALHOU: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"   ❌ ERRO: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"📊 RESULTADO: {passed}/{len(tests)} testes passaram")
+
+    if failed > 0:
+        print(f"❌ {failed} TESTE(S) FALHARAM!")
+        sys.exit(1)
+
+    print("✅ TODOS OS TESTES PASSARAM!")
+    print("=" * 60)
@@ -21,22 +21,14 @@ def verificar_vencimentos():
         # Inicializar serviço
         alunos_service = AlunosService()
         
-        # Buscar todos os alunos
-        print("🔍 Buscando todos os alunos...")
-        alunos = alunos_service.listar_alunos()
-        
-        if not alunos:
-            print("❌ Nenhum aluno encontrado no sistema")
-            return
-        
-        print(f"✅ Total de alunos no sistema: {len(alunos)}")
-        print()
-        
-        # Filtrar alunos com vencimento fora do padrão
+        # Percorrer todos os alunos em lotes, sem carregar a collection inteira
+        print("🔍 Percorrendo todos os alunos...")
         vencimentos_validos = [10, 15, 25]
         alunos_fora_padrao = []
+        total_alunos = 0
         
-        for aluno in alunos:
+        for aluno in alunos_service.iter_alunos():
+            total_alunos += 1
             vencimento = aluno.get('vencimentoDia')
             if vencimento and vencimento not in vencimentos_validos:
                 alunos_fora_padrao.append({
@@ -47,6 +39,13 @@ def verificar_vencimentos():
                     'turma': aluno.get('turma', 'N/A')
                 })
         
+        if not total_alunos:
+            print("❌ Nenhum aluno encontrado no sistema")
+            return
+        
+        print(f"✅ Total de alunos no sistema: {total_alunos}")
+        print()
+        
         # Mostrar resultados
         if not alunos_fora_padrao:
             print("✅ ÓTIMO! Todos os alunos já estão com vencimento no padrão (10, 15 ou 25)")
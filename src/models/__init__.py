@@ -0,0 +1,12 @@
+"""
+Modelos de domínio com __slots__ (decodificados uma vez do Firestore)
+"""
+
+from src.models.base import Modelo
+from src.models.aluno import Aluno
+from src.models.pagamento import Pagamento
+from src.models.presenca import Presenca
+from src.models.graduacao import Graduacao
+from src.models.turma import Turma
+
+__all__ = ['Modelo', 'Aluno', 'Pagamento', 'Presenca', 'Graduacao', 'Turma']
@@ -0,0 +1,42 @@
+"""
+Aluno - Modelo de /alunos/{alunoId}
+"""
+
+from src.models.base import Modelo
+
+
+class Aluno(Modelo):
+    """Aluno com datas já convertidas e status/turma internados"""
+
+    __slots__ = (
+        'nome', 'status', 'turma', 'turma_id', 'graduacao', 'vencimento_dia',
+        'ativo_desde', 'inativo_desde', 'data_nascimento', 'contato', 'plano_id',
+        'updated_at', 'endereco', 'responsavel', 'ultimo_pagamento_ym', 'created_at',
+    )
+
+    CAMPOS = (
+        ('nome', 'nome', 'str'),
+        ('status', 'status', 'enum'),
+        ('turma', 'turma', 'enum'),
+        ('turmaId', 'turma_id', 'enum'),
+        ('graduacao', 'graduacao', 'enum'),
+        ('vencimentoDia', 'vencimento_dia', 'int'),
+        ('ativoDesde', 'ativo_desde', 'date'),
+        ('inativoDesde', 'inativo_desde', 'date'),
+        ('dataNascimento', 'data_nascimento', 'date'),
+        ('contato', 'contato', 'any'),
+        ('planoId', 'plano_id', 'enum'),
+        ('updatedAt', 'updated_at', 'any'),
+        ('endereco', 'endereco', 'str'),
+        ('responsavel', 'responsavel', 'any'),
+        ('ultimoPagamentoYm', 'ultimo_pagamento_ym', 'enum'),
+        ('createdAt', 'created_at', 'any'),
+    )
+
+    @property
+    def ativo(self) -> bool:
+        return self.status == 'ativo'
+
+    @property
+    def telefone(self) -> str:
+        return (self.contato or {}).get('telefone', '') if isinstance(self.contato, dict) else ''
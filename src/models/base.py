@@ -0,0 +1,169 @@
+"""
+Modelo - Base dos modelos de domínio com __slots__
+Decodifica o documento do Firestore UMA vez (datas já convertidas, enums
+internados) e expõe uma API de leitura compatível com dict (get, [], in)
+para que as páginas migrem aos poucos.
+"""
+
+import sys
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+
+def _decodificar_data(valor: Any) -> Any:
+    """'YYYY-MM-DD' → date (valores inválidos são mantidos como vieram)"""
+    if valor is None or isinstance(valor, date) and not isinstance(valor, datetime):
+        return valor
+    if isinstance(valor, datetime):
+        return valor.date()
+    try:
+        return date.fromisoformat(str(valor)[:10])
+    except ValueError:
+        return valor
+
+
+def _decodificar_enum(valor: Any) -> Any:
+    """Strings repetidas (status, turma, nível) compartilham o mesmo objeto"""
+    return sys.intern(valor) if isinstance(valor, str) else valor
+
+
+def _decodificar_int(valor: Any) -> Any:
+    try:
+        return int(valor) if valor is not None else None
+    except (TypeError, ValueError):
+        return valor
+
+
+def _decodificar_float(valor: Any) -> Any:
+    try:
+        return float(valor) if valor is not None else None
+    except (TypeError, ValueError):
+        return valor
+
+
+def _identidade(valor: Any) -> Any:
+    return valor
+
+
+def _codificar_data(valor: Any) -> Any:
+    return valor.strftime('%Y-%m-%d') if isinstance(valor, date) else valor
+
+
+DECODIFICADORES: Dict[str, Callable[[Any], Any]] = {
+    'str': _identidade,
+    'enum': _decodificar_enum,
+    'date': _decodificar_data,
+    'int': _decodificar_int,
+    'float': _decodificar_float,
+    'bool': _identidade,
+    'any': _identidade,
+}
+
+CODIFICADORES: Dict[str, Callable[[Any], Any]] = {
+    'date': _codificar_data,
+}
+
+
+class Modelo:
+    """
+    Base dos modelos de domínio
+
+    Subclasses declaram CAMPOS como tuplas (campo_firestore, atributo, tipo),
+    com tipo em 'str', 'enum', 'date', 'int', 'float', 'bool' ou 'any', e os
+    atributos correspondentes em __slots__. Campos não declarados ficam em
+    `extras` (None quando não há nenhum).
+    """
+
+    __slots__ = ('id', 'extras')
+
+    CAMPOS: Tuple[Tuple[str, str, str], ...] = ()
+    # campo_firestore → (atributo, tipo); preenchido por __init_subclass__
+    _INDICE: Dict[str, Tuple[str, str]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._INDICE = {campo: (atributo, tipo) for campo, atributo, tipo in cls.CAMPOS}
+
+    @classmethod
+    def from_dict(cls, dados: Dict[str, Any], doc_id: Optional[str] = None):
+        """
+        Decodifica um dict do Firestore (com ou sem 'id' injetado)
+
+        Args:
+            dados: Dados do documento (to_dict())
+            doc_id: ID do documento (default: dados['id'])
+        """
+        obj = cls.__new__(cls)
+        obj.id = doc_id if doc_id is not None else dados.get('id')
+        valor_de = dados.get
+        for campo, atributo, tipo in cls.CAMPOS:
+            setattr(obj, atributo, DECODIFICADORES[tipo](valor_de(campo)))
+        # dict novo (não uma cópia reduzida com pop): tabela do tamanho certo
+        indice = cls._INDICE
+        extras = {k: v for k, v in dados.items() if k not in indice and k != 'id'}
+        obj.extras = extras or None
+        obj._pos_decodificar()
+        return obj
+
+    @classmethod
+    def from_snapshot(cls, doc):
+        """Decodifica um DocumentSnapshot do Firestore"""
+        return cls.from_dict(doc.to_dict() or {}, doc.id)
+
+    def _pos_decodificar(self) -> None:
+        """Gancho para campos derivados (ex.: ano/mes a partir de ym)"""
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Adaptador para o formato antigo: dict do Firestore + 'id'"""
+        dados: Dict[str, Any] = dict(self.extras) if self.extras else {}
+        for campo, atributo, tipo in self.CAMPOS:
+            valor = getattr(self, atributo)
+            if valor is not None:
+                dados[campo] = CODIFICADORES.get(tipo, _identidade)(valor)
+        if self.id is not None:
+            dados['id'] = self.id
+        return dados
+
+    # ------------------------------------------------------------------
+    # Compatibilidade com dict (somente leitura)
+    # ------------------------------------------------------------------
+    def get(self, campo: str, default: Any = None) -> Any:
+        if campo == 'id':
+            return self.id if self.id is not None else default
+        indice = self._INDICE.get(campo)
+        if indice is not None:
+            atributo, tipo = indice
+            valor = getattr(self, atributo)
+            if valor is None:
+                return default
+            return CODIFICADORES.get(tipo, _identidade)(valor)
+        if self.extras and campo in self.extras:
+            return self.extras[campo]
+        return default
+
+    def __getitem__(self, campo: str) -> Any:
+        valor = self.get(campo, _AUSENTE)
+        if valor is _AUSENTE:
+            raise KeyError(campo)
+        return valor
+
+    def __contains__(self, campo: str) -> bool:
+        return self.get(campo, _AUSENTE) is not _AUSENTE
+
+    def keys(self) -> Iterator[str]:
+        return iter(self.to_dict().keys())
+
+    def __eq__(self, outro: Any) -> bool:
+        if isinstance(outro, Modelo):
+            return type(self) is type(outro) and self.to_dict() == outro.to_dict()
+        if isinstance(outro, dict):
+            return self.to_dict() == outro
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(id={self.id!r})"
+
+
+_AUSENTE = object()
@@ -0,0 +1,22 @@
+"""
+Graduacao - Modelo de /alunos/{alunoId}/graduacoes/{gradId}
+"""
+
+from src.models.base import Modelo
+
+
+class Graduacao(Modelo):
+    """Graduação com data já convertida e nível internado"""
+
+    __slots__ = (
+        'aluno_id', 'nivel', 'data', 'obs', 'updated_at', 'created_at',
+    )
+
+    CAMPOS = (
+        ('alunoId', 'aluno_id', 'enum'),
+        ('nivel', 'nivel', 'enum'),
+        ('data', 'data', 'date'),
+        ('obs', 'obs', 'str'),
+        ('updatedAt', 'updated_at', 'any'),
+        ('createdAt', 'created_at', 'any'),
+    )
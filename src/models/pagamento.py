@@ -0,0 +1,52 @@
+"""
+Pagamento - Modelo de /pagamentos/{alunoId_YYYY_MM}
+"""
+
+from datetime import date
+
+from src.models.base import Modelo
+
+
+class Pagamento(Modelo):
+    """Pagamento mensal com ano/mês e data de vencimento pré-calculados"""
+
+    __slots__ = (
+        'aluno_id', 'aluno_nome', 'ano', 'mes', 'ym', 'valor', 'status',
+        'dia_vencimento', 'carencia_dias', 'data_atraso', 'exigivel', 'paid_at',
+        'updated_at', 'vencimento', 'created_at',
+    )
+
+    CAMPOS = (
+        ('alunoId', 'aluno_id', 'enum'),
+        ('alunoNome', 'aluno_nome', 'str'),
+        ('ano', 'ano', 'int'),
+        ('mes', 'mes', 'int'),
+        ('ym', 'ym', 'enum'),
+        ('valor', 'valor', 'float'),
+        ('status', 'status', 'enum'),
+        ('dataVencimento', 'dia_vencimento', 'int'),
+        ('carenciaDias', 'carencia_dias', 'int'),
+        ('dataAtraso', 'data_atraso', 'date'),
+        ('exigivel', 'exigivel', 'bool'),
+        ('paidAt', 'paid_at', 'any'),
+        ('updatedAt', 'updated_at', 'any'),
+        ('createdAt', 'created_at', 'any'),
+    )
+
+    def _pos_decodificar(self) -> None:
+        # ym é a fonte de verdade em documentos antigos sem ano/mes
+        if (self.ano is None or self.mes is None) and isinstance(self.ym, str):
+            try:
+                self.ano, self.mes = map(int, self.ym.split('-'))
+            except ValueError:
+                pass
+
+        # Data completa do vencimento (dia padrão 15, como no serviço)
+        try:
+            self.vencimento = date(self.ano, self.mes, self.dia_vencimento or 15)
+        except (TypeError, ValueError):
+            self.vencimento = None
+
+    @property
+    def pendente(self) -> bool:
+        return self.status in ('devedor', 'inadimplente')
@@ -0,0 +1,22 @@
+"""
+Presenca - Modelo de /presencas/{alunoId_YYYY-MM-DD}
+"""
+
+from src.models.base import Modelo
+
+
+class Presenca(Modelo):
+    """Presença com a data da aula já convertida"""
+
+    __slots__ = (
+        'aluno_id', 'data', 'ym', 'presente', 'updated_at', 'created_at',
+    )
+
+    CAMPOS = (
+        ('alunoId', 'aluno_id', 'enum'),
+        ('data', 'data', 'date'),
+        ('ym', 'ym', 'enum'),
+        ('presente', 'presente', 'bool'),
+        ('updatedAt', 'updated_at', 'any'),
+        ('createdAt', 'created_at', 'any'),
+    )
@@ -0,0 +1,29 @@
+"""
+Turma - Modelo de /turmas/{turmaId}
+"""
+
+from src.models.base import Modelo, _decodificar_enum
+
+
+class Turma(Modelo):
+    """Turma com nome, horários e dias da semana internados"""
+
+    __slots__ = (
+        'nome', 'horario_inicio', 'horario_fim', 'dias_semana', 'descricao', 'ativo',
+        'created_at', 'updated_at',
+    )
+
+    CAMPOS = (
+        ('nome', 'nome', 'enum'),
+        ('horarioInicio', 'horario_inicio', 'enum'),
+        ('horarioFim', 'horario_fim', 'enum'),
+        ('diasSemana', 'dias_semana', 'any'),
+        ('descricao', 'descricao', 'str'),
+        ('ativo', 'ativo', 'bool'),
+        ('createdAt', 'created_at', 'any'),
+        ('updatedAt', 'updated_at', 'any'),
+    )
+
+    def _pos_decodificar(self) -> None:
+        if isinstance(self.dias_semana, list):
+            self.dias_semana = [_decodificar_enum(d) for d in self.dias_semana]
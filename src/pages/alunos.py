@@ -4,28 +4,23 @@ Integrado ao AlunosService
 """
 
 import streamlit as st
-import pandas as pd
 from datetime import date, datetime
-from typing import Dict, Any, List
+from typing import TYPE_CHECKING, Dict, Any, List
 from src.services.alunos_service import AlunosService
-from src.services.graduacoes_service import GraduacoesService
-from src.services.pagamentos_service import PagamentosService
-from src.services.presencas_service import PresencasService
-from src.services.turmas_service import TurmasService
-from src.utils.cache_service import get_cache_manager
+from src.services.registry import get_service
+
+if TYPE_CHECKING:
+    from src.services.student_profile_loader import StudentProfileLoader
 
 def show_alunos():
     """Exibe a página de gerenciamento de alunos"""
     
-    # Inicializar serviço de alunos
-    if 'alunos_service' not in st.session_state:
-        try:
-            st.session_state.alunos_service = AlunosService()
-        except Exception as e:
-            st.error(f"❌ Erro ao conectar com o banco de dados: {str(e)}")
-            return
-    
-    alunos_service = st.session_state.alunos_service
+    # Serviço compartilhado do processo (registry)
+    try:
+        alunos_service = get_service(AlunosService)
+    except Exception as e:
+        st.error(f"❌ Erro ao conectar com o banco de dados: {str(e)}")
+        return
     
     st.markdown("## 👥 Gerenciamento de Alunos")
     
@@ -66,15 +61,13 @@ def _mostrar_lista_alunos(alunos_service: AlunosService):
     
     st.markdown("### 📋 Lista de Alunos")
     
-    # Inicializar serviço de graduações
-    if 'graduacoes_service' not in st.session_state:
-        try:
-            st.session_state.graduacoes_service = GraduacoesService()
-        except Exception as e:
-            st.warning(f"⚠️ Serviço de graduações indisponível: {str(e)}")
-            st.session_state.graduacoes_service = None
-    
-    graduacoes_service = st.session_state.graduacoes_service
+    # Serviço de graduações
+    try:
+        from src.services.graduacoes_service import GraduacoesService
+        graduacoes_service = get_service(GraduacoesService)
+    except Exception as e:
+        st.warning(f"⚠️ Serviço de graduações indisponível: {str(e)}")
+        graduacoes_service = None
     
     # Buscar turmas disponíveis primeiro (para definir opções antes dos filtros)
     try:
@@ -252,6 +245,7 @@ def _mostrar_lista_alunos(alunos_service: AlunosService):
             })
         
         # Exibir tabela
+        import pandas as pd
         df = pd.DataFrame(dados_tabela)
         
         # Configurar exibição das colunas
@@ -333,9 +327,8 @@ def _mostrar_quick_add_aluno(alunos_service: AlunosService):
     
     # Carregar turmas
     try:
-        if 'turmas_service' not in st.session_state:
-            st.session_state.turmas_service = TurmasService()
-        turmas_db = st.session_state.turmas_service.listar_turmas(apenas_ativas=True)
+        from src.services.turmas_service import TurmasService
+        turmas_db = get_service(TurmasService).listar_turmas(apenas_ativas=True)
         turmas_nomes = [t['nome'] for t in turmas_db] if turmas_db else []
         turmas_labels = [f"{t['nome']} ({t['horarioInicio']} - {t['horarioFim']})" for t in turmas_db] if turmas_db else []
     except Exception:
@@ -557,10 +550,8 @@ def _mostrar_formulario_novo_aluno(alunos_service: AlunosService):
         with col2:
             # Buscar turmas do banco de dados
             try:
-                if 'turmas_service' not in st.session_state:
-                    st.session_state.turmas_service = TurmasService()
-                
-                turmas_service = st.session_state.turmas_service
+                from src.services.turmas_service import TurmasService
+                turmas_service = get_service(TurmasService)
                 turmas_db = turmas_service.listar_turmas(apenas_ativas=True)
                 
                 if turmas_db:
@@ -781,6 +772,7 @@ def _mostrar_estatisticas_alunos(alunos_service: AlunosService):
             st.markdown("#### 🥋 Distribuição por Turma")
             
             # Preparar dados para tabela
+            import pandas as pd
             turma_df = pd.DataFrame(
                 list(stats['por_turma'].items()),
                 columns=['Turma', 'Quantidade']
@@ -808,6 +800,7 @@ def _mostrar_estatisticas_alunos(alunos_service: AlunosService):
                 dia = aluno.get('vencimentoDia', 0)
                 vencimentos[dia] = vencimentos.get(dia, 0) + 1
             
+            import pandas as pd
             venc_df = pd.DataFrame(
                 list(vencimentos.items()),
                 columns=['Dia', 'Quantidade']
@@ -829,22 +822,33 @@ def _mostrar_estatisticas_alunos(alunos_service: AlunosService):
     except Exception as e:
         st.error(f"❌ Erro ao carregar estatísticas: {str(e)}")
 
+def _get_profile_loader() -> "StudentProfileLoader":
+    """Obtém o loader da ficha 360 (compartilhado, usa os serviços do registry)"""
+    from src.services.student_profile_loader import StudentProfileLoader
+    return get_service(StudentProfileLoader)
+
 def _mostrar_ficha_360(aluno_id: str):
     """Mostra ficha 360° do aluno: dados, pagamentos, presenças e graduações"""
     try:
-        alunos_service = st.session_state.get('alunos_service') or AlunosService()
-        aluno = alunos_service.buscar_aluno(aluno_id)
+        # Uma única carga paralela (e cacheada) para todas as abas
+        loader = _get_profile_loader()
+        perfil = loader.carregar(aluno_id)
+        erros = perfil['erros']
+        if 'aluno' in erros:
+            raise Exception(erros['aluno'])
+        aluno = perfil['aluno']
         if not aluno:
             st.error("❌ Aluno não encontrado!")
             return
+        if perfil['stale']:
+            st.warning("⚠️ Banco de dados instável: exibindo os últimos dados conhecidos desta ficha.")
 
         # Se veio da tela de cobranças, mostrar formulário de pagamento em destaque
         veio_de_cobranca = st.session_state.pop('ficha_tab_default', None) == 'pagamentos'
         if veio_de_cobranca:
             st.markdown("### 💰 Registrar Pagamento")
             st.info(f"Aluno: **{aluno.get('nome', '')}** | Turma: {aluno.get('turma', 'N/A')} | Venc: dia {aluno.get('vencimentoDia', 'N/A')}")
-            pag_service = PagamentosService()
-            cache_manager = get_cache_manager()
+            pag_service = loader.pagamentos_service
             hoje = date.today()
             _nomes_meses = {
                 1: 'Janeiro', 2: 'Fevereiro', 3: 'Março', 4: 'Abril',
@@ -898,7 +902,6 @@ def _mostrar_ficha_360(aluno_id: str):
                             'exigivel': True
                         }
                         pag_service.criar_pagamento(dados)
-                        cache_manager.invalidate_pagamento_cache(f"{ano_ref:04d}-{mes_ref:02d}")
                         st.toast(f"✅ Pagamento de {aluno.get('nome', '')} registrado! R$ {valor_pag:.2f} — {mes_ref:02d}/{ano_ref}")
                         # Voltar para pagamentos
                         st.session_state.current_page = "💰 Pagamentos"
@@ -910,8 +913,8 @@ def _mostrar_ficha_360(aluno_id: str):
 
             st.divider()
 
-        tab_dados, tab_pag, tab_grad = st.tabs(
-            ["📝 Dados", "💰 Pagamentos", "🥋 Graduações"]
+        tab_dados, tab_pag, tab_pres, tab_grad = st.tabs(
+            ["📝 Dados", "💰 Pagamentos", "✅ Presenças", "🥋 Graduações"]
         )
 
         # --- Aba Dados ---
@@ -943,9 +946,10 @@ def _mostrar_ficha_360(aluno_id: str):
         # --- Aba Pagamentos ---
         with tab_pag:
             try:
-                pag_service = PagamentosService()
-                cache_manager = get_cache_manager()
-                pagamentos = pag_service.listar_pagamentos_por_aluno(aluno_id)
+                if 'pagamentos' in erros:
+                    raise Exception(erros['pagamentos'])
+                pag_service = loader.pagamentos_service
+                pagamentos = perfil['pagamentos']
 
                 # Resumo rápido
                 total_pago = sum(1 for p in pagamentos if p.get('status') == 'pago')
@@ -1013,7 +1017,6 @@ def _mostrar_ficha_360(aluno_id: str):
                                 'exigivel': True
                             }
                             pag_service.criar_pagamento(dados)
-                            cache_manager.invalidate_pagamento_cache(f"{ano_ref:04d}-{mes_ref:02d}")
                             st.toast(f"✅ Pagamento {mes_ref:02d}/{ano_ref} registrado!")
                             st.rerun()
 
@@ -1032,7 +1035,6 @@ def _mostrar_ficha_360(aluno_id: str):
                             with c2:
                                 if st.button("💰 Marcar Pago", key=f"ficha_pag_{p.get('id')}", use_container_width=True):
                                     pag_service.marcar_como_pago(p.get('id'))
-                                    cache_manager.invalidate_pagamento_cache(p.get('ym'))
                                     st.toast(f"✅ Pagamento {p.get('ym')} marcado como pago!")
                                     st.rerun()
                     st.divider()
@@ -1044,6 +1046,7 @@ def _mostrar_ficha_360(aluno_id: str):
                         'pago': '🟢 Pago', 'devedor': '🔔 A Cobrar',
                         'inadimplente': '🔴 Inadimplente', 'ausente': '⚪ Ausente'
                     }
+                    import pandas as pd
                     df_pag = pd.DataFrame([{
                         'Mês': p.get('ym', ''),
                         'Valor': p.get('valor', 0),
@@ -1058,11 +1061,35 @@ def _mostrar_ficha_360(aluno_id: str):
             except Exception as e:
                 st.error(f"Erro ao carregar pagamentos: {e}")
 
+        # --- Aba Presenças ---
+        with tab_pres:
+            if 'presencas' in erros:
+                st.error(f"Erro ao carregar presenças: {erros['presencas']}")
+            elif not perfil['presencas']:
+                st.info("Nenhuma presença registrada.")
+            else:
+                presencas = perfil['presencas']
+                total_presente = sum(1 for p in presencas if p.get('presente'))
+                p1, p2 = st.columns(2)
+                with p1:
+                    st.metric("Presenças", total_presente)
+                with p2:
+                    st.metric("Faltas", len(presencas) - total_presente)
+                st.caption(f"Últimos {len(presencas)} registros")
+                import pandas as pd
+                df_pres = pd.DataFrame([{
+                    'Data': p.get('data', ''),
+                    'Situação': '🟢 Presente' if p.get('presente') else '🔴 Falta',
+                } for p in presencas])
+                st.dataframe(df_pres, hide_index=True, use_container_width=True)
+
         # --- Aba Graduações ---
         with tab_grad:
             try:
-                grad_service = st.session_state.get('graduacoes_service') or GraduacoesService()
-                historico = grad_service.listar_graduacoes_aluno(aluno_id)
+                if 'graduacoes' in erros:
+                    raise Exception(erros['graduacoes'])
+                grad_service = loader.graduacoes_service
+                historico = perfil['graduacoes']
 
                 st.write(f"**Graduação atual:** {aluno.get('graduacao', 'Sem Graduação')}")
 
@@ -1363,10 +1390,8 @@ def _mostrar_formulario_editar_aluno(alunos_service: AlunosService):
             with col2:
                 # Buscar turmas do banco de dados
                 try:
-                    if 'turmas_service' not in st.session_state:
-                        st.session_state.turmas_service = TurmasService()
-                    
-                    turmas_service = st.session_state.turmas_service
+                    from src.services.turmas_service import TurmasService
+                    turmas_service = get_service(TurmasService)
                     turmas_db = turmas_service.listar_turmas(apenas_ativas=True)
                     
                     if turmas_db:
@@ -1505,8 +1530,7 @@ def _mostrar_formulario_editar_aluno(alunos_service: AlunosService):
                     sucesso = alunos_service.atualizar_aluno(aluno_id, dados_atualizacao)
                     
                     if sucesso:
-                        # Limpar cache para forçar recarregamento
-                        st.cache_data.clear()
+                        # Lista de alunos e ficha 360 já atualizadas no cache pelo serviço (write-through)
                         # Limpar estado do checkbox
                         chave_estado = f'possui_responsavel_edit_{aluno_id}'
                         if chave_estado in st.session_state:
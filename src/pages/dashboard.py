@@ -4,13 +4,20 @@ Página Dashboard - KPIs e visão geral
 
 import streamlit as st
 from datetime import datetime, date
-from typing import Dict, Any, Optional
-import pandas as pd
+from functools import partial
+from typing import TYPE_CHECKING, Dict, Any, Optional
 from src.services.alunos_service import AlunosService
 from src.services.pagamentos_service import PagamentosService
 from src.services.presencas_service import PresencasService
-from src.services.graduacoes_service import GraduacoesService
+from src.services.periodos_service import PeriodosService
+from src.services.registry import get_service
 from src.utils.cache_service import get_cache_manager
+from src.utils.concurrent_loader import carregar_em_paralelo
+from src.utils.resilience import is_stale
+from src.utils.ui import render_pay_button, reset_pay_buttons
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 def show_dashboard(mode: Optional[str] = None, forced_year: Optional[int] = None):
     """Exibe o dashboard principal com KPIs"""
@@ -29,12 +36,16 @@ def show_dashboard(mode: Optional[str] = None, forced_year: Optional[int] = None
         current_year = datetime.now().year
         current_month = datetime.now().month
 
+        # Meses com dados vêm do índice /meta/periodos (uma leitura)
+        periodo = _get_available_period()
+        anos_com_dados = set(periodo['anos'])
+
         if effective_mode == 'historico':
-            anos_disponiveis = [2024, 2025]
+            anos_disponiveis = sorted(a for a in anos_com_dados if a < 2026) or [2024, 2025]
         else:
             # Operação a partir de 2026
             start_year = 2026
-            anos_disponiveis = list(range(start_year, max(start_year, current_year) + 1))
+            anos_disponiveis = sorted({a for a in anos_com_dados if a >= start_year} | {max(start_year, current_year)})
 
         # Ano padrão
         if forced_year in anos_disponiveis:
@@ -50,12 +61,13 @@ def show_dashboard(mode: Optional[str] = None, forced_year: Optional[int] = None
     
     with col2:
         # Determinar meses disponíveis baseado no ano selecionado
+        meses_com_dados = set(periodo['meses_por_ano'].get(selected_year, set()))
         if selected_year == current_year:
-            # Para o ano atual, só mostrar até o mês atual
-            meses_disponiveis = list(range(1, current_month + 1))
+            # Para o ano atual, só mostrar até o mês atual (sempre inclui o mês atual)
+            meses_disponiveis = sorted(m for m in meses_com_dados | {current_month} if m <= current_month)
         else:
-            # Para anos anteriores, mostrar todos os meses
-            meses_disponiveis = list(range(1, 13))
+            # Para anos anteriores, mostrar os meses com dados (todos se o índice não tem o ano)
+            meses_disponiveis = sorted(meses_com_dados) or list(range(1, 13))
         
         # Adicionar opção "Todos" para mostrar dados anuais
         meses_opcoes = ["Todos"] + meses_disponiveis
@@ -101,8 +113,16 @@ def show_dashboard(mode: Optional[str] = None, forced_year: Optional[int] = None
         'percentual_ativos': 0,
         'media_presencas_dia': 0.0,
         'total_presencas': 0,
+        'indisponiveis': [],
+        'desatualizados': [],
         **dados_reais,
     }
+    indisponiveis = dados_reais['indisponiveis']
+    if dados_reais['desatualizados']:
+        st.warning(
+            "⚠️ Banco de dados instável: exibindo os últimos dados conhecidos para "
+            + ", ".join(dados_reais['desatualizados'])
+        )
     
     # Métricas principais - 3 colunas
     col1, col2, col3 = st.columns(3)
@@ -126,6 +146,8 @@ def show_dashboard(mode: Optional[str] = None, forced_year: Optional[int] = None
                     comparacao_html = '<small>📈 Novo vs mês anterior (R$ 0)</small>'
                 else:
                     comparacao_html = '<small>➖ Sem variação vs mês anterior</small>'
+        if 'pagamentos' in indisponiveis:
+            comparacao_html = '<small>⚠️ Pagamentos indisponíveis no momento</small>'
         
         st.markdown("""
         <div class="metric-card">
@@ -136,25 +158,30 @@ def show_dashboard(mode: Optional[str] = None, forced_year: Optional[int] = None
         """.format(periodo_label, dados_reais['receita'], comparacao_html), unsafe_allow_html=True)
     
     with col2:
+        if 'pagamentos' in indisponiveis:
+            inadimplentes_rodape = '<small>⚠️ Indisponível no momento</small>'
+        else:
+            inadimplentes_rodape = '<small>💸 R$ {:.2f}</small>'.format(dados_reais['valor_inadimplentes'])
         st.markdown("""
         <div class="metric-card">
             <h3>🔴 Inadimplentes</h3>
             <h2 style="color: #dc3545;">{}</h2>
-            <small>💸 R$ {:.2f}</small>
+            {}
         </div>
-        """.format(dados_reais['inadimplentes'], dados_reais['valor_inadimplentes']), unsafe_allow_html=True)
+        """.format(dados_reais['inadimplentes'], inadimplentes_rodape), unsafe_allow_html=True)
     
     with col3:
+        if 'alunos' in indisponiveis:
+            alunos_rodape = '<small>⚠️ Indisponível no momento</small>'
+        else:
+            alunos_rodape = '<small>📊 {}% do total</small>'.format(dados_reais['percentual_ativos'])
         st.markdown("""
         <div class="metric-card">
             <h3>👥 Alunos Ativos</h3>
             <h2 style="color: #007bff;">{}</h2>
-            <small>📊 {}% do total</small>
+            {}
         </div>
-        """.format(
-            dados_reais['ativos'], 
-            dados_reais['percentual_ativos']
-        ), unsafe_allow_html=True)
+        """.format(dados_reais['ativos'], alunos_rodape), unsafe_allow_html=True)
     
     st.divider()
     
@@ -188,28 +215,31 @@ def _mostrar_secao_devedores(ym: str, dados_reais: Dict[str, Any]):
     st.markdown("### 🔔 Cobranças Pendentes")
 
     try:
-        if 'pagamentos_service' not in st.session_state:
-            st.session_state.pagamentos_service = PagamentosService()
-        if 'alunos_service' not in st.session_state:
-            st.session_state.alunos_service = AlunosService()
-        pagamentos_service = st.session_state.pagamentos_service
-        alunos_service = st.session_state.alunos_service
+        pagamentos_service = get_service(PagamentosService)
+        alunos_service = get_service(AlunosService)
         cache_manager = get_cache_manager()
 
-        # Buscar devedores e inadimplentes do mês
-        devedores = pagamentos_service.obter_devedores(ym=ym)
-        inadimplentes = pagamentos_service.obter_inadimplentes(ym=ym)
-        pendentes = devedores + inadimplentes
+        # Buscar devedores, inadimplentes e alunos do mês em paralelo
+        resultados = carregar_em_paralelo({
+            'devedores': partial(pagamentos_service.obter_devedores, ym=ym),
+            'inadimplentes': partial(pagamentos_service.obter_inadimplentes, ym=ym),
+            'alunos': partial(cache_manager.get_alunos_cached, alunos_service),
+        })
+        for nome in ('devedores', 'inadimplentes'):
+            if not resultados[nome].ok:
+                st.warning(f"⚠️ Não foi possível carregar {nome}: {resultados[nome].erro}")
+        pendentes = resultados['devedores'].valor_ou([]) + resultados['inadimplentes'].valor_ou([])
 
         if not pendentes:
             st.info("Nenhum pagamento pendente encontrado.")
             st.divider()
             return
 
-        # Montar mapa alunoId → telefone (1 query via cache)
-        alunos = cache_manager.get_alunos_cached(alunos_service)
+        # Montar mapa alunoId → telefone (sem telefone se a lista falhar)
+        alunos = resultados['alunos'].valor_ou([])
         telefone_map = {a['id']: a.get('telefone', '') for a in alunos}
 
+        reset_pay_buttons("dash_pagar")
         for pag in pendentes:
             pag_id = pag.get('id', '')
             nome = pag.get('alunoNome', 'N/A')
@@ -241,14 +271,8 @@ def _mostrar_secao_devedores(ym: str, dados_reais: Dict[str, Any]):
                         st.caption("Sem telefone")
 
                 with col_action:
-                    if st.button("💰 Pago", key=f"dash_pagar_{pag_id}", use_container_width=True):
-                        try:
-                            pagamentos_service.marcar_como_pago(pag_id)
-                            cache_manager.invalidate_pagamento_cache()
-                            st.toast(f"✅ {nome} marcado como pago!")
-                            st.rerun()
-                        except Exception as e:
-                            st.error(f"Erro: {e}")
+                    # Fragmento: marcar como pago não recarrega o dashboard inteiro
+                    render_pay_button(pag_id, nome, pagamentos_service, key_prefix="dash_pagar")
 
     except Exception as e:
         st.error(f"Erro ao carregar devedores: {e}")
@@ -257,219 +281,176 @@ def _mostrar_secao_devedores(ym: str, dados_reais: Dict[str, Any]):
 
 
 def _get_available_period():
-    """Detecta período disponível nos dados reais de pagamentos"""
+    """
+    Detecta período disponível nos dados reais de pagamentos
+    
+    Lê o índice /meta/periodos (uma leitura, em cache no processo) em vez de
+    varrer todos os pagamentos. Ver scripts/backfill_periodos.py.
+    """
+    current_year = datetime.now().year
+    fallback = {
+        'anos': [current_year],
+        'meses_por_ano': {current_year: {datetime.now().month}}
+    }
+    
     try:
-        # Inicializar serviço de pagamentos
-        cache_manager = get_cache_manager()
+        periodos_service = get_service(PeriodosService)
         
-        # Buscar anos disponíveis nos pagamentos
-        if 'pagamentos_service' not in st.session_state:
-            st.session_state.pagamentos_service = PagamentosService()
+        meses_por_ano = {ano: set(meses) for ano, meses in periodos_service.meses_por_ano('pagamentos').items()}
         
-        pagamentos_service = st.session_state.pagamentos_service
+        # Se não encontrou dados (índice ainda vazio), usar ano atual como fallback
+        if not meses_por_ano:
+            return fallback
         
-        # Buscar todos os pagamentos para extrair anos
-        try:
-            # Buscar todos os documentos de pagamentos
-            collection_ref = pagamentos_service.db.collection('pagamentos')
-            docs = list(collection_ref.stream())
-            
-            anos_encontrados = set()
-            meses_por_ano = {}
-            
-            for doc in docs:
-                data = doc.to_dict()
-                ano = data.get('ano')
-                mes = data.get('mes')
-                
-                if ano and mes:
-                    anos_encontrados.add(int(ano))
-                    if ano not in meses_por_ano:
-                        meses_por_ano[ano] = set()
-                    meses_por_ano[ano].add(int(mes))
-            
-            # Se não encontrou dados, usar ano atual como fallback
-            if not anos_encontrados:
-                current_year = datetime.now().year
-                anos_encontrados = {current_year}
-                meses_por_ano = {current_year: {datetime.now().month}}
-            
-            return {
-                'anos': list(anos_encontrados),
-                'meses_por_ano': meses_por_ano
-            }
-            
-        except Exception as e:
-            # Fallback se não conseguir acessar dados
-            current_year = datetime.now().year
-            return {
-                'anos': [current_year],
-                'meses_por_ano': {current_year: {datetime.now().month}}
-            }
-    
-    except Exception as e:
-        # Fallback completo
-        current_year = datetime.now().year
         return {
-            'anos': [current_year],
-            'meses_por_ano': {current_year: {datetime.now().month}}
+            'anos': sorted(meses_por_ano),
+            'meses_por_ano': meses_por_ano
         }
+    
+    except Exception:
+        # Fallback se não conseguir acessar dados
+        return fallback
+
+def _ym_anterior(ym: str) -> str:
+    """Retorna o ym (YYYY-MM) do mês anterior"""
+    ano_atual, mes_atual = map(int, ym.split('-'))
+    if mes_atual == 1:
+        return f"{ano_atual - 1}-12"
+    return f"{ano_atual}-{mes_atual - 1:02d}"
 
 def _get_real_data(ym: str, is_annual_view: bool = False, mode: str = 'operacional') -> Dict[str, Any]:
-    """Obtém dados reais dos serviços para o dashboard com cache"""
+    """
+    Obtém dados reais dos serviços para o dashboard com cache
+
+    Alunos, estatísticas de pagamentos (mês atual e anterior) e relatório de
+    presenças são independentes: são disparados em paralelo e uma falha em um
+    deles só zera o próprio widget (listado em 'indisponiveis').
+    """
     try:
-        # Reusar instâncias via session_state (T25)
-        if 'alunos_service' not in st.session_state:
-            st.session_state.alunos_service = AlunosService()
-        if 'pagamentos_service' not in st.session_state:
-            st.session_state.pagamentos_service = PagamentosService()
-        if 'presencas_service' not in st.session_state:
-            st.session_state.presencas_service = PresencasService()
-        alunos_service = st.session_state.alunos_service
-        pagamentos_service = st.session_state.pagamentos_service
-        presencas_service = st.session_state.presencas_service
+        # Serviços compartilhados do processo (registry)
+        alunos_service = get_service(AlunosService)
+        pagamentos_service = get_service(PagamentosService)
+        presencas_service = get_service(PresencasService)
         cache_manager = get_cache_manager()
-        
-        # Determinar ano-alvo
-        try:
-            target_year = int(str(ym).split('-')[0])
-        except Exception:
-            target_year = datetime.now().year
+    except Exception as e:
+        # Sem números inventados: todos os widgets ficam marcados como indisponíveis
+        st.error(f"❌ Erro ao conectar com o banco de dados: {str(e)}")
+        return {'indisponiveis': ['alunos', 'pagamentos', 'presencas'], 'ym': ym}
 
-        # Dados de alunos (com cache)
-        alunos = cache_manager.get_alunos_cached(alunos_service)
+    if is_annual_view:
+        meses = [f"{int(ym)}-{mes:02d}" for mes in range(1, 13)]
+    else:
+        meses = [ym]
+
+    # Disparar todas as leituras independentes de uma vez
+    tarefas = {'alunos': partial(cache_manager.get_alunos_cached, alunos_service)}
+    for ym_mes in meses:
+        tarefas[f"pagamentos:{ym_mes}"] = partial(
+            cache_manager.get_estatisticas_pagamentos_cached, pagamentos_service, ym_mes
+        )
+        tarefas[f"presencas:{ym_mes}"] = partial(
+            cache_manager.get_relatorio_presencas_cached, presencas_service, ym_mes
+        )
+    if not is_annual_view:
+        tarefas['pagamentos_anterior'] = partial(
+            cache_manager.get_estatisticas_pagamentos_cached, pagamentos_service, _ym_anterior(ym)
+        )
+
+    resultados = carregar_em_paralelo(tarefas, timeout_padrao=15.0)
+    indisponiveis = []
+    desatualizados = sorted({
+        nome.split(':')[0].replace('_anterior', '')
+        for nome, res in resultados.items() if res.ok and is_stale(res.valor)
+    })
+
+    # Dados de alunos (com cache)
+    alunos_res = resultados['alunos']
+    if alunos_res.ok:
+        alunos = alunos_res.valor
 
         # Para operação (2026+), apartar base ignorando legados
+        # (modelos Aluno: ativoDesde já vem convertido para date)
         if mode != 'historico':
-            def _is_2026_plus(aluno: Dict[str, Any]) -> bool:
-                ativo_desde = aluno.get('ativoDesde')
-                if not ativo_desde or not isinstance(ativo_desde, str):
-                    return False
-                try:
-                    return int(ativo_desde[:4]) >= 2026
-                except Exception:
-                    return False
-
-            alunos = [a for a in alunos if _is_2026_plus(a)]
-        total_alunos = len(alunos)
-        alunos_ativos = len([a for a in alunos if a.get('status') == 'ativo'])
-        alunos_inativos = total_alunos - alunos_ativos
-        percentual_ativos = round((alunos_ativos / max(1, total_alunos)) * 100, 1)
-        
-        # Dados de pagamentos (com cache) - modificado para suportar consulta anual
-        try:
-            if is_annual_view:
-                # Para visualização anual, calcular receita de todo o ano
-                ano = int(ym)
-                receita_total_ano = 0.0
-                devedores_total = 0
-                inadimplentes_total = 0
-                valor_devedores_total = 0.0
-                valor_inadimplentes_total = 0.0
-                
-                # Buscar todos os meses do ano
-                for mes in range(1, 13):
-                    ym_mes = f"{ano}-{mes:02d}"
-                    try:
-                        estat_mes = cache_manager.get_estatisticas_pagamentos_cached(pagamentos_service, ym_mes)
-                        receita_total_ano += estat_mes.get('receita_total', 0.0)
-                        devedores_total += estat_mes.get('total_devedores', 0)
-                        inadimplentes_total += estat_mes.get('total_inadimplentes', 0)
-                        valor_devedores_total += estat_mes.get('valor_devedores', 0.0)
-                        valor_inadimplentes_total += estat_mes.get('valor_inadimplencia', 0.0)
-                    except:
-                        continue
-                
-                receita = receita_total_ano
-                devedores = devedores_total
-                inadimplentes = inadimplentes_total
-                valor_devedores = valor_devedores_total
-                valor_inadimplentes = valor_inadimplentes_total
-            else:
-                # Consulta mensal normal
-                estatisticas_pag = cache_manager.get_estatisticas_pagamentos_cached(pagamentos_service, ym)
-                receita = estatisticas_pag.get('receita_total', 0.0)
-                devedores = estatisticas_pag.get('total_devedores', 0)
-                inadimplentes = estatisticas_pag.get('total_inadimplentes', 0)
-                valor_devedores = estatisticas_pag.get('valor_devedores', 0.0)
-                valor_inadimplentes = estatisticas_pag.get('valor_inadimplencia', 0.0)
-                
-                # Calcular receita do mês anterior para comparação
-                try:
-                    parts = ym.split('-')
-                    ano_atual = int(parts[0])
-                    mes_atual = int(parts[1])
-                    if mes_atual == 1:
-                        ym_anterior = f"{ano_atual - 1}-12"
-                    else:
-                        ym_anterior = f"{ano_atual}-{mes_atual - 1:02d}"
-                    estat_anterior = cache_manager.get_estatisticas_pagamentos_cached(pagamentos_service, ym_anterior)
-                    receita_mes_anterior = estat_anterior.get('receita_total', 0.0)
-                except Exception:
-                    receita_mes_anterior = None
-        except Exception:
-            receita = 0.0
-            devedores = 0
-            inadimplentes = 0
-            valor_devedores = 0.0
-            valor_inadimplentes = 0.0
-            receita_mes_anterior = None
-        
-        # Dados de presenças (com cache) - modificado para suportar consulta anual
-        try:
-            if is_annual_view:
-                # Para visualização anual, somar presenças de todo o ano
-                ano = int(ym)
-                total_presencas_ano = 0
-                total_dias_com_presencas = 0
-                
-                for mes in range(1, 13):
-                    ym_mes = f"{ano}-{mes:02d}"
-                    try:
-                        relatorio_mes = cache_manager.get_relatorio_presencas_cached(presencas_service, ym_mes)
-                        total_presencas_ano += relatorio_mes.get('total_presencas', 0)
-                        if relatorio_mes.get('total_presencas', 0) > 0:
-                            total_dias_com_presencas += 1
-                    except:
-                        continue
-                
-                total_presencas = total_presencas_ano
-                media_presencas_dia = total_presencas_ano / max(1, total_dias_com_presencas * 30)  # Aproximação
-            else:
-                # Consulta mensal normal
-                relatorio_presencas = cache_manager.get_relatorio_presencas_cached(presencas_service, ym)
-                total_presencas = relatorio_presencas.get('total_presencas', 0)
-                media_presencas_dia = relatorio_presencas.get('media_presencas_dia', 0.0)
-        except Exception:
-            total_presencas = 0
-            media_presencas_dia = 0.0
-        
-        return {
-            'receita': receita,
-            'receita_mes_anterior': receita_mes_anterior if not is_annual_view else None,
-            'devedores': devedores,
-            'inadimplentes': inadimplentes,
-            'valor_devedores': valor_devedores,
-            'valor_inadimplentes': valor_inadimplentes,
-            'ativos': alunos_ativos,
-            'inativos': alunos_inativos,
-            'percentual_ativos': percentual_ativos,
-            'total_presencas': total_presencas,
-            'media_presencas_dia': media_presencas_dia,
-            'ym': ym
-        }
-        
-    except Exception as e:
-        # Fallback para dados mock em caso de erro
-        st.warning(f"⚠️ Erro ao carregar dados reais: {str(e)}. Usando dados de exemplo.")
-        return _get_mock_data_fallback(ym)
+            alunos = [a for a in alunos if isinstance(a.ativo_desde, date) and a.ativo_desde.year >= 2026]
+    else:
+        alunos = []
+        indisponiveis.append('alunos')
+    total_alunos = len(alunos)
+    alunos_ativos = sum(1 for a in alunos if a.ativo)
+    alunos_inativos = total_alunos - alunos_ativos
+    percentual_ativos = round((alunos_ativos / max(1, total_alunos)) * 100, 1)
+
+    # Dados de pagamentos (com cache) - soma dos meses carregados (1 no mensal, 12 no anual)
+    receita = 0.0
+    devedores = 0
+    inadimplentes = 0
+    valor_devedores = 0.0
+    valor_inadimplentes = 0.0
+    falhas_pagamentos = 0
+    for ym_mes in meses:
+        res = resultados[f"pagamentos:{ym_mes}"]
+        if not res.ok:
+            falhas_pagamentos += 1
+            continue
+        estat_mes = res.valor
+        receita += estat_mes.get('receita_total', 0.0)
+        devedores += estat_mes.get('total_devedores', 0)
+        inadimplentes += estat_mes.get('total_inadimplentes', 0)
+        valor_devedores += estat_mes.get('valor_devedores', 0.0)
+        valor_inadimplentes += estat_mes.get('valor_inadimplencia', 0.0)
+    if falhas_pagamentos == len(meses):
+        indisponiveis.append('pagamentos')
+
+    receita_mes_anterior = None
+    if not is_annual_view:
+        res_anterior = resultados['pagamentos_anterior']
+        if res_anterior.ok:
+            receita_mes_anterior = res_anterior.valor.get('receita_total', 0.0)
+
+    # Dados de presenças (com cache)
+    total_presencas = 0
+    media_presencas_dia = 0.0
+    meses_com_presencas = 0
+    falhas_presencas = 0
+    for ym_mes in meses:
+        res = resultados[f"presencas:{ym_mes}"]
+        if not res.ok:
+            falhas_presencas += 1
+            continue
+        relatorio_mes = res.valor
+        total_presencas += relatorio_mes.get('total_presencas', 0)
+        if relatorio_mes.get('total_presencas', 0) > 0:
+            meses_com_presencas += 1
+        if not is_annual_view:
+            media_presencas_dia = relatorio_mes.get('media_presencas_dia', 0.0)
+    if is_annual_view:
+        media_presencas_dia = total_presencas / max(1, meses_com_presencas * 30)  # Aproximação
+    if falhas_presencas == len(meses):
+        indisponiveis.append('presencas')
 
-def _get_receitas_historicas(ym_atual: str, is_annual_view: bool = False) -> pd.DataFrame:
+    return {
+        'receita': receita,
+        'receita_mes_anterior': receita_mes_anterior,
+        'devedores': devedores,
+        'inadimplentes': inadimplentes,
+        'valor_devedores': valor_devedores,
+        'valor_inadimplentes': valor_inadimplentes,
+        'ativos': alunos_ativos,
+        'inativos': alunos_inativos,
+        'percentual_ativos': percentual_ativos,
+        'total_presencas': total_presencas,
+        'media_presencas_dia': media_presencas_dia,
+        'indisponiveis': indisponiveis,
+        'desatualizados': desatualizados,
+        'ym': ym
+    }
+
+def _get_receitas_historicas(ym_atual: str, is_annual_view: bool = False) -> "pd.DataFrame":
     """Obtém receitas dos últimos períodos para gráfico histórico"""
+    import pandas as pd
+
     try:
-        if 'pagamentos_service' not in st.session_state:
-            st.session_state.pagamentos_service = PagamentosService()
-        pagamentos_service = st.session_state.pagamentos_service
+        pagamentos_service = get_service(PagamentosService)
         
         if is_annual_view:
             # Visualização anual: mostrar últimos anos
@@ -541,16 +522,3 @@ def _get_receitas_historicas(ym_atual: str, is_annual_view: bool = False) -> pd.
                 'Mês': ['08/24', '09/24', '10/24', '11/24', '12/24', '01/25'],
                 'Receita': [18000.0, 22000.0, 19500.0, 20800.0, 21500.0, 23200.0]
             })
-
-def _get_mock_data_fallback(ym: str) -> Dict[str, Any]:
-    """Dados de fallback quando serviços falham"""
-    return {
-        'receita': 4500.00,
-        'inadimplentes': 3,
-        'ativos': 45,
-        'inativos': 8,
-        'percentual_ativos': 85,
-        'total_presencas': 180,
-        'media_presencas_dia': 6.0,
-        'ym': ym
-    }
\ No newline at end of file
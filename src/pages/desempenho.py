@@ -0,0 +1,186 @@
+"""
+Painel de desempenho (somente admin)
+Cache por prefixo, renders lentos, leituras do Firestore por página,
+latência dos serviços, jobs em background e memória — com ações para
+aquecer, limpar e invalidar o cache sem acesso ao shell.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+
+import streamlit as st
+
+from src.utils.cache_service import get_cache_manager
+from src.utils import firestore_metrics, metrics
+
+
+def _ms(segundos):
+    return f"{segundos * 1000:.0f} ms" if segundos is not None else "—"
+
+
+def _exibir_cache(cache_manager):
+    st.markdown("#### 🗃️ Cache")
+    stats = cache_manager.get_cache_stats()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Entradas", stats['total_entries'])
+    col2.metric("Ativas", stats['active_entries'])
+    col3.metric("Expiradas", stats['expired_entries'])
+    col4.metric("Tags", len(cache_manager.cache.tags))
+    if cache_manager.cache.backend is not None:
+        st.caption(f"L2 compartilhado: {type(cache_manager.cache.backend).__name__} "
+                   f"(circuito {cache_manager.cache._circuito.estado}) — tabela abaixo mostra o L1 deste processo")
+
+    agora = time.time()
+    por_prefixo = {}
+    for chave, entrada in list(cache_manager.cache.cache.items()):
+        linha = por_prefixo.setdefault(chave.split(':', 1)[0], {'entradas': 0, 'ttl': entrada['ttl'], 'idade': 0.0})
+        linha['entradas'] += 1
+        linha['idade'] = max(linha['idade'], agora - entrada['created_at'])
+
+    taxas = metrics.taxa_acerto_cache()
+    linhas = []
+    for prefixo in sorted(set(por_prefixo) | set(taxas)):
+        taxa = taxas.get(prefixo, {})
+        local = por_prefixo.get(prefixo, {})
+        linhas.append({
+            'Prefixo': prefixo,
+            'Entradas': local.get('entradas', 0),
+            'TTL (s)': local.get('ttl'),
+            'Mais antiga (s)': round(local['idade']) if local else None,
+            'Acertos': taxa.get('acertos', 0),
+            'Faltas': taxa.get('faltas', 0),
+            'Taxa de acerto': f"{taxa['taxa']:.0%}" if taxa.get('taxa') is not None else "—",
+        })
+    if linhas:
+        st.dataframe(linhas, use_container_width=True, hide_index=True)
+    else:
+        st.caption("Cache vazio e sem acessos registrados.")
+    return sorted(por_prefixo)
+
+
+def _exibir_acoes(cache_manager, prefixos):
+    st.markdown("#### 🛠️ Ações")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if st.button("🔥 Aquecer cache", use_container_width=True):
+            from src.utils.warmup import aquecer
+            with st.spinner("Aquecendo..."):
+                estado = aquecer()
+            st.success(f"Warm-up concluído em {estado['duracao']:.2f}s")
+    with col2:
+        if st.button("🧹 Remover expiradas", use_container_width=True):
+            st.success(f"{cache_manager.cleanup_cache()} entrada(s) expirada(s) removida(s)")
+    with col3:
+        if st.button("🗑️ Esvaziar cache", use_container_width=True, type="primary"):
+            st.success(f"{cache_manager.flush_cache()} entrada(s) removida(s)")
+
+    col_tag, col_prefixo = st.columns(2)
+    with col_tag:
+        tags = sorted(cache_manager.cache.tags)
+        tag = st.selectbox("Tag", options=tags, key="perf_tag", disabled=not tags)
+        if st.button("Invalidar tag", disabled=not tags, use_container_width=True):
+            st.success(f"{cache_manager.cache.invalidate_tag(tag)} entrada(s) invalidada(s) em '{tag}'")
+    with col_prefixo:
+        prefixo = st.selectbox("Prefixo", options=prefixos, key="perf_prefixo", disabled=not prefixos)
+        if st.button("Invalidar prefixo", disabled=not prefixos, use_container_width=True):
+            st.success(f"{cache_manager.invalidate_prefix(prefixo)} entrada(s) invalidada(s) em '{prefixo}'")
+
+
+def _exibir_renders():
+    limite = float(os.getenv('DOJO_SLOW_RENDER', metrics.RENDER_LENTO_PADRAO))
+    st.markdown(f"#### 🐢 Renders lentos (> {limite:.1f}s)")
+    renders = metrics.renders_recentes(apenas_lentos=True)
+    if not renders:
+        st.caption(f"Nenhum dos últimos {metrics.LIMITE_RENDERS} renders passou do limite.")
+        return
+    st.dataframe([{
+        'Quando': datetime.fromtimestamp(r['quando']).strftime('%H:%M:%S'),
+        'Página': r['pagina'],
+        'Modo': r['data_mode'],
+        'Duração (s)': round(r['segundos'], 2),
+        'Leituras': r['leituras'],
+    } for r in renders], use_container_width=True, hide_index=True)
+
+
+def _exibir_firestore():
+    st.markdown("#### 🔥 Firestore (desde o início do processo)")
+    col_paginas, col_operacoes = st.columns(2)
+    with col_paginas:
+        st.caption("Por página")
+        st.dataframe([{'Página': p, 'Leituras': l, 'Escritas': e, 'RPCs': r}
+                      for p, l, e, r in firestore_metrics.top_paginas(None)],
+                     use_container_width=True, hide_index=True)
+    with col_operacoes:
+        st.caption("Métodos que mais leem")
+        st.dataframe([{'Operação': o, 'Leituras': l, 'Escritas': e, 'RPCs': r}
+                      for o, l, e, r in firestore_metrics.top_operacoes(10)],
+                     use_container_width=True, hide_index=True)
+
+
+def _exibir_latencias():
+    st.markdown("#### ⏱️ Latência dos serviços")
+    resumo = sorted(metrics.resumo_latencias().items(), key=lambda item: item[1]['p95'] or 0, reverse=True)
+    if not resumo:
+        st.caption("Nenhuma chamada registrada ainda.")
+        return
+    st.dataframe([{
+        'Operação': nome, 'Chamadas': r['chamadas'], 'Erros': r['erros'],
+        'p50': _ms(r['p50']), 'p95': _ms(r['p95']), 'p99': _ms(r['p99']),
+    } for nome, r in resumo], use_container_width=True, hide_index=True)
+
+
+def _exibir_jobs():
+    from src.utils.warmup import estado_warmup
+    st.markdown("#### ⚙️ Jobs em background")
+    estado = estado_warmup()
+    duracao = f" em {estado['duracao']:.2f}s" if estado['duracao'] is not None else ""
+    st.write(f"**Warm-up:** {estado['status']}{duracao}")
+    for nome, erro in estado['erros'].items():
+        st.warning(f"{nome}: {erro}")
+    threads = sorted(t.name for t in threading.enumerate() if t.name.startswith('dojo-'))
+    st.write(f"**Threads:** {', '.join(threads) if threads else 'nenhuma'}")
+    exportacao = [f"{var}={os.getenv(var)}" for var in ('DOJO_METRICS_PORT', 'DOJO_METRICS_FILE') if os.getenv(var)]
+    st.write(f"**Exportação de métricas:** {', '.join(exportacao) if exportacao else 'desligada'}")
+
+
+def _exibir_memoria():
+    from src.utils.memory_report import formatar_relatorio_memoria, gerar_relatorio_memoria, gravar_relatorio_memoria
+    st.markdown("#### 🧠 Memória")
+    col1, col2 = st.columns(2)
+    with col1:
+        gerar = st.button("Gerar relatório de memória", use_container_width=True)
+    with col2:
+        if st.button("Gravar dump em disco", use_container_width=True):
+            st.success(f"Relatório salvo em {gravar_relatorio_memoria()}.txt")
+    if gerar:
+        with st.spinner("Medindo..."):
+            st.code(formatar_relatorio_memoria(gerar_relatorio_memoria()), language=None)
+
+
+def show_desempenho(is_admin: bool):
+    """
+    Renderiza o painel de desempenho
+
+    Args:
+        is_admin: Usuário atual é admin (o painel é bloqueado para os demais)
+    """
+    st.markdown("## 📈 Desempenho")
+    if not is_admin:
+        st.error("⛔ Acesso restrito a administradores.")
+        return
+
+    cache_manager = get_cache_manager()
+    try:
+        prefixos = _exibir_cache(cache_manager)
+        _exibir_acoes(cache_manager, prefixos)
+        st.divider()
+        _exibir_renders()
+        _exibir_firestore()
+        _exibir_latencias()
+        st.divider()
+        _exibir_jobs()
+        _exibir_memoria()
+    except Exception as e:
+        st.error(f"Erro ao carregar painel de desempenho: {str(e)}")
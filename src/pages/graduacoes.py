@@ -1,24 +1,18 @@
 import streamlit as st
 from datetime import date
-import pandas as pd
 from src.services.graduacoes_service import GraduacoesService
 from src.services.alunos_service import AlunosService
 from src.services.turmas_service import TurmasService
-from src.utils.cache_service import CacheManager
+from src.services.registry import get_service
+from src.utils.cache_service import get_cache_manager
 
 
 def exibir_registrar_graduacao():
-    # Reusar instâncias via session_state (T25)
-    if 'graduacoes_service' not in st.session_state:
-        st.session_state.graduacoes_service = GraduacoesService()
-    if 'alunos_service' not in st.session_state:
-        st.session_state.alunos_service = AlunosService()
-    if 'turmas_service' not in st.session_state:
-        st.session_state.turmas_service = TurmasService()
-    graduacoes_service = st.session_state.graduacoes_service
-    alunos_service = st.session_state.alunos_service
-    turmas_service = st.session_state.turmas_service
-    cache_manager = CacheManager()
+    # Serviços compartilhados do processo (registry)
+    graduacoes_service = get_service(GraduacoesService)
+    alunos_service = get_service(AlunosService)
+    turmas_service = get_service(TurmasService)
+    cache_manager = get_cache_manager()
 
     try:
         # Filtro por turma
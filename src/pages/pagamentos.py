@@ -4,33 +4,34 @@ Integrado ao PagamentosService
 """
 
 import streamlit as st
-import pandas as pd
 from datetime import date, datetime, timedelta
 from typing import Dict, Any, List
 from src.services.pagamentos_service import PagamentosService
 from src.services.alunos_service import AlunosService
+from src.services.fechamentos_service import FechamentosService
+from src.services.registry import get_service
 from src.utils.cache_service import get_cache_manager
 
-def show_pagamentos():
-    """Exibe a página de gerenciamento de pagamentos"""
+def show_pagamentos(is_admin: bool = False):
+    """
+    Exibe a página de gerenciamento de pagamentos
     
-    # Inicializar serviços
-    if 'pagamentos_service' not in st.session_state:
-        try:
-            st.session_state.pagamentos_service = PagamentosService()
-        except Exception as e:
-            st.error(f"❌ Erro ao conectar com pagamentos: {str(e)}")
-            return
+    Args:
+        is_admin: Usuário atual é admin (libera fechar/reabrir o mês nas estatísticas)
+    """
     
-    if 'alunos_service' not in st.session_state:
-        try:
-            st.session_state.alunos_service = AlunosService()
-        except Exception as e:
-            st.error(f"❌ Erro ao conectar com alunos: {str(e)}")
-            return
+    # Serviços compartilhados do processo (registry)
+    try:
+        pagamentos_service = get_service(PagamentosService)
+    except Exception as e:
+        st.error(f"❌ Erro ao conectar com pagamentos: {str(e)}")
+        return
     
-    pagamentos_service = st.session_state.pagamentos_service
-    alunos_service = st.session_state.alunos_service
+    try:
+        alunos_service = get_service(AlunosService)
+    except Exception as e:
+        st.error(f"❌ Erro ao conectar com alunos: {str(e)}")
+        return
     
     st.markdown("## 💳 Gerenciamento de Pagamentos")
     
@@ -44,14 +45,18 @@ def show_pagamentos():
         return
     
     # Navegação por tabs (sem rerun ao trocar de aba)
-    tab_cobrar, tab_inadim = st.tabs(
-        ["🔔 A Cobrar", "🔴 Inadimplentes"]
+    tab_cobrar, tab_inadim, tab_lista, tab_stats = st.tabs(
+        ["🔔 A Cobrar", "🔴 Inadimplentes", "📋 Lista", "📊 Estatísticas"]
     )
     
     with tab_cobrar:
         _mostrar_devedores(pagamentos_service)
     with tab_inadim:
         _mostrar_inadimplentes(pagamentos_service)
+    with tab_lista:
+        _mostrar_lista_pagamentos_filtrada(pagamentos_service, alunos_service)
+    with tab_stats:
+        _mostrar_estatisticas_pagamentos(pagamentos_service, is_admin)
 
 def _mostrar_lista_pagamentos_filtrada(pagamentos_service: PagamentosService, alunos_service: AlunosService):
     """Mostra lista unificada de pagamentos com filtros por turma e status"""
@@ -82,7 +87,7 @@ def _mostrar_lista_pagamentos_filtrada(pagamentos_service: PagamentosService, al
         # Filtro por Turma
         try:
             from src.services.turmas_service import TurmasService
-            turmas_service = TurmasService()
+            turmas_service = get_service(TurmasService)
             turmas = turmas_service.listar_turmas()
             turmas_opcoes = {"Todas as turmas": None}
             turmas_opcoes.update({f"{t.get('nome', 'Sem nome')}": t.get('id') for t in turmas})
@@ -132,15 +137,26 @@ def _mostrar_lista_pagamentos_filtrada(pagamentos_service: PagamentosService, al
             key="pag_busca_todos"
         )
     
-    # Botão de limpar filtros
-    if st.button("Limpar Filtros", key="pag_limpar_filtros"):
-        st.rerun()
+    # Botão de limpar filtros + tamanho da página
+    col_limpar, _, col_tamanho = st.columns([2, 5, 2])
+    with col_limpar:
+        if st.button("Limpar Filtros", key="pag_limpar_filtros"):
+            st.rerun()
+    with col_tamanho:
+        tamanho_pagina = st.selectbox("Por página:", options=[25, 50, 100], index=1, key="pag_tamanho_pagina")
     
     st.markdown("---")
     
-    # Aplicar filtros e buscar pagamentos
+    # Aplicar filtros e buscar a página atual (filtros e ordenação no servidor)
     try:
-        # Se tem termo de busca, buscar alunos primeiro
+        filtros = {}
+        if filtro_mes:
+            filtros['ym'] = filtro_mes
+        if filtro_status:
+            filtros['status'] = filtro_status
+        
+        # Busca por nome e turma viram um filtro por alunoId
+        alunos_ids = None
         if termo_busca and len(termo_busca.strip()) >= 2:
             alunos_encontrados = alunos_service.buscar_alunos_por_nome(termo_busca.strip())
             
@@ -148,75 +164,57 @@ def _mostrar_lista_pagamentos_filtrada(pagamentos_service: PagamentosService, al
                 st.warning(f"❌ Nenhum aluno encontrado com o termo: '{termo_busca}'")
                 return
             
-            # IDs dos alunos encontrados
-            alunos_ids = [a.get('id') for a in alunos_encontrados]
-        else:
-            alunos_ids = None
-        
-        # Buscar pagamentos baseado nos filtros
-        if filtro_mes:
-            # Se tem filtro de mês, buscar por mês
-            pagamentos = pagamentos_service.listar_pagamentos(filtros={'ym': filtro_mes})
-        else:
-            # Buscar todos (limitado)
-            pagamentos = pagamentos_service.listar_pagamentos()
+            alunos_ids = {a.get('id') for a in alunos_encontrados}
         
-        # Pré-carregar mapa alunoId → turmaId (evita N queries individuais)
-        aluno_turma_map = {}
         if filtro_turma:
             cache_manager = get_cache_manager()
             todos_alunos = cache_manager.get_alunos_cached(alunos_service)
-            aluno_turma_map = {a['id']: a.get('turmaId') for a in todos_alunos}
+            ids_turma = {a['id'] for a in todos_alunos if a.get('turmaId') == filtro_turma}
+            alunos_ids = ids_turma if alunos_ids is None else alunos_ids & ids_turma
         
-        # Aplicar filtros no cliente
-        pagamentos_filtrados = []
-        for pag in pagamentos:
-            # Filtro de status
-            if filtro_status and pag.get('status') != filtro_status:
-                continue
-            
-            # Filtro de aluno (se tem busca)
-            if alunos_ids and pag.get('alunoId') not in alunos_ids:
-                continue
-            
-            # Filtro de turma (usa mapa pré-carregado)
-            if filtro_turma:
-                if aluno_turma_map.get(pag.get('alunoId')) != filtro_turma:
-                    continue
-            
-            pagamentos_filtrados.append(pag)
+        if alunos_ids is not None:
+            filtros['alunoIds'] = sorted(alunos_ids)
         
-        # Mostrar resultados
-        if not pagamentos_filtrados:
-            st.info("📭 Nenhum pagamento encontrado com os filtros aplicados.")
-            return
+        # Cursor da página atual fica no session_state; muda o filtro → volta à página 1
+        assinatura = repr(sorted(filtros.items())) + f"|{tamanho_pagina}|{st.session_state.get('data_mode')}"
+        if st.session_state.get('pag_filtros_assinatura') != assinatura:
+            st.session_state.pag_filtros_assinatura = assinatura
+            st.session_state.pag_cursores = [None]
+            st.session_state.pag_pagina = 0
         
-        # Estatísticas rápidas
-        total = len(pagamentos_filtrados)
-        pagos = sum(1 for p in pagamentos_filtrados if p.get('status') == 'pago')
-        devedores = sum(1 for p in pagamentos_filtrados if p.get('status') == 'devedor')
-        inadimplentes = sum(1 for p in pagamentos_filtrados if p.get('status') == 'inadimplente')
-        valor_total = sum(p.get('valor', 0) for p in pagamentos_filtrados if p.get('status') in ['devedor', 'inadimplente'])
+        pagina = st.session_state.pag_pagina
+        resultado = pagamentos_service.listar_pagamentos_paginado(
+            filtros=filtros,
+            tamanho_pagina=tamanho_pagina,
+            cursor=st.session_state.pag_cursores[pagina],
+        )
+        pagamentos_pagina = resultado['pagamentos']
+        proximo_cursor = resultado['proximo_cursor']
         
-        # Métricas
-        col1, col2, col3, col4, col5 = st.columns(5)
-        with col1:
-            st.metric("📊 Total", total)
-        with col2:
-            st.metric("🟢 Pagos", pagos)
-        with col3:
-            st.metric("🔔 A Cobrar", devedores)
-        with col4:
-            st.metric("🔴 Inadimplentes", inadimplentes)
-        with col5:
-            st.metric("💰 A Receber", f"R$ {valor_total:.2f}")
+        # Estatísticas rápidas (agregações no servidor, sem ler os documentos)
+        resumo = pagamentos_service.resumir_pagamentos(filtros)
+        if resumo is not None:
+            col1, col2, col3, col4, col5 = st.columns(5)
+            with col1:
+                st.metric("📊 Total", resumo['total'])
+            with col2:
+                st.metric("🟢 Pagos", resumo['pago'])
+            with col3:
+                st.metric("🔔 A Cobrar", resumo['devedor'])
+            with col4:
+                st.metric("🔴 Inadimplentes", resumo['inadimplente'])
+            with col5:
+                st.metric("💰 A Receber", f"R$ {resumo['valor_a_receber']:.2f}")
+        else:
+            st.caption("ℹ️ Totais indisponíveis para filtros com mais de 30 alunos")
         
         st.markdown("---")
         
-        # Ordenar pagamentos (mais recentes primeiro)
-        pagamentos_filtrados.sort(key=lambda x: (x.get('ym', ''), x.get('alunoNome', '')), reverse=True)
+        if not pagamentos_pagina and pagina == 0:
+            st.info("📭 Nenhum pagamento encontrado com os filtros aplicados.")
+            return
         
-        # Tabela compacta com st.dataframe
+        # Tabela compacta com st.dataframe (somente a página visível)
         STATUS_MAP = {
             'pago': '🟢 Pago',
             'devedor': '🔔 A Cobrar',
@@ -225,7 +223,7 @@ def _mostrar_lista_pagamentos_filtrada(pagamentos_service: PagamentosService, al
         }
         
         df_data = []
-        for p in pagamentos_filtrados:
+        for p in pagamentos_pagina:
             df_data.append({
                 'Aluno': p.get('alunoNome', 'N/A'),
                 'Mês': p.get('ym', ''),
@@ -234,6 +232,7 @@ def _mostrar_lista_pagamentos_filtrada(pagamentos_service: PagamentosService, al
                 'Venc.': p.get('dataVencimento', 15),
             })
         
+        import pandas as pd
         df = pd.DataFrame(df_data)
         st.dataframe(
             df,
@@ -245,11 +244,27 @@ def _mostrar_lista_pagamentos_filtrada(pagamentos_service: PagamentosService, al
             },
         )
         
-        # Ações rápidas para pendentes (devedor / inadimplente)
-        pendentes = [p for p in pagamentos_filtrados if p.get('status') in ('devedor', 'inadimplente')]
+        # Navegação entre páginas
+        col_ant, col_pag, col_prox = st.columns([1, 2, 1])
+        with col_ant:
+            if st.button("⬅️ Anterior", key="pag_pagina_anterior", disabled=pagina == 0, use_container_width=True):
+                st.session_state.pag_pagina = pagina - 1
+                st.rerun()
+        with col_pag:
+            st.caption(f"Página {pagina + 1} · {len(pagamentos_pagina)} pagamento(s)")
+        with col_prox:
+            if st.button("Próxima ➡️", key="pag_pagina_proxima", disabled=proximo_cursor is None, use_container_width=True):
+                cursores = st.session_state.pag_cursores[:pagina + 1]
+                cursores.append(proximo_cursor)
+                st.session_state.pag_cursores = cursores
+                st.session_state.pag_pagina = pagina + 1
+                st.rerun()
+        
+        # Ações rápidas para pendentes da página (devedor / inadimplente)
+        pendentes = [p for p in pagamentos_pagina if p.get('status') in ('devedor', 'inadimplente')]
         if pendentes:
             st.markdown("#### ⚡ Ações Pendentes")
-            cache_manager = get_cache_manager()
+            reset_pay_buttons("pag_pagar")
             for pag in pendentes:
                 pag_id = pag.get('id', '')
                 nome = pag.get('alunoNome', 'N/A')
@@ -261,14 +276,8 @@ def _mostrar_lista_pagamentos_filtrada(pagamentos_service: PagamentosService, al
                 with c_info:
                     st.markdown(f"{emoji} **{nome}** — {pag.get('ym', '')} — R$ {valor:.2f}")
                 with c_pagar:
-                    if st.button("💰 Pago", key=f"pag_pagar_{pag_id}", use_container_width=True):
-                        try:
-                            pagamentos_service.marcar_como_pago(pag_id)
-                            cache_manager.invalidate_pagamento_cache(pag.get('ym'))
-                            st.toast(f"✅ {nome} marcado como pago!")
-                            st.rerun()
-                        except Exception as e:
-                            st.error(f"Erro: {e}")
+                    # Fragmento: só a linha é refeita ao marcar como pago
+                    render_pay_button(pag_id, nome, pagamentos_service, key_prefix="pag_pagar")
                 with c_editar:
                     if st.button("✏️", key=f"edit_{pag_id}", help="Editar"):
                         st.session_state.pagamento_editando = pag_id
@@ -542,9 +551,7 @@ def _mostrar_formulario_editar_pagamento(pagamentos_service: PagamentosService,
                         
                         if sucesso:
                             st.success("✅ Pagamento atualizado com sucesso!")
-                            # Invalidar cache de pagamentos
-                            cache_manager = get_cache_manager()
-                            cache_manager.invalidate_pagamento_cache(pagamento.get('ym'))
+                            # Estatísticas do mês já corrigidas no cache pelo serviço (write-through)
                             # Voltar para lista após 2 segundos
                             st.session_state.pagamentos_modo = 'lista'
                             del st.session_state.pagamento_editando
@@ -579,9 +586,7 @@ def _mostrar_formulario_editar_pagamento(pagamentos_service: PagamentosService,
                         sucesso = pagamentos_service.deletar_pagamento(pagamento_id)
                         if sucesso:
                             st.success("✅ Pagamento excluído com sucesso!")
-                            # Invalidar cache de pagamentos
-                            cache_manager = get_cache_manager()
-                            cache_manager.invalidate_pagamento_cache(pagamento.get('ym'))
+                            # Estatísticas do mês já corrigidas no cache pelo serviço (write-through)
                             st.session_state.pagamentos_modo = 'lista'
                             del st.session_state.pagamento_editando
                             del st.session_state.confirmar_exclusao
@@ -800,9 +805,7 @@ def _mostrar_devedores(pagamentos_service: PagamentosService):
     
     try:
         # 1. Buscar todos os alunos ativos
-        if 'alunos_service' not in st.session_state:
-            st.session_state.alunos_service = AlunosService()
-        alunos_service = st.session_state.alunos_service
+        alunos_service = get_service(AlunosService)
         alunos_ativos = alunos_service.listar_alunos(status='ativo')
         
         if not alunos_ativos:
@@ -902,9 +905,7 @@ def _mostrar_inadimplentes(pagamentos_service: PagamentosService):
     
     try:
         # 1. Buscar todos os alunos ativos
-        if 'alunos_service' not in st.session_state:
-            st.session_state.alunos_service = AlunosService()
-        alunos_service = st.session_state.alunos_service
+        alunos_service = get_service(AlunosService)
         alunos_ativos = alunos_service.listar_alunos(status='ativo')
         
         if not alunos_ativos:
@@ -982,8 +983,14 @@ def _mostrar_inadimplentes(pagamentos_service: PagamentosService):
     except Exception as e:
         st.error(f"❌ Erro ao carregar inadimplentes: {str(e)}")
 
-def _mostrar_estatisticas_pagamentos(pagamentos_service: PagamentosService):
-    """Mostra estatísticas de pagamentos"""
+def _mostrar_estatisticas_pagamentos(pagamentos_service: PagamentosService, is_admin: bool = False):
+    """
+    Mostra estatísticas de pagamentos
+    
+    Args:
+        pagamentos_service: Serviço de pagamentos
+        is_admin: Usuário atual é admin (libera fechar/reabrir o mês)
+    """
     
     st.markdown("### 📊 Estatísticas de Pagamentos")
     
@@ -1015,11 +1022,12 @@ def _mostrar_estatisticas_pagamentos(pagamentos_service: PagamentosService):
         if not meses_opcoes:
             meses_opcoes = [f"{hoje.year:04d}-{hoje.month:02d}"]
         
-        ym_stats = st.selectbox("📅 Mês para análise:", options=meses_opcoes, index=0)
+        ym_stats = st.selectbox("📅 Mês para análise:", options=meses_opcoes, index=0, key="pag_stats_mes")
     
-    # Obter estatísticas
+    # Obter estatísticas (resumo em cache; as listas só carregam ao expandir os detalhes)
+    cache_manager = get_cache_manager()
     try:
-        stats = pagamentos_service.obter_estatisticas_mes(ym_stats)
+        stats = cache_manager.get_estatisticas_pagamentos_cached(pagamentos_service, ym_stats)
         
         # Exibir métricas principais
         col1, col2, col3, col4, col5 = st.columns(5)
@@ -1068,6 +1076,7 @@ def _mostrar_estatisticas_pagamentos(pagamentos_service: PagamentosService):
             st.markdown("#### 📈 Distribuição por Status")
             
             # Criar DataFrame para gráfico
+            import pandas as pd
             chart_data = pd.DataFrame({
                 'Status': ['Pagos', 'A Cobrar', 'Inadimplentes', 'Ausentes'],
                 'Quantidade': [
@@ -1107,13 +1116,15 @@ def _mostrar_estatisticas_pagamentos(pagamentos_service: PagamentosService):
                     st.markdown(f"**R$ {row['Valor']:.0f}**")
         
         # Lista detalhada
-        if st.checkbox("📋 Mostrar detalhes dos pagamentos"):
+        if st.checkbox("📋 Mostrar detalhes dos pagamentos", key="pag_stats_detalhes"):
             st.markdown("#### 📋 Detalhes dos Pagamentos")
+            # Listas carregadas (e cacheadas) à parte, só quando expandidas
+            detalhes = cache_manager.get_detalhes_pagamentos_cached(pagamentos_service, ym_stats)
             
             tab1, tab2, tab3, tab4 = st.tabs(["✅ Pagos", "🔔 A Cobrar", "🚫 Inadimplentes", "⚪ Ausentes"])
             
             with tab1:
-                pagos = stats['detalhes']['pagos']
+                pagos = detalhes['pagos']
                 if pagos:
                     for p in pagos:
                         st.write(f"✅ {p.get('alunoNome', 'N/A')} - R$ {p.get('valor', 0):.2f}")
@@ -1121,7 +1132,7 @@ def _mostrar_estatisticas_pagamentos(pagamentos_service: PagamentosService):
                     st.info("Nenhum pagamento confirmado")
             
             with tab2:
-                devedores = stats['detalhes'].get('devedores', [])
+                devedores = detalhes.get('devedores', [])
                 if devedores:
                     for p in devedores:
                         venc = p.get('dataVencimento', 15)
@@ -1130,7 +1141,7 @@ def _mostrar_estatisticas_pagamentos(pagamentos_service: PagamentosService):
                     st.success("Nenhum devedor! 🎉")
             
             with tab3:
-                inadimplentes = stats['detalhes']['inadimplentes']
+                inadimplentes = detalhes['inadimplentes']
                 if inadimplentes:
                     for p in inadimplentes:
                         st.write(f"🚫 {p.get('alunoNome', 'N/A')} - R$ {p.get('valor', 0):.2f}")
@@ -1138,13 +1149,43 @@ def _mostrar_estatisticas_pagamentos(pagamentos_service: PagamentosService):
                     st.success("Nenhum inadimplente! 🎉")
             
             with tab4:
-                ausentes = stats['detalhes']['ausentes']
+                ausentes = detalhes['ausentes']
                 if ausentes:
                     for p in ausentes:
                         st.write(f"⚪ {p.get('alunoNome', 'N/A')} - R$ {p.get('valor', 0):.2f}")
                 else:
                     st.info("Nenhum ausente registrado")
         
+        _mostrar_fechamento_mes(ym_stats, stats, is_admin)
+        
     except Exception as e:
         st.error(f"❌ Erro ao obter estatísticas: {str(e)}")
 
+def _mostrar_fechamento_mes(ym: str, stats: Dict[str, Any], is_admin: bool = False):
+    """Fecha/reabre o mês (snapshot imutável dos agregados); botões só para admin"""
+    hoje = date.today()
+    if ym >= f"{hoje.year:04d}-{hoje.month:02d}":
+        return
+    
+    st.markdown("---")
+    if stats.get('fechado'):
+        st.caption(f"🔒 Mês {ym} fechado: valores finais do fechamento. Edições exigem reabrir o mês.")
+    
+    # Fechar sela o mês para todos os usuários
+    if not is_admin:
+        return
+    
+    fechamentos_service = get_service(FechamentosService)
+    if stats.get('fechado'):
+        acao, rotulo = fechamentos_service.reabrir_mes, "🔓 Reabrir mês"
+    else:
+        acao, rotulo = fechamentos_service.fechar_mes, "🔒 Fechar mês"
+    
+    if st.button(rotulo, key=f"fechamento_{ym}"):
+        try:
+            acao(ym)
+        except Exception as e:
+            st.error(f"❌ {str(e)}")
+            return
+        st.rerun()
+
@@ -9,7 +9,8 @@ from typing import List, Dict
 from src.services.presencas_service import PresencasService
 from src.services.alunos_service import AlunosService
 from src.services.turmas_service import TurmasService
-from src.utils.cache_service import CacheManager
+from src.services.registry import get_service
+from src.utils.cache_service import get_cache_manager
 
 
 def init_session_state():
@@ -26,17 +27,11 @@ def init_session_state():
 
 def exibir_gestao_ausencias():
     """Exibe interface de gestão de ausências por turma"""
-    # Reusar instâncias via session_state (T25)
-    if 'presencas_service' not in st.session_state:
-        st.session_state.presencas_service = PresencasService()
-    if 'alunos_service' not in st.session_state:
-        st.session_state.alunos_service = AlunosService()
-    if 'turmas_service' not in st.session_state:
-        st.session_state.turmas_service = TurmasService()
-    presencas_service = st.session_state.presencas_service
-    alunos_service = st.session_state.alunos_service
-    turmas_service = st.session_state.turmas_service
-    cache_manager = CacheManager()
+    # Serviços compartilhados do processo (registry)
+    presencas_service = get_service(PresencasService)
+    alunos_service = get_service(AlunosService)
+    turmas_service = get_service(TurmasService)
+    cache_manager = get_cache_manager()
     
     # Exibir feedback se houver
     if st.session_state.presencas_feedback_message:
@@ -128,6 +123,19 @@ def exibir_gestao_ausencias():
         st.session_state.presencas_contexto = contexto_atual
         st.session_state.presencas_gen += 1
     
+    # Lista + salvar em um fragmento: marcar uma falta refaz só a lista,
+    # sem recarregar turmas, alunos e presenças do dia
+    _lista_ausencias(alunos_ordenados, data_selecionada, presencas_service)
+
+
+@st.fragment
+def _lista_ausencias(alunos_ordenados: List[Dict], data_selecionada: date, presencas_service: PresencasService):
+    """
+    Lista de alunos com checkboxes de falta (fragmento)
+    
+    O estado fica em st.session_state.ausencias_selecionadas; o Firestore só
+    é acessado ao salvar.
+    """
     # Tabela de alunos
     st.markdown("#### 📋 Lista de Alunos - Marque as Ausências")
     
@@ -200,7 +208,7 @@ def exibir_gestao_ausencias():
             st.session_state.presencas_feedback_message = f"✅ {len(registros)} registros processados ({total_presentes} presentes, {total_ausentes} ausentes)"
             st.session_state.presencas_feedback_type = "success"
             st.session_state.presencas_contexto = None  # Forçar reload do banco no próximo render
-            st.rerun()
+            st.rerun(scope="app")  # Sai do fragmento: recarrega a página inteira
         except Exception as e:
             st.error(f"❌ Erro ao salvar registros: {str(e)}")
 
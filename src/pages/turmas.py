@@ -1,12 +1,9 @@
 import streamlit as st
-import pandas as pd
 from src.services.turmas_service import TurmasService
+from src.services.registry import get_service
 
 def show_turmas():
-    if 'turmas_service' not in st.session_state:
-        st.session_state.turmas_service = TurmasService()
-    
-    turmas_service = st.session_state.turmas_service
+    turmas_service = get_service(TurmasService)
     st.markdown("## 👨‍👩‍👧‍👦 Gerenciamento de Turmas")
     
     if 'turmas_modo' not in st.session_state:
@@ -3,14 +3,20 @@ Serviço de gerenciamento de Alunos com CRUD completo
 Baseado no FIRESTORE_SCHEMA.md
 """
 
-from typing import List, Dict, Any, Optional
+from typing import Iterator, List, Dict, Any, Optional
 from datetime import datetime, date
 import streamlit as st
 from google.cloud.firestore_v1 import SERVER_TIMESTAMP
-from src.utils.firebase_config import FirebaseConfig
+from google.cloud.firestore_v1.base_query import FieldFilter
+from src.utils.firebase_config import get_firestore_client, stream_em_lotes
+from src.utils.cache_service import get_cache_manager
 from src.utils.readonly_guard import ensure_writable
-from src.utils.operational_scope import should_apply_operational_scope, aluno_is_operational
+from src.utils.operational_scope import should_apply_operational_scope, aluno_is_operational, escopo_alunos_query
+from src.utils.metrics import instrumentar_servico
+from src.utils.resilience import resiliente, timeout_restante
+from src.utils.request_context import data_de_hoje
 
+@instrumentar_servico
 class AlunosService:
     """Serviço para operações CRUD de Alunos"""
 
@@ -22,8 +28,7 @@ class AlunosService:
     
     def __init__(self):
         """Inicializa o serviço com conexão Firestore"""
-        self.firebase_config = FirebaseConfig()
-        self.db = self.firebase_config.db
+        self.db = get_firestore_client()
         self.collection = self.db.collection('alunos')
     
     def criar_aluno(self, dados_aluno_ou_nome, telefone: str = "", email: str = "", 
@@ -61,12 +66,12 @@ class AlunosService:
                 turma = dados.get('turma', '')
                 plano_id = dados.get('planoId', '')
                 status = dados.get('status', 'ativo')
-                ativo_desde = dados.get('ativoDesde', date.today().strftime('%Y-%m-%d'))
+                ativo_desde = dados.get('ativoDesde', data_de_hoje().strftime('%Y-%m-%d'))
             else:
                 # Método antigo - dados_aluno_ou_nome é o nome
                 nome = self._normalize_nome(dados_aluno_ou_nome)
                 status = 'ativo'
-                ativo_desde = date.today().strftime('%Y-%m-%d')
+                ativo_desde = data_de_hoje().strftime('%Y-%m-%d')
             
             if not (1 <= vencimento_dia <= 28):
                 raise ValueError("Dia de vencimento deve estar entre 1 e 28")
@@ -81,7 +86,7 @@ class AlunosService:
                 'endereco': endereco.strip() if endereco else "",
                 'status': status if status in ['ativo', 'inativo'] else 'ativo',
                 'vencimentoDia': vencimento_dia,
-                'ativoDesde': ativo_desde if ativo_desde else date.today().strftime('%Y-%m-%d'),
+                'ativoDesde': ativo_desde if ativo_desde else data_de_hoje().strftime('%Y-%m-%d'),
                 'turma': turma.strip() if turma else "",
                 'graduacao': 'Sem graduação',
                 'createdAt': SERVER_TIMESTAMP,
@@ -103,6 +108,7 @@ class AlunosService:
             
             # Criar documento no Firestore
             doc_ref = self.collection.add(aluno_data)[1]
+            get_cache_manager().invalidate_aluno_cache(doc_ref.id)
             
             return doc_ref.id
             
@@ -110,6 +116,7 @@ class AlunosService:
             st.error(f"❌ Erro ao criar aluno: {str(e)}")
             raise e
     
+    @resiliente()
     def buscar_aluno(self, aluno_id: str) -> Optional[Dict[str, Any]]:
         """
         Busca um aluno por ID
@@ -121,7 +128,7 @@ class AlunosService:
             Dict com dados do aluno ou None se não encontrado
         """
         try:
-            doc = self.collection.document(aluno_id).get()
+            doc = self.collection.document(aluno_id).get(timeout=timeout_restante())
             
             if doc.exists:
                 aluno_data = doc.to_dict()
@@ -136,9 +143,9 @@ class AlunosService:
             return None
             
         except Exception as e:
-            st.error(f"❌ Erro ao buscar aluno: {str(e)}")
-            raise e
+            raise Exception(f"Erro ao buscar aluno: {str(e)}")
     
+    @resiliente(prazo=20.0)
     def listar_alunos(self, status: Optional[str] = None, ordenar_por: str = 'nome') -> List[Dict[str, Any]]:
         """
         Lista alunos com filtros opcionais
@@ -151,28 +158,24 @@ class AlunosService:
             Lista de dicionários com dados dos alunos
         """
         try:
+            # Escopo resolvido uma vez por chamada (não por documento)
+            aplicar_escopo = should_apply_operational_scope()
+            
             # Para evitar problemas de índices compostos, fazer filtro e ordenação separadamente
-            if status:
+            if aplicar_escopo:
+                # Escopo no servidor (ativoDesde >= 2026): status e ordenação no cliente
+                query = escopo_alunos_query(self.collection, aplicar_escopo)
+            elif status:
                 # Consulta apenas com filtro
                 query = self.collection.where('status', '==', status)
-                docs = query.stream()
             else:
                 # Consulta apenas com ordenação
                 query = self.collection.order_by(ordenar_por)
-                docs = query.stream()
-            
-            alunos = []
-            for doc in docs:
-                aluno_data = doc.to_dict()
-                aluno_data['id'] = doc.id
-
-                if should_apply_operational_scope() and not aluno_is_operational(aluno_data):
-                    continue
-
-                alunos.append(aluno_data)
+            docs = query.stream(timeout=timeout_restante())
+            alunos = list(self._decodificar_alunos(docs, status, aplicar_escopo))
             
             # Se não houve filtro de status mas queremos ordenar, ordenar no cliente
-            if not status:
+            if not status or aplicar_escopo:
                 alunos.sort(key=lambda x: x.get(ordenar_por, ''))
             elif status and ordenar_por != 'nome':
                 # Se houve filtro E queremos ordenar por outro campo, ordenar no cliente
@@ -181,8 +184,77 @@ class AlunosService:
             return alunos
             
         except Exception as e:
-            st.error(f"❌ Erro ao listar alunos: {str(e)}")
-            raise e
+            raise Exception(f"Erro ao listar alunos: {str(e)}")
+    
+    @staticmethod
+    def _decodificar_alunos(docs, status: Optional[str], aplicar_escopo: bool) -> Iterator[Dict[str, Any]]:
+        """Documentos → dicts com 'id', com os filtros que não couberam na query"""
+        for doc in docs:
+            aluno_data = doc.to_dict()
+            aluno_data['id'] = doc.id
+
+            if aplicar_escopo:
+                if not aluno_is_operational(aluno_data):
+                    continue
+                if status and aluno_data.get('status') != status:
+                    continue
+
+            yield aluno_data
+    
+    def iter_alunos(self, status: Optional[str] = None, tamanho_lote: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        Percorre os alunos sem montar a lista (scripts, exportações)
+        
+        Mesmos filtros de listar_alunos, sem ordenação: os documentos são lidos
+        em lotes e decodificados sob demanda, em memória constante.
+        
+        Args:
+            status: Filtrar por status ('ativo', 'inativo') ou None para todos
+            tamanho_lote: Documentos lidos por ida ao Firestore
+            
+        Yields:
+            Dicionários com dados dos alunos
+        """
+        try:
+            aplicar_escopo = should_apply_operational_scope()
+            if aplicar_escopo:
+                query = escopo_alunos_query(self.collection, aplicar_escopo)
+            elif status:
+                query = self.collection.where('status', '==', status)
+            else:
+                query = self.collection
+            
+            yield from self._decodificar_alunos(stream_em_lotes(query, tamanho_lote), status, aplicar_escopo)
+            
+        except Exception as e:
+            raise Exception(f"Erro ao percorrer alunos: {str(e)}")
+    
+    @resiliente(prazo=20.0)
+    def listar_alunos_atualizados_desde(self, desde: datetime) -> List[Dict[str, Any]]:
+        """
+        Lista alunos alterados a partir de um instante (sync incremental)
+        
+        Args:
+            desde: Watermark (maior updatedAt já sincronizado). Estritamente
+                maior: lotes importados com o mesmo timestamp não são relidos.
+            
+        Returns:
+            Lista de alunos alterados, SEM filtro de escopo operacional: um aluno
+            que saiu do escopo precisa chegar até quem chama para ser removido
+        """
+        try:
+            query = self.collection.where(filter=FieldFilter('updatedAt', '>', desde))
+            
+            alunos = []
+            for doc in query.stream(timeout=timeout_restante()):
+                aluno_data = doc.to_dict()
+                aluno_data['id'] = doc.id
+                alunos.append(aluno_data)
+            
+            return alunos
+            
+        except Exception as e:
+            raise Exception(f"Erro ao listar alunos atualizados: {str(e)}")
     
     def atualizar_aluno(self, aluno_id: str, dados_atualizacao: Dict[str, Any]) -> bool:
         """
@@ -209,6 +281,7 @@ class AlunosService:
             
             # Atualizar documento
             self.collection.document(aluno_id).update(update_data)
+            get_cache_manager().patch_aluno(aluno_id, update_data)
             
             return True
             
@@ -229,10 +302,12 @@ class AlunosService:
         """
         try:
             ensure_writable("vincular plano")
-            self.collection.document(aluno_id).update({
+            update_data = {
                 'planoId': plano_id,
                 'updatedAt': SERVER_TIMESTAMP
-            })
+            }
+            self.collection.document(aluno_id).update(update_data)
+            get_cache_manager().patch_aluno(aluno_id, update_data)
             return True
         except Exception as e:
             st.error(f"❌ Erro ao vincular plano: {str(e)}")
@@ -271,7 +346,7 @@ class AlunosService:
         try:
             ensure_writable("inativar aluno")
             if not data_inativacao:
-                data_inativacao = date.today().strftime('%Y-%m-%d')
+                data_inativacao = data_de_hoje().strftime('%Y-%m-%d')
             
             update_data = {
                 'status': 'inativo',
@@ -280,6 +355,7 @@ class AlunosService:
             }
             
             self.collection.document(aluno_id).update(update_data)
+            get_cache_manager().patch_aluno(aluno_id, update_data)
             
             return True
             
@@ -301,7 +377,7 @@ class AlunosService:
         try:
             ensure_writable("reativar aluno")
             if not data_reativacao:
-                data_reativacao = date.today().strftime('%Y-%m-%d')
+                data_reativacao = data_de_hoje().strftime('%Y-%m-%d')
             
             update_data = {
                 'status': 'ativo',
@@ -310,10 +386,9 @@ class AlunosService:
             }
             
             # Remover data de inativação
-            self.collection.document(aluno_id).update({
-                **update_data,
-                'inativoDesde': None
-            })
+            update_data['inativoDesde'] = None
+            self.collection.document(aluno_id).update(update_data)
+            get_cache_manager().patch_aluno(aluno_id, update_data)
             
             return True
             
@@ -402,6 +477,7 @@ class AlunosService:
         
         return {k: v for k, v in dados.items() if k in campos_permitidos}
     
+    @resiliente(prazo=20.0)
     def obter_estatisticas(self) -> Dict[str, Any]:
         """
         Obtém estatísticas gerais dos alunos
@@ -430,8 +506,7 @@ class AlunosService:
             }
             
         except Exception as e:
-            st.error(f"❌ Erro ao obter estatísticas: {str(e)}")
-            raise e
+            raise Exception(f"Erro ao obter estatísticas: {str(e)}")
     
     def buscar_alunos_por_nome(self, termo_busca: str) -> list:
         """
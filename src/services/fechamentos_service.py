@@ -0,0 +1,212 @@
+"""
+FechamentosService - Fechamento mensal (snapshots imutáveis)
+Fechar um mês grava em /fechamentos/{YYYY-MM} as estatísticas de pagamentos e
+o relatório de presenças finais e registra o mês em /meta/fechamentos. Meses
+fechados são servidos do snapshot (sem reagregar) e só aceitam escritas depois
+de reabertos. O snapshot guarda só os agregados (tamanho independe do volume de
+registros, longe do limite de 1 MiB por documento); as listas de um mês fechado
+são remontadas sob demanda a partir do próprio mês, que não muda mais.
+"""
+
+from typing import Any, Dict, List, Optional
+from google.cloud import firestore
+from src.utils.cache_service import CacheManager, get_cache_manager, get_cache_service
+from src.utils.firebase_config import get_firestore_client
+from src.utils.operational_scope import should_apply_operational_scope, ym_is_operational
+from src.utils.readonly_guard import ensure_writable
+from src.utils.request_context import data_de_hoje
+from src.utils.resilience import resiliente, timeout_restante
+
+FECHAMENTOS_COLLECTION = 'fechamentos'
+META_COLLECTION = 'meta'
+FECHAMENTOS_DOC = 'fechamentos'
+
+CHAVE_MESES_FECHADOS = 'fechamentos:meses'
+# A lista muda fora do processo (scripts/fechar_mes.py, outras réplicas sem L2):
+# TTL curto para o bloqueio de escrita acompanhar fechamentos e reaberturas.
+# Só os snapshots, imutáveis até a reabertura, ficam com TTL_FECHADO.
+TTL_MESES_FECHADOS = 60
+
+
+class MesFechadoError(ValueError):
+    """Escrita em um mês fechado (reabrir antes de editar)"""
+
+
+class FechamentosService:
+    """Serviço de fechamento mensal"""
+
+    def __init__(self, db=None):
+        """Inicializa o serviço com conexão Firestore"""
+        self.db = db or get_firestore_client()
+        self.cache = get_cache_service()
+
+    def _meta_ref(self):
+        return self.db.collection(META_COLLECTION).document(FECHAMENTOS_DOC)
+
+    def _snapshot_ref(self, ym: str):
+        return self.db.collection(FECHAMENTOS_COLLECTION).document(ym)
+
+    def _chave_snapshot(self, ym: str) -> str:
+        return self.cache._generate_key('fechamento', ym=ym)
+
+    @resiliente()
+    def listar_meses_fechados(self) -> List[str]:
+        """
+        Meses fechados (uma leitura de /meta/fechamentos, depois cache)
+
+        Returns:
+            Lista ordenada de 'YYYY-MM'
+        """
+        meses = self.cache.get(CHAVE_MESES_FECHADOS)
+        if meses is not None:
+            return meses
+
+        try:
+            doc = self._meta_ref().get(timeout=timeout_restante())
+            dados = (doc.to_dict() or {}) if doc.exists else {}
+            meses = sorted(set(dados.get('meses', [])))
+        except Exception as e:
+            raise Exception(f"Erro ao listar meses fechados: {str(e)}")
+
+        self.cache.set(CHAVE_MESES_FECHADOS, meses, TTL_MESES_FECHADOS)
+        return meses
+
+    def mes_fechado(self, ym: str) -> bool:
+        """True se o mês foi fechado"""
+        return ym in self.listar_meses_fechados()
+
+    def garantir_mes_aberto(self, ym: str) -> None:
+        """
+        Bloqueia escritas em meses fechados
+
+        Raises:
+            MesFechadoError: Se o mês está fechado
+        """
+        hoje = data_de_hoje()
+        # Só meses encerrados são fechados: o mês corrente dispensa a consulta
+        if not ym or ym >= f"{hoje.year:04d}-{hoje.month:02d}":
+            return
+        if self.mes_fechado(ym):
+            raise MesFechadoError(f"Mês {ym} está fechado: reabra o mês antes de editar")
+
+    def obter_fechamento(self, ym: str) -> Optional[Dict[str, Any]]:
+        """
+        Snapshot do mês fechado
+
+        Args:
+            ym: Mês no formato YYYY-MM
+
+        Returns:
+            Dict com 'ym', 'pagamentos' e 'presencas' (resumos), ou None se o mês está aberto
+        """
+        if not self.mes_fechado(ym):
+            return None
+
+        chave = self._chave_snapshot(ym)
+        snapshot = self.cache.get(chave)
+        if snapshot is not None:
+            return snapshot
+
+        try:
+            doc = self._snapshot_ref(ym).get(timeout=timeout_restante())
+        except Exception as e:
+            raise Exception(f"Erro ao obter fechamento: {str(e)}")
+        if not doc.exists:
+            return None
+
+        snapshot = doc.to_dict()
+        self.cache.set(chave, snapshot, CacheManager.TTL_FECHADO)
+        return snapshot
+
+    def fechar_mes(self, ym: str, pagamentos_service=None, presencas_service=None) -> Dict[str, Any]:
+        """
+        Fecha um mês: agrega pagamentos e presenças uma última vez e grava o snapshot
+
+        Args:
+            ym: Mês no formato YYYY-MM (anterior ao mês corrente)
+            pagamentos_service: Serviço de pagamentos (default: registry)
+            presencas_service: Serviço de presenças (default: registry)
+
+        Returns:
+            Snapshot gravado
+
+        Raises:
+            ValueError: Mês corrente/futuro ou já fechado
+            Exception: Se erro ao gravar no Firestore
+        """
+        ensure_writable("fechar mês")
+
+        hoje = data_de_hoje()
+        if ym >= f"{hoje.year:04d}-{hoje.month:02d}":
+            raise ValueError(f"Só meses encerrados podem ser fechados: {ym}")
+        if self.mes_fechado(ym):
+            raise ValueError(f"Mês {ym} já está fechado")
+        if should_apply_operational_scope() and not ym_is_operational(ym):
+            # No escopo operacional o mês legado aparece vazio: o snapshot ficaria zerado
+            raise ValueError(f"Mês legado {ym}: feche pelos scripts (escopo completo)")
+
+        # Import tardio: os serviços de pagamentos/presenças importam este módulo
+        from src.services.pagamentos_service import PagamentosService
+        from src.services.presencas_service import PresencasService
+        from src.services.registry import get_service
+        pagamentos_service = pagamentos_service or get_service(PagamentosService)
+        presencas_service = presencas_service or get_service(PresencasService)
+
+        # Leitura completa em lotes: listar_* param em 1000 registros e o snapshot é final.
+        # Os iteradores não têm fallback stale: indisponibilidade vira erro aqui.
+        try:
+            pagamentos = list(pagamentos_service.iter_pagamentos(filtros={'ym': ym}))
+            presencas = list(presencas_service.iter_presencas(filtros={'ym': ym}))
+        except Exception as e:
+            raise Exception(f"Erro ao fechar mês: {str(e)}")
+
+        snapshot = {
+            'ym': ym,
+            'pagamentos': {**PagamentosService.montar_estatisticas(ym, pagamentos), 'fechado': True},
+            'presencas': {**PresencasService.montar_relatorio_mensal(ym, presencas), 'fechado': True},
+        }
+
+        try:
+            batch = self.db.batch()
+            batch.set(self._snapshot_ref(ym), {**snapshot, 'fechadoEm': firestore.SERVER_TIMESTAMP})
+            batch.set(self._meta_ref(), {'meses': firestore.ArrayUnion([ym])}, merge=True)
+            batch.commit()
+        except Exception as e:
+            raise Exception(f"Erro ao fechar mês: {str(e)}")
+
+        self._invalidar(ym)
+        return snapshot
+
+    def reabrir_mes(self, ym: str) -> bool:
+        """
+        Reabre um mês fechado: remove o snapshot e libera as escritas
+
+        Args:
+            ym: Mês no formato YYYY-MM
+
+        Returns:
+            bool: True se o mês estava fechado
+        """
+        ensure_writable("reabrir mês")
+
+        if not self.mes_fechado(ym):
+            return False
+
+        try:
+            batch = self.db.batch()
+            batch.delete(self._snapshot_ref(ym))
+            batch.set(self._meta_ref(), {'meses': firestore.ArrayRemove([ym])}, merge=True)
+            batch.commit()
+        except Exception as e:
+            raise Exception(f"Erro ao reabrir mês: {str(e)}")
+
+        self._invalidar(ym)
+        return True
+
+    def _invalidar(self, ym: str) -> None:
+        """Lista de meses, snapshot e agregados do mês (todas as réplicas via L2)"""
+        self.cache.delete(CHAVE_MESES_FECHADOS)
+        self.cache.delete(self._chave_snapshot(ym))
+        cache_manager = get_cache_manager()
+        cache_manager.invalidate_pagamento_cache(ym)
+        cache_manager.invalidate_presenca_cache(ym)
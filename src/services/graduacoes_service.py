@@ -7,9 +7,15 @@ from datetime import datetime, date
 from typing import Dict, List, Optional, Any
 from google.cloud import firestore
 from src.utils.firebase_config import get_firestore_client
+from src.utils.cache_service import get_cache_manager
 from src.utils.readonly_guard import ensure_writable
+from src.utils.metrics import instrumentar_servico
+from src.utils.resilience import resiliente, timeout_restante
+from src.utils.request_context import data_de_hoje
+from src.models.graduacao import Graduacao
 import uuid
 
+@instrumentar_servico
 class GraduacoesService:
     """Serviço para gerenciamento de graduações e promoções"""
     
@@ -47,7 +53,7 @@ class GraduacoesService:
         
         # Usar data atual se não especificada
         if data_graduacao is None:
-            data_graduacao = date.today()
+            data_graduacao = data_de_hoje()
         
         # Gerar ID único para graduação
         grad_id = str(uuid.uuid4())
@@ -71,7 +77,7 @@ class GraduacoesService:
         try:
             # Verificar se aluno existe
             aluno_ref = self.db.collection(self.alunos_collection).document(aluno_id)
-            aluno_doc = aluno_ref.get()
+            aluno_doc = aluno_ref.get(timeout=timeout_restante())
             
             if not aluno_doc.exists:
                 raise ValueError(f"Aluno não encontrado: {aluno_id}")
@@ -85,12 +91,14 @@ class GraduacoesService:
                 'graduacao': nivel.strip(),
                 'updatedAt': agora
             })
+            get_cache_manager().invalidate_perfil_aluno(aluno_id)
             
             return grad_id
             
         except Exception as e:
             raise Exception(f"Erro ao registrar graduação: {str(e)}")
     
+    @resiliente()
     def buscar_graduacao(self, aluno_id: str, grad_id: str) -> Optional[Dict[str, Any]]:
         """
         Busca uma graduação específica
@@ -108,7 +116,7 @@ class GraduacoesService:
                        .collection(self.graduacoes_subcollection)
                        .document(grad_id))
             
-            doc = grad_ref.get()
+            doc = grad_ref.get(timeout=timeout_restante())
             
             if doc.exists:
                 dados = doc.to_dict()
@@ -121,6 +129,7 @@ class GraduacoesService:
         except Exception as e:
             raise Exception(f"Erro ao buscar graduação: {str(e)}")
     
+    @resiliente()
     def listar_graduacoes_aluno(self, aluno_id: str, limite: int = 50) -> List[Dict[str, Any]]:
         """
         Lista todas as graduações de um aluno ordenadas por data (mais recente primeiro)
@@ -139,7 +148,7 @@ class GraduacoesService:
                     .collection(self.graduacoes_subcollection)
                     .limit(limite))
             
-            docs = query.stream()
+            docs = query.stream(timeout=timeout_restante())
             
             graduacoes = []
             for doc in docs:
@@ -180,58 +189,30 @@ class GraduacoesService:
                     'progressao': []
                 }
             
-            # Ordenar por data (cronológica para timeline)
-            # Filtrar graduações válidas antes de ordenar
-            graduacoes_validas = [g for g in graduacoes if g and g.get('data')]
-            timeline = sorted(graduacoes_validas, key=lambda x: x.get('data', ''))
+            # Decodificar uma vez (datas já convertidas) e ordenar cronologicamente;
+            # graduações sem data válida ficam fora da timeline
+            decodificadas = [(Graduacao.from_dict(g), g) for g in graduacoes if g]
+            decodificadas = [(modelo, g) for modelo, g in decodificadas if isinstance(modelo.data, date)]
+            decodificadas.sort(key=lambda par: par[0].data)
+            timeline = [g for _, g in decodificadas]
             
             # Calcular progressão (intervalos entre graduações)
             progressao = []
-            for i in range(1, len(timeline)):
-                grad_anterior = timeline[i-1]
-                grad_atual = timeline[i]
-                
-                # Verificar se as graduações têm dados válidos
-                if not grad_anterior or not grad_atual:
-                    continue
-                
-                data_anterior_str = grad_anterior.get('data', '')
-                data_atual_str = grad_atual.get('data', '')
-                
-                if not data_anterior_str or not data_atual_str:
-                    continue
-                
-                try:
-                    data_anterior = datetime.strptime(data_anterior_str, '%Y-%m-%d').date()
-                    data_atual = datetime.strptime(data_atual_str, '%Y-%m-%d').date()
-                    
-                    dias_entre = (data_atual - data_anterior).days
-                    
-                    progressao.append({
-                        'de': grad_anterior.get('nivel', ''),
-                        'para': grad_atual.get('nivel', ''),
-                        'data_inicial': data_anterior_str,
-                        'data_final': data_atual_str,
-                        'dias_entre': dias_entre,
-                        'meses_aproximados': round(dias_entre / 30.44, 1)
-                    })
-                except (ValueError, TypeError):
-                    # Ignorar datas inválidas
-                    continue
+            for (anterior, _), (atual, _) in zip(decodificadas, decodificadas[1:]):
+                dias_entre = (atual.data - anterior.data).days
+                progressao.append({
+                    'de': anterior.nivel or '',
+                    'para': atual.nivel or '',
+                    'data_inicial': anterior.get('data'),
+                    'data_final': atual.get('data'),
+                    'dias_entre': dias_entre,
+                    'meses_aproximados': round(dias_entre / 30.44, 1)
+                })
             
-            # Calcular tempo total com verificações de segurança
+            # Tempo total entre a primeira e a última graduação
             tempo_total_dias = 0
-            if len(timeline) >= 2 and timeline[0] and timeline[-1]:
-                data_primeira_str = timeline[0].get('data', '')
-                data_ultima_str = timeline[-1].get('data', '')
-                
-                if data_primeira_str and data_ultima_str:
-                    try:
-                        data_primeira = datetime.strptime(data_primeira_str, '%Y-%m-%d').date()
-                        data_ultima = datetime.strptime(data_ultima_str, '%Y-%m-%d').date()
-                        tempo_total_dias = (data_ultima - data_primeira).days
-                    except (ValueError, TypeError):
-                        tempo_total_dias = 0
+            if len(decodificadas) >= 2:
+                tempo_total_dias = (decodificadas[-1][0].data - decodificadas[0][0].data).days
             
             return {
                 'aluno_id': aluno_id,
@@ -286,6 +267,7 @@ class GraduacoesService:
                         'graduacao': dados_atualizacao['nivel'],
                         'updatedAt': firestore.SERVER_TIMESTAMP
                     })
+            get_cache_manager().invalidate_perfil_aluno(aluno_id)
             
             return True
             
@@ -337,12 +319,14 @@ class GraduacoesService:
                     'graduacao': 'Sem graduação',
                     'updatedAt': firestore.SERVER_TIMESTAMP
                 })
+            get_cache_manager().invalidate_perfil_aluno(aluno_id)
             
             return True
             
         except Exception as e:
             raise Exception(f"Erro ao deletar graduação: {str(e)}")
     
+    @resiliente(prazo=20.0)
     def obter_estatisticas_graduacoes(self, mode: str = 'operacional') -> Dict[str, Any]:
         """
         Obtém estatísticas gerais sobre graduações no sistema
@@ -352,7 +336,7 @@ class GraduacoesService:
         """
         try:
             # Buscar todos os alunos
-            alunos_query = self.db.collection(self.alunos_collection).stream()
+            alunos_query = self.db.collection(self.alunos_collection).stream(timeout=timeout_restante())
             
             total_alunos = 0
             graduacoes_por_nivel = {}
@@ -410,6 +394,7 @@ class GraduacoesService:
         except Exception as e:
             raise Exception(f"Erro ao obter estatísticas de graduações: {str(e)}")
     
+    @resiliente(prazo=20.0)
     def listar_candidatos_promocao(self, filtros: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
         Lista alunos candidatos à promoção baseado em critérios
@@ -422,7 +407,7 @@ class GraduacoesService:
         """
         try:
             # Buscar todos os alunos ativos
-            alunos_query = self.db.collection(self.alunos_collection).where('status', '==', 'ativo').stream()
+            alunos_query = self.db.collection(self.alunos_collection).where('status', '==', 'ativo').stream(timeout=timeout_restante())
             
             candidatos = []
             meses_minimos = filtros.get('meses_minimos_graduacao', 6) if filtros else 6
@@ -437,7 +422,7 @@ class GraduacoesService:
                 if graduacoes:
                     ultima_graduacao = graduacoes[0]
                     data_ultima = datetime.strptime(ultima_graduacao.get('data', ''), '%Y-%m-%d').date()
-                    hoje = date.today()
+                    hoje = data_de_hoje()
                     
                     dias_desde_ultima = (hoje - data_ultima).days
                     meses_desde_ultima = dias_desde_ultima / 30.44
@@ -4,13 +4,23 @@ Integração com Firestore para collection /pagamentos/{alunoId_YYYY_MM}
 """
 
 from datetime import datetime, date, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
 from google.cloud import firestore
 from google.cloud.firestore_v1.base_query import FieldFilter
-from src.utils.firebase_config import get_firestore_client
+from src.utils.firebase_config import get_firestore_client, stream_em_lotes
+from src.utils.cache_service import aplicar_campos, get_cache_manager
 from src.utils.readonly_guard import ensure_writable
-from src.utils.operational_scope import should_apply_operational_scope, pagamento_is_operational
+from src.utils.operational_scope import (
+    should_apply_operational_scope, pagamento_is_operational, ym_is_operational,
+    escopo_pagamentos_query, escopo_pagamentos_aluno_query, OPERATIONAL_START_YEAR, OPERATIONAL_START_YM
+)
+from src.utils.metrics import instrumentar_servico
+from src.utils.resilience import resiliente, timeout_restante
+from src.utils.request_context import data_de_hoje
+from src.services.periodos_service import PeriodosService
+from src.services.fechamentos_service import FechamentosService
 
+@instrumentar_servico
 class PagamentosService:
     """Serviço para gerenciamento de pagamentos mensais"""
     
@@ -18,6 +28,13 @@ class PagamentosService:
     VENCIMENTOS_VALIDOS = [10, 15, 25]
     CARENCIA_PADRAO = 0  # SEM carência - Após 1 dia do vencimento = inadimplente
     
+    # Status com lista nos detalhes do mês (status → chave)
+    STATUS_DETALHES = {'pago': 'pagos', 'devedor': 'devedores', 'inadimplente': 'inadimplentes', 'ausente': 'ausentes'}
+    
+    # Listagem paginada
+    LIMITE_FILTRO_IN = 30  # máximo de valores em um filtro 'in' do Firestore
+    LIMITE_VARREDURA_PAGINA = 500  # documentos lidos por página com filtro no cliente
+    
     # Mapeamento de vencimento para dia de cobrança (devedor)
     # Alerta aparece 10 dias ANTES do vencimento para gestão
     DIAS_COBRANCA = {
@@ -31,6 +48,65 @@ class PagamentosService:
         self.db = get_firestore_client()
         self.collection_name = 'pagamentos'
     
+    @staticmethod
+    def _aluno_id_do_pagamento(pagamento_id: str) -> str:
+        """Extrai o alunoId do ID estável alunoId_YYYY_MM"""
+        return pagamento_id.rsplit('_', 2)[0]
+    
+    @staticmethod
+    def _ym_do_pagamento(pagamento_id: str) -> str:
+        """Extrai o YYYY-MM do ID estável alunoId_YYYY_MM"""
+        _, ano, mes = pagamento_id.rsplit('_', 2)
+        return f"{ano}-{mes}"
+    
+    def _atualizar_caches(self, pagamento_id: str, campos: Optional[Dict[str, Any]],
+                          anterior: Optional[Dict[str, Any]], anterior_lido: bool = True) -> None:
+        """
+        Write-through de uma escrita: estatísticas do mês (resumo e detalhes) e
+        fichas 360 do aluno são corrigidas no cache em vez de invalidadas (sem reler o mês inteiro)
+        
+        Args:
+            pagamento_id: ID estável alunoId_YYYY_MM
+            campos: Campos gravados (set merge/update, sentinelas aceitos); None = excluído
+            anterior: Documento antes da escrita; None = não existia
+            anterior_lido: False se o anterior não foi lido (não havia resumo em
+                cache); um resumo carregado nesse meio-tempo é descartado
+        """
+        aluno_id = self._aluno_id_do_pagamento(pagamento_id)
+        ym = self._ym_do_pagamento(pagamento_id)
+        cache_manager = get_cache_manager()
+        
+        def mesclar(base):
+            return aplicar_campos({**base, 'id': pagamento_id}, campos)
+        
+        novo = mesclar(anterior or {}) if campos is not None else None
+        
+        def aplicar(pagamentos):
+            # A escrita é mesclada ao registro em cache (anterior não lido: campos antigos preservados)
+            atual = next((p for p in pagamentos if p.get('id') == pagamento_id), anterior or {})
+            outros = [p for p in pagamentos if p.get('id') != pagamento_id]
+            if campos is None:
+                return outros
+            return outros + [mesclar(atual)]
+        
+        def patch_estatisticas(stats):
+            if not anterior_lido:
+                return None  # sem o valor antigo não há como corrigir os totais
+            return self.aplicar_escrita_estatisticas(stats, anterior, novo)
+        
+        def patch_detalhes(detalhes):
+            listas = self.STATUS_DETALHES.values()
+            return self.montar_detalhes(ym, aplicar([p for lista in listas for p in detalhes[lista]]))
+        
+        def patch_ficha(perfil):
+            novos = sorted(aplicar(perfil['pagamentos']), key=lambda p: p.get('ym', ''), reverse=True)
+            return {**perfil, 'pagamentos': novos}
+        
+        cache_manager.patch_estatisticas_pagamentos(ym, patch_estatisticas)
+        cache_manager.patch_detalhes_pagamentos(ym, patch_detalhes)
+        # Mês legado só é corrigido na partição histórica (onde é visível)
+        cache_manager.patch_perfil_aluno(aluno_id, patch_ficha, ym=ym)
+    
     def calcular_status_pagamento(self, ano: int, mes: int, data_vencimento: int = 15, 
                                    carencia_dias: int = None, data_referencia: date = None) -> str:
         """
@@ -59,7 +135,7 @@ class PagamentosService:
             carencia_dias = self.CARENCIA_PADRAO
         
         if data_referencia is None:
-            data_referencia = date.today()
+            data_referencia = data_de_hoje()
         
         # Validar vencimento
         if data_vencimento not in self.VENCIMENTOS_VALIDOS:
@@ -141,6 +217,7 @@ class PagamentosService:
         mes = dados_pagamento['mes']
         pagamento_id = f"{aluno_id}_{ano:04d}_{mes:02d}"
         ym = f"{ano:04d}-{mes:02d}"
+        FechamentosService(self.db).garantir_mes_aberto(ym)
         
         # Preparar documento
         agora = firestore.SERVER_TIMESTAMP
@@ -178,14 +255,30 @@ class PagamentosService:
             documento['paidAt'] = agora
         
         try:
+            # Upsert: o documento anterior (se houver) sai dos totais do mês em cache.
+            # Só é lido se há totais em cache para corrigir (sem leitura antes de cada escrita)
+            anterior_lido = get_cache_manager().tem_estatisticas_pagamentos(ym)
+            anterior = self.buscar_pagamento(pagamento_id) if anterior_lido else None
+            
             # Criar documento com merge para permitir upsert
             doc_ref = self.db.collection(self.collection_name).document(pagamento_id)
             doc_ref.set(documento, merge=True)
+            self._atualizar_caches(pagamento_id, documento, anterior, anterior_lido)
+            
+            # Índice /meta/periodos (seletores do dashboard); sem escrita se o mês já é conhecido.
+            # Falha aqui não desfaz o pagamento: o backfill corrige o índice
+            try:
+                PeriodosService(self.db).registrar_periodo(self.collection_name, ym)
+            except Exception:
+                pass
+            
             return pagamento_id
             
         except Exception as e:
             raise Exception(f"Erro ao criar pagamento: {str(e)}")
     
+    # Sem fallback stale: escritas usam o resultado como base do write-through
+    @resiliente(servir_stale=False)
     def buscar_pagamento(self, pagamento_id: str) -> Optional[Dict[str, Any]]:
         """
         Busca um pagamento por ID
@@ -198,7 +291,7 @@ class PagamentosService:
         """
         try:
             doc_ref = self.db.collection(self.collection_name).document(pagamento_id)
-            doc = doc_ref.get()
+            doc = doc_ref.get(timeout=timeout_restante())
             
             if doc.exists:
                 dados = doc.to_dict()
@@ -225,6 +318,61 @@ class PagamentosService:
         pagamento_id = f"{aluno_id}_{ano:04d}_{mes:02d}"
         return self.buscar_pagamento(pagamento_id)
     
+    def _query_listagem(self, filtros: Dict[str, Any]):
+        """
+        Monta a query de listar_pagamentos/iter_pagamentos
+        
+        Returns:
+            Tupla (query, filtros_cliente, aplicar_escopo); query None quando o
+            filtro está fora do escopo operacional (nada a ler)
+        """
+        campos_filtro = ['ym', 'status', 'alunoId', 'ano', 'mes', 'exigivel']
+        aplicar_escopo = should_apply_operational_scope()
+        
+        # Filtro de igualdade fora do escopo operacional: nada a ler
+        if aplicar_escopo:
+            if 'ym' in filtros and not ym_is_operational(filtros['ym']):
+                return None, {}, aplicar_escopo
+            if 'ano' in filtros and int(filtros['ano']) < OPERATIONAL_START_YEAR:
+                return None, {}, aplicar_escopo
+        
+        # Aplicar apenas UM filtro por vez para evitar índices compostos
+        campo_servidor = next((c for c in campos_filtro if c in filtros), None)
+        if aplicar_escopo and campo_servidor not in ('ym', 'ano', 'alunoId'):
+            # ym/ano já implicam o escopo e alunoId é seletivo o bastante; nos demais
+            # casos o filtro de escopo (ano >= 2026) vai ao servidor e a igualdade
+            # fica no cliente
+            campo_servidor = None
+        
+        query = escopo_pagamentos_query(
+            self.db.collection(self.collection_name),
+            aplicar_escopo and campo_servidor is None
+        )
+        if campo_servidor:
+            query = query.where(filter=FieldFilter(campo_servidor, '==', filtros[campo_servidor]))
+        
+        filtros_cliente = {k: v for k, v in filtros.items() if k in campos_filtro and k != campo_servidor}
+        return query, filtros_cliente, aplicar_escopo
+    
+    @staticmethod
+    def _decodificar_pagamentos(docs, filtros_cliente: Dict[str, Any],
+                                aplicar_escopo: bool) -> Iterator[Dict[str, Any]]:
+        """Documentos → dicts com 'id', com os filtros que não couberam na query"""
+        for doc in docs:
+            pagamento = doc.to_dict()
+            pagamento['id'] = doc.id
+            
+            # Filtros adicionais no cliente
+            if any(pagamento.get(key) != value for key, value in filtros_cliente.items()):
+                continue
+            
+            # In operational UI, hide legacy (pre-2026) payments.
+            if aplicar_escopo and not pagamento_is_operational(pagamento):
+                continue
+            
+            yield pagamento
+    
+    @resiliente(prazo=20.0)
     def listar_pagamentos(self, filtros: Optional[Dict[str, Any]] = None, 
                          ordenar_por: str = 'ym', ordem: str = 'desc') -> List[Dict[str, Any]]:
         """
@@ -239,52 +387,13 @@ class PagamentosService:
             Lista de pagamentos
         """
         try:
-            query = self.db.collection(self.collection_name)
-            
-            # Aplicar apenas UM filtro por vez para evitar índices compostos
-            if filtros:
-                if 'ym' in filtros:
-                    query = query.where(filter=FieldFilter('ym', '==', filtros['ym']))
-                elif 'status' in filtros:
-                    query = query.where(filter=FieldFilter('status', '==', filtros['status']))
-                elif 'alunoId' in filtros:
-                    query = query.where(filter=FieldFilter('alunoId', '==', filtros['alunoId']))
-                elif 'ano' in filtros:
-                    query = query.where(filter=FieldFilter('ano', '==', filtros['ano']))
-                elif 'mes' in filtros:
-                    query = query.where(filter=FieldFilter('mes', '==', filtros['mes']))
-                elif 'exigivel' in filtros:
-                    query = query.where(filter=FieldFilter('exigivel', '==', filtros['exigivel']))
+            query, filtros_cliente, aplicar_escopo = self._query_listagem(filtros or {})
+            if query is None:
+                return []
             
             # Sem ordenação na query para evitar índices - faremos no cliente
-            docs = query.limit(1000).stream()
-            
-            pagamentos = []
-            for doc in docs:
-                pagamento = doc.to_dict()
-                pagamento['id'] = doc.id
-                
-                # Aplicar filtros adicionais no cliente se necessário
-                incluir = True
-                if filtros:
-                    for key, value in filtros.items():
-                        if key not in ['ym', 'status', 'alunoId', 'ano', 'mes', 'exigivel']:
-                            continue
-                        # Se já foi filtrado na query, pular
-                        if (key in ['ym', 'status', 'alunoId', 'ano', 'mes', 'exigivel'] and 
-                            len([k for k in filtros.keys() if k in ['ym', 'status', 'alunoId', 'ano', 'mes', 'exigivel']]) == 1):
-                            continue
-                        # Filtros adicionais no cliente
-                        if pagamento.get(key) != value:
-                            incluir = False
-                            break
-                
-                if incluir:
-                    pagamentos.append(pagamento)
-
-            # In operational UI, hide legacy (pre-2026) payments.
-            if should_apply_operational_scope():
-                pagamentos = [p for p in pagamentos if pagamento_is_operational(p)]
+            docs = query.limit(1000).stream(timeout=timeout_restante())
+            pagamentos = list(self._decodificar_pagamentos(docs, filtros_cliente, aplicar_escopo))
             
             # Ordenação no cliente
             reverse_order = (ordem == 'desc')
@@ -295,6 +404,168 @@ class PagamentosService:
         except Exception as e:
             raise Exception(f"Erro ao listar pagamentos: {str(e)}")
     
+    def iter_pagamentos(self, filtros: Optional[Dict[str, Any]] = None,
+                        tamanho_lote: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        Percorre pagamentos sem montar a lista (scripts, exportações)
+        
+        Mesmos filtros de listar_pagamentos, sem ordenação e sem o teto de 1000
+        documentos: lidos em lotes e decodificados sob demanda, em memória constante.
+        
+        Args:
+            filtros: Dicionário com UM filtro por vez (status OU ym OU alunoId, etc.)
+            tamanho_lote: Documentos lidos por ida ao Firestore
+        
+        Yields:
+            Pagamentos
+        """
+        try:
+            query, filtros_cliente, aplicar_escopo = self._query_listagem(filtros or {})
+            if query is None:
+                return
+            
+            yield from self._decodificar_pagamentos(stream_em_lotes(query, tamanho_lote),
+                                                    filtros_cliente, aplicar_escopo)
+            
+        except Exception as e:
+            raise Exception(f"Erro ao percorrer pagamentos: {str(e)}")
+    
+    def _query_paginada(self, filtros: Dict[str, Any]):
+        """
+        Monta a query da listagem paginada (ordem: ym desc, ID desc)
+        
+        Returns:
+            Tupla (query, ids_cliente): query None quando o filtro está fora do
+            escopo; ids_cliente é o conjunto de alunoIds filtrado no cliente
+            quando não cabe em um filtro 'in' (mais de 30 alunos)
+        """
+        aplicar_escopo = should_apply_operational_scope()
+        query = self.db.collection(self.collection_name)
+        
+        ym = filtros.get('ym')
+        if ym:
+            if aplicar_escopo and not ym_is_operational(ym):
+                return None, None
+            query = query.where(filter=FieldFilter('ym', '==', ym))
+        elif aplicar_escopo:
+            # Mesmo critério de ano >= 2026, mas no campo da ordenação (sem índice extra)
+            query = query.where(filter=FieldFilter('ym', '>=', OPERATIONAL_START_YM))
+        
+        if filtros.get('status'):
+            query = query.where(filter=FieldFilter('status', '==', filtros['status']))
+        
+        ids_cliente = None
+        aluno_ids = filtros.get('alunoIds')
+        if aluno_ids is not None:
+            aluno_ids = sorted(set(aluno_ids))
+            if not aluno_ids:
+                return None, None
+            if len(aluno_ids) <= self.LIMITE_FILTRO_IN:
+                query = query.where(filter=FieldFilter('alunoId', 'in', aluno_ids))
+            else:
+                ids_cliente = set(aluno_ids)
+        
+        query = query.order_by('ym', direction=firestore.Query.DESCENDING)
+        query = query.order_by('__name__', direction=firestore.Query.DESCENDING)
+        return query, ids_cliente
+    
+    @resiliente()
+    def listar_pagamentos_paginado(self, filtros: Optional[Dict[str, Any]] = None,
+                                   tamanho_pagina: int = 50,
+                                   cursor: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Lista UMA página de pagamentos com filtros e ordenação no servidor
+        
+        O custo não depende do tamanho do mês: são lidos apenas os documentos
+        da página (mais a varredura limitada quando o filtro de alunos passa
+        de 30 IDs).
+        
+        Índices compostos usados: (status, ym desc), (alunoId, ym desc) e
+        (alunoId, status, ym desc) - ver Docs/FIRESTORE_SCHEMA.md
+        
+        Args:
+            filtros: Filtros combináveis - ym, status e alunoIds (lista)
+            tamanho_pagina: Quantidade de pagamentos por página
+            cursor: [ym, id] do último pagamento da página anterior (None = primeira)
+        
+        Returns:
+            Dict com 'pagamentos' (página atual) e 'proximo_cursor' ([ym, id] ou
+            None quando não há mais páginas)
+        """
+        try:
+            query, ids_cliente = self._query_paginada(filtros or {})
+            if query is None:
+                return {'pagamentos': [], 'proximo_cursor': None}
+            
+            pagamentos = []
+            lidos = 0
+            ultimo = cursor
+            while lidos < self.LIMITE_VARREDURA_PAGINA:
+                lote_query = query
+                if ultimo:
+                    lote_query = lote_query.start_after({'ym': ultimo[0], '__name__': ultimo[1]})
+                # Um documento a mais indica se existe próxima página
+                docs = list(lote_query.limit(tamanho_pagina + 1).stream(timeout=timeout_restante()))
+                lidos += len(docs)
+                
+                for doc in docs:
+                    if len(pagamentos) == tamanho_pagina:
+                        return {'pagamentos': pagamentos, 'proximo_cursor': ultimo}
+                    pagamento = doc.to_dict()
+                    pagamento['id'] = doc.id
+                    ultimo = [pagamento.get('ym', ''), doc.id]
+                    if ids_cliente is None or pagamento.get('alunoId') in ids_cliente:
+                        pagamentos.append(pagamento)
+                
+                if len(docs) <= tamanho_pagina:
+                    return {'pagamentos': pagamentos, 'proximo_cursor': None}
+            
+            # Varredura limitada (filtro de alunos no cliente): página parcial, continua do cursor
+            return {'pagamentos': pagamentos, 'proximo_cursor': ultimo}
+            
+        except Exception as e:
+            raise Exception(f"Erro ao listar pagamentos paginados: {str(e)}")
+    
+    @resiliente()
+    def resumir_pagamentos(self, filtros: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Totais por status via agregações do Firestore (count/sum), sem ler os documentos
+        
+        Args:
+            filtros: Mesmos filtros de listar_pagamentos_paginado
+        
+        Returns:
+            Dict com 'total', contagem por status e 'valor_a_receber', ou None
+            quando o filtro de alunos é aplicado no cliente (mais de 30 IDs)
+        """
+        try:
+            filtros = dict(filtros or {})
+            status_filtro = filtros.pop('status', None)
+            query, ids_cliente = self._query_paginada(filtros)
+            
+            resumo = {'total': 0, 'pago': 0, 'devedor': 0, 'inadimplente': 0,
+                      'ausente': 0, 'valor_a_receber': 0.0}
+            if query is None:
+                return resumo
+            if ids_cliente is not None:
+                return None
+            
+            for status in ('pago', 'devedor', 'inadimplente', 'ausente'):
+                if status_filtro and status != status_filtro:
+                    continue
+                agregacao = (query.where(filter=FieldFilter('status', '==', status))
+                             .count(alias='quantidade').sum('valor', alias='valor'))
+                valores = {r.alias: r.value for r in agregacao.get(timeout=timeout_restante())[0]}
+                resumo[status] = int(valores.get('quantidade') or 0)
+                resumo['total'] += resumo[status]
+                if status in ('devedor', 'inadimplente'):
+                    resumo['valor_a_receber'] += float(valores.get('valor') or 0)
+            
+            return resumo
+            
+        except Exception as e:
+            raise Exception(f"Erro ao resumir pagamentos: {str(e)}")
+    
     def atualizar_pagamento(self, pagamento_id: str, dados_atualizacao: Dict[str, Any]) -> bool:
         """
         Atualiza um pagamento existente
@@ -308,9 +579,11 @@ class PagamentosService:
         """
         try:
             ensure_writable("atualizar pagamento")
+            FechamentosService(self.db).garantir_mes_aberto(self._ym_do_pagamento(pagamento_id))
 
             # Verificar se pagamento existe
-            if not self.buscar_pagamento(pagamento_id):
+            existente = self.buscar_pagamento(pagamento_id)
+            if not existente:
                 raise ValueError(f"Pagamento não encontrado: {pagamento_id}")
             
             # Preparar dados de atualização
@@ -327,6 +600,7 @@ class PagamentosService:
             # Atualizar documento
             doc_ref = self.db.collection(self.collection_name).document(pagamento_id)
             doc_ref.update(dados_atualizacao)
+            self._atualizar_caches(pagamento_id, dados_atualizacao, existente)
             
             return True
             
@@ -394,6 +668,15 @@ class PagamentosService:
             'exigivel': exigivel
         })
     
+    def _query_por_aluno(self, aluno_id: str):
+        """Pagamentos do aluno, mais recentes primeiro, com o escopo operacional na query"""
+        query = self.db.collection(self.collection_name).where(
+            filter=FieldFilter('alunoId', '==', aluno_id)
+        )
+        query = escopo_pagamentos_aluno_query(query, should_apply_operational_scope())
+        return query.order_by('ym', direction=firestore.Query.DESCENDING)
+    
+    @resiliente()
     def obter_extrato_aluno(self, aluno_id: str, limite_meses: int = 12) -> List[Dict[str, Any]]:
         """
         Obtém extrato de pagamentos de um aluno
@@ -406,31 +689,24 @@ class PagamentosService:
             Lista de pagamentos do aluno ordenados por data (mais recente primeiro)
         """
         try:
-            # Consulta simples apenas por alunoId para evitar índice composto
-            query = (self.db.collection(self.collection_name)
-                    .where(filter=FieldFilter('alunoId', '==', aluno_id))
-                    .limit(limite_meses * 2))  # Buscar mais para garantir que temos suficientes
+            # Escopo, ordenação e limite no servidor: índice (alunoId, ym desc)
+            query = (self._query_por_aluno(aluno_id)
+                    .limit(limite_meses))
             
-            docs = query.stream()
+            docs = query.stream(timeout=timeout_restante())
             
             extrato = []
             for doc in docs:
                 pagamento = doc.to_dict()
                 pagamento['id'] = doc.id
                 extrato.append(pagamento)
-
-            if should_apply_operational_scope():
-                extrato = [p for p in extrato if pagamento_is_operational(p)]
             
-            # Ordenar no cliente por ym (mais recente primeiro)
-            extrato.sort(key=lambda x: x.get('ym', ''), reverse=True)
-            
-            # Limitar ao número solicitado
-            return extrato[:limite_meses]
+            return extrato
             
         except Exception as e:
             raise Exception(f"Erro ao obter extrato: {str(e)}")
     
+    @resiliente()
     def obter_inadimplentes(self, ym: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Obtém lista de pagamentos inadimplentes
@@ -442,15 +718,21 @@ class PagamentosService:
             Lista de pagamentos inadimplentes
         """
         try:
+            aplicar_escopo = should_apply_operational_scope()
+            
             # Para evitar índice composto, fazer consulta simples e filtrar no cliente
             if ym:
+                if aplicar_escopo and not ym_is_operational(ym):
+                    return []
                 # Consulta apenas por ym
                 query = self.db.collection(self.collection_name).where(filter=FieldFilter('ym', '==', ym))
             else:
-                # Consulta todos os documentos dos últimos 6 meses
-                query = self.db.collection(self.collection_name).limit(1000)
+                # Sem mês: escopo operacional (ano >= 2026) aplicado no servidor
+                query = escopo_pagamentos_query(
+                    self.db.collection(self.collection_name), aplicar_escopo
+                ).limit(1000)
             
-            docs = query.stream()
+            docs = query.stream(timeout=timeout_restante())
             
             inadimplentes = []
             for doc in docs:
@@ -462,7 +744,7 @@ class PagamentosService:
                     pagamento.get('exigivel', True)):
                     inadimplentes.append(pagamento)
 
-            if should_apply_operational_scope():
+            if aplicar_escopo:
                 inadimplentes = [p for p in inadimplentes if pagamento_is_operational(p)]
             
             # Ordenar por ym (mais recente primeiro)
@@ -473,6 +755,7 @@ class PagamentosService:
         except Exception as e:
             raise Exception(f"Erro ao obter inadimplentes: {str(e)}")
     
+    @resiliente()
     def obter_devedores(self, ym: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Obtém lista de pagamentos em status devedor (a cobrar)
@@ -484,15 +767,21 @@ class PagamentosService:
             Lista de pagamentos em status devedor
         """
         try:
+            aplicar_escopo = should_apply_operational_scope()
+            
             # Para evitar índice composto, fazer consulta simples e filtrar no cliente
             if ym:
+                if aplicar_escopo and not ym_is_operational(ym):
+                    return []
                 # Consulta apenas por ym
                 query = self.db.collection(self.collection_name).where(filter=FieldFilter('ym', '==', ym))
             else:
-                # Consulta todos os documentos dos últimos 6 meses
-                query = self.db.collection(self.collection_name).limit(1000)
+                # Sem mês: escopo operacional (ano >= 2026) aplicado no servidor
+                query = escopo_pagamentos_query(
+                    self.db.collection(self.collection_name), aplicar_escopo
+                ).limit(1000)
             
-            docs = query.stream()
+            docs = query.stream(timeout=timeout_restante())
             
             devedores = []
             for doc in docs:
@@ -503,7 +792,7 @@ class PagamentosService:
                 if pagamento.get('status') == 'devedor':
                     devedores.append(pagamento)
 
-            if should_apply_operational_scope():
+            if aplicar_escopo:
                 devedores = [p for p in devedores if pagamento_is_operational(p)]
             
             # Ordenar por ym (mais recente primeiro)
@@ -514,9 +803,109 @@ class PagamentosService:
         except Exception as e:
             raise Exception(f"Erro ao obter devedores: {str(e)}")
     
+    @staticmethod
+    def montar_estatisticas(ym: str, pagamentos_mes: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Resumo (KPIs) do mês a partir dos pagamentos já carregados
+        
+        Usado por obter_estatisticas_mes e pelo fechamento; o write-through do
+        cache corrige o resumo com aplicar_escrita_estatisticas.
+        
+        Args:
+            ym: Mês no formato YYYY-MM
+            pagamentos_mes: Pagamentos do mês
+        
+        Returns:
+            Dict com estatísticas do mês (sem as listas: ver montar_detalhes)
+        """
+        por_status = {status: [0, 0.0] for status in PagamentosService.STATUS_DETALHES}
+        for pagamento in pagamentos_mes:
+            PagamentosService._acumular(por_status, pagamento, 1)
+        return PagamentosService.resumir_totais(ym, len(pagamentos_mes), por_status)
+    
+    @staticmethod
+    def _acumular(por_status: Dict[str, list], pagamento: Dict[str, Any], sinal: int) -> None:
+        """Soma (sinal=1) ou retira (sinal=-1) um pagamento dos totais por status"""
+        status = pagamento.get('status')
+        if status in por_status:
+            por_status[status][0] += sinal
+            por_status[status][1] += sinal * (pagamento.get('valor') or 0)
+    
+    @staticmethod
+    def resumir_totais(ym: str, total_pagamentos: int, por_status: Dict[str, list]) -> Dict[str, Any]:
+        """
+        Estatísticas do mês a partir dos totais por status (status → [quantidade, soma])
+        
+        Os totais ficam no resumo para o write-through corrigi-lo com os valores
+        antigo e novo do pagamento, em tamanho constante.
+        """
+        contagem = {status: por_status[status][0] for status in por_status}
+        valores = {status: round(por_status[status][1], 2) for status in por_status}
+        pagos, devedores = contagem['pago'], contagem['devedor']
+        inadimplentes, ausentes = contagem['inadimplente'], contagem['ausente']
+        
+        # Total exigível = devedores + inadimplentes
+        total_exigivel = devedores + inadimplentes
+        valor_total_exigivel = valores['devedor'] + valores['inadimplente']
+        
+        return {
+            'ym': ym,
+            'total_pagamentos': total_pagamentos,
+            'total_pagos': pagos,
+            'total_devedores': devedores,
+            'total_inadimplentes': inadimplentes,
+            'total_ausentes': ausentes,
+            'total_exigivel': total_exigivel,
+            'receita_total': valores['pago'],
+            'valor_devedores': valores['devedor'],
+            'valor_inadimplencia': valores['inadimplente'],
+            'valor_total_exigivel': valor_total_exigivel,
+            'taxa_inadimplencia': (inadimplentes / max(1, total_pagamentos - ausentes)) * 100,
+            'taxa_cobranca': (total_exigivel / max(1, total_pagamentos - ausentes)) * 100,
+            'por_status': {status: [contagem[status], valores[status]] for status in por_status},
+        }
+    
+    @staticmethod
+    def aplicar_escrita_estatisticas(stats: Dict[str, Any], anterior: Optional[Dict[str, Any]],
+                                     novo: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Corrige o resumo do mês com uma escrita (retira o valor antigo, soma o novo)
+        
+        Args:
+            stats: Resumo em cache
+            anterior: Pagamento antes da escrita (None = não existia)
+            novo: Pagamento depois da escrita (None = excluído)
+        
+        Returns:
+            Resumo corrigido, ou None se o formato não tem os totais (recarregar)
+        """
+        if 'por_status' not in stats:
+            return None  # resumo de uma versão anterior: recarregar
+        por_status = {status: list(totais) for status, totais in stats['por_status'].items()}
+        total = stats['total_pagamentos']
+        for pagamento, sinal in ((anterior, -1), (novo, 1)):
+            if pagamento is not None:
+                PagamentosService._acumular(por_status, pagamento, sinal)
+                total += sinal
+        return PagamentosService.resumir_totais(stats['ym'], total, por_status)
+    
+    @staticmethod
+    def montar_detalhes(ym: str, pagamentos_mes: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Listas de pagamentos do mês por status (carregadas só quando a tela expande)
+        
+        Returns:
+            Dict com 'ym' e as listas 'pagos', 'devedores', 'inadimplentes', 'ausentes'
+        """
+        detalhes = {'ym': ym}
+        for status, lista in PagamentosService.STATUS_DETALHES.items():
+            detalhes[lista] = [p for p in pagamentos_mes if p.get('status') == status]
+        return detalhes
+    
+    @resiliente(prazo=20.0)
     def obter_estatisticas_mes(self, ym: str) -> Dict[str, Any]:
         """
-        Obtém estatísticas de pagamentos de um mês
+        Obtém estatísticas de pagamentos de um mês (resumo, sem listas)
         
         Args:
             ym: Mês no formato YYYY-MM
@@ -525,48 +914,41 @@ class PagamentosService:
             Dict com estatísticas do mês
         """
         try:
+            # Mês fechado: estatísticas finais gravadas no fechamento
+            fechamento = FechamentosService(self.db).obter_fechamento(ym)
+            if fechamento is not None and (ym_is_operational(ym) or not should_apply_operational_scope()):
+                return fechamento['pagamentos']
+            
             # Usar método simplificado de listagem
             pagamentos_mes = self.listar_pagamentos(filtros={'ym': ym})
-            
-            total_pagamentos = len(pagamentos_mes)
-            pagos = [p for p in pagamentos_mes if p['status'] == 'pago']
-            devedores = [p for p in pagamentos_mes if p['status'] == 'devedor']
-            inadimplentes = [p for p in pagamentos_mes if p['status'] == 'inadimplente']
-            ausentes = [p for p in pagamentos_mes if p['status'] == 'ausente']
-            
-            receita_total = sum(p['valor'] for p in pagos)
-            valor_devedores = sum(p['valor'] for p in devedores)
-            valor_inadimplencia = sum(p['valor'] for p in inadimplentes)
-            
-            # Total exigível = devedores + inadimplentes
-            total_exigivel = len(devedores) + len(inadimplentes)
-            valor_total_exigivel = valor_devedores + valor_inadimplencia
-            
-            return {
-                'ym': ym,
-                'total_pagamentos': total_pagamentos,
-                'total_pagos': len(pagos),
-                'total_devedores': len(devedores),
-                'total_inadimplentes': len(inadimplentes),
-                'total_ausentes': len(ausentes),
-                'total_exigivel': total_exigivel,
-                'receita_total': receita_total,
-                'valor_devedores': valor_devedores,
-                'valor_inadimplencia': valor_inadimplencia,
-                'valor_total_exigivel': valor_total_exigivel,
-                'taxa_inadimplencia': (len(inadimplentes) / max(1, total_pagamentos - len(ausentes))) * 100,
-                'taxa_cobranca': (total_exigivel / max(1, total_pagamentos - len(ausentes))) * 100,
-                'detalhes': {
-                    'pagos': pagos,
-                    'devedores': devedores,
-                    'inadimplentes': inadimplentes,
-                    'ausentes': ausentes
-                }
-            }
+            return self.montar_estatisticas(ym, pagamentos_mes)
             
         except Exception as e:
             raise Exception(f"Erro ao obter estatísticas: {str(e)}")
     
+    @resiliente(prazo=20.0)
+    def obter_detalhes_mes(self, ym: str) -> Dict[str, Any]:
+        """
+        Obtém os pagamentos de um mês agrupados por status
+        
+        Args:
+            ym: Mês no formato YYYY-MM
+        
+        Returns:
+            Dict com 'ym', 'pagos', 'devedores', 'inadimplentes' e 'ausentes'
+        """
+        try:
+            # Mês fechado não muda: leitura completa em lotes, cacheada com TTL_FECHADO
+            if FechamentosService(self.db).mes_fechado(ym):
+                pagamentos_mes = list(self.iter_pagamentos(filtros={'ym': ym}))
+                return {**self.montar_detalhes(ym, pagamentos_mes), 'fechado': True}
+            
+            pagamentos_mes = self.listar_pagamentos(filtros={'ym': ym})
+            return self.montar_detalhes(ym, pagamentos_mes)
+            
+        except Exception as e:
+            raise Exception(f"Erro ao obter detalhes dos pagamentos: {str(e)}")
+    
     def deletar_pagamento(self, pagamento_id: str) -> bool:
         """
         Deleta um pagamento (usar com cuidado!)
@@ -579,14 +961,17 @@ class PagamentosService:
         """
         try:
             ensure_writable("deletar pagamento")
+            FechamentosService(self.db).garantir_mes_aberto(self._ym_do_pagamento(pagamento_id))
 
             # Verificar se existe
-            if not self.buscar_pagamento(pagamento_id):
+            existente = self.buscar_pagamento(pagamento_id)
+            if not existente:
                 raise ValueError(f"Pagamento não encontrado: {pagamento_id}")
             
             # Deletar documento
             doc_ref = self.db.collection(self.collection_name).document(pagamento_id)
             doc_ref.delete()
+            self._atualizar_caches(pagamento_id, None, existente)
             
             return True
             
@@ -643,6 +1028,7 @@ class PagamentosService:
         except Exception as e:
             raise Exception(f"Erro ao gerar pagamentos do mês: {str(e)}")
     
+    @resiliente()
     def listar_pagamentos_por_aluno(self, aluno_id: str) -> list:
         """
         Lista todos os pagamentos de um aluno específico
@@ -657,24 +1043,14 @@ class PagamentosService:
             if not aluno_id:
                 return []
             
-            # Buscar todos os pagamentos do aluno
-            query = self.db.collection(self.collection_name).where(
-                filter=FieldFilter('alunoId', '==', aluno_id)
-            )
-            
-            docs = query.stream()
+            # Buscar os pagamentos do aluno no escopo (mais recente primeiro, no servidor)
+            docs = self._query_por_aluno(aluno_id).stream(timeout=timeout_restante())
             
             pagamentos = []
             for doc in docs:
                 pagamento = doc.to_dict()
                 pagamento['id'] = doc.id
                 pagamentos.append(pagamento)
-
-            if should_apply_operational_scope():
-                pagamentos = [p for p in pagamentos if pagamento_is_operational(p)]
-            
-            # Ordenar por ym (mais recente primeiro)
-            pagamentos.sort(key=lambda x: x.get('ym', ''), reverse=True)
             
             return pagamentos
             
@@ -0,0 +1,120 @@
+"""
+PeriodosService - Índice de períodos com dados
+Documento /meta/periodos com a lista de meses (YYYY-MM) que têm dados em cada
+collection, mantido com ArrayUnion nas escritas. Os seletores de período do
+dashboard custam uma leitura em vez de um scan de /pagamentos.
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Set
+from google.cloud import firestore
+from src.utils.firebase_config import get_firestore_client
+from src.utils.resilience import resiliente, timeout_restante
+
+META_COLLECTION = 'meta'
+PERIODOS_DOC = 'periodos'
+
+# Cache por processo: as escritas deste processo atualizam o cache local e o
+# TTL (o mesmo do sync de alunos) traz os meses registrados por outras réplicas
+TTL_PERIODOS = 60  # segundos
+_periodos_cache: Optional[Dict[str, List[str]]] = None
+_periodos_expira_em = 0.0
+_periodos_lock = threading.Lock()
+
+
+def invalidar_cache_periodos() -> None:
+    """Descarta o cache local (próxima leitura vai ao Firestore)"""
+    global _periodos_cache
+    with _periodos_lock:
+        _periodos_cache = None
+
+
+class PeriodosService:
+    """Serviço para o índice /meta/periodos"""
+
+    def __init__(self, db=None):
+        """Inicializa o serviço com conexão Firestore"""
+        self.db = db or get_firestore_client()
+
+    def _doc_ref(self):
+        return self.db.collection(META_COLLECTION).document(PERIODOS_DOC)
+
+    @resiliente()
+    def obter_periodos(self) -> Dict[str, List[str]]:
+        """
+        Obtém os meses com dados por collection (uma leitura, depois cache por TTL_PERIODOS)
+
+        Returns:
+            Dict collection → lista ordenada de 'YYYY-MM'
+        """
+        global _periodos_cache, _periodos_expira_em
+        if _periodos_cache is not None and time.monotonic() < _periodos_expira_em:
+            return _periodos_cache
+
+        try:
+            doc = self._doc_ref().get(timeout=timeout_restante())
+            dados = (doc.to_dict() or {}) if doc.exists else {}
+            periodos = {colecao: sorted(set(meses)) for colecao, meses in dados.items()
+                        if isinstance(meses, list)}
+        except Exception as e:
+            raise Exception(f"Erro ao obter períodos: {str(e)}")
+
+        with _periodos_lock:
+            _periodos_cache = periodos
+            _periodos_expira_em = time.monotonic() + TTL_PERIODOS
+        return periodos
+
+    def registrar_periodos(self, colecao: str, yms: List[str]) -> None:
+        """
+        Registra meses com dados em uma collection (ArrayUnion, idempotente)
+
+        Meses já conhecidos não geram escrita. Com o cache vazio (processo sem
+        warm-up, scripts) o índice é lido antes: uma leitura no lugar de uma
+        escrita no mesmo documento a cada chamada (ex.: gerar_pagamentos_mes).
+
+        Args:
+            colecao: Nome da collection (ex.: 'pagamentos')
+            yms: Meses no formato YYYY-MM
+        """
+        try:
+            periodos = self.obter_periodos()
+        except Exception:
+            # Índice ilegível: ArrayUnion é idempotente, grava sem o diff
+            periodos = {}
+        conhecidos: Set[str] = set(periodos.get(colecao, []))
+        novos = sorted(set(yms) - conhecidos)
+        if not novos:
+            return
+
+        try:
+            self._doc_ref().set({colecao: firestore.ArrayUnion(novos)}, merge=True)
+        except Exception as e:
+            raise Exception(f"Erro ao registrar períodos: {str(e)}")
+
+        with _periodos_lock:
+            if _periodos_cache is not None:
+                _periodos_cache[colecao] = sorted(conhecidos | set(novos))
+
+    def registrar_periodo(self, colecao: str, ym: str) -> None:
+        """Registra um mês com dados em uma collection"""
+        self.registrar_periodos(colecao, [ym])
+
+    def meses_por_ano(self, colecao: str) -> Dict[int, List[int]]:
+        """
+        Meses com dados agrupados por ano
+
+        Args:
+            colecao: Nome da collection
+
+        Returns:
+            Dict ano → lista ordenada de meses (1-12)
+        """
+        resultado: Dict[int, List[int]] = {}
+        for ym in self.obter_periodos().get(colecao, []):
+            try:
+                ano, mes = map(int, ym.split('-'))
+            except ValueError:
+                continue
+            resultado.setdefault(ano, []).append(mes)
+        return {ano: sorted(meses) for ano, meses in resultado.items()}
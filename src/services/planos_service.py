@@ -7,16 +7,18 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime
 import streamlit as st
 from google.cloud.firestore_v1 import SERVER_TIMESTAMP
-from src.utils.firebase_config import FirebaseConfig
+from src.utils.firebase_config import get_firestore_client
 from src.utils.readonly_guard import ensure_writable
+from src.utils.metrics import instrumentar_servico
+from src.utils.resilience import resiliente, timeout_restante
 
+@instrumentar_servico
 class PlanosService:
     """Serviço para operações CRUD de Planos"""
     
     def __init__(self):
         """Inicializa o serviço com conexão Firestore"""
-        self.firebase_config = FirebaseConfig()
-        self.db = self.firebase_config.db
+        self.db = get_firestore_client()
         self.collection = self.db.collection('planos')
     
     def criar_plano(self, dados_plano: Dict[str, Any]) -> str:
@@ -55,6 +57,7 @@ class PlanosService:
             st.error(f"❌ Erro ao criar plano: {str(e)}")
             raise e
     
+    @resiliente()
     def buscar_plano(self, plano_id: str) -> Optional[Dict[str, Any]]:
         """
         Busca um plano por ID
@@ -66,7 +69,7 @@ class PlanosService:
             Dict com dados do plano ou None se não encontrado
         """
         try:
-            doc = self.collection.document(plano_id).get()
+            doc = self.collection.document(plano_id).get(timeout=timeout_restante())
             
             if doc.exists:
                 plano_data = doc.to_dict()
@@ -76,9 +79,9 @@ class PlanosService:
             return None
             
         except Exception as e:
-            st.error(f"❌ Erro ao buscar plano: {str(e)}")
-            raise e
+            raise Exception(f"Erro ao buscar plano: {str(e)}")
     
+    @resiliente()
     def listar_planos(self, apenas_ativos: Optional[bool] = None, ordenar_por: str = 'nome') -> List[Dict[str, Any]]:
         """
         Lista planos com filtros opcionais
@@ -95,11 +98,11 @@ class PlanosService:
             if apenas_ativos is not None:
                 # Consulta apenas com filtro
                 query = self.collection.where('ativo', '==', apenas_ativos)
-                docs = query.stream()
+                docs = query.stream(timeout=timeout_restante())
             else:
                 # Consulta apenas com ordenação
                 query = self.collection.order_by(ordenar_por)
-                docs = query.stream()
+                docs = query.stream(timeout=timeout_restante())
             
             planos = []
             for doc in docs:
@@ -117,8 +120,7 @@ class PlanosService:
             return planos
             
         except Exception as e:
-            st.error(f"❌ Erro ao listar planos: {str(e)}")
-            raise e
+            raise Exception(f"Erro ao listar planos: {str(e)}")
     
     def atualizar_plano(self, plano_id: str, dados_atualizacao: Dict[str, Any]) -> bool:
         """
@@ -4,20 +4,100 @@ Integração com Firestore para collection /presencas/{presencaId}
 """
 
 from datetime import datetime, date
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
 from google.cloud import firestore
-from src.utils.firebase_config import get_firestore_client
+from src.utils.firebase_config import get_firestore_client, stream_em_lotes
+from src.utils.cache_service import aplicar_campos, get_cache_manager
+from src.utils.checkin_queue import DESCONHECIDO, get_checkin_queue
 from src.utils.readonly_guard import ensure_writable
-from src.utils.operational_scope import should_apply_operational_scope, presenca_is_operational
+from src.utils.operational_scope import (
+    should_apply_operational_scope, presenca_is_operational, ym_is_operational, escopo_presencas_query
+)
+from src.utils.metrics import instrumentar_servico
+from src.utils.resilience import resiliente, timeout_restante
+from src.utils.request_context import data_de_hoje
+from src.services.fechamentos_service import FechamentosService
 
+@instrumentar_servico
 class PresencasService:
     """Serviço para gerenciamento de presenças e check-ins"""
     
+    LIMITE_PRESENCAS_FICHA = 30  # presenças exibidas na ficha 360
+    
     def __init__(self):
         """Inicializa o serviço com conexão Firestore"""
         self.db = get_firestore_client()
         self.collection_name = 'presencas'
     
+    @staticmethod
+    def _ym_da_presenca(presenca_id: str) -> str:
+        """Extrai o YYYY-MM do ID determinístico alunoId_YYYY-MM-DD"""
+        return presenca_id.rsplit('_', 1)[-1][:7]
+    
+    @staticmethod
+    def atualizar_caches(escritas: Dict[str, Optional[Dict[str, Any]]],
+                         anteriores: Optional[Dict[str, Optional[Dict[str, Any]]]] = None) -> None:
+        """
+        Write-through de escritas em presenças: relatórios mensais (resumo e
+        detalhes) e fichas 360 são corrigidos no cache em vez de relidos do Firestore
+        
+        Estático para ser usado também pelo flusher da fila de check-in.
+        
+        Args:
+            escritas: presenca_id → documento gravado (completo, sentinelas
+                aceitos) ou None para presença excluída
+            anteriores: presenca_id → documento antes da escrita (None = não
+                existia); sem o ID o estado anterior é desconhecido e o resumo
+                do mês é recarregado
+        """
+        anteriores = anteriores or {}
+        cache_manager = get_cache_manager()
+        fila = get_checkin_queue()
+        por_mes: Dict[str, Dict[str, Any]] = {}
+        por_aluno: Dict[tuple, Dict[str, Any]] = {}
+        for presenca_id, documento in escritas.items():
+            if fila is not None:
+                # Faltas, lotes e exclusões diretas também valem para a deduplicação do check-in
+                fila.lembrar(presenca_id, None if documento is None else bool(documento.get('presente', False)))
+            aluno_id, data_str = presenca_id.rsplit('_', 1)
+            por_mes.setdefault(data_str[:7], {})[presenca_id] = documento
+            por_aluno.setdefault((aluno_id, data_str[:7]), {})[presenca_id] = documento
+        
+        def aplicar(presencas, mudancas):
+            por_id = {p['id']: p for p in presencas}
+            for presenca_id, documento in mudancas.items():
+                if documento is None:
+                    por_id.pop(presenca_id, None)
+                else:
+                    por_id[presenca_id] = aplicar_campos({'id': presenca_id}, documento)
+            return sorted(por_id.values(), key=lambda p: p.get('data', ''), reverse=True)
+        
+        # Cada patch alcança só as partições que enxergam o mês (legado: histórico)
+        for ym, mudancas in por_mes.items():
+            def patch_relatorio(relatorio, mudancas=mudancas):
+                if any(presenca_id not in anteriores for presenca_id in mudancas):
+                    return None  # estado anterior desconhecido: recarregar
+                for presenca_id, documento in mudancas.items():
+                    relatorio = PresencasService.aplicar_escrita_relatorio(
+                        relatorio, presenca_id, anteriores[presenca_id], documento)
+                    if relatorio is None:
+                        return None
+                return relatorio
+            
+            def patch_detalhes(detalhes, ym=ym, mudancas=mudancas):
+                presencas = aplicar(detalhes['presentes'] + detalhes['faltas'], mudancas)
+                return PresencasService.montar_detalhes(ym, presencas)
+            cache_manager.patch_relatorio_presencas(ym, patch_relatorio)
+            cache_manager.patch_detalhes_presencas(ym, patch_detalhes)
+        
+        limite = PresencasService.LIMITE_PRESENCAS_FICHA
+        for (aluno_id, ym), mudancas in por_aluno.items():
+            def patch_ficha(perfil, mudancas=mudancas):
+                if len(perfil['presencas']) >= limite and None in mudancas.values():
+                    return None  # lista cortada: a próxima presença mais antiga não está em cache
+                return {**perfil, 'presencas': aplicar(perfil['presencas'], mudancas)[:limite]}
+            cache_manager.patch_perfil_aluno(aluno_id, patch_ficha, ym=ym)
+    
     def registrar_presenca(self, aluno_id: str, data_presenca: Optional[date] = None, 
                           presente: bool = True) -> str:
         """
@@ -42,13 +122,14 @@ class PresencasService:
         
         # Usar data atual se não especificada
         if data_presenca is None:
-            data_presenca = date.today()
+            data_presenca = data_de_hoje()
         
-        # Doc-id determinístico: elimina read-before-write
+        # Doc-id determinístico: sem query, só a leitura pontual do registro anterior
         aluno_id_clean = aluno_id.strip()
         data_str = data_presenca.strftime('%Y-%m-%d')
         ym = data_presenca.strftime('%Y-%m')
         presenca_id = f"{aluno_id_clean}_{data_str}"
+        FechamentosService(self.db).garantir_mes_aberto(ym)
         
         # Preparar documento
         agora = firestore.SERVER_TIMESTAMP
@@ -61,14 +142,22 @@ class PresencasService:
         }
         
         try:
+            # Registro anterior: o resumo do mês em cache troca o valor antigo pelo novo.
+            # Só é lido se há resumo em cache; sem ele o anterior fica desconhecido
+            anteriores = {}
+            if get_cache_manager().tem_relatorio_presencas(ym):
+                anteriores[presenca_id] = self.buscar_presenca(presenca_id)
             doc_ref = self.db.collection(self.collection_name).document(presenca_id)
             # merge=True preserva createdAt em docs existentes
             doc_ref.set({**documento, 'createdAt': agora}, merge=True)
+            self.atualizar_caches({presenca_id: documento}, anteriores)
             return presenca_id
             
         except Exception as e:
             raise Exception(f"Erro ao registrar presença: {str(e)}")
     
+    # Sem fallback stale: escritas usam o resultado como base do write-through
+    @resiliente(servir_stale=False)
     def buscar_presenca(self, presenca_id: str) -> Optional[Dict[str, Any]]:
         """
         Busca uma presença por ID
@@ -81,7 +170,7 @@ class PresencasService:
         """
         try:
             doc_ref = self.db.collection(self.collection_name).document(presenca_id)
-            doc = doc_ref.get()
+            doc = doc_ref.get(timeout=timeout_restante())
             
             if doc.exists:
                 dados = doc.to_dict()
@@ -93,6 +182,8 @@ class PresencasService:
         except Exception as e:
             raise Exception(f"Erro ao buscar presença: {str(e)}")
     
+    # Sem fallback stale: um "sem registro" antigo deixaria o check-in sobrescrever a falta
+    @resiliente(servir_stale=False)
     def buscar_presenca_por_aluno_data(self, aluno_id: str, data_presenca: date) -> Optional[Dict[str, Any]]:
         """
         Busca presença de um aluno em uma data específica
@@ -112,7 +203,7 @@ class PresencasService:
                     .where('alunoId', '==', aluno_id)
                     .limit(100))
             
-            docs = query.stream()
+            docs = query.stream(timeout=timeout_restante())
             
             # Filtrar por data no cliente
             for doc in docs:
@@ -126,6 +217,59 @@ class PresencasService:
         except Exception as e:
             raise Exception(f"Erro ao buscar presença por aluno/data: {str(e)}")
     
+    def _query_listagem(self, filtros: Dict[str, Any]):
+        """
+        Monta a query de listar_presencas/iter_presencas
+        
+        Returns:
+            Tupla (query, filtros_cliente, aplicar_escopo); query None quando o
+            filtro está fora do escopo operacional (nada a ler)
+        """
+        campos_filtro = ['alunoId', 'ym', 'data', 'presente']
+        aplicar_escopo = should_apply_operational_scope()
+        
+        # Filtro de igualdade fora do escopo operacional: nada a ler
+        if aplicar_escopo:
+            if 'ym' in filtros and not ym_is_operational(filtros['ym']):
+                return None, {}, aplicar_escopo
+            if 'data' in filtros and not ym_is_operational(str(filtros['data'])[:7]):
+                return None, {}, aplicar_escopo
+        
+        # Aplicar apenas UM filtro por vez para evitar índices compostos
+        campo_servidor = next((c for c in campos_filtro if c in filtros), None)
+        if aplicar_escopo and campo_servidor == 'presente':
+            # Escopo (ym >= 2026-01) no servidor, 'presente' no cliente
+            campo_servidor = None
+        
+        query = escopo_presencas_query(
+            self.db.collection(self.collection_name),
+            aplicar_escopo and campo_servidor is None
+        )
+        if campo_servidor:
+            query = query.where(campo_servidor, '==', filtros[campo_servidor])
+        
+        filtros_cliente = {k: v for k, v in filtros.items() if k in campos_filtro and k != campo_servidor}
+        return query, filtros_cliente, aplicar_escopo
+    
+    @staticmethod
+    def _decodificar_presencas(docs, filtros_cliente: Dict[str, Any],
+                               aplicar_escopo: bool) -> Iterator[Dict[str, Any]]:
+        """Documentos → dicts com 'id', com os filtros que não couberam na query"""
+        for doc in docs:
+            presenca = doc.to_dict()
+            presenca['id'] = doc.id
+            
+            # Filtros adicionais no cliente
+            if any(presenca.get(key) != value for key, value in filtros_cliente.items()):
+                continue
+            
+            # In operational UI, hide legacy (pre-2026) presence records.
+            if aplicar_escopo and not presenca_is_operational(presenca):
+                continue
+            
+            yield presenca
+    
+    @resiliente(prazo=20.0)
     def listar_presencas(self, filtros: Optional[Dict[str, Any]] = None, 
                         limite: int = 1000) -> List[Dict[str, Any]]:
         """
@@ -139,48 +283,13 @@ class PresencasService:
             Lista de presenças
         """
         try:
-            query = self.db.collection(self.collection_name)
-            
-            # Aplicar apenas UM filtro por vez para evitar índices compostos
-            if filtros:
-                if 'alunoId' in filtros:
-                    query = query.where('alunoId', '==', filtros['alunoId'])
-                elif 'ym' in filtros:
-                    query = query.where('ym', '==', filtros['ym'])
-                elif 'data' in filtros:
-                    query = query.where('data', '==', filtros['data'])
-                elif 'presente' in filtros:
-                    query = query.where('presente', '==', filtros['presente'])
+            query, filtros_cliente, aplicar_escopo = self._query_listagem(filtros or {})
+            if query is None:
+                return []
             
             # Limitar resultados
-            query = query.limit(limite)
-            docs = query.stream()
-            
-            presencas = []
-            for doc in docs:
-                presenca = doc.to_dict()
-                presenca['id'] = doc.id
-                
-                # Aplicar filtros adicionais no cliente se necessário
-                incluir = True
-                if filtros:
-                    for key, value in filtros.items():
-                        if key not in ['alunoId', 'ym', 'data', 'presente']:
-                            continue
-                        # Se já foi filtrado na query, pular
-                        if len([k for k in filtros.keys() if k in ['alunoId', 'ym', 'data', 'presente']]) == 1:
-                            continue
-                        # Filtros adicionais no cliente
-                        if presenca.get(key) != value:
-                            incluir = False
-                            break
-                
-                if incluir:
-                    presencas.append(presenca)
-
-            # In operational UI, hide legacy (pre-2026) presence records.
-            if should_apply_operational_scope():
-                presencas = [p for p in presencas if presenca_is_operational(p)]
+            docs = query.limit(limite).stream(timeout=timeout_restante())
+            presencas = list(self._decodificar_presencas(docs, filtros_cliente, aplicar_escopo))
             
             # Ordenar por data (mais recente primeiro)
             presencas.sort(key=lambda x: x.get('data', ''), reverse=True)
@@ -190,6 +299,34 @@ class PresencasService:
         except Exception as e:
             raise Exception(f"Erro ao listar presenças: {str(e)}")
     
+    def iter_presencas(self, filtros: Optional[Dict[str, Any]] = None,
+                       tamanho_lote: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        Percorre presenças sem montar a lista (scripts, exportações)
+        
+        Mesmos filtros de listar_presencas, sem ordenação e sem limite: lidas em
+        lotes e decodificadas sob demanda, em memória constante.
+        
+        Args:
+            filtros: Dicionário com UM filtro por vez (alunoId OU ym OU data)
+            tamanho_lote: Documentos lidos por ida ao Firestore
+        
+        Yields:
+            Presenças
+        """
+        try:
+            query, filtros_cliente, aplicar_escopo = self._query_listagem(filtros or {})
+            if query is None:
+                return
+            
+            yield from self._decodificar_presencas(stream_em_lotes(query, tamanho_lote),
+                                                   filtros_cliente, aplicar_escopo)
+            
+        except Exception as e:
+            raise Exception(f"Erro ao percorrer presenças: {str(e)}")
+    
+    # Sem fallback stale: base das escritas em lote e do estado do dia da fila de check-in
+    @resiliente(servir_stale=False)
     def buscar_presencas_por_data(self, data_presenca: date) -> Dict[str, Dict[str, Any]]:
         """
         Busca todas as presenças de uma data (1 query).
@@ -202,7 +339,7 @@ class PresencasService:
             query = (self.db.collection(self.collection_name)
                      .where('data', '==', data_str)
                      .limit(500))
-            docs = query.stream()
+            docs = query.stream(timeout=timeout_restante())
             resultado = {}
             for doc in docs:
                 p = doc.to_dict()
@@ -227,6 +364,7 @@ class PresencasService:
         
         data_str = data_presenca.strftime('%Y-%m-%d')
         ym = data_presenca.strftime('%Y-%m')
+        FechamentosService(self.db).garantir_mes_aberto(ym)
         
         # Carregar presenças existentes para a data (1 query)
         existentes = self.buscar_presencas_por_data(data_presenca)
@@ -234,6 +372,8 @@ class PresencasService:
         agora = firestore.SERVER_TIMESTAMP
         batch = self.db.batch()
         count = 0
+        escritas = {}
+        anteriores = {}
         
         for reg in registros:
             aluno_id = reg['alunoId']
@@ -245,23 +385,30 @@ class PresencasService:
                 if existente.get('presente') != presente:
                     doc_ref = self.db.collection(self.collection_name).document(existente['id'])
                     batch.update(doc_ref, {'presente': presente, 'updatedAt': agora})
+                    escritas[existente['id']] = {**existente, 'presente': presente, 'updatedAt': agora}
+                    anteriores[existente['id']] = existente
                     count += 1
             else:
                 # Criar novo com doc-id determinístico
                 presenca_id = f"{aluno_id}_{data_str}"
                 doc_ref = self.db.collection(self.collection_name).document(presenca_id)
-                batch.set(doc_ref, {
+                documento = {
                     'alunoId': aluno_id,
                     'data': data_str,
                     'ym': ym,
                     'presente': presente,
                     'createdAt': agora,
                     'updatedAt': agora,
-                })
+                }
+                batch.set(doc_ref, documento)
+                escritas[presenca_id] = documento
+                anteriores[presenca_id] = None
                 count += 1
         
         if count > 0:
             batch.commit()
+            # Só os documentos gravados: relatório do mês e fichas corrigidos no cache
+            self.atualizar_caches(escritas, anteriores)
         
         return count
 
@@ -278,9 +425,11 @@ class PresencasService:
         """
         try:
             ensure_writable("atualizar presença")
+            FechamentosService(self.db).garantir_mes_aberto(self._ym_da_presenca(presenca_id))
 
             # Verificar se presença existe
-            if not self.buscar_presenca(presenca_id):
+            existente = self.buscar_presenca(presenca_id)
+            if not existente:
                 raise ValueError(f"Presença não encontrada: {presenca_id}")
             
             # Preparar dados de atualização
@@ -289,6 +438,8 @@ class PresencasService:
             # Atualizar documento
             doc_ref = self.db.collection(self.collection_name).document(presenca_id)
             doc_ref.update(dados_atualizacao)
+            self.atualizar_caches({presenca_id: aplicar_campos(existente, dados_atualizacao)},
+                                  {presenca_id: existente})
             
             return True
             
@@ -306,8 +457,57 @@ class PresencasService:
         Returns:
             str: ID da presença registrada
         """
+        fila = get_checkin_queue()
+        if fila is not None:
+            return self._enfileirar_presenca(fila, aluno_id, data_presenca or data_de_hoje())
         return self.registrar_presenca(aluno_id, data_presenca, presente=True)
     
+    def _enfileirar_presenca(self, fila, aluno_id: str, data_presenca: date,
+                             anterior: Any = DESCONHECIDO) -> str:
+        """
+        Registra a presença na fila write-behind (sem escrita síncrona no Firestore)
+        
+        O status anterior (para o write-through do relatório do mês) vem de quem
+        chamou, do estado conhecido da fila ou, em último caso, de uma leitura pontual.
+        """
+        ensure_writable("registrar presença")
+
+        if not aluno_id or not aluno_id.strip():
+            raise ValueError("ID do aluno é obrigatório")
+
+        aluno_id = aluno_id.strip()
+        data_str = data_presenca.strftime('%Y-%m-%d')
+        ym = data_presenca.strftime('%Y-%m')
+        FechamentosService(self.db).garantir_mes_aberto(ym)
+
+        if anterior is DESCONHECIDO:
+            anterior = fila.status_conhecido(f"{aluno_id}_{data_str}")
+            if anterior is None and not fila.dia_carregado(data_str):
+                # Data fora do dia carregado na fila (lançamento retroativo): lido
+                # só se há resumo do mês em cache para corrigir
+                if get_cache_manager().tem_relatorio_presencas(ym):
+                    registro = self.buscar_presenca(f"{aluno_id}_{data_str}")
+                    anterior = bool(registro.get('presente', False)) if registro else None
+                else:
+                    anterior = DESCONHECIDO
+
+        return fila.enfileirar(aluno_id, data_str, ym, presente=True, anterior=anterior)
+    
+    def _carregar_dia_na_fila(self, fila, data_presenca: date) -> None:
+        """
+        Semeia o estado conhecido da fila com as presenças do dia (1 query por dia
+        e processo), para o check-in não ler o Firestore a cada aluno
+        """
+        data_str = data_presenca.strftime('%Y-%m-%d')
+        if fila.dia_carregado(data_str):
+            return
+        
+        presencas = self.buscar_presencas_por_data(data_presenca)
+        if len(presencas) >= 500:
+            # Dia maior que a query (limit 500): segue com leituras pontuais
+            return
+        fila.carregar_dia(data_str, {p['id']: bool(p.get('presente', False)) for p in presencas.values()})
+    
     def marcar_falta(self, aluno_id: str, data_presenca: Optional[date] = None) -> str:
         """
         Marca um aluno como ausente em uma data
@@ -341,9 +541,120 @@ class PresencasService:
         except Exception as e:
             raise Exception(f"Erro ao obter presenças do aluno: {str(e)}")
     
+    @staticmethod
+    def montar_relatorio_mensal(ym: str, presencas_mes: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Resumo do relatório do mês a partir das presenças já carregadas
+        
+        Usado por obter_relatorio_mensal e pelo fechamento; o write-through do
+        cache corrige o resumo com aplicar_escrita_relatorio.
+        
+        Args:
+            ym: Mês no formato YYYY-MM
+            presencas_mes: Presenças do mês
+        
+        Returns:
+            Dict com relatório mensal de presenças (sem as listas: ver montar_detalhes)
+        """
+        por_aluno: Dict[str, list] = {}
+        por_dia: Dict[str, Dict[str, int]] = {}
+        for presenca in presencas_mes:
+            PresencasService._acumular(por_aluno, por_dia, presenca, 1)
+        return PresencasService.resumir_totais(ym, por_aluno, por_dia)
+    
+    @staticmethod
+    def _acumular(por_aluno: Dict[str, list], por_dia: Dict[str, Dict[str, int]],
+                  presenca: Dict[str, Any], sinal: int) -> None:
+        """Soma (sinal=1) ou retira (sinal=-1) um registro dos totais por aluno e por dia"""
+        presente = bool(presenca.get('presente', False))
+        aluno = por_aluno.setdefault(presenca.get('alunoId'), [0, 0])
+        aluno[0 if presente else 1] += sinal
+        if aluno == [0, 0]:
+            del por_aluno[presenca.get('alunoId')]
+        
+        data = presenca.get('data', '')
+        dia = por_dia.setdefault(data, {'presentes': 0, 'faltas': 0})
+        dia['presentes' if presente else 'faltas'] += sinal
+        if dia == {'presentes': 0, 'faltas': 0}:
+            del por_dia[data]
+    
+    @staticmethod
+    def resumir_totais(ym: str, por_aluno: Dict[str, list],
+                       por_dia: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
+        """
+        Relatório do mês a partir dos totais por aluno (alunoId → [presenças, faltas])
+        e por dia (data → {'presentes', 'faltas'})
+        
+        Os totais ficam no resumo para o write-through corrigi-lo com os valores
+        antigo e novo de cada registro; o tamanho segue alunos e dias, não registros.
+        """
+        total_presencas = sum(dia['presentes'] for dia in por_dia.values())
+        total_registros = total_presencas + sum(dia['faltas'] for dia in por_dia.values())
+        
+        # Calcular médias
+        total_dias_com_treino = len(por_dia)
+        media_presencas_dia = total_presencas / max(1, total_dias_com_treino)
+        
+        return {
+            'ym': ym,
+            'total_presencas': total_presencas,
+            'total_faltas': total_registros - total_presencas,
+            'total_registros': total_registros,
+            'alunos_ativos': len(por_aluno),
+            'alunos_presentes': sum(1 for presencas, _ in por_aluno.values() if presencas),
+            'alunos_faltosos': sum(1 for _, faltas in por_aluno.values() if faltas),
+            'dias_com_treino': total_dias_com_treino,
+            'media_presencas_dia': round(media_presencas_dia, 1),
+            'taxa_presenca': (total_presencas / max(1, total_registros)) * 100,
+            'presencas_por_dia': por_dia,
+            'por_aluno': por_aluno,
+        }
+    
+    @staticmethod
+    def aplicar_escrita_relatorio(relatorio: Dict[str, Any], presenca_id: str,
+                                  anterior: Optional[Dict[str, Any]],
+                                  documento: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Corrige o resumo do mês com uma escrita (retira o registro antigo, soma o novo)
+        
+        Args:
+            relatorio: Resumo em cache
+            presenca_id: ID alunoId_YYYY-MM-DD
+            anterior: Registro antes da escrita (None = não existia)
+            documento: Registro depois da escrita (None = excluído)
+        
+        Returns:
+            Resumo corrigido, ou None se o formato não tem os totais (recarregar)
+        """
+        if 'por_aluno' not in relatorio:
+            return None  # resumo de uma versão anterior: recarregar
+        aluno_id, data_str = presenca_id.rsplit('_', 1)
+        chave = {'alunoId': aluno_id, 'data': data_str}
+        por_aluno = {aluno: list(totais) for aluno, totais in relatorio['por_aluno'].items()}
+        por_dia = {data: dict(dia) for data, dia in relatorio['presencas_por_dia'].items()}
+        for registro, sinal in ((anterior, -1), (documento, 1)):
+            if registro is not None:
+                PresencasService._acumular(por_aluno, por_dia, {**chave, 'presente': registro.get('presente')}, sinal)
+        return PresencasService.resumir_totais(relatorio['ym'], por_aluno, por_dia)
+    
+    @staticmethod
+    def montar_detalhes(ym: str, presencas_mes: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Registros do mês separados em presenças e faltas (carregados só quando a tela expande)
+        
+        Returns:
+            Dict com 'ym', 'presentes' e 'faltas'
+        """
+        return {
+            'ym': ym,
+            'presentes': [p for p in presencas_mes if p.get('presente', False)],
+            'faltas': [p for p in presencas_mes if not p.get('presente', False)],
+        }
+    
+    @resiliente(prazo=20.0)
     def obter_relatorio_mensal(self, ym: str) -> Dict[str, Any]:
         """
-        Obtém relatório de presenças de um mês
+        Obtém relatório de presenças de um mês (resumo, sem os registros)
         
         Args:
             ym: Mês no formato YYYY-MM
@@ -352,54 +663,41 @@ class PresencasService:
             Dict com relatório mensal de presenças
         """
         try:
-            presencas_mes = self.listar_presencas(filtros={'ym': ym})
+            # Mês fechado: relatório final gravado no fechamento
+            fechamento = FechamentosService(self.db).obter_fechamento(ym)
+            if fechamento is not None and (ym_is_operational(ym) or not should_apply_operational_scope()):
+                return fechamento['presencas']
             
-            # Separar presenças e faltas
-            presentes = [p for p in presencas_mes if p.get('presente', False)]
-            faltas = [p for p in presencas_mes if not p.get('presente', True)]
-            
-            # Contar alunos únicos
-            alunos_presentes = set(p.get('alunoId') for p in presentes)
-            alunos_faltosos = set(p.get('alunoId') for p in faltas)
-            todos_alunos = alunos_presentes.union(alunos_faltosos)
-            
-            # Estatísticas por dia
-            presencas_por_dia = {}
-            for presenca in presencas_mes:
-                data = presenca.get('data', '')
-                if data not in presencas_por_dia:
-                    presencas_por_dia[data] = {'presentes': 0, 'faltas': 0}
-                
-                if presenca.get('presente', False):
-                    presencas_por_dia[data]['presentes'] += 1
-                else:
-                    presencas_por_dia[data]['faltas'] += 1
+            presencas_mes = self.listar_presencas(filtros={'ym': ym})
+            return self.montar_relatorio_mensal(ym, presencas_mes)
             
-            # Calcular médias
-            total_dias_com_treino = len(presencas_por_dia)
-            media_presencas_dia = len(presentes) / max(1, total_dias_com_treino)
+        except Exception as e:
+            raise Exception(f"Erro ao obter relatório mensal: {str(e)}")
+    
+    @resiliente(prazo=20.0)
+    def obter_detalhes_mes(self, ym: str) -> Dict[str, Any]:
+        """
+        Obtém os registros de presença de um mês
+        
+        Args:
+            ym: Mês no formato YYYY-MM
+        
+        Returns:
+            Dict com 'ym', 'presentes' e 'faltas'
+        """
+        try:
+            # Mês fechado não muda: leitura completa em lotes, cacheada com TTL_FECHADO
+            if FechamentosService(self.db).mes_fechado(ym):
+                presencas_mes = list(self.iter_presencas(filtros={'ym': ym}))
+                return {**self.montar_detalhes(ym, presencas_mes), 'fechado': True}
             
-            return {
-                'ym': ym,
-                'total_presencas': len(presentes),
-                'total_faltas': len(faltas),
-                'total_registros': len(presencas_mes),
-                'alunos_ativos': len(todos_alunos),
-                'alunos_presentes': len(alunos_presentes),
-                'alunos_faltosos': len(alunos_faltosos),
-                'dias_com_treino': total_dias_com_treino,
-                'media_presencas_dia': round(media_presencas_dia, 1),
-                'taxa_presenca': (len(presentes) / max(1, len(presencas_mes))) * 100,
-                'presencas_por_dia': presencas_por_dia,
-                'detalhes': {
-                    'presentes': presentes,
-                    'faltas': faltas
-                }
-            }
+            presencas_mes = self.listar_presencas(filtros={'ym': ym})
+            return self.montar_detalhes(ym, presencas_mes)
             
         except Exception as e:
-            raise Exception(f"Erro ao obter relatório mensal: {str(e)}")
+            raise Exception(f"Erro ao obter detalhes das presenças: {str(e)}")
     
+    @resiliente()
     def obter_frequencia_aluno(self, aluno_id: str, ym: str) -> Dict[str, Any]:
         """
         Obtém frequência específica de um aluno em um mês
@@ -450,7 +748,40 @@ class PresencasService:
             Dict com resultado do check-in
         """
         try:
-            hoje = date.today()
+            hoje = data_de_hoje()
+            
+            # Com a fila write-behind, a checagem usa o estado do dia que este
+            # processo já conhece (carregado do Firestore no primeiro check-in
+            # do dia); leitura pontual só se o dia não pôde ser carregado
+            fila = get_checkin_queue()
+            if fila is not None:
+                presenca_id = f"{aluno_id.strip()}_{hoje.strftime('%Y-%m-%d')}"
+                self._carregar_dia_na_fila(fila, hoje)
+                status_conhecido = fila.status_conhecido(presenca_id)
+                if status_conhecido is None and not fila.dia_carregado(hoje.strftime('%Y-%m-%d')):
+                    presenca_hoje = self.buscar_presenca_por_aluno_data(aluno_id.strip(), hoje)
+                    if presenca_hoje:
+                        presenca_id = presenca_hoje['id']
+                        status_conhecido = bool(presenca_hoje.get('presente', False))
+                        fila.lembrar(presenca_id, status_conhecido)
+                if status_conhecido is not None:
+                    status_atual = "presente" if status_conhecido else "ausente"
+                    return {
+                        'sucesso': False,
+                        'mensagem': f"Aluno já registrado como {status_atual} hoje",
+                        'presenca_id': presenca_id,
+                        'status_atual': status_atual,
+                        'data': hoje.strftime('%Y-%m-%d')
+                    }
+                # Sem registro hoje (conferido acima): nada a retirar do relatório
+                presenca_id = self._enfileirar_presenca(fila, aluno_id, hoje, anterior=None)
+                return {
+                    'sucesso': True,
+                    'mensagem': "Check-in realizado com sucesso!",
+                    'presenca_id': presenca_id,
+                    'status_atual': "presente",
+                    'data': hoje.strftime('%Y-%m-%d')
+                }
             
             # Verificar se já fez check-in hoje
             presenca_hoje = self.buscar_presenca_por_aluno_data(aluno_id, hoje)
@@ -491,14 +822,17 @@ class PresencasService:
         """
         try:
             ensure_writable("deletar presença")
+            FechamentosService(self.db).garantir_mes_aberto(self._ym_da_presenca(presenca_id))
 
             # Verificar se existe
-            if not self.buscar_presenca(presenca_id):
+            existente = self.buscar_presenca(presenca_id)
+            if not existente:
                 raise ValueError(f"Presença não encontrada: {presenca_id}")
             
             # Deletar documento
             doc_ref = self.db.collection(self.collection_name).document(presenca_id)
             doc_ref.delete()
+            self.atualizar_caches({presenca_id: None}, {presenca_id: existente})
             
             return True
             
@@ -0,0 +1,40 @@
+"""
+Registro de serviços do processo
+Os serviços não guardam estado de usuário (só o cliente Firestore e nomes de
+collection), então uma instância por classe atende todas as sessões do
+Streamlit — no mesmo espírito do st.cache_resource. O st.session_state fica
+só com estado de UI.
+"""
+
+import threading
+from typing import Any, Dict, Type, TypeVar
+
+T = TypeVar('T')
+
+_instancias: Dict[type, Any] = {}
+_lock = threading.Lock()
+
+
+def get_service(classe: Type[T]) -> T:
+    """
+    Obtém a instância compartilhada do serviço (criada no primeiro uso)
+
+    Args:
+        classe: Classe do serviço (ex.: AlunosService)
+
+    Returns:
+        Instância única da classe no processo
+    """
+    instancia = _instancias.get(classe)
+    if instancia is None:
+        with _lock:
+            instancia = _instancias.get(classe)
+            if instancia is None:
+                instancia = _instancias[classe] = classe()
+    return instancia
+
+
+def reset_services() -> None:
+    """Descarta as instâncias (testes e troca de credenciais)"""
+    with _lock:
+        _instancias.clear()
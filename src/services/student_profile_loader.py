@@ -0,0 +1,81 @@
+"""
+StudentProfileLoader - Carregamento agregado da ficha 360° do aluno
+Busca aluno, pagamentos, graduações e presenças em paralelo e mantém o
+perfil em cache sob a tag "aluno:{alunoId}:{partição}"
+"""
+
+from functools import partial
+from typing import Dict, Any, Optional
+from src.services.alunos_service import AlunosService
+from src.services.graduacoes_service import GraduacoesService
+from src.services.pagamentos_service import PagamentosService
+from src.services.presencas_service import PresencasService
+from src.services.registry import get_service
+from src.utils.cache_service import get_cache_service, tag_aluno
+from src.utils.concurrent_loader import carregar_em_paralelo
+from src.utils.operational_scope import cache_partition
+from src.utils.resilience import is_stale
+
+class StudentProfileLoader:
+    """Carrega a ficha 360° de um aluno em uma única chamada"""
+
+    CACHE_PREFIX = 'aluno_perfil'
+    CACHE_TTL = 120
+    LIMITE_DIAS_PRESENCAS = PresencasService.LIMITE_PRESENCAS_FICHA
+
+    def __init__(self, alunos_service: Optional[AlunosService] = None,
+                 pagamentos_service: Optional[PagamentosService] = None,
+                 graduacoes_service: Optional[GraduacoesService] = None,
+                 presencas_service: Optional[PresencasService] = None):
+        """Inicializa o loader (serviços não informados vêm do registry do processo)"""
+        self.alunos_service = alunos_service or get_service(AlunosService)
+        self.pagamentos_service = pagamentos_service or get_service(PagamentosService)
+        self.graduacoes_service = graduacoes_service or get_service(GraduacoesService)
+        self.presencas_service = presencas_service or get_service(PresencasService)
+        self.cache = get_cache_service()
+
+    def carregar(self, aluno_id: str, force_refresh: bool = False) -> Dict[str, Any]:
+        """
+        Carrega o perfil completo do aluno
+
+        Args:
+            aluno_id: ID do aluno
+            force_refresh: Ignora o cache e busca tudo novamente
+
+        Returns:
+            Dict com 'aluno', 'pagamentos', 'graduacoes', 'presencas', 'erros'
+            (mapa seção → mensagem para as seções que falharam) e 'stale'
+            (seções servidas do último valor bom). 'aluno' é None se o aluno
+            não existe.
+        """
+        # O escopo (operacional/histórico) muda o que pagamentos e presenças retornam
+        particao = cache_partition()
+        cache_key = self.cache._generate_key(self.CACHE_PREFIX, aluno_id=aluno_id, particao=particao)
+
+        if not force_refresh:
+            perfil = self.cache.get(cache_key)
+            if perfil is not None:
+                return perfil
+
+        resultados = carregar_em_paralelo({
+            'aluno': partial(self.alunos_service.buscar_aluno, aluno_id),
+            'pagamentos': partial(self.pagamentos_service.listar_pagamentos_por_aluno, aluno_id),
+            'graduacoes': partial(self.graduacoes_service.listar_graduacoes_aluno, aluno_id),
+            'presencas': partial(self.presencas_service.obter_presencas_aluno, aluno_id,
+                                 limite_dias=self.LIMITE_DIAS_PRESENCAS),
+        })
+
+        perfil = {
+            'aluno': resultados['aluno'].valor_ou(None),
+            'pagamentos': resultados['pagamentos'].valor_ou([]),
+            'graduacoes': resultados['graduacoes'].valor_ou([]),
+            'presencas': resultados['presencas'].valor_ou([]),
+            'erros': {nome: str(r.erro) for nome, r in resultados.items() if not r.ok},
+            'stale': [nome for nome, r in resultados.items() if r.ok and is_stale(r.valor)],
+        }
+
+        # Só guardar perfis completos e atuais: falha parcial não deve ficar em cache
+        if perfil['aluno'] and not perfil['erros'] and not perfil['stale']:
+            self.cache.set(cache_key, perfil, ttl=self.CACHE_TTL, tags=[tag_aluno(aluno_id, particao)])
+
+        return perfil
@@ -3,20 +3,22 @@ Serviço de gerenciamento de Turmas com CRUD completo
 Gerencia turmas de treino com horários
 """
 
-from typing import List, Dict, Any, Optional
+from typing import Iterator, List, Dict, Any, Optional
 from datetime import datetime
 import streamlit as st
 from google.cloud.firestore_v1 import SERVER_TIMESTAMP
-from src.utils.firebase_config import FirebaseConfig
+from src.utils.firebase_config import get_firestore_client, stream_em_lotes
 from src.utils.readonly_guard import ensure_writable
+from src.utils.metrics import instrumentar_servico
+from src.utils.resilience import resiliente, timeout_restante
 
+@instrumentar_servico
 class TurmasService:
     """Serviço para operações CRUD de Turmas"""
     
     def __init__(self):
         """Inicializa o serviço com conexão Firestore"""
-        self.firebase_config = FirebaseConfig()
-        self.db = self.firebase_config.db
+        self.db = get_firestore_client()
         self.collection = self.db.collection('turmas')
     
     def criar_turma(self, dados_turma: Dict[str, Any]) -> str:
@@ -84,6 +86,7 @@ class TurmasService:
         except Exception as e:
             raise Exception(f"Erro ao criar turma: {str(e)}")
     
+    @resiliente()
     def listar_turmas(self, apenas_ativas: bool = True) -> List[Dict[str, Any]]:
         """
         Lista todas as turmas
@@ -97,16 +100,8 @@ class TurmasService:
         try:
             # Buscar todas as turmas e filtrar/ordenar em memória
             # para evitar necessidade de índice composto no Firestore
-            turmas = []
-            for doc in self.collection.stream():
-                turma_data = doc.to_dict()
-                turma_data['id'] = doc.id
-                
-                # Filtrar turmas ativas se necessário
-                if apenas_ativas and not turma_data.get('ativo', True):
-                    continue
-                    
-                turmas.append(turma_data)
+            docs = self.collection.stream(timeout=timeout_restante())
+            turmas = list(self._decodificar_turmas(docs, apenas_ativas))
             
             # Ordenar por nome em memória
             turmas.sort(key=lambda x: x.get('nome', ''))
@@ -116,6 +111,39 @@ class TurmasService:
         except Exception as e:
             raise Exception(f"Erro ao listar turmas: {str(e)}")
     
+    @staticmethod
+    def _decodificar_turmas(docs, apenas_ativas: bool) -> Iterator[Dict[str, Any]]:
+        """Documentos → dicts com 'id', filtrando inativas se necessário"""
+        for doc in docs:
+            turma_data = doc.to_dict()
+            turma_data['id'] = doc.id
+            
+            # Filtrar turmas ativas se necessário
+            if apenas_ativas and not turma_data.get('ativo', True):
+                continue
+            
+            yield turma_data
+    
+    def iter_turmas(self, apenas_ativas: bool = True,
+                    tamanho_lote: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        Percorre as turmas sem montar a lista, em lotes e sem ordenação
+        
+        Args:
+            apenas_ativas: Se True, retorna apenas turmas ativas
+            tamanho_lote: Documentos lidos por ida ao Firestore
+            
+        Yields:
+            Dict com dados da turma e ID
+        """
+        try:
+            yield from self._decodificar_turmas(stream_em_lotes(self.collection, tamanho_lote),
+                                                apenas_ativas)
+            
+        except Exception as e:
+            raise Exception(f"Erro ao percorrer turmas: {str(e)}")
+    
+    @resiliente()
     def buscar_turma(self, turma_id: str) -> Optional[Dict[str, Any]]:
         """
         Busca uma turma específica por ID
@@ -127,7 +155,7 @@ class TurmasService:
             Dict com dados da turma ou None se não encontrada
         """
         try:
-            doc = self.collection.document(turma_id).get()
+            doc = self.collection.document(turma_id).get(timeout=timeout_restante())
             
             if doc.exists:
                 turma_data = doc.to_dict()
@@ -11,8 +11,6 @@ import hashlib
 import time
 from pathlib import Path
 
-from utils.ui import render_brand_header
-
 # Importar CookieManager para persistência
 try:
     from extra_streamlit_components import CookieManager
@@ -334,6 +332,7 @@ class AuthManager:
 
         with col2:
             # Branding: usar pranch.png (mais “hero”) no login
+            from utils.ui import render_brand_header
             root_dir = Path(__file__).resolve().parents[2]
             pranch_path = root_dir / "pranch.png"
 
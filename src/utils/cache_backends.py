@@ -0,0 +1,281 @@
+"""
+Backends de cache compartilhado (L2)
+O CacheService continua sendo o L1 em memória de cada processo. Com um
+backend configurado, as entradas também vão para o L2 compartilhado entre
+réplicas/workers e toda invalidação é publicada num canal pub/sub: cada
+processo assina o canal e descarta as cópias do próprio L1.
+
+Configuração (get_cache_service):
+- DOJO_REDIS_URL (ou REDIS_URL, definida pelo plugin Redis do Railway)
+- DOJO_CACHE_BACKEND=local desliga o L2 mesmo com a URL definida
+- DOJO_CACHE_NAMESPACE (default 'dojo') separa ambientes no mesmo Redis
+
+Os valores são serializados com pickle: o Redis deve ser privado da aplicação.
+"""
+
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger('DojojApp')
+
+TIMEOUT_REDIS = 0.25  # segundos: o L2 nunca deve segurar um render
+INTERVALO_RECONEXAO = 5.0
+
+Mensagem = Dict[str, Any]
+
+
+class CacheBackend:
+    """
+    Interface do L2: valores com TTL, índice de tags e canal de invalidação
+
+    Mensagens do canal: {'origem', 'op': 'delete', 'keys': [...], 'tag'?}
+    ou {'origem', 'op': 'clear'}.
+    """
+
+    def get(self, key: str) -> Optional[Tuple[Any, Optional[float]]]:
+        """(valor, segundos restantes) ou None se não existe"""
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: float, tags: Iterable[str] = ()) -> None:
+        raise NotImplementedError
+
+    def delete(self, keys: Iterable[str]) -> None:
+        raise NotImplementedError
+
+    def invalidate_tag(self, tag: str) -> List[str]:
+        """Remove as entradas da tag e retorna as chaves removidas"""
+        raise NotImplementedError
+
+    def tag_keys(self, tag: str) -> List[str]:
+        """Chaves marcadas com a tag (sem remover)"""
+        raise NotImplementedError
+
+    def keys(self) -> List[str]:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def publicar(self, mensagem: Mensagem) -> None:
+        raise NotImplementedError
+
+    def assinar(self, callback: Callable[[Mensagem], None]) -> None:
+        """Entrega as mensagens do canal ao callback (em outra thread, se preciso)"""
+        raise NotImplementedError
+
+    def fechar(self) -> None:
+        pass
+
+
+class MemoriaCacheBackend(CacheBackend):
+    """
+    L2 em memória compartilhado por CacheServices do mesmo processo
+
+    Implementação de referência da interface (testes e desenvolvimento):
+    serializa como o Redis e entrega as mensagens de forma síncrona.
+    """
+
+    def __init__(self):
+        self._dados: Dict[str, Tuple[bytes, float]] = {}
+        self._tags: Dict[str, set] = {}
+        self._assinantes: List[Callable[[Mensagem], None]] = []
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._dados.get(key)
+        if item is None or item[1] <= time.time():
+            return None
+        return pickle.loads(item[0]), item[1] - time.time()
+
+    def set(self, key, value, ttl, tags=()):
+        dados = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._dados[key] = (dados, time.time() + ttl)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+    def delete(self, keys):
+        with self._lock:
+            for key in keys:
+                self._dados.pop(key, None)
+
+    def invalidate_tag(self, tag):
+        with self._lock:
+            keys = list(self._tags.pop(tag, ()))
+            for key in keys:
+                self._dados.pop(key, None)
+        return keys
+
+    def tag_keys(self, tag):
+        with self._lock:
+            return list(self._tags.get(tag, ()))
+
+    def keys(self):
+        agora = time.time()
+        with self._lock:
+            return [key for key, (_, expira) in self._dados.items() if expira > agora]
+
+    def clear(self):
+        with self._lock:
+            self._dados.clear()
+            self._tags.clear()
+
+    def publicar(self, mensagem):
+        for callback in list(self._assinantes):
+            callback(json.loads(json.dumps(mensagem)))
+
+    def assinar(self, callback):
+        self._assinantes.append(callback)
+
+
+class RedisCacheBackend(CacheBackend):
+    """L2 no Redis (ou qualquer servidor do protocolo: KeyDB, Valkey, fakeredis)"""
+
+    def __init__(self, url: Optional[str] = None, namespace: str = 'dojo', cliente: Any = None):
+        """
+        Args:
+            url: redis://[:senha@]host:porta/db (ignorada se cliente for informado)
+            namespace: Prefixo de todas as chaves e do canal
+            cliente: Cliente redis-py já criado (ex.: fakeredis nos testes)
+        """
+        if cliente is None:
+            if not REDIS_AVAILABLE:
+                raise Exception("Erro ao iniciar cache Redis: pacote 'redis' não instalado")
+            cliente = redis.Redis.from_url(url, socket_timeout=TIMEOUT_REDIS,
+                                           socket_connect_timeout=TIMEOUT_REDIS)
+        self.cliente = cliente
+        self.prefixo = f"{namespace}:cache:"
+        self.prefixo_tag = f"{namespace}:tag:"
+        self.canal = f"{namespace}:cache:invalidacoes"
+        self._parar = threading.Event()
+
+    def get(self, key):
+        pipe = self.cliente.pipeline(transaction=False)
+        pipe.get(self.prefixo + key)
+        pipe.pttl(self.prefixo + key)
+        dados, pttl = pipe.execute()
+        if dados is None:
+            return None
+        return pickle.loads(dados), (pttl / 1000 if pttl and pttl > 0 else None)
+
+    def set(self, key, value, ttl, tags=()):
+        pipe = self.cliente.pipeline(transaction=False)
+        pipe.set(self.prefixo + key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), px=max(int(ttl * 1000), 1))
+        tags = list(tags)
+        for tag in tags:
+            pipe.sadd(self.prefixo_tag + tag, key)
+            pipe.ttl(self.prefixo_tag + tag)
+        resultados = pipe.execute()
+        # O índice da tag vive tanto quanto a entrada mais longa dela
+        # (TTL -1 = sem expiração: índice recém-criado)
+        for tag, atual in zip(tags, resultados[2::2]):
+            if atual == -1 or atual < ttl:
+                self.cliente.expire(self.prefixo_tag + tag, max(int(ttl + 0.999), 1))
+
+    def delete(self, keys):
+        chaves = [self.prefixo + key for key in keys]
+        if chaves:
+            self.cliente.delete(*chaves)
+
+    def invalidate_tag(self, tag):
+        chave_tag = self.prefixo_tag + tag
+        pipe = self.cliente.pipeline(transaction=True)
+        pipe.smembers(chave_tag)
+        pipe.delete(chave_tag)
+        membros, _ = pipe.execute()
+        keys = [m.decode() if isinstance(m, bytes) else m for m in membros]
+        self.delete(keys)
+        return keys
+
+    def tag_keys(self, tag):
+        return [m.decode() if isinstance(m, bytes) else m
+                for m in self.cliente.smembers(self.prefixo_tag + tag)]
+
+    def keys(self):
+        inicio = len(self.prefixo)
+        return [(k.decode() if isinstance(k, bytes) else k)[inicio:]
+                for k in self.cliente.scan_iter(match=self.prefixo + '*', count=500)]
+
+    def clear(self):
+        for padrao in (self.prefixo + '*', self.prefixo_tag + '*'):
+            lote = []
+            for chave in self.cliente.scan_iter(match=padrao, count=500):
+                lote.append(chave)
+                if len(lote) >= 500:
+                    self.cliente.delete(*lote)
+                    lote = []
+            if lote:
+                self.cliente.delete(*lote)
+
+    def publicar(self, mensagem):
+        self.cliente.publish(self.canal, json.dumps(mensagem))
+
+    def assinar(self, callback):
+        threading.Thread(target=self._escutar, args=(callback,),
+                         name='dojo-cache-pubsub', daemon=True).start()
+
+    def _escutar(self, callback: Callable[[Mensagem], None]) -> None:
+        """Loop do assinante; reconecta sozinho e limpa o L1 após uma queda"""
+        perdeu_conexao = False
+        while not self._parar.is_set():
+            pubsub = None
+            try:
+                pubsub = self.cliente.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.canal)
+                if perdeu_conexao:
+                    # Invalidações publicadas durante a queda se perderam
+                    callback({'op': 'clear', 'origem': 'reconexao'})
+                    perdeu_conexao = False
+                while not self._parar.is_set():
+                    mensagem = pubsub.get_message(timeout=1.0)
+                    if mensagem and mensagem.get('type') == 'message':
+                        callback(json.loads(mensagem['data']))
+            except Exception as e:
+                if not perdeu_conexao:
+                    logger.warning(f"⚠️ Canal de invalidação do cache indisponível: {e}")
+                perdeu_conexao = True
+                self._parar.wait(INTERVALO_RECONEXAO)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+    def fechar(self):
+        self._parar.set()
+
+
+def criar_backend_cache() -> Optional[CacheBackend]:
+    """
+    Backend L2 conforme o ambiente (None = só L1 em memória)
+
+    Falhas ao criar o backend não impedem o app de subir: o cache segue local.
+    """
+    url = os.getenv('DOJO_REDIS_URL') or os.getenv('REDIS_URL')
+    if not url or os.getenv('DOJO_CACHE_BACKEND', 'redis').lower() != 'redis':
+        return None
+    try:
+        backend = RedisCacheBackend(url, namespace=os.getenv('DOJO_CACHE_NAMESPACE', 'dojo'))
+    except Exception as e:
+        logger.warning(f"⚠️ Cache L2 (Redis) não configurado, usando só o cache local: {e}")
+        return None
+    try:
+        backend.cliente.ping()
+        logger.info("🗄️ Cache L2 compartilhado no Redis ativo")
+    except Exception as e:
+        # Mantém o backend: o circuit breaker do CacheService volta a usá-lo quando o Redis responder
+        logger.warning(f"⚠️ Redis ainda não responde, cache local até reconectar: {e}")
+    return backend
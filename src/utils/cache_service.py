@@ -1,26 +1,113 @@
 """
 CacheService - Sistema de cache simples para otimizar performance
 TTL de 60 segundos para leituras principais
+
+Com um backend compartilhado (cache_backends, ex.: Redis) o dict em memória
+vira o L1 de cada processo e as invalidações chegam às outras réplicas.
 """
 
+import logging
+from functools import partial
+import threading
 import time
-from typing import Any, Dict, Optional, Callable
-from datetime import datetime, timedelta
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Callable, Set
+from datetime import datetime, timedelta, timezone
 import json
 import hashlib
+from google.cloud.firestore_v1 import DELETE_FIELD, SERVER_TIMESTAMP
+from src.utils.operational_scope import (
+    CACHE_PARTITIONS, aluno_is_operational, cache_partition, partitions_with_ym, should_apply_operational_scope,
+    ym_is_operational
+)
+from src.models.aluno import Aluno
+from src.utils.cache_backends import CacheBackend, criar_backend_cache
+from src.utils.metrics import registrar_cache
+from src.utils.resilience import CircuitBreaker
+
+logger = logging.getLogger('DojojApp')
 
 class CacheService:
     """Serviço de cache em memória com TTL"""
     
-    def __init__(self, default_ttl: int = 60):
+    def __init__(self, default_ttl: int = 60, backend: Optional[CacheBackend] = None):
         """
         Inicializa o cache
         
         Args:
             default_ttl: TTL padrão em segundos (default: 60)
+            backend: L2 compartilhado entre processos (None = só memória)
         """
         self.cache: Dict[str, Dict[str, Any]] = {}
         self.default_ttl = default_ttl
+        # Índice tag → chaves (ex.: "aluno:{id}" → perfis daquele aluno)
+        self.tags: Dict[str, Set[str]] = {}
+        
+        self.backend = backend
+        self._origem = uuid.uuid4().hex  # ignora as próprias mensagens no canal
+        self._circuito = CircuitBreaker('cache_l2', limite_falhas=3)
+        self._ouvintes: List[Callable[[Dict[str, Any]], None]] = []
+        # update() é ler-alterar-gravar: sessões concorrentes não podem perder patches
+        self._lock_update = threading.RLock()
+        if backend is not None:
+            backend.assinar(self._aplicar_invalidacao_remota)
+    
+    # ------------------------------------------------------------------
+    # L2 compartilhado
+    # ------------------------------------------------------------------
+    def _l2(self, operacao: str, *args) -> Any:
+        """
+        Chama o backend L2; falhas degradam para só L1 (circuit breaker)
+        
+        Returns:
+            Resultado da operação ou None (sem backend, circuito aberto ou erro)
+        """
+        if self.backend is None or not self._circuito.permite_chamada():
+            return None
+        try:
+            resultado = getattr(self.backend, operacao)(*args)
+        except Exception as e:
+            self._circuito.registrar_falha()
+            logger.warning(f"⚠️ Cache L2 indisponível ({operacao}): {e}")
+            return None
+        self._circuito.registrar_sucesso()
+        return resultado
+    
+    def _publicar(self, op: str, keys: Iterable[str] = (), tag: Optional[str] = None) -> None:
+        """Avisa as outras réplicas para descartar as cópias do L1"""
+        if self.backend is None:
+            return
+        mensagem: Dict[str, Any] = {'origem': self._origem, 'op': op, 'keys': list(keys)}
+        if tag is not None:
+            mensagem['tag'] = tag
+        self._l2('publicar', mensagem)
+    
+    def _aplicar_invalidacao_remota(self, mensagem: Dict[str, Any]) -> None:
+        """Mensagem do canal: remove do L1 local (sem republicar)"""
+        if mensagem.get('origem') == self._origem:
+            return
+        if mensagem.get('op') == 'clear':
+            self.cache.clear()
+            self.tags.clear()
+        else:
+            for key in mensagem.get('keys', []):
+                self.cache.pop(key, None)
+            if mensagem.get('tag'):
+                self.tags.pop(mensagem['tag'], None)
+        for ouvinte in list(self._ouvintes):
+            try:
+                ouvinte(mensagem)
+            except Exception as e:
+                logger.warning(f"⚠️ Erro ao aplicar invalidação remota: {e}")
+    
+    def on_remote_invalidation(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        Registra um callback para invalidações vindas de outras réplicas
+        
+        Args:
+            callback: Recebe a mensagem ({'op', 'keys', 'tag'?})
+        """
+        self._ouvintes.append(callback)
     
     def _generate_key(self, prefix: str, **kwargs) -> str:
         """
@@ -60,21 +147,31 @@ class CacheService:
         Returns:
             Valor armazenado ou None se não existe/expirou
         """
-        if key not in self.cache:
-            return None
-        
-        entry = self.cache[key]
-        
-        if self._is_expired(entry):
-            # Remove entrada expirada
-            del self.cache[key]
-            return None
+        nome = key.split(':', 1)[0]
+        entry = self.cache.get(key)
+        if entry is not None and self._is_expired(entry):
+            # Remove entrada expirada (pop: outra thread pode ter removido antes)
+            self.cache.pop(key, None)
+            entry = None
+        
+        if entry is None:
+            # L1 vazio: tentar o L2 (outra réplica pode já ter carregado)
+            remoto = self._l2('get', key)
+            if remoto is None:
+                registrar_cache(nome, acerto=False)
+                return None
+            value, restante = remoto
+            self._set_local(key, value, restante if restante is not None else self.default_ttl)
+            registrar_cache(nome, acerto=True)
+            return value
         
         # Atualizar último acesso
         entry['last_accessed'] = time.time()
+        registrar_cache(nome, acerto=True)
         return entry['value']
     
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+    def set(self, key: str, value: Any, ttl: Optional[int] = None,
+            tags: Optional[Iterable[str]] = None) -> None:
         """
         Armazena valor no cache
         
@@ -82,10 +179,20 @@ class CacheService:
             key: Chave do cache
             value: Valor a armazenar
             ttl: TTL em segundos (usa default se None)
+            tags: Tags para invalidação em grupo (ver invalidate_tag)
         """
         if ttl is None:
             ttl = self.default_ttl
+        tags = list(tags or ())
         
+        self._set_local(key, value, ttl, tags)
+        if self.backend is not None:
+            self._l2('set', key, value, ttl, tags)
+            # Réplicas com uma cópia antiga da chave passam a ler a nova do L2
+            self._publicar('delete', [key])
+    
+    def _set_local(self, key: str, value: Any, ttl: float, tags: Iterable[str] = ()) -> None:
+        """Grava só no L1 deste processo"""
         now = time.time()
         
         self.cache[key] = {
@@ -95,6 +202,9 @@ class CacheService:
             'expires_at': now + ttl,
             'ttl': ttl
         }
+        
+        for tag in tags:
+            self.tags.setdefault(tag, set()).add(key)
     
     def delete(self, key: str) -> bool:
         """
@@ -104,16 +214,101 @@ class CacheService:
             key: Chave a remover
         
         Returns:
-            bool: True se removeu, False se não existia
+            bool: True se removeu, False se não existia (no L1 deste processo)
+        """
+        removed = self.cache.pop(key, None) is not None
+        if self.backend is not None:
+            self._l2('delete', [key])
+            self._publicar('delete', [key])
+        return removed
+    
+    def invalidate_tag(self, tag: str) -> int:
         """
-        if key in self.cache:
-            del self.cache[key]
+        Remove todas as entradas marcadas com a tag
+        
+        Args:
+            tag: Tag informada em set()
+        
+        Returns:
+            int: Número de entradas removidas
+        """
+        keys = self.tags.pop(tag, set())
+        removed = sum(1 for key in keys if self.cache.pop(key, None) is not None)
+        if self.backend is not None:
+            remote_keys = self._l2('invalidate_tag', tag) or []
+            for key in remote_keys:
+                self.cache.pop(key, None)
+            self._publicar('delete', keys | set(remote_keys), tag=tag)
+            removed = max(removed, len(remote_keys))
+        return removed
+    
+    def update(self, key: str, funcao: Callable[[Any], Any], tags: Optional[Iterable[str]] = None) -> bool:
+        """
+        Write-through: aplica funcao ao valor em cache e regrava no lugar
+        
+        A entrada mantém o TTL restante e as tags; com L2, o valor novo vai
+        para o backend e as outras réplicas descartam a cópia antiga.
+        
+        Args:
+            key: Chave do cache
+            funcao: Recebe o valor atual e retorna o novo, sem alterar o
+                atual (outras sessões podem estar lendo). None descarta a
+                entrada: a próxima leitura recarrega da fonte
+            tags: Tags adicionais da entrada (além das conhecidas no L1)
+        
+        Returns:
+            bool: True se havia valor em cache e ele foi atualizado
+        """
+        with self._lock_update:
+            entry = self.cache.get(key)
+            if entry is not None and not self._is_expired(entry):
+                valor, restante = entry['value'], entry['expires_at'] - time.time()
+            else:
+                remoto = self._l2('get', key)
+                if remoto is None:
+                    return False
+                valor, restante = remoto
+                restante = restante if restante is not None else self.default_ttl
+            
+            try:
+                novo = funcao(valor)
+            except Exception as e:
+                logger.warning(f"⚠️ Erro ao atualizar cache '{key}', descartando entrada: {e}")
+                novo = None
+            if novo is None:
+                self.delete(key)
+                return False
+            
+            tags_entrada = set(tags or ()) | {tag for tag, keys in self.tags.items() if key in keys}
+            self.set(key, novo, max(restante, 1), tags_entrada)
             return True
-        return False
+    
+    def update_tag(self, tag: str, funcao: Callable[[Any], Any]) -> int:
+        """
+        Write-through em todas as entradas marcadas com a tag (ver update)
+        
+        Returns:
+            int: Número de entradas atualizadas
+        """
+        keys = set(self.tags.get(tag, ()))
+        if self.backend is not None:
+            keys |= set(self._l2('tag_keys', tag) or [])
+        return sum(1 for key in keys if self.update(key, funcao, tags=[tag]))
+    
+    def keys(self) -> List[str]:
+        """Chaves do L1 e do L2 (para invalidações por padrão)"""
+        local = list(self.cache.keys())
+        if self.backend is None:
+            return local
+        return list(set(local) | set(self._l2('keys') or []))
     
     def clear(self) -> None:
-        """Remove todas as entradas do cache"""
+        """Remove todas as entradas do cache (em todas as réplicas, com L2)"""
         self.cache.clear()
+        self.tags.clear()
+        if self.backend is not None:
+            self._l2('clear')
+            self._publicar('clear')
     
     def cleanup_expired(self) -> int:
         """
@@ -124,12 +319,12 @@ class CacheService:
         """
         expired_keys = []
         
-        for key, entry in self.cache.items():
+        for key, entry in list(self.cache.items()):
             if self._is_expired(entry):
                 expired_keys.append(key)
         
         for key in expired_keys:
-            del self.cache[key]
+            self.cache.pop(key, None)
         
         return len(expired_keys)
     
@@ -144,7 +339,7 @@ class CacheService:
         total_entries = len(self.cache)
         expired_count = 0
         
-        for entry in self.cache.values():
+        for entry in list(self.cache.values()):
             if self._is_expired(entry):
                 expired_count += 1
         
@@ -169,8 +364,8 @@ class CacheService:
         Returns:
             Resultado da função (do cache ou execução nova)
         """
-        # Gerar chave baseada na função e parâmetros
-        cache_key = self._generate_key(cache_prefix, func_name=func.__name__, **kwargs)
+        # Gerar chave baseada na função, parâmetros e partição de dados (escopo operacional)
+        cache_key = self._generate_key(cache_prefix, func_name=func.__name__, particao=cache_partition(), **kwargs)
         
         # Tentar obter do cache
         cached_result = self.get(cache_key)
@@ -179,7 +374,9 @@ class CacheService:
         
         # Executar função e armazenar resultado
         result = func(**kwargs)
-        self.set(cache_key, result, ttl)
+        # Valor "stale" (Firestore degradado) não é cacheado: próxima leitura tenta de novo
+        if not getattr(result, 'stale', False):
+            self.set(cache_key, result, ttl)
         
         return result
 
@@ -190,7 +387,7 @@ def get_cache_service() -> CacheService:
     """Obtém instância singleton do cache"""
     global _cache_instance
     if _cache_instance is None:
-        _cache_instance = CacheService()
+        _cache_instance = CacheService(backend=criar_backend_cache())
     return _cache_instance
 
 # Decorador para cache automático
@@ -218,71 +415,316 @@ def cached(cache_prefix: str, ttl: int = 60):
         return wrapper
     return decorator
 
+def tag_aluno(aluno_id: str, particao: Optional[str] = None) -> str:
+    """Tag das fichas 360 do aluno em uma partição (default: a da leitura atual)"""
+    return f"aluno:{aluno_id}:{particao or cache_partition()}"
+
+def aplicar_campos(documento: Dict[str, Any], campos: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Cópia do documento com uma escrita aplicada (como ficará no Firestore)
+    
+    Sentinelas viram o valor local equivalente: SERVER_TIMESTAMP → agora
+    (UTC) e DELETE_FIELD remove o campo.
+    
+    Args:
+        documento: Documento atual (não é alterado)
+        campos: Campos gravados (update/set merge)
+    
+    Returns:
+        Dict novo com os campos aplicados
+    """
+    novo = dict(documento)
+    agora = datetime.now(timezone.utc)
+    for campo, valor in campos.items():
+        if valor is DELETE_FIELD:
+            novo.pop(campo, None)
+        else:
+            novo[campo] = agora if valor is SERVER_TIMESTAMP else valor
+    return novo
+
 # Funcões de conveniência para operações comuns
 class CacheManager:
     """Manager de cache para operações específicas do sistema"""
     
+    ALUNOS_TTL = 60  # intervalo entre syncs incrementais
+    ALUNOS_RECONCILIACAO = 900  # recarga completa periódica (pega exclusões)
+    TTL_HISTORICO = 86400  # meses legados (< 2026) não mudam mais
+    TTL_FECHADO = 30 * 86400  # snapshots de meses fechados: só a reabertura remove
+    
     def __init__(self):
         self.cache = get_cache_service()
+        # Estado do sync incremental da lista de alunos, por partição de dados
+        self._alunos_sync: Dict[str, Dict[str, Any]] = {}
+        self._alunos_lock = threading.Lock()
     
     def get_alunos_cached(self, alunos_service, force_refresh: bool = False) -> list:
-        """Cache para lista de alunos"""
-        if force_refresh:
-            self.cache.delete("alunos:list")
+        """
+        Lista de alunos com sync incremental por updatedAt
+        
+        A primeira leitura (e a reconciliação periódica) carrega a coleção
+        inteira; depois disso só os documentos com updatedAt > watermark são
+        lidos e mesclados na lista em memória.
         
-        return self.cache.cached_call(
-            alunos_service.listar_alunos,
-            "alunos",
-            ttl=60
-        )
+        Returns:
+            Lista de modelos Aluno (somente leitura; aceitam .get()/[] como
+            os dicts antigos, use .to_dict() para uma cópia mutável)
+        """
+        modo = cache_partition()
+        with self._alunos_lock:
+            estado = self._alunos_sync.get(modo)
+            agora = time.time()
+            
+            if (force_refresh or estado is None or estado['watermark'] is None
+                    or agora - estado['ultimo_full'] > self.ALUNOS_RECONCILIACAO):
+                registrar_cache('alunos', acerto=False)
+                return self._sync_alunos_completo(alunos_service, modo)
+            
+            # Sync incremental conta como acerto: a lista vem da memória
+            registrar_cache('alunos', acerto=True)
+            if estado['sujo'] or agora - estado['ultimo_delta'] > self.ALUNOS_TTL:
+                self._sync_alunos_delta(alunos_service, estado)
+            
+            return estado['lista']
     
-    def get_estatisticas_pagamentos_cached(self, pagamentos_service, ym: str, force_refresh: bool = False) -> dict:
-        """Cache para estatísticas de pagamentos"""
+    @staticmethod
+    def _max_updated_at(alunos: list, inicial=None):
+        """Maior updatedAt da lista (ignora documentos sem o campo)"""
+        watermark = inicial
+        for aluno in alunos:
+            updated_at = aluno.get('updatedAt')
+            if updated_at is None or not hasattr(updated_at, 'year'):
+                continue
+            if watermark is None or updated_at > watermark:
+                watermark = updated_at
+        return watermark
+    
+    def _sync_alunos_completo(self, alunos_service, modo: str) -> list:
+        """Recarga completa: redefine lista, índice por id e watermark"""
+        alunos = alunos_service.listar_alunos()
+        if getattr(alunos, 'stale', False):
+            # Firestore degradado: não substituir o estado sincronizado
+            return type(alunos)(Aluno.from_dict(a) for a in alunos)
+        
+        # Modelos com __slots__: decodificados uma vez, bem menores que os dicts
+        alunos = [Aluno.from_dict(a) for a in alunos]
+        agora = time.time()
+        self._alunos_sync[modo] = {
+            'por_id': {a.id: a for a in alunos},
+            'lista': alunos,
+            'watermark': self._max_updated_at(alunos),
+            'ultimo_full': agora,
+            'ultimo_delta': agora,
+            'sujo': False,
+        }
+        return alunos
+    
+    def _sync_alunos_delta(self, alunos_service, estado: Dict[str, Any]) -> None:
+        """Sync incremental: lê só os alterados desde o watermark e mescla por id"""
+        try:
+            alterados = alunos_service.listar_alunos_atualizados_desde(estado['watermark'])
+        except Exception:
+            # Mantém a lista atual; próxima leitura tenta de novo
+            return
+        if getattr(alterados, 'stale', False):
+            return
+        
+        if alterados:
+            por_id = estado['por_id']
+            aplicar_escopo = should_apply_operational_scope()
+            for dados in alterados:
+                aluno = Aluno.from_dict(dados)
+                if aplicar_escopo and not aluno_is_operational(aluno):
+                    # Saiu do escopo operacional (ex.: ativoDesde corrigido para 2025)
+                    por_id.pop(aluno.id, None)
+                else:
+                    por_id[aluno.id] = aluno
+            estado['lista'] = sorted(por_id.values(), key=lambda a: a.nome or '')
+            estado['watermark'] = self._max_updated_at(alterados, estado['watermark'])
+        
+        estado['ultimo_delta'] = time.time()
+        estado['sujo'] = False
+    
+    def _cached(self, key: str, carregar: Callable[[], Any], ttl: int, force_refresh: bool) -> Any:
+        """Lê a chave ou carrega e grava (valores "stale" não são cacheados)"""
         if force_refresh:
-            key = self.cache._generate_key("pagamentos_stats", ym=ym)
             self.cache.delete(key)
+        else:
+            valor = self.cache.get(key)
+            if valor is not None:
+                return valor
+        
+        valor = carregar()
+        # Valor "stale" (Firestore degradado) não é cacheado: próxima leitura tenta de novo
+        if not getattr(valor, 'stale', False):
+            if isinstance(valor, dict) and valor.get('fechado'):
+                ttl = self.TTL_FECHADO
+            self.cache.set(key, valor, ttl)
+        return valor
+    
+    def chave_mensal(self, prefixo: str, ym: str, particao: Optional[str] = None) -> str:
+        """
+        Chave de um valor mensal (estatísticas, relatório)
         
-        return self.cache.cached_call(
-            pagamentos_service.obter_estatisticas_mes,
-            "pagamentos_stats",
-            ttl=120,  # TTL maior para estatísticas
-            ym=ym
-        )
+        Args:
+            prefixo: Ex.: "pagamentos_stats"
+            ym: Mês no formato YYYY-MM
+            particao: "operacional" ou "historico" (default: a da leitura atual)
+        """
+        return self.cache._generate_key(prefixo, ym=ym, particao=particao or cache_partition())
+    
+    def _ttl_mensal(self, ym: str, ttl: int) -> int:
+        """Meses legados são imutáveis: ficam em cache por TTL_HISTORICO"""
+        return ttl if ym_is_operational(ym) else self.TTL_HISTORICO
+    
+    def get_estatisticas_pagamentos_cached(self, pagamentos_service, ym: str, force_refresh: bool = False) -> dict:
+        """Cache para estatísticas de pagamentos"""
+        # TTL maior para estatísticas
+        return self._cached(self.chave_mensal("pagamentos_stats", ym),
+                            partial(pagamentos_service.obter_estatisticas_mes, ym),
+                            self._ttl_mensal(ym, 120), force_refresh)
     
     def get_relatorio_presencas_cached(self, presencas_service, ym: str, force_refresh: bool = False) -> dict:
         """Cache para relatório de presenças"""
-        if force_refresh:
-            key = self.cache._generate_key("presencas_relatorio", ym=ym)
-            self.cache.delete(key)
-        
-        return self.cache.cached_call(
-            presencas_service.obter_relatorio_mensal,
-            "presencas_relatorio",
-            ttl=90,
-            ym=ym
-        )
+        return self._cached(self.chave_mensal("presencas_relatorio", ym),
+                            partial(presencas_service.obter_relatorio_mensal, ym),
+                            self._ttl_mensal(ym, 90), force_refresh)
+    
+    def get_detalhes_pagamentos_cached(self, pagamentos_service, ym: str, force_refresh: bool = False) -> dict:
+        """Cache das listas de pagamentos do mês (separado do resumo, só quando a tela expande)"""
+        return self._cached(self.chave_mensal("pagamentos_detalhes", ym),
+                            partial(pagamentos_service.obter_detalhes_mes, ym),
+                            self._ttl_mensal(ym, 120), force_refresh)
+    
+    def get_detalhes_presencas_cached(self, presencas_service, ym: str, force_refresh: bool = False) -> dict:
+        """Cache dos registros de presença do mês (separado do resumo)"""
+        return self._cached(self.chave_mensal("presencas_detalhes", ym),
+                            partial(presencas_service.obter_detalhes_mes, ym),
+                            self._ttl_mensal(ym, 90), force_refresh)
     
     def get_estatisticas_graduacoes_cached(self, graduacoes_service, force_refresh: bool = False) -> dict:
         """Cache para estatísticas de graduações"""
-        if force_refresh:
-            self.cache.delete("graduacoes:stats")
+        particao = cache_partition()
+        # TTL longo pois graduações mudam pouco
+        return self._cached(self.cache._generate_key("graduacoes_stats", particao=particao),
+                            partial(graduacoes_service.obter_estatisticas_graduacoes, mode=particao),
+                            300, force_refresh)
+    
+    # ------------------------------------------------------------------
+    # Write-through: escritas bem-sucedidas corrigem o cache no lugar
+    # ------------------------------------------------------------------
+    def patch_estatisticas_pagamentos(self, ym: str, funcao: Callable[[dict], Optional[dict]]) -> bool:
+        """
+        Atualiza as estatísticas do mês em cache sem reler o Firestore
         
-        return self.cache.cached_call(
-            graduacoes_service.obter_estatisticas_graduacoes,
-            "graduacoes",
-            ttl=300  # TTL longo pois graduações mudam pouco
-        )
+        Args:
+            ym: Mês no formato YYYY-MM
+            funcao: Estatísticas atuais → novas (None descarta a entrada)
+        
+        Returns:
+            bool: True se havia estatísticas em cache e foram atualizadas
+        """
+        return self._patch_mensal("pagamentos_stats", ym, funcao)
+    
+    def patch_relatorio_presencas(self, ym: str, funcao: Callable[[dict], Optional[dict]]) -> bool:
+        """Atualiza o relatório de presenças do mês em cache (ver patch_estatisticas_pagamentos)"""
+        return self._patch_mensal("presencas_relatorio", ym, funcao)
+    
+    def patch_detalhes_pagamentos(self, ym: str, funcao: Callable[[dict], Optional[dict]]) -> bool:
+        """Atualiza as listas de pagamentos do mês em cache, se carregadas"""
+        return self._patch_mensal("pagamentos_detalhes", ym, funcao)
+    
+    def patch_detalhes_presencas(self, ym: str, funcao: Callable[[dict], Optional[dict]]) -> bool:
+        """Atualiza os registros de presença do mês em cache, se carregados"""
+        return self._patch_mensal("presencas_detalhes", ym, funcao)
+    
+    def tem_estatisticas_pagamentos(self, ym: str) -> bool:
+        """True se há estatísticas do mês em cache (escritas só leem o anterior nesse caso)"""
+        return self._tem_mensal("pagamentos_stats", ym)
+    
+    def tem_relatorio_presencas(self, ym: str) -> bool:
+        """True se há relatório de presenças do mês em cache (ver tem_estatisticas_pagamentos)"""
+        return self._tem_mensal("presencas_relatorio", ym)
+    
+    def _tem_mensal(self, prefixo: str, ym: str) -> bool:
+        return any(self.cache.get(self.chave_mensal(prefixo, ym, particao)) is not None
+                   for particao in partitions_with_ym(ym))
+    
+    def _patch_mensal(self, prefixo: str, ym: str, funcao: Callable[[dict], Optional[dict]]) -> bool:
+        """Aplica o patch em todas as partições que enxergam o mês"""
+        atualizadas = [self.cache.update(self.chave_mensal(prefixo, ym, particao), funcao)
+                       for particao in partitions_with_ym(ym)]
+        return any(atualizadas)
+    
+    def patch_perfil_aluno(self, aluno_id: str, funcao: Callable[[dict], Optional[dict]],
+                           ym: Optional[str] = None) -> int:
+        """
+        Atualiza as fichas 360 do aluno em cache
+        
+        Args:
+            aluno_id: ID do aluno
+            funcao: Ficha atual → nova (None descarta a ficha)
+            ym: Mês do registro alterado; só as partições que enxergam o mês
+                são corrigidas (default: todas)
+        
+        Returns:
+            int: Número de fichas atualizadas
+        """
+        if not aluno_id:
+            return 0
+        particoes = partitions_with_ym(ym) if ym else CACHE_PARTITIONS
+        return sum(self.cache.update_tag(tag_aluno(aluno_id, particao), funcao) for particao in particoes)
+    
+    def patch_aluno(self, aluno_id: str, campos: Dict[str, Any]) -> None:
+        """
+        Aplica uma atualização de aluno à lista sincronizada e às fichas 360
+        
+        Substitui a recarga por invalidate_aluno_cache: o modelo é refeito a
+        partir dos campos gravados. O watermark não avança (updatedAt real é
+        do servidor), então o próximo sync incremental confirma o documento.
+        
+        Args:
+            aluno_id: ID do aluno
+            campos: Campos gravados no update (sentinelas são aceitos)
+        """
+        with self._alunos_lock:
+            for particao, estado in list(self._alunos_sync.items()):
+                atual = estado['por_id'].get(aluno_id)
+                if atual is None:
+                    # Fora da lista (ex.: pode ter entrado no escopo): o sync incremental decide
+                    estado['sujo'] = True
+                    continue
+                aluno = Aluno.from_dict(aplicar_campos(atual.to_dict(), campos))
+                por_id = dict(estado['por_id'])
+                if particao == 'operacional' and not aluno_is_operational(aluno):
+                    por_id.pop(aluno_id)
+                else:
+                    por_id[aluno_id] = aluno
+                # Dicts novos: sessões no meio de um render seguem com a lista antiga
+                estado['por_id'] = por_id
+                estado['lista'] = sorted(por_id.values(), key=lambda a: a.nome or '')
+        # Outras réplicas: a chave publica a mudança e elas fazem sync incremental
+        self.cache.delete("alunos:list")
+        
+        def atualizar_ficha(perfil):
+            # ativoDesde decide o escopo operacional: a ficha é recarregada
+            if not perfil.get('aluno') or 'ativoDesde' in campos:
+                return None
+            return {**perfil, 'aluno': aplicar_campos(perfil['aluno'], campos)}
+        self.patch_perfil_aluno(aluno_id, atualizar_ficha)
     
     def invalidate_aluno_cache(self, aluno_id: str = None):
         """Invalida cache relacionado a alunos"""
-        # Invalidar lista geral
+        # Lista geral: próxima leitura faz sync incremental (não recarga completa)
+        for estado in list(self._alunos_sync.values()):
+            estado['sujo'] = True
         self.cache.delete("alunos:list")
         
         # Se aluno específico, invalidar caches relacionados
         if aluno_id:
+            self.invalidate_perfil_aluno(aluno_id)
             # Padrão simples: deletar keys que podem conter o aluno
             keys_to_delete = []
-            for key in self.cache.cache.keys():
+            for key in self.cache.keys():
                 if 'alunos' in key or aluno_id in key:
                     keys_to_delete.append(key)
             
@@ -292,12 +734,13 @@ class CacheManager:
     def invalidate_pagamento_cache(self, ym: str = None):
         """Invalida cache de pagamentos"""
         if ym:
-            key = self.cache._generate_key("pagamentos_stats", ym=ym)
-            self.cache.delete(key)
+            for particao in CACHE_PARTITIONS:
+                for prefixo in ("pagamentos_stats", "pagamentos_detalhes"):
+                    self.cache.delete(self.chave_mensal(prefixo, ym, particao))
         else:
             # Invalidar todos os caches de pagamentos
             keys_to_delete = []
-            for key in self.cache.cache.keys():
+            for key in self.cache.keys():
                 if 'pagamentos' in key:
                     keys_to_delete.append(key)
             
@@ -307,12 +750,13 @@ class CacheManager:
     def invalidate_presenca_cache(self, ym: str = None):
         """Invalida cache de presenças"""
         if ym:
-            key = self.cache._generate_key("presencas_relatorio", ym=ym)
-            self.cache.delete(key)
+            for particao in CACHE_PARTITIONS:
+                for prefixo in ("presencas_relatorio", "presencas_detalhes"):
+                    self.cache.delete(self.chave_mensal(prefixo, ym, particao))
         else:
             # Invalidar todos os caches de presenças
             keys_to_delete = []
-            for key in self.cache.cache.keys():
+            for key in self.cache.keys():
                 if 'presencas' in key:
                     keys_to_delete.append(key)
             
@@ -322,13 +766,53 @@ class CacheManager:
     def invalidate_graduacao_cache(self):
         """Invalida cache de graduações"""
         keys_to_delete = []
-        for key in self.cache.cache.keys():
+        for key in self.cache.keys():
             if 'graduacoes' in key:
                 keys_to_delete.append(key)
         
         for key in keys_to_delete:
             self.cache.delete(key)
     
+    def invalidate_perfil_aluno(self, aluno_id: str):
+        """Invalida a ficha 360 (perfil agregado) de um aluno específico"""
+        if aluno_id:
+            for particao in CACHE_PARTITIONS:
+                self.cache.invalidate_tag(tag_aluno(aluno_id, particao))
+    
+    def invalidate_prefix(self, prefix: str) -> int:
+        """
+        Remove todas as entradas de um prefixo (ex.: "pagamentos_stats")
+        
+        Returns:
+            int: Número de entradas removidas
+        """
+        if prefix == 'alunos':
+            for estado in list(self._alunos_sync.values()):
+                estado['sujo'] = True
+        keys = [key for key in self.cache.keys() if key.split(':', 1)[0] == prefix]
+        for key in keys:
+            self.cache.delete(key)
+        return len(keys)
+    
+    def flush_cache(self) -> int:
+        """
+        Esvazia o cache inteiro, inclusive a lista sincronizada de alunos
+        
+        Returns:
+            int: Número de entradas removidas
+        """
+        total = len(self.cache.cache)
+        self.cache.clear()
+        with self._alunos_lock:
+            self._alunos_sync.clear()
+        return total
+    
+    def _on_remote_invalidation(self, mensagem: dict) -> None:
+        """Outra réplica mexeu em alunos: próxima leitura faz sync incremental"""
+        if mensagem.get('op') == 'clear' or any(key.startswith('alunos') for key in mensagem.get('keys', [])):
+            for estado in list(self._alunos_sync.values()):
+                estado['sujo'] = True
+    
     def get_cache_stats(self) -> dict:
         """Obtém estatísticas do cache"""
         return self.cache.get_stats()
@@ -345,4 +829,5 @@ def get_cache_manager() -> CacheManager:
     global _cache_manager_instance
     if _cache_manager_instance is None:
         _cache_manager_instance = CacheManager()
+        _cache_manager_instance.cache.on_remote_invalidation(_cache_manager_instance._on_remote_invalidation)
     return _cache_manager_instance
\ No newline at end of file
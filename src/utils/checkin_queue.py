@@ -0,0 +1,338 @@
+"""
+CheckinQueue - Fila write-behind para check-ins de presença
+Check-ins são confirmados assim que gravados em um journal local (append-only)
+e enviados ao Firestore em lotes a cada poucos centésimos de segundo.
+
+Habilitada por DOJO_CHECKIN_QUEUE=1. Itens não enviados sobrevivem a restart:
+o journal é reprocessado na inicialização.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+JOURNAL_PADRAO = "/tmp/dojo_checkins.jsonl"
+INTERVALO_FLUSH = 0.3  # segundos
+TAMANHO_LOTE = 450  # abaixo do limite de 500 operações por batch do Firestore
+
+# Status anterior não informado em enfileirar (o relatório do mês é recarregado)
+DESCONHECIDO = object()
+
+
+def _gravar_no_firestore(registros: List[Dict[str, Any]]) -> None:
+    """Escritor padrão: grava os registros em /presencas com batch"""
+    from google.cloud import firestore
+    from src.utils.firebase_config import get_firestore_client
+
+    db = get_firestore_client()
+    agora = firestore.SERVER_TIMESTAMP
+
+    for inicio in range(0, len(registros), TAMANHO_LOTE):
+        batch = db.batch()
+        for reg in registros[inicio:inicio + TAMANHO_LOTE]:
+            doc_ref = db.collection('presencas').document(reg['id'])
+            # merge=True preserva createdAt em docs existentes
+            batch.set(doc_ref, {
+                'alunoId': reg['alunoId'],
+                'data': reg['data'],
+                'ym': reg['ym'],
+                'presente': reg['presente'],
+                'createdAt': agora,
+                'updatedAt': agora,
+            }, merge=True)
+        batch.commit()
+
+
+class CheckinQueue:
+    """Fila durável de check-ins com flush em lote e deduplicação por alunoId_data"""
+
+    def __init__(self, journal_path: str = JOURNAL_PADRAO,
+                 escritor: Callable[[List[Dict[str, Any]]], None] = _gravar_no_firestore,
+                 intervalo: float = INTERVALO_FLUSH):
+        """
+        Inicializa a fila e reprocessa o journal existente
+
+        Args:
+            journal_path: Caminho do journal append-only
+            escritor: Função que persiste um lote de registros
+            intervalo: Intervalo entre flushes (segundos)
+        """
+        self.journal_path = journal_path
+        self.escritor = escritor
+        self.intervalo = intervalo
+
+        self._lock = threading.Lock()
+        self._acordar = threading.Event()
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._seq = 0
+        self._pendentes: Dict[str, Dict[str, Any]] = {}
+        # Status já conhecidos neste processo (pendentes, enviados ou lidos), só
+        # do dia mais recente: a deduplicação do check-in olha apenas o dia
+        # corrente e dias passados são descartados ao virar o dia
+        self._dia: Optional[str] = None
+        self._dia_carregado = False
+        self._conhecidos: Dict[str, bool] = {}
+        self.ultimo_erro: Optional[str] = None
+
+        self._reprocessar_journal()
+
+    # ------------------------------------------------------------------
+    # Journal
+    # ------------------------------------------------------------------
+    def _append(self, registro: Dict[str, Any]) -> None:
+        """Acrescenta um registro ao journal com fsync (durável antes do ack)"""
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _reprocessar_journal(self) -> None:
+        """Reconstrói os pendentes a partir do journal (checkins sem ack)"""
+        if not os.path.exists(self.journal_path):
+            return
+
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for linha in f:
+                try:
+                    registro = json.loads(linha)
+                except ValueError:
+                    # Linha truncada por queda no meio da escrita
+                    continue
+
+                self._seq = max(self._seq, registro.get('seq', 0))
+                if registro.get('op') == 'checkin':
+                    self._pendentes[registro['id']] = registro
+                elif registro.get('op') == 'ack':
+                    for presenca_id, seq in registro.get('itens', []):
+                        pendente = self._pendentes.get(presenca_id)
+                        # Só remove se nenhum check-in mais novo chegou depois
+                        if pendente and pendente['seq'] <= seq:
+                            del self._pendentes[presenca_id]
+
+        for presenca_id, registro in self._pendentes.items():
+            self._conhecer(presenca_id, registro['presente'])
+
+        if self._pendentes:
+            self._iniciar_flusher()
+            self._acordar.set()
+        else:
+            self._compactar()
+
+    def _compactar(self) -> None:
+        """Trunca o journal quando não há pendentes (evita crescimento infinito)"""
+        try:
+            tmp_path = f"{self.journal_path}.tmp"
+            open(tmp_path, 'w').close()
+            os.replace(tmp_path, self.journal_path)
+        except OSError:
+            pass
+
+    # ------------------------------------------------------------------
+    # Estado conhecido (chamar com o lock)
+    # ------------------------------------------------------------------
+    def _virar_dia(self, data_str: str) -> bool:
+        """Passa para um dia mais novo (descartando o anterior); False se data_str é passado"""
+        if self._dia is None or data_str > self._dia:
+            self._dia = data_str
+            self._dia_carregado = False
+            self._conhecidos = {}
+        return data_str == self._dia
+
+    def _conhecer(self, presenca_id: str, presente: Optional[bool]) -> None:
+        if not self._virar_dia(presenca_id.rsplit('_', 1)[-1]):
+            return
+        if presente is None:
+            self._conhecidos.pop(presenca_id, None)
+        else:
+            self._conhecidos[presenca_id] = presente
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+    def enfileirar(self, aluno_id: str, data_str: str, ym: str, presente: bool = True,
+                   anterior: Any = DESCONHECIDO) -> str:
+        """
+        Registra um check-in na fila (retorna assim que o journal foi gravado)
+
+        Args:
+            aluno_id: ID do aluno
+            data_str: Data da aula (YYYY-MM-DD)
+            ym: Mês de referência (YYYY-MM)
+            presente: True para presente, False para falta
+            anterior: Status gravado antes (None = sem registro), para o
+                write-through do relatório do mês; omitido se desconhecido
+
+        Returns:
+            str: ID da presença (alunoId_YYYY-MM-DD)
+        """
+        presenca_id = f"{aluno_id}_{data_str}"
+
+        with self._lock:
+            self._seq += 1
+            registro = {
+                'op': 'checkin',
+                'seq': self._seq,
+                'id': presenca_id,
+                'alunoId': aluno_id,
+                'data': data_str,
+                'ym': ym,
+                'presente': presente,
+                'ts': time.time(),
+            }
+            pendente = self._pendentes.get(presenca_id)
+            if pendente is not None:
+                # Ainda não enviado: o anterior é o do Firestore, não o do pendente
+                if 'anterior' in pendente:
+                    registro['anterior'] = pendente['anterior']
+            elif anterior is not DESCONHECIDO:
+                registro['anterior'] = anterior
+            self._append(registro)
+            # Deduplicação: o último check-in do aluno no dia prevalece
+            self._pendentes[presenca_id] = registro
+            self._conhecer(presenca_id, presente)
+
+        self._iniciar_flusher()
+        self._acordar.set()
+        return presenca_id
+
+    def status_conhecido(self, presenca_id: str) -> Optional[bool]:
+        """Retorna o status presente/ausente já registrado neste processo (ou None)"""
+        return self._conhecidos.get(presenca_id)
+
+    def dia_carregado(self, data_str: str) -> bool:
+        """True se as presenças do dia foram carregadas (status ausente = sem registro)"""
+        return self._dia_carregado and self._dia == data_str
+
+    def carregar_dia(self, data_str: str, presencas: Dict[str, bool]) -> None:
+        """
+        Semeia o estado conhecido com as presenças do dia lidas do Firestore
+
+        Args:
+            data_str: Data (YYYY-MM-DD)
+            presencas: ID da presença → presente (status já conhecidos prevalecem)
+        """
+        with self._lock:
+            if not self._virar_dia(data_str):
+                return
+            for presenca_id, presente in presencas.items():
+                self._conhecidos.setdefault(presenca_id, presente)
+            self._dia_carregado = True
+
+    def lembrar(self, presenca_id: str, presente: Optional[bool]) -> None:
+        """
+        Registra o status de uma presença gravada fora da fila (escrita direta ou
+        lida do Firestore), para a deduplicação do check-in enxergá-la
+
+        Args:
+            presenca_id: ID da presença (alunoId_YYYY-MM-DD)
+            presente: Status gravado, ou None para presença excluída
+        """
+        with self._lock:
+            self._conhecer(presenca_id, presente)
+
+    def total_pendentes(self) -> int:
+        """Número de check-ins ainda não enviados ao Firestore"""
+        return len(self._pendentes)
+
+    def flush(self) -> int:
+        """
+        Envia imediatamente os pendentes (chamado pelo flusher e no encerramento)
+
+        Returns:
+            int: Número de registros enviados
+        """
+        with self._lock:
+            if not self._pendentes:
+                return 0
+            lote = list(self._pendentes.values())
+
+        try:
+            self.escritor(lote)
+        except Exception as e:
+            # Mantém os pendentes; próxima tentativa no próximo ciclo
+            self.ultimo_erro = str(e)
+            return 0
+
+        with self._lock:
+            self._append({
+                'op': 'ack',
+                'seq': self._seq,
+                'itens': [[reg['id'], reg['seq']] for reg in lote],
+            })
+            for reg in lote:
+                atual = self._pendentes.get(reg['id'])
+                if atual is not None and atual['seq'] == reg['seq']:
+                    del self._pendentes[reg['id']]
+            if not self._pendentes:
+                self._compactar()
+            self.ultimo_erro = None
+
+        # Relatório do mês e fichas 360 passam a refletir as presenças gravadas (write-through)
+        from src.services.presencas_service import PresencasService
+        PresencasService.atualizar_caches(
+            {reg['id']: {campo: reg[campo] for campo in ('alunoId', 'data', 'ym', 'presente')}
+             for reg in lote},
+            {reg['id']: None if reg['anterior'] is None else {'presente': reg['anterior']}
+             for reg in lote if 'anterior' in reg}
+        )
+
+        return len(lote)
+
+    def parar(self, timeout: float = 5.0) -> None:
+        """Para o flusher enviando o que restar na fila"""
+        self._parar.set()
+        self._acordar.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.flush()
+
+    # ------------------------------------------------------------------
+    # Flusher
+    # ------------------------------------------------------------------
+    def _iniciar_flusher(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._loop, name="dojo-checkin-flusher", daemon=True)
+            self._thread.start()
+
+    def _loop(self) -> None:
+        while not self._parar.is_set():
+            self._acordar.wait()
+            if self._parar.is_set():
+                break
+            # Janela curta para agrupar check-ins em rajada num único batch
+            time.sleep(self.intervalo)
+            self._acordar.clear()
+            self.flush()
+            if self._pendentes:
+                # Falhou: tentar de novo sem depender de um novo check-in
+                time.sleep(self.intervalo)
+                self._acordar.set()
+
+
+# Instância global da fila (None quando desabilitada)
+_checkin_queue_instance: Optional[CheckinQueue] = None
+_checkin_queue_lock = threading.Lock()
+
+
+def get_checkin_queue() -> Optional[CheckinQueue]:
+    """Obtém a fila singleton se DOJO_CHECKIN_QUEUE estiver habilitado"""
+    global _checkin_queue_instance
+    if os.getenv("DOJO_CHECKIN_QUEUE", "false").lower() not in ("1", "true"):
+        return None
+
+    if _checkin_queue_instance is None:
+        with _checkin_queue_lock:
+            if _checkin_queue_instance is None:
+                _checkin_queue_instance = CheckinQueue(
+                    journal_path=os.getenv("DOJO_CHECKIN_JOURNAL", JOURNAL_PADRAO)
+                )
+                atexit.register(_checkin_queue_instance.parar)
+    return _checkin_queue_instance
@@ -0,0 +1,136 @@
+"""
+ConcurrentLoader - Carregamento paralelo de chamadas independentes
+Dispara chamadas de serviço em um pool de threads compartilhado, com timeout
+por chamada. A latência total passa a ser a da chamada mais lenta (e não a soma).
+"""
+
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from typing import Any, Callable, Dict, Optional
+
+# Pool compartilhado pelo processo (criado sob demanda)
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+TIMEOUT_PADRAO = 10.0
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Obtém o pool de threads singleton do carregador"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                max_workers = int(os.getenv("DOJO_LOADER_WORKERS", "8"))
+                _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dojo-loader")
+    return _executor
+
+
+def _propagar_contexto(func: Callable[[], Any]) -> Callable[[], Any]:
+    """
+    Anexa o ScriptRunContext do Streamlit à thread do pool.
+
+    Sem isso, os serviços executados no pool não enxergam st.session_state
+    (ex.: data_mode) e o escopo operacional deixaria de ser aplicado.
+    """
+    try:
+        from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+        ctx = get_script_run_ctx()
+    except Exception:
+        return func
+
+    if ctx is None:
+        return func
+
+    def _executar():
+        thread = threading.current_thread()
+        add_script_run_ctx(thread, ctx)
+        try:
+            return func()
+        finally:
+            # Threads do pool são reutilizadas: não deixar contexto de outra sessão
+            setattr(thread, "streamlit_script_run_ctx", None)
+
+    return _executar
+
+
+class ResultadoCarga:
+    """Resultado de uma chamada do carregador (valor OU erro)"""
+
+    __slots__ = ("nome", "valor", "erro", "duracao")
+
+    def __init__(self, nome: str, valor: Any = None, erro: Optional[BaseException] = None,
+                 duracao: float = 0.0):
+        self.nome = nome
+        self.valor = valor
+        self.erro = erro
+        self.duracao = duracao
+
+    @property
+    def ok(self) -> bool:
+        return self.erro is None
+
+    def valor_ou(self, padrao: Any) -> Any:
+        """Retorna o valor ou o padrão informado se a chamada falhou"""
+        return self.valor if self.erro is None else padrao
+
+    def __repr__(self) -> str:
+        status = "ok" if self.ok else f"erro={self.erro!r}"
+        return f"ResultadoCarga({self.nome}, {status}, {self.duracao:.3f}s)"
+
+
+def carregar_em_paralelo(tarefas: Dict[str, Callable[[], Any]],
+                         timeouts: Optional[Dict[str, float]] = None,
+                         timeout_padrao: float = TIMEOUT_PADRAO) -> Dict[str, ResultadoCarga]:
+    """
+    Executa chamadas independentes em paralelo
+
+    Args:
+        tarefas: Mapa nome → callable sem argumentos (use lambda/partial)
+        timeouts: Timeout específico por nome (segundos)
+        timeout_padrao: Timeout para tarefas sem valor em `timeouts`
+
+    Returns:
+        Mapa nome → ResultadoCarga. Falhas e timeouts ficam isolados no
+        resultado da própria tarefa; nunca propagam para as demais.
+    """
+    timeouts = timeouts or {}
+    executor = _get_executor()
+    inicio = time.monotonic()
+
+    futures = {}
+    for nome, func in tarefas.items():
+        # Cópia dos ContextVars (ex.: request_context) por tarefa: o mesmo
+        # Context não pode ser executado em duas threads ao mesmo tempo
+        contexto = contextvars.copy_context()
+        futures[nome] = executor.submit(contexto.run, _cronometrar, _propagar_contexto(func))
+
+    resultados: Dict[str, ResultadoCarga] = {}
+    for nome, future in futures.items():
+        # Todas começaram juntas: cada uma tem seu próprio prazo absoluto
+        prazo = inicio + timeouts.get(nome, timeout_padrao)
+        restante = max(0.0, prazo - time.monotonic())
+        try:
+            valor, duracao = future.result(timeout=restante)
+            resultados[nome] = ResultadoCarga(nome, valor=valor, duracao=duracao)
+        except FuturesTimeoutError:
+            future.cancel()
+            resultados[nome] = ResultadoCarga(
+                nome,
+                erro=TimeoutError(f"Tempo limite excedido ao carregar '{nome}'"),
+                duracao=time.monotonic() - inicio,
+            )
+        except Exception as e:
+            resultados[nome] = ResultadoCarga(nome, erro=e, duracao=time.monotonic() - inicio)
+
+    return resultados
+
+
+def _cronometrar(func: Callable[[], Any]):
+    """Executa a função retornando (valor, duração)"""
+    inicio = time.monotonic()
+    valor = func()
+    return valor, time.monotonic() - inicio
@@ -5,7 +5,7 @@ Configuração e conexão com Firebase/Firestore
 import streamlit as st
 import firebase_admin
 from firebase_admin import credentials, firestore
-from typing import Optional
+from typing import Iterator, Optional
 import os
 from pathlib import Path
 
@@ -27,7 +27,9 @@ class FirebaseConfig:
                 # Inicializar Firebase Admin
                 firebase_admin.initialize_app(self.cred)
             
-            # Obter cliente Firestore
+            # Obter cliente Firestore (instrumentado: leituras/escritas por rerun)
+            from src.utils.firestore_metrics import instalar_metricas_firestore
+            instalar_metricas_firestore()
             self.db = firestore.client()
             
         except Exception as e:
@@ -191,4 +193,37 @@ def get_firestore_client() -> firestore.Client:
     if _firebase_instance is None:
         _firebase_instance = FirebaseConfig()
     
-    return _firebase_instance.get_db()
\ No newline at end of file
+    return _firebase_instance.get_db()
+
+def stream_em_lotes(query, tamanho_lote: int = 500) -> Iterator:
+    """
+    Percorre uma query em lotes encadeados por cursor (start_after do último documento)
+    
+    Cada lote é uma query curta: a memória fica limitada a um lote e o stream
+    não esbarra no prazo de uma leitura longa, qualquer que seja o tamanho da
+    collection.
+    
+    Args:
+        query: Query ou collection do Firestore (sem limit)
+        tamanho_lote: Documentos por lote
+    
+    Yields:
+        DocumentSnapshot, na ordem da query (ID do documento se não houver ordenação)
+    """
+    from src.utils.resilience import timeout_restante
+    
+    ultimo = None
+    while True:
+        lote = query.limit(tamanho_lote)
+        if ultimo is not None:
+            lote = lote.start_after(ultimo)
+        
+        quantidade = 0
+        # Prazo da operação resiliente em andamento, recalculado a cada lote
+        for doc in lote.stream(timeout=timeout_restante()):
+            quantidade += 1
+            ultimo = doc
+            yield doc
+        
+        if quantidade < tamanho_lote:
+            return
@@ -0,0 +1,251 @@
+"""
+Contabilidade de leituras/escritas do Firestore
+Instrumenta o cliente google-cloud-firestore (queries, agregações, get de
+documento, get_all e commits) e atribui cada RPC à requisição atual
+(RequestContext), à página e ao método de serviço que a originou.
+
+- Por rerun: leituras, escritas e round trips no RequestContext, com aviso
+  no log quando o orçamento de leituras (DOJO_READ_BUDGET) é ultrapassado.
+- Por processo: totais por página e por método, para listar os maiores
+  consumidores (top_operacoes / top_paginas).
+
+Contagem segue a cobrança do Firestore: cada documento retornado é uma
+leitura, query vazia conta 1 e agregação (count/sum) conta 1 por chamada
+(o Firestore cobra 1 a cada 1000 entradas de índice).
+Desligar com DOJO_FIRESTORE_METRICS=0.
+"""
+
+import functools
+import logging
+import os
+import sys
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.request_context import RequestContext, get_request_context
+
+logger = logging.getLogger('DojojApp')
+
+TOP_PADRAO = 5
+_MARCA = '_dojo_metricas'
+
+# Totais do processo: chave → [leituras, escritas, round trips]
+_por_operacao: Dict[str, List[int]] = {}
+_por_pagina: Dict[str, List[int]] = {}
+_totais_lock = threading.Lock()
+
+
+def _operacao_chamadora() -> str:
+    """Primeiro frame dentro de src/services (ex.: 'AlunosService.listar_alunos')"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        caminho = frame.f_code.co_filename.replace('\\', '/')
+        if '/src/services/' in caminho:
+            codigo = frame.f_code
+            qualname = getattr(codigo, 'co_qualname', None)  # Python 3.11+
+            if qualname:
+                return qualname
+            instancia = frame.f_locals.get('self')
+            if instancia is not None:
+                return f"{type(instancia).__name__}.{codigo.co_name}"
+            return codigo.co_name
+        frame = frame.f_back
+    return '(fora dos serviços)'
+
+
+def _somar(destino: Dict[str, List[int]], chave: str, leituras: int, escritas: int,
+           round_trips: int) -> None:
+    totais = destino.setdefault(chave, [0, 0, 0])
+    totais[0] += leituras
+    totais[1] += escritas
+    totais[2] += round_trips
+
+
+def registrar(leituras: int = 0, escritas: int = 0, round_trips: int = 0,
+              operacao: Optional[str] = None) -> None:
+    """
+    Contabiliza uma chamada ao Firestore na requisição e nos totais do processo
+
+    Args:
+        leituras: Documentos lidos
+        escritas: Documentos gravados
+        round_trips: RPCs
+        operacao: Método responsável (default: descoberto pela pilha)
+    """
+    operacao = operacao or _operacao_chamadora()
+    contexto = get_request_context()
+    pagina = (contexto.pagina if contexto is not None else None) or '(sem página)'
+
+    with _totais_lock:
+        _somar(_por_operacao, operacao, leituras, escritas, round_trips)
+        _somar(_por_pagina, pagina, leituras, escritas, round_trips)
+
+    if contexto is None:
+        return
+    dentro_do_orcamento = contexto.registrar_operacao(operacao, leituras, escritas, round_trips)
+    if not dentro_do_orcamento and not contexto.orcamento_excedido:
+        # Um aviso por render: o primeiro a estourar é quem aparece no log
+        contexto.orcamento_excedido = True
+        logger.warning(f"💸 Orçamento de leituras excedido em {pagina}: "
+                       f"{contexto.leituras} > {contexto.orcamento_leituras} (em {operacao})")
+
+
+# ----------------------------------------------------------------------
+# Instrumentação do cliente
+# ----------------------------------------------------------------------
+def _instrumentar_stream(classe, por_documento: bool) -> None:
+    """Envolve o gerador _make_stream (base de get() e stream() de queries/agregações)"""
+    original = classe._make_stream
+
+    @functools.wraps(original)
+    def _make_stream(self, *args, **kwargs):
+        operacao = None
+        documentos = 0
+        gerador = original(self, *args, **kwargs)
+        try:
+            while True:
+                try:
+                    item = next(gerador)
+                except StopIteration as fim:
+                    return fim.value
+                if operacao is None:
+                    operacao = _operacao_chamadora()
+                documentos += 1
+                yield item
+        finally:
+            leituras = max(1, documentos) if por_documento else 1
+            registrar(leituras=leituras, round_trips=1,
+                      operacao=operacao or _operacao_chamadora())
+
+    classe._make_stream = _make_stream
+
+
+def _instrumentar_get_all(classe) -> None:
+    """Client.get_all: um RPC, uma leitura por documento pedido"""
+    original = classe.get_all
+
+    @functools.wraps(original)
+    def get_all(self, references, *args, **kwargs):
+        references = list(references)
+        operacao = _operacao_chamadora()
+        try:
+            yield from original(self, references, *args, **kwargs)
+        finally:
+            registrar(leituras=max(1, len(references)), round_trips=1, operacao=operacao)
+
+    classe.get_all = get_all
+
+
+def _instrumentar_chamada(classe, metodo: str, leituras: int = 0, escritas: int = 0) -> None:
+    """Métodos síncronos com custo fixo (get/delete de documento)"""
+    original = getattr(classe, metodo)
+
+    @functools.wraps(original)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return original(self, *args, **kwargs)
+        finally:
+            registrar(leituras=leituras, escritas=escritas, round_trips=1)
+
+    setattr(classe, metodo, wrapper)
+
+
+def _instrumentar_commit(classe) -> None:
+    """WriteBatch.commit (também usado por set/update/create de documento)"""
+    original = classe.commit
+
+    @functools.wraps(original)
+    def commit(self, *args, **kwargs):
+        escritas = len(getattr(self, '_write_pbs', ()) or ())
+        try:
+            return original(self, *args, **kwargs)
+        finally:
+            registrar(escritas=escritas, round_trips=1)
+
+    classe.commit = commit
+
+
+def instalar_metricas_firestore() -> bool:
+    """
+    Instrumenta as classes do cliente Firestore (idempotente, por processo)
+
+    Returns:
+        bool: True se a instrumentação está ativa
+    """
+    if os.getenv('DOJO_FIRESTORE_METRICS', '1').lower() in ('0', 'false', 'no'):
+        return False
+    try:
+        from google.cloud.firestore_v1.aggregation import AggregationQuery
+        from google.cloud.firestore_v1.batch import WriteBatch
+        from google.cloud.firestore_v1.client import Client
+        from google.cloud.firestore_v1.document import DocumentReference
+        from google.cloud.firestore_v1.query import Query
+    except ImportError:
+        return False
+
+    # Marca na própria classe: app.py e os serviços importam este módulo por
+    # caminhos diferentes (utils.* e src.utils.*)
+    if getattr(Query, _MARCA, False):
+        return True
+    try:
+        _instrumentar_stream(Query, por_documento=True)
+        _instrumentar_stream(AggregationQuery, por_documento=False)
+        _instrumentar_get_all(Client)
+        _instrumentar_chamada(DocumentReference, 'get', leituras=1)
+        _instrumentar_chamada(DocumentReference, 'delete', escritas=1)
+        _instrumentar_commit(WriteBatch)
+    except AttributeError as e:
+        # Versão do cliente sem os pontos esperados: segue sem métricas
+        logger.warning(f"⚠️ Métricas do Firestore indisponíveis: {e}")
+        return False
+    setattr(Query, _MARCA, True)
+    return True
+
+
+# ----------------------------------------------------------------------
+# Relatórios
+# ----------------------------------------------------------------------
+def _top(totais: Dict[str, List[int]], n: Optional[int]) -> List[Tuple[str, int, int, int]]:
+    with _totais_lock:
+        itens = [(chave, *valores) for chave, valores in totais.items()]
+    return sorted(itens, key=lambda item: (item[1], item[2]), reverse=True)[:n]
+
+
+def top_operacoes(n: Optional[int] = TOP_PADRAO) -> List[Tuple[str, int, int, int]]:
+    """Métodos que mais leram no processo: (operação, leituras, escritas, round trips; n=None → todos)"""
+    return _top(_por_operacao, n)
+
+
+def top_paginas(n: Optional[int] = TOP_PADRAO) -> List[Tuple[str, int, int, int]]:
+    """Páginas que mais leram no processo: (página, leituras, escritas, round trips)"""
+    return _top(_por_pagina, n)
+
+
+def resetar_metricas() -> None:
+    """Zera os totais do processo"""
+    with _totais_lock:
+        _por_operacao.clear()
+        _por_pagina.clear()
+
+
+def registrar_resumo_render(contexto: Optional[RequestContext] = None, n: int = TOP_PADRAO) -> None:
+    """
+    Loga o custo do rerun e os métodos que mais leram nele
+
+    Args:
+        contexto: Contexto do rerun (default: o atual)
+        n: Quantidade de métodos listados
+    """
+    contexto = contexto or get_request_context()
+    if contexto is None or not contexto.round_trips:
+        return
+    orcamento = (f" / orçamento {contexto.orcamento_leituras}"
+                 if contexto.orcamento_leituras is not None else "")
+    nivel = logging.WARNING if contexto.orcamento_excedido else logging.INFO
+    logger.log(nivel, f"📊 Firestore em {contexto.pagina or 'render'}: {contexto.leituras} leituras"
+                      f"{orcamento}, {contexto.escritas} escritas, {contexto.round_trips} round trips")
+    with contexto._lock:
+        itens = sorted(contexto.por_operacao.items(), key=lambda item: item[1][0], reverse=True)[:n]
+    for operacao, (leituras, escritas, round_trips) in itens:
+        logger.log(nivel, f"   {leituras:>6} leituras | {escritas:>4} escritas | "
+                          f"{round_trips:>3} RPCs | {operacao}")
@@ -0,0 +1,282 @@
+"""
+Relatório de memória do processo
+Quebra o uso de memória por prefixo do CacheService (e demais caches de
+processo), por sessão do Streamlit (st.session_state, chave a chave) e, com
+tracemalloc ativo, pelos maiores sítios de alocação.
+
+- DOJO_TRACEMALLOC=1 (ou =N frames) liga o tracemalloc no boot
+- kill -USR1 <pid> grava o relatório em DOJO_MEMORY_DUMP_DIR
+  (default /tmp/dojo_memory) quando o start.py roda o Streamlit no processo
+"""
+
+import json
+import logging
+import os
+import signal
+import sys
+import threading
+import tracemalloc
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger('DojojApp')
+
+TOP_PADRAO = 15
+DIRETORIO_PADRAO = '/tmp/dojo_memory'
+LIMITE_OBJETOS = 200_000  # teto de objetos visitados por medição
+
+# Objetos de bibliotecas (cliente Firestore, canal gRPC, Streamlit) são
+# compartilhados entre sessões: entram só com o tamanho raso
+_MODULOS_RASOS = ('google.', 'grpc', 'firebase_admin', 'streamlit', 'proto.')
+
+
+def tamanho_profundo(obj: Any, vistos: Optional[set] = None) -> int:
+    """
+    Tamanho aproximado (bytes) de um objeto e do que ele referencia
+
+    Args:
+        obj: Objeto a medir
+        vistos: ids já contados (compartilhe para não contar duas vezes)
+    """
+    vistos = set() if vistos is None else vistos
+    total = 0
+    pendentes = [obj]
+    while pendentes and len(vistos) < LIMITE_OBJETOS:
+        atual = pendentes.pop()
+        if id(atual) in vistos:
+            continue
+        vistos.add(id(atual))
+        try:
+            total += sys.getsizeof(atual)
+        except TypeError:
+            continue
+
+        tipo = type(atual)
+        if isinstance(atual, (str, bytes, int, float, bool, type(None))) or isinstance(atual, type):
+            continue
+        if callable(atual) and not hasattr(atual, '__dict__') and not hasattr(tipo, '__slots__'):
+            continue
+        if (tipo.__module__ or '').startswith(_MODULOS_RASOS):
+            continue
+        if isinstance(atual, dict):
+            pendentes.extend(atual.keys())
+            pendentes.extend(atual.values())
+        elif isinstance(atual, (list, tuple, set, frozenset)):
+            pendentes.extend(atual)
+        else:
+            dados = getattr(atual, '__dict__', None)
+            if isinstance(dados, dict):
+                pendentes.append(dados)
+            for classe in tipo.__mro__:
+                for slot in getattr(classe, '__slots__', ()):
+                    valor = getattr(atual, slot, None)
+                    if valor is not None:
+                        pendentes.append(valor)
+    return total
+
+
+def _rss_bytes() -> Optional[int]:
+    """RSS atual (/proc) ou pico (getrusage) em bytes"""
+    try:
+        with open('/proc/self/status') as f:
+            for linha in f:
+                if linha.startswith('VmRSS:'):
+                    return int(linha.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except Exception:
+        return None
+
+
+# ----------------------------------------------------------------------
+# Partes do relatório
+# ----------------------------------------------------------------------
+def medir_caches() -> List[Dict[str, Any]]:
+    """
+    Memória por prefixo do CacheService e pelos caches de processo
+
+    Returns:
+        Lista de {cache, entradas, bytes} ordenada por bytes
+    """
+    from src.utils.cache_service import get_cache_manager
+    from src.utils import resilience
+
+    manager = get_cache_manager()
+    grupos: Dict[str, List[Any]] = {}
+    for chave, entrada in list(manager.cache.cache.items()):
+        grupos.setdefault(chave.split(':', 1)[0], []).append(entrada)
+
+    vistos: set = set()
+    linhas = [{'cache': prefixo, 'entradas': len(entradas), 'bytes': tamanho_profundo(entradas, vistos)}
+              for prefixo, entradas in grupos.items()]
+    for modo, estado in list(manager._alunos_sync.items()):
+        linhas.append({'cache': f"alunos_sync:{modo}", 'entradas': len(estado.get('lista', [])),
+                       'bytes': tamanho_profundo(estado, vistos)})
+    ultimos = dict(resilience._ultimos_valores)
+    if ultimos:
+        linhas.append({'cache': 'resiliencia:ultimo_valor', 'entradas': len(ultimos),
+                       'bytes': tamanho_profundo(ultimos, vistos)})
+    return sorted(linhas, key=lambda linha: linha['bytes'], reverse=True)
+
+
+def _estados_de_sessao() -> List[Tuple[str, Dict[str, Any]]]:
+    """(id da sessão, st.session_state) de todas as sessões do Runtime"""
+    try:
+        from streamlit.runtime import Runtime
+        if not Runtime.exists():
+            return []
+        sessoes = Runtime.instance()._session_mgr.list_sessions()
+        return [(info.session.id, info.session.session_state.filtered_state) for info in sessoes]
+    except Exception:
+        return []
+
+
+def medir_sessoes(estados: Optional[List[Tuple[str, Dict[str, Any]]]] = None,
+                  top_chaves: int = 5) -> List[Dict[str, Any]]:
+    """
+    Memória do st.session_state por sessão, com as maiores chaves
+
+    Args:
+        estados: (id, dict) por sessão (default: sessões ativas do Runtime)
+        top_chaves: Chaves listadas por sessão
+
+    Returns:
+        Lista de {sessao, chaves, bytes, maiores: [(chave, bytes)]}
+    """
+    estados = _estados_de_sessao() if estados is None else estados
+    resultado = []
+    for sessao_id, estado in estados:
+        vistos: set = set()  # por sessão: o que for compartilhado aparece em cada uma
+        por_chave = [(chave, tamanho_profundo(valor, vistos)) for chave, valor in estado.items()]
+        por_chave.sort(key=lambda item: item[1], reverse=True)
+        resultado.append({
+            'sessao': sessao_id,
+            'chaves': len(por_chave),
+            'bytes': sum(tamanho for _, tamanho in por_chave),
+            'maiores': por_chave[:top_chaves],
+        })
+    return sorted(resultado, key=lambda sessao: sessao['bytes'], reverse=True)
+
+
+def top_alocacoes(n: int = TOP_PADRAO) -> List[Dict[str, Any]]:
+    """Maiores sítios de alocação do tracemalloc (vazio se desligado)"""
+    if not tracemalloc.is_tracing():
+        return []
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+        tracemalloc.Filter(False, '<unknown>'),
+    ))
+    return [{'local': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+             'bytes': stat.size, 'blocos': stat.count}
+            for stat in snapshot.statistics('lineno')[:n]]
+
+
+def iniciar_tracemalloc(frames: Optional[int] = None) -> bool:
+    """
+    Liga o tracemalloc (idempotente)
+
+    Args:
+        frames: Profundidade das pilhas (default: DOJO_TRACEMALLOC se numérico, senão 1)
+
+    Returns:
+        bool: True se está rastreando
+    """
+    if tracemalloc.is_tracing():
+        return True
+    valor = os.getenv('DOJO_TRACEMALLOC', '')
+    if frames is None:
+        if valor.lower() in ('', '0', 'false', 'no'):
+            return False
+        frames = int(valor) if valor.isdigit() and int(valor) > 1 else 1
+    tracemalloc.start(frames)
+    logger.info(f"🧠 tracemalloc ativo ({frames} frame(s) por alocação)")
+    return True
+
+
+def gerar_relatorio_memoria(n: int = TOP_PADRAO) -> Dict[str, Any]:
+    """
+    Relatório completo (RSS, caches, sessões e alocações)
+
+    Returns:
+        Dict pronto para JSON/exibição
+    """
+    atual, pico = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (None, None)
+    return {
+        'gerado_em': datetime.now().isoformat(timespec='seconds'),
+        'pid': os.getpid(),
+        'rss_bytes': _rss_bytes(),
+        'tracemalloc': {'ativo': tracemalloc.is_tracing(), 'atual_bytes': atual, 'pico_bytes': pico},
+        'caches': medir_caches(),
+        'sessoes': medir_sessoes(),
+        'alocacoes': top_alocacoes(n),
+    }
+
+
+def _mb(valor: Optional[int]) -> str:
+    return f"{valor / 1024 / 1024:.1f} MB" if valor is not None else 'n/d'
+
+
+def formatar_relatorio_memoria(relatorio: Dict[str, Any]) -> str:
+    """Versão texto do relatório (dump e log)"""
+    linhas = [f"Relatório de memória - pid {relatorio['pid']} - {relatorio['gerado_em']}",
+              f"RSS: {_mb(relatorio['rss_bytes'])}"]
+    tm = relatorio['tracemalloc']
+    linhas.append(f"tracemalloc: atual {_mb(tm['atual_bytes'])}, pico {_mb(tm['pico_bytes'])}"
+                  if tm['ativo'] else "tracemalloc: desligado (DOJO_TRACEMALLOC=1)")
+
+    linhas += ["", "Caches (por prefixo):"]
+    linhas += [f"  {_mb(c['bytes']):>10}  {c['entradas']:>6} entradas  {c['cache']}"
+               for c in relatorio['caches']] or ["  (vazio)"]
+
+    linhas += ["", f"Sessões ({len(relatorio['sessoes'])}):"]
+    for sessao in relatorio['sessoes']:
+        maiores = ', '.join(f"{chave}={tamanho / 1024:.0f}KB" for chave, tamanho in sessao['maiores'])
+        linhas.append(f"  {_mb(sessao['bytes']):>10}  {sessao['chaves']:>3} chaves  {sessao['sessao']}  [{maiores}]")
+
+    if relatorio['alocacoes']:
+        linhas += ["", "Maiores sítios de alocação:"]
+        linhas += [f"  {_mb(a['bytes']):>10}  {a['blocos']:>8} blocos  {a['local']}"
+                   for a in relatorio['alocacoes']]
+    return '\n'.join(linhas) + '\n'
+
+
+def gravar_relatorio_memoria(diretorio: Optional[str] = None) -> str:
+    """
+    Grava o relatório em .txt e .json
+
+    Returns:
+        Caminho base dos arquivos (sem extensão)
+    """
+    diretorio = diretorio or os.getenv('DOJO_MEMORY_DUMP_DIR', DIRETORIO_PADRAO)
+    os.makedirs(diretorio, exist_ok=True)
+    relatorio = gerar_relatorio_memoria()
+    base = os.path.join(diretorio, f"memoria_{datetime.now().strftime('%Y%m%d-%H%M%S')}_{os.getpid()}")
+    with open(f"{base}.txt", 'w', encoding='utf-8') as arquivo:
+        arquivo.write(formatar_relatorio_memoria(relatorio))
+    with open(f"{base}.json", 'w', encoding='utf-8') as arquivo:
+        json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+    logger.info(f"🧠 Relatório de memória salvo em {base}.txt (RSS {_mb(relatorio['rss_bytes'])})")
+    return base
+
+
+def instalar_dump_sinal(sinal: int = getattr(signal, 'SIGUSR1', 0)) -> bool:
+    """
+    kill -USR1 <pid> grava o relatório (só na thread principal; fora do Windows)
+
+    Returns:
+        bool: True se o handler foi instalado
+    """
+    if not sinal or threading.current_thread() is not threading.main_thread():
+        return False
+
+    def _handler(signum, frame):
+        # Fora do handler: medir sessões pode demorar e não deve bloquear o loop
+        threading.Thread(target=gravar_relatorio_memoria, name='dojo-memory-dump', daemon=True).start()
+
+    signal.signal(sinal, _handler)
+    return True
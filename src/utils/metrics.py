@@ -0,0 +1,365 @@
+"""
+Métricas de latência dos serviços (formato Prometheus)
+Histogramas por método público dos serviços (@instrumentar_servico), contagem
+de erros e taxa de acerto dos caches, com p50/p95/p99 estimados a partir dos
+buckets. A exposição em texto do Prometheus inclui também os contadores da
+camada resiliente e as leituras/escritas do Firestore.
+
+Exportação (uma vez por processo, iniciar_exportacao_metricas):
+- DOJO_METRICS_PORT: servidor HTTP local em /metrics
+- DOJO_METRICS_FILE: arquivo reescrito a cada DOJO_METRICS_INTERVAL segundos
+  (textfile collector do node_exporter)
+"""
+
+import bisect
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger('DojojApp')
+
+# Limites superiores dos buckets (segundos): ~x1.5 de 1ms a 30s
+BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0015, 0.0025, 0.004, 0.006, 0.01, 0.015, 0.025, 0.04, 0.06,
+    0.1, 0.15, 0.25, 0.4, 0.6, 1.0, 1.5, 2.5, 4.0, 6.0, 10.0, 15.0, 30.0,
+)
+QUANTIS = (0.5, 0.95, 0.99)
+INTERVALO_ARQUIVO_PADRAO = 15.0
+LIMITE_RENDERS = 50
+RENDER_LENTO_PADRAO = 1.0  # segundos (DOJO_SLOW_RENDER)
+
+
+class Histograma:
+    """Histograma de buckets fixos (contagem por bucket, soma e total)"""
+
+    __slots__ = ('contagens', 'soma', 'total')
+
+    def __init__(self):
+        self.contagens = [0] * (len(BUCKETS) + 1)  # último = +Inf
+        self.soma = 0.0
+        self.total = 0
+
+    def observar(self, segundos: float) -> None:
+        self.contagens[bisect.bisect_left(BUCKETS, segundos)] += 1
+        self.soma += segundos
+        self.total += 1
+
+    def quantil(self, q: float) -> Optional[float]:
+        """
+        Estima o quantil por interpolação linear dentro do bucket
+        (mesma aproximação do histogram_quantile do Prometheus)
+        """
+        if not self.total:
+            return None
+        alvo = q * self.total
+        acumulado = 0
+        for indice, contagem in enumerate(self.contagens):
+            if contagem and acumulado + contagem >= alvo:
+                if indice == len(BUCKETS):
+                    return BUCKETS[-1]
+                inferior = BUCKETS[indice - 1] if indice else 0.0
+                return inferior + (BUCKETS[indice] - inferior) * (alvo - acumulado) / contagem
+            acumulado += contagem
+        return BUCKETS[-1]
+
+
+_histogramas: Dict[str, Histograma] = {}
+_erros: Dict[str, int] = {}
+_cache: Dict[str, List[int]] = {}  # nome → [acertos, faltas]
+_renders: Deque[Dict[str, Any]] = deque(maxlen=LIMITE_RENDERS)
+_lock = threading.Lock()
+_exportacao_iniciada = False
+
+
+def observar(operacao: str, segundos: float, erro: bool = False) -> None:
+    """Registra a duração de uma chamada (e se terminou em exceção)"""
+    with _lock:
+        histograma = _histogramas.get(operacao)
+        if histograma is None:
+            histograma = _histogramas[operacao] = Histograma()
+        histograma.observar(segundos)
+        if erro:
+            _erros[operacao] = _erros.get(operacao, 0) + 1
+
+
+def registrar_cache(nome: str, acerto: bool) -> None:
+    """Registra um acerto/falta de cache (nome = prefixo da chave)"""
+    with _lock:
+        contadores = _cache.get(nome)
+        if contadores is None:
+            contadores = _cache[nome] = [0, 0]
+        contadores[0 if acerto else 1] += 1
+
+
+def registrar_render(pagina: str, data_mode: str, segundos: float, leituras: int = 0) -> None:
+    """Guarda o rerun no histórico recente (últimos LIMITE_RENDERS)"""
+    with _lock:
+        _renders.append({'quando': time.time(), 'pagina': pagina, 'data_mode': data_mode,
+                         'segundos': segundos, 'leituras': leituras})
+
+
+def medir(operacao: str) -> Callable:
+    """Decorador: histograma de latência + contagem de erros da função"""
+    def decorator(func: Callable):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                resultado = func(*args, **kwargs)
+            except BaseException:
+                observar(operacao, time.perf_counter() - inicio, erro=True)
+                raise
+            observar(operacao, time.perf_counter() - inicio)
+            return resultado
+        return wrapper
+    return decorator
+
+
+def instrumentar_servico(cls):
+    """
+    Decorador de classe: mede todos os métodos públicos do serviço
+
+    Métodos com _, staticmethods/classmethods/properties e geradores (iter_*:
+    a chamada só cria o gerador) ficam de fora. O nome da operação é
+    'Classe.metodo'.
+    """
+    for nome, atributo in list(vars(cls).items()):
+        if nome.startswith('_') or not inspect.isfunction(atributo) or inspect.isgeneratorfunction(atributo):
+            continue
+        setattr(cls, nome, medir(f"{cls.__name__}.{nome}")(atributo))
+    return cls
+
+
+# ----------------------------------------------------------------------
+# Consulta
+# ----------------------------------------------------------------------
+def resumo_latencias() -> Dict[str, Dict[str, Any]]:
+    """
+    Resumo por operação
+
+    Returns:
+        Dict operação → {chamadas, erros, media, p50, p95, p99} (segundos)
+    """
+    with _lock:
+        itens = [(nome, h.total, h.soma, list(h.contagens), _erros.get(nome, 0))
+                 for nome, h in _histogramas.items()]
+    resumo = {}
+    for nome, total, soma, contagens, erros in itens:
+        copia = Histograma()
+        copia.contagens, copia.soma, copia.total = contagens, soma, total
+        resumo[nome] = {
+            'chamadas': total,
+            'erros': erros,
+            'media': soma / total if total else None,
+            **{f"p{int(q * 100)}": copia.quantil(q) for q in QUANTIS},
+        }
+    return resumo
+
+
+def taxa_acerto_cache() -> Dict[str, Dict[str, Any]]:
+    """Acertos, faltas e taxa de acerto por cache"""
+    with _lock:
+        itens = [(nome, acertos, faltas) for nome, (acertos, faltas) in _cache.items()]
+    return {
+        nome: {'acertos': acertos, 'faltas': faltas,
+               'taxa': acertos / (acertos + faltas) if acertos + faltas else None}
+        for nome, acertos, faltas in itens
+    }
+
+
+def renders_recentes(apenas_lentos: bool = False) -> List[Dict[str, Any]]:
+    """
+    Reruns recentes, do mais novo ao mais antigo
+
+    Args:
+        apenas_lentos: Só os acima de DOJO_SLOW_RENDER segundos (default 1s)
+    """
+    limite = float(os.getenv('DOJO_SLOW_RENDER', RENDER_LENTO_PADRAO)) if apenas_lentos else 0.0
+    with _lock:
+        itens = [dict(render) for render in _renders if render['segundos'] >= limite]
+    return itens[::-1]
+
+
+def resetar_metricas() -> None:
+    """Zera histogramas, erros, contadores de cache e renders recentes"""
+    with _lock:
+        _histogramas.clear()
+        _erros.clear()
+        _cache.clear()
+        _renders.clear()
+
+
+# ----------------------------------------------------------------------
+# Exposição Prometheus
+# ----------------------------------------------------------------------
+def _rotulo(valor: Any) -> str:
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _numero(valor: float) -> str:
+    return repr(float(valor)) if valor is not None else 'NaN'
+
+
+def gerar_exposicao_prometheus() -> str:
+    """Texto no formato de exposição do Prometheus (version 0.0.4)"""
+    with _lock:
+        histogramas = {nome: (list(h.contagens), h.soma, h.total) for nome, h in _histogramas.items()}
+        erros = dict(_erros)
+    linhas: List[str] = [
+        '# HELP dojo_service_latency_seconds Latência dos métodos públicos dos serviços',
+        '# TYPE dojo_service_latency_seconds histogram',
+    ]
+    for nome in sorted(histogramas):
+        contagens, soma, total = histogramas[nome]
+        op = _rotulo(nome)
+        acumulado = 0
+        for limite, contagem in zip(BUCKETS, contagens):
+            acumulado += contagem
+            linhas.append(f'dojo_service_latency_seconds_bucket{{operacao="{op}",le="{limite}"}} {acumulado}')
+        linhas.append(f'dojo_service_latency_seconds_bucket{{operacao="{op}",le="+Inf"}} {total}')
+        linhas.append(f'dojo_service_latency_seconds_sum{{operacao="{op}"}} {_numero(soma)}')
+        linhas.append(f'dojo_service_latency_seconds_count{{operacao="{op}"}} {total}')
+
+    linhas += [
+        '# HELP dojo_service_latency_quantile_seconds p50/p95/p99 estimados pelos buckets',
+        '# TYPE dojo_service_latency_quantile_seconds gauge',
+    ]
+    for nome, resumo in sorted(resumo_latencias().items()):
+        for q in QUANTIS:
+            valor = resumo[f"p{int(q * 100)}"]
+            linhas.append(f'dojo_service_latency_quantile_seconds{{operacao="{_rotulo(nome)}",'
+                          f'quantile="{q}"}} {_numero(valor)}')
+
+    linhas += [
+        '# HELP dojo_service_errors_total Chamadas que terminaram em exceção',
+        '# TYPE dojo_service_errors_total counter',
+    ]
+    for nome in sorted(histogramas):
+        linhas.append(f'dojo_service_errors_total{{operacao="{_rotulo(nome)}"}} {erros.get(nome, 0)}')
+
+    linhas += [
+        '# HELP dojo_cache_requests_total Consultas ao cache por resultado',
+        '# TYPE dojo_cache_requests_total counter',
+    ]
+    caches = taxa_acerto_cache()
+    for nome, dados in sorted(caches.items()):
+        linhas.append(f'dojo_cache_requests_total{{cache="{_rotulo(nome)}",resultado="hit"}} {dados["acertos"]}')
+        linhas.append(f'dojo_cache_requests_total{{cache="{_rotulo(nome)}",resultado="miss"}} {dados["faltas"]}')
+    linhas += [
+        '# HELP dojo_cache_hit_ratio Taxa de acerto do cache desde o início do processo',
+        '# TYPE dojo_cache_hit_ratio gauge',
+    ]
+    for nome, dados in sorted(caches.items()):
+        linhas.append(f'dojo_cache_hit_ratio{{cache="{_rotulo(nome)}"}} {_numero(dados["taxa"])}')
+
+    linhas += _exposicao_resiliencia() + _exposicao_firestore()
+    return '\n'.join(linhas) + '\n'
+
+
+def _exposicao_resiliencia() -> List[str]:
+    from src.utils.resilience import obter_metricas
+
+    metricas = obter_metricas()
+    linhas = [
+        '# HELP dojo_resilience_events_total Chamadas, retries, falhas e respostas stale por operação',
+        '# TYPE dojo_resilience_events_total counter',
+    ]
+    for evento in ('chamadas', 'retries', 'falhas', 'stale'):
+        for operacao, valor in sorted(metricas.get(evento, {}).items()):
+            linhas.append(f'dojo_resilience_events_total{{evento="{evento}",'
+                          f'operacao="{_rotulo(operacao)}"}} {valor}')
+    return linhas
+
+
+def _exposicao_firestore() -> List[str]:
+    from src.utils.firestore_metrics import top_operacoes
+
+    linhas = []
+    operacoes = top_operacoes(n=None)
+    for indice, (metrica, ajuda) in enumerate((
+        ('dojo_firestore_reads_total', 'Documentos lidos do Firestore'),
+        ('dojo_firestore_writes_total', 'Documentos gravados no Firestore'),
+        ('dojo_firestore_round_trips_total', 'RPCs ao Firestore'),
+    ), start=1):
+        linhas += [f'# HELP {metrica} {ajuda}', f'# TYPE {metrica} counter']
+        for item in operacoes:
+            linhas.append(f'{metrica}{{operacao="{_rotulo(item[0])}"}} {item[indice]}')
+    return linhas
+
+
+# ----------------------------------------------------------------------
+# Exportação
+# ----------------------------------------------------------------------
+class _MetricasHandler(BaseHTTPRequestHandler):
+    """GET /metrics → exposição Prometheus"""
+
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        corpo = gerar_exposicao_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, format, *args):
+        pass  # scrape a cada 15s não deve poluir o log
+
+
+def iniciar_servidor_metricas(porta: int) -> ThreadingHTTPServer:
+    """Sobe o endpoint /metrics em uma thread daemon"""
+    servidor = ThreadingHTTPServer(('0.0.0.0', porta), _MetricasHandler)
+    threading.Thread(target=servidor.serve_forever, name='dojo-metrics', daemon=True).start()
+    logger.info(f"📈 Métricas Prometheus em :{servidor.server_address[1]}/metrics")
+    return servidor
+
+
+def escrever_arquivo_metricas(caminho: str) -> None:
+    """Grava a exposição de forma atômica (tmp + rename)"""
+    temporario = f"{caminho}.tmp"
+    with open(temporario, 'w', encoding='utf-8') as arquivo:
+        arquivo.write(gerar_exposicao_prometheus())
+    os.replace(temporario, caminho)
+
+
+def _loop_arquivo(caminho: str, intervalo: float) -> None:
+    while True:
+        time.sleep(intervalo)
+        try:
+            escrever_arquivo_metricas(caminho)
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao gravar métricas em {caminho}: {e}")
+
+
+def iniciar_exportacao_metricas() -> None:
+    """Inicia HTTP e/ou arquivo conforme as variáveis de ambiente (uma vez por processo)"""
+    global _exportacao_iniciada
+    with _lock:
+        if _exportacao_iniciada:
+            return
+        _exportacao_iniciada = True
+
+    porta = os.getenv('DOJO_METRICS_PORT')
+    if porta:
+        try:
+            iniciar_servidor_metricas(int(porta))
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Endpoint de métricas não iniciado: {e}")
+
+    caminho = os.getenv('DOJO_METRICS_FILE')
+    if caminho:
+        try:
+            intervalo = float(os.getenv('DOJO_METRICS_INTERVAL', INTERVALO_ARQUIVO_PADRAO))
+        except ValueError:
+            intervalo = INTERVALO_ARQUIVO_PADRAO
+        threading.Thread(target=_loop_arquivo, args=(caminho, intervalo),
+                         name='dojo-metrics-file', daemon=True).start()
+        logger.info(f"📈 Métricas Prometheus em {caminho} (a cada {intervalo:.0f}s)")
@@ -6,14 +6,16 @@ from datetime import date, datetime, timedelta
 from typing import List, Dict, Any, Optional
 from src.services.alunos_service import AlunosService
 from src.services.pagamentos_service import PagamentosService
+from src.services.registry import get_service
+from src.models.pagamento import Pagamento
 
 class NotificationService:
     """Serviço para gerenciar notificações e alertas do sistema"""
     
     def __init__(self):
-        """Inicializa o serviço de notificações"""
-        self.alunos_service = AlunosService()
-        self.pagamentos_service = PagamentosService()
+        """Inicializa o serviço de notificações (serviços compartilhados do registry)"""
+        self.alunos_service = get_service(AlunosService)
+        self.pagamentos_service = get_service(PagamentosService)
     
     def verificar_alunos_ausentes(self, dias_limite: int = 7) -> List[Dict[str, Any]]:
         """
@@ -45,16 +47,11 @@ class NotificationService:
                 if not extrato:
                     dias_sem_atividade = 30  # Assumir 30 dias se não há histórico
                 else:
-                    ultimo_pagamento = extrato[0]
-                    try:
-                        ultimo_ym = ultimo_pagamento.get('ym', '')
-                        if ultimo_ym:
-                            ano, mes = map(int, ultimo_ym.split('-'))
-                            ultima_data = date(ano, mes, 1)
-                            dias_sem_atividade = (hoje - ultima_data).days
-                        else:
-                            dias_sem_atividade = 30
-                    except:
+                    ultimo_pagamento = Pagamento.from_dict(extrato[0])
+                    if ultimo_pagamento.ano and ultimo_pagamento.mes:
+                        ultima_data = date(ultimo_pagamento.ano, ultimo_pagamento.mes, 1)
+                        dias_sem_atividade = (hoje - ultima_data).days
+                    else:
                         dias_sem_atividade = 30
                 
                 # Se está ausente há mais que o limite
@@ -134,24 +131,18 @@ class NotificationService:
             hoje = date.today()
             
             for pagamento in inadimplentes:
-                try:
-                    # Calcular dias de atraso usando dados REAIS do pagamento
-                    ym = pagamento.get('ym', '')
-                    if ym:
-                        ano, mes = map(int, ym.split('-'))
-                        # Usar dia de vencimento REAL do pagamento
-                        dia_vencimento = pagamento.get('dataVencimento', 15)
-                        data_vencimento = date(ano, mes, dia_vencimento)
-                        
-                        # SEM carência - passou 1 dia = inadimplente
-                        dias_atraso = (hoje - data_vencimento).days
-                        
-                        if dias_atraso >= dias_atraso_limite:
-                            pagamento['dias_atraso'] = dias_atraso
-                            pagamento['status_risco'] = self._calcular_status_risco_inadimplencia(dias_atraso)
-                            inadimplentes_criticos.append(pagamento)
-                except:
+                # Vencimento REAL do pagamento (ym + dataVencimento), decodificado uma vez
+                data_vencimento = Pagamento.from_dict(pagamento).vencimento
+                if data_vencimento is None:
                     continue
+                
+                # SEM carência - passou 1 dia = inadimplente
+                dias_atraso = (hoje - data_vencimento).days
+                
+                if dias_atraso >= dias_atraso_limite:
+                    pagamento['dias_atraso'] = dias_atraso
+                    pagamento['status_risco'] = self._calcular_status_risco_inadimplencia(dias_atraso)
+                    inadimplentes_criticos.append(pagamento)
             
             # Ordenar por dias de atraso
             inadimplentes_criticos.sort(key=lambda x: x.get('dias_atraso', 0), reverse=True)
@@ -186,30 +177,25 @@ class NotificationService:
             hoje = date.today()
             devedores_info = []
             
-            for pagamento in devedores:
-                try:
-                    # Calcular dias até o vencimento
-                    ym_pag = pagamento.get('ym', '')
-                    if ym_pag:
-                        ano, mes = map(int, ym_pag.split('-'))
-                        dia_vencimento = pagamento.get('dataVencimento', 15)
-                        data_vencimento = date(ano, mes, dia_vencimento)
-                        dias_ate_vencer = (data_vencimento - hoje).days
-                        
-                        pagamento_info = {
-                            'id': pagamento.get('id'),
-                            'alunoId': pagamento.get('alunoId'),
-                            'alunoNome': pagamento.get('alunoNome', 'N/A'),
-                            'valor': pagamento.get('valor', 0),
-                            'ym': ym_pag,
-                            'dataVencimento': dia_vencimento,
-                            'data_vencimento_completa': data_vencimento.strftime('%Y-%m-%d'),
-                            'dias_ate_vencer': dias_ate_vencer,
-                            'status_alerta': self._calcular_status_alerta_cobranca(dias_ate_vencer)
-                        }
-                        devedores_info.append(pagamento_info)
-                except:
+            for dados in devedores:
+                # Calcular dias até o vencimento (datas já convertidas pelo modelo)
+                pagamento = Pagamento.from_dict(dados)
+                if pagamento.vencimento is None:
                     continue
+                dias_ate_vencer = (pagamento.vencimento - hoje).days
+                
+                pagamento_info = {
+                    'id': pagamento.id,
+                    'alunoId': pagamento.aluno_id,
+                    'alunoNome': pagamento.aluno_nome or 'N/A',
+                    'valor': pagamento.valor or 0,
+                    'ym': pagamento.ym,
+                    'dataVencimento': pagamento.dia_vencimento or 15,
+                    'data_vencimento_completa': pagamento.vencimento.strftime('%Y-%m-%d'),
+                    'dias_ate_vencer': dias_ate_vencer,
+                    'status_alerta': self._calcular_status_alerta_cobranca(dias_ate_vencer)
+                }
+                devedores_info.append(pagamento_info)
             
             # Ordenar por dias até vencer (mais urgentes primeiro)
             devedores_info.sort(key=lambda x: x.get('dias_ate_vencer', 999))
@@ -14,6 +14,8 @@ from __future__ import annotations
 from datetime import date, datetime
 from typing import Any, Dict, Optional
 
+from src.utils.request_context import get_request_context
+
 OPERATIONAL_START_YEAR = 2026
 OPERATIONAL_START_YM = f"{OPERATIONAL_START_YEAR:04d}-01"
 
@@ -30,6 +32,11 @@ def _in_streamlit_runtime() -> bool:
 
 
 def get_active_data_mode(default: str = "operacional") -> str:
+    # Fast path: mode resolved once per rerun/invocation (request_context)
+    contexto = get_request_context()
+    if contexto is not None:
+        return contexto.data_mode
+
     if not _in_streamlit_runtime():
         return default
 
@@ -42,9 +49,36 @@ def get_active_data_mode(default: str = "operacional") -> str:
 
 
 def should_apply_operational_scope() -> bool:
+    contexto = get_request_context()
+    if contexto is not None:
+        return contexto.aplicar_escopo
+
     return _in_streamlit_runtime() and get_active_data_mode() == "operacional"
 
 
+# ----------------------------------------------------------------------
+# Cache partitions
+#
+# Service reads depend on the data mode only through
+# should_apply_operational_scope(), so the effective scope is what
+# partitions cache keys and tags. Scripts/CLI read the full dataset and
+# share the "historico" partition.
+# ----------------------------------------------------------------------
+CACHE_PARTITIONS = ("operacional", "historico")
+
+
+def cache_partition() -> str:
+    """Cache partition of the current reads: "operacional" (2026+ scope) or "historico"."""
+
+    return "operacional" if should_apply_operational_scope() else "historico"
+
+
+def partitions_with_ym(ym: Any) -> tuple:
+    """Partitions whose monthly data includes `ym` (legacy months are hidden in operacional)."""
+
+    return CACHE_PARTITIONS if ym_is_operational(ym) else ("historico",)
+
+
 def _extract_year(value: Any) -> Optional[int]:
     if value is None:
         return None
@@ -101,3 +135,59 @@ def pagamento_is_operational(pagamento: Dict[str, Any]) -> bool:
 
 def presenca_is_operational(presenca: Dict[str, Any]) -> bool:
     return ym_is_operational(presenca.get("ym"))
+
+
+# ----------------------------------------------------------------------
+# Query builders: push the operational filter to Firestore.
+#
+# Each helper receives `aplicar` already resolved by the caller (resolve the
+# mode ONCE per service call via should_apply_operational_scope()), so no
+# per-document Streamlit context lookups happen.
+#
+# Only single-field range filters are used (automatic indexes). Callers must
+# not combine them with another equality/range filter on a different field,
+# otherwise Firestore requires a composite index: in that case keep the other
+# filter client-side.
+# ----------------------------------------------------------------------
+
+
+def _field_filter(field: str, op: str, value: Any):
+    from google.cloud.firestore_v1.base_query import FieldFilter
+
+    return FieldFilter(field, op, value)
+
+
+def escopo_alunos_query(query, aplicar: bool):
+    """ativoDesde >= '2026' (ativoDesde is stored as 'YYYY-MM-DD')."""
+
+    if not aplicar:
+        return query
+    return query.where(filter=_field_filter("ativoDesde", ">=", f"{OPERATIONAL_START_YEAR:04d}"))
+
+
+def escopo_pagamentos_query(query, aplicar: bool):
+    """ano >= 2026 (ano is stored as int)."""
+
+    if not aplicar:
+        return query
+    return query.where(filter=_field_filter("ano", ">=", OPERATIONAL_START_YEAR))
+
+
+def escopo_pagamentos_aluno_query(query, aplicar: bool):
+    """ym >= '2026-01', for queries with alunoId == (index (alunoId, ym desc)).
+
+    Same scope as escopo_pagamentos_query, on the field the per-student
+    listings already order by, so no extra composite index is needed.
+    """
+
+    if not aplicar:
+        return query
+    return query.where(filter=_field_filter("ym", ">=", OPERATIONAL_START_YM))
+
+
+def escopo_presencas_query(query, aplicar: bool):
+    """ym >= '2026-01'."""
+
+    if not aplicar:
+        return query
+    return query.where(filter=_field_filter("ym", ">=", OPERATIONAL_START_YM))
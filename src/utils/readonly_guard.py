@@ -12,8 +12,14 @@ from __future__ import annotations
 
 from typing import Optional
 
+from src.utils.request_context import get_request_context
+
 
 def get_data_mode(default: str = "operacional") -> str:
+    contexto = get_request_context()
+    if contexto is not None:
+        return contexto.data_mode
+
     try:
         import streamlit as st
 
@@ -0,0 +1,189 @@
+"""Contexto da requisição (um rerun do Streamlit, um script ou um job).
+
+Guarda em um ContextVar o que antes era relido de st.session_state e de
+date.today() a cada chamada de serviço:
+- modo de dados (operacional/historico) e se o escopo operacional se aplica;
+- data de referência ("hoje" fixo durante a requisição);
+- usuário autenticado e página renderizada;
+- orçamento de leituras do Firestore e a contabilidade de leituras, escritas
+  e round trips da requisição (ver firestore_metrics).
+
+Definido UMA vez por rerun (app.py) ou invocação (request_context() em
+scripts/benchmarks). Sem contexto definido, os helpers caem no comportamento
+antigo (Streamlit → session_state; CLI → dataset completo).
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from datetime import date
+from typing import Any, Dict, Iterator, Optional
+
+
+class RequestContext:
+    """Estado imutável da requisição + contadores do Firestore"""
+
+    __slots__ = (
+        "data_mode",
+        "aplicar_escopo",
+        "data_referencia",
+        "usuario",
+        "pagina",
+        "orcamento_leituras",
+        "leituras",
+        "escritas",
+        "round_trips",
+        "por_operacao",
+        "orcamento_excedido",
+        "origem",
+        "_lock",
+    )
+
+    def __init__(self, data_mode: str = "operacional", data_referencia: Optional[date] = None,
+                 usuario: Optional[Dict[str, Any]] = None, orcamento_leituras: Optional[int] = None,
+                 aplicar_escopo: Optional[bool] = None, origem: str = "cli",
+                 pagina: Optional[str] = None):
+        """
+        Args:
+            data_mode: 'operacional' ou 'historico'
+            data_referencia: Data usada como "hoje" (default: date.today())
+            usuario: Usuário autenticado (name/username/role)
+            orcamento_leituras: Máximo de documentos lidos na requisição (None = sem limite)
+            aplicar_escopo: Força o escopo operacional (default: data_mode == 'operacional')
+            origem: 'streamlit', 'cli', 'job', 'benchmark'...
+            pagina: Página renderizada (reruns do Streamlit)
+        """
+        self.data_mode = data_mode
+        self.aplicar_escopo = (data_mode == "operacional") if aplicar_escopo is None else aplicar_escopo
+        self.data_referencia = data_referencia or date.today()
+        self.usuario = usuario
+        self.pagina = pagina
+        self.orcamento_leituras = orcamento_leituras
+        self.leituras = 0
+        self.escritas = 0
+        self.round_trips = 0
+        # operação (ex.: 'PagamentosService.listar_pagamentos') → [leituras, escritas, round trips]
+        self.por_operacao: Dict[str, list] = {}
+        self.orcamento_excedido = False
+        self.origem = origem
+        self._lock = threading.Lock()
+
+    def registrar_leituras(self, quantidade: int = 1) -> bool:
+        """
+        Contabiliza documentos lidos (threads do carregador compartilham o contexto)
+
+        Returns:
+            bool: False se o orçamento de leituras foi ultrapassado
+        """
+        return self.registrar_operacao(None, leituras=quantidade)
+
+    def registrar_operacao(self, operacao: Optional[str], leituras: int = 0, escritas: int = 0,
+                           round_trips: int = 0) -> bool:
+        """
+        Contabiliza leituras, escritas e round trips de uma operação
+
+        Args:
+            operacao: Método de serviço responsável (None = não atribuído)
+            leituras: Documentos lidos
+            escritas: Documentos gravados
+            round_trips: Chamadas RPC ao Firestore
+
+        Returns:
+            bool: False se o orçamento de leituras foi ultrapassado
+        """
+        with self._lock:
+            self.leituras += leituras
+            self.escritas += escritas
+            self.round_trips += round_trips
+            if operacao is not None:
+                totais = self.por_operacao.setdefault(operacao, [0, 0, 0])
+                totais[0] += leituras
+                totais[1] += escritas
+                totais[2] += round_trips
+            leituras_total = self.leituras
+        return self.orcamento_leituras is None or leituras_total <= self.orcamento_leituras
+
+    @property
+    def orcamento_restante(self) -> Optional[int]:
+        if self.orcamento_leituras is None:
+            return None
+        return max(0, self.orcamento_leituras - self.leituras)
+
+    def __repr__(self) -> str:
+        return (f"RequestContext(origem={self.origem!r}, data_mode={self.data_mode!r}, "
+                f"data_referencia={self.data_referencia}, leituras={self.leituras}, "
+                f"escritas={self.escritas})")
+
+
+_contexto: ContextVar[Optional[RequestContext]] = ContextVar("dojo_request_context", default=None)
+
+
+def get_request_context() -> Optional[RequestContext]:
+    """Contexto da requisição atual (None se nenhum foi definido)"""
+    return _contexto.get()
+
+
+def set_request_context(contexto: Optional[RequestContext]) -> Token:
+    """Define o contexto da requisição atual"""
+    return _contexto.set(contexto)
+
+
+def reset_request_context(token: Token) -> None:
+    """Restaura o contexto anterior"""
+    _contexto.reset(token)
+
+
+@contextmanager
+def request_context(**kwargs) -> Iterator[RequestContext]:
+    """
+    Executa um bloco com contexto próprio (scripts, jobs, benchmarks)
+
+    Exemplo:
+        with request_context(data_mode='operacional', data_referencia=date(2026, 3, 1)):
+            PagamentosService().obter_devedores()
+    """
+    contexto = RequestContext(**kwargs)
+    token = set_request_context(contexto)
+    try:
+        yield contexto
+    finally:
+        reset_request_context(token)
+
+
+def _orcamento_padrao() -> Optional[int]:
+    valor = os.getenv("DOJO_READ_BUDGET")
+    try:
+        return int(valor) if valor else None
+    except ValueError:
+        return None
+
+
+def iniciar_contexto_streamlit(usuario: Optional[Dict[str, Any]] = None) -> RequestContext:
+    """
+    Cria o contexto do rerun a partir de st.session_state (chamar uma vez no app.py)
+
+    Args:
+        usuario: Usuário autenticado (AuthManager.get_current_user())
+    """
+    import streamlit as st
+
+    contexto = RequestContext(
+        data_mode=str(st.session_state.get("data_mode", "operacional")),
+        usuario=usuario,
+        orcamento_leituras=_orcamento_padrao(),
+        origem="streamlit",
+        pagina=st.session_state.get("current_page"),
+    )
+    set_request_context(contexto)
+    return contexto
+
+
+def data_de_hoje() -> date:
+    """Data de referência da requisição (date.today() fora de um contexto)"""
+    contexto = _contexto.get()
+    if contexto is None:
+        return date.today()
+    return contexto.data_referencia
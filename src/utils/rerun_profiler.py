@@ -0,0 +1,218 @@
+"""
+Profiler por rerun (sob demanda)
+Amostra a pilha da thread do script em intervalos fixos enquanto a página é
+renderizada e grava, por rerun, em DOJO_PROFILE_DIR (default /tmp/dojo_profiles):
+- <carimbo>_<página>_<modo>.speedscope.json  → abrir em https://www.speedscope.app
+- <carimbo>_<página>_<modo>.collapsed.txt    → flamegraph.pl / inferno
+- <carimbo>_<página>_<modo>.top.txt          → top-N por tempo próprio e total
+
+Ativado por DOJO_PROFILE=1 (todos os reruns) ou, para admins, pelo parâmetro
+?profile=1 na URL. Desligado, o custo é uma checagem de env/query param.
+As threads do carregador paralelo não são amostradas (só o tempo de espera
+delas aparece na pilha do script).
+"""
+
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger('DojojApp')
+
+INTERVALO_PADRAO = 0.005  # 5ms
+TOP_PADRAO = 25
+DIRETORIO_PADRAO = '/tmp/dojo_profiles'
+
+Quadro = Tuple[str, str, int]  # (função, arquivo, linha da definição)
+
+
+def perfil_solicitado(is_admin: bool = False) -> bool:
+    """
+    O rerun atual deve ser perfilado?
+
+    Args:
+        is_admin: Usuário atual é admin (libera o ?profile=1)
+    """
+    if os.getenv('DOJO_PROFILE', '').lower() in ('1', 'true', 'yes'):
+        return True
+    if not is_admin:
+        return False
+    try:
+        import streamlit as st
+        return st.query_params.get('profile') == '1'
+    except Exception:
+        return False
+
+
+class AmostradorPilhas:
+    """Thread que amostra a pilha de outra thread (sys._current_frames)"""
+
+    def __init__(self, thread_id: int, intervalo: float = INTERVALO_PADRAO):
+        self.thread_id = thread_id
+        self.intervalo = intervalo
+        self.amostras: Counter = Counter()  # pilha (raiz → folha) → nº de amostras
+        self.duracao = 0.0
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._inicio = 0.0
+
+    def _pilha(self, frame) -> Tuple[Quadro, ...]:
+        quadros: List[Quadro] = []
+        while frame is not None:
+            codigo = frame.f_code
+            nome = getattr(codigo, 'co_qualname', codigo.co_name)
+            quadros.append((nome, codigo.co_filename, codigo.co_firstlineno))
+            frame = frame.f_back
+        quadros.reverse()
+        return tuple(quadros)
+
+    def _executar(self) -> None:
+        while not self._parar.wait(self.intervalo):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.amostras[self._pilha(frame)] += 1
+            del frame
+
+    def iniciar(self) -> None:
+        self._inicio = time.perf_counter()
+        self._thread = threading.Thread(target=self._executar, name='dojo-profiler', daemon=True)
+        self._thread.start()
+
+    def parar(self) -> None:
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duracao = time.perf_counter() - self._inicio
+
+
+# ----------------------------------------------------------------------
+# Saídas
+# ----------------------------------------------------------------------
+def _rotulo(quadro: Quadro) -> str:
+    nome, arquivo, linha = quadro
+    return f"{nome} ({os.path.basename(arquivo)}:{linha})"
+
+
+def gerar_speedscope(amostras: Counter, nome: str, intervalo: float) -> Dict:
+    """Perfil 'sampled' no formato de arquivo do speedscope (pesos em ms)"""
+    indices: Dict[Quadro, int] = {}
+    frames = []
+    samples = []
+    weights = []
+    for pilha, quantidade in amostras.items():
+        pilha_indices = []
+        for quadro in pilha:
+            if quadro not in indices:
+                indices[quadro] = len(frames)
+                frames.append({'name': quadro[0], 'file': quadro[1], 'line': quadro[2]})
+            pilha_indices.append(indices[quadro])
+        samples.append(pilha_indices)
+        weights.append(round(quantidade * intervalo * 1000, 3))
+    return {
+        '$schema': 'https://www.speedscope.app/file-format-schema.json',
+        'name': nome,
+        'exporter': 'dojo rerun_profiler',
+        'activeProfileIndex': 0,
+        'shared': {'frames': frames},
+        'profiles': [{
+            'type': 'sampled',
+            'name': nome,
+            'unit': 'milliseconds',
+            'startValue': 0,
+            'endValue': round(sum(weights), 3),
+            'samples': samples,
+            'weights': weights,
+        }],
+    }
+
+
+def gerar_collapsed(amostras: Counter) -> str:
+    """Formato 'folded' do flamegraph.pl: quadro;quadro;... contagem"""
+    linhas = [';'.join(_rotulo(q).replace(';', ':') for q in pilha) + f" {quantidade}"
+              for pilha, quantidade in amostras.items()]
+    return '\n'.join(sorted(linhas)) + '\n'
+
+
+def gerar_top(amostras: Counter, intervalo: float, n: int = TOP_PADRAO) -> List[Tuple[str, float, float]]:
+    """
+    Funções com mais tempo (amostras × intervalo)
+
+    Returns:
+        Lista (função, tempo próprio em s, tempo total em s) ordenada pelo próprio
+    """
+    proprio: Counter = Counter()
+    total: Counter = Counter()
+    for pilha, quantidade in amostras.items():
+        if not pilha:
+            continue
+        proprio[pilha[-1]] += quantidade
+        for quadro in set(pilha):  # recursão conta uma vez no total
+            total[quadro] += quantidade
+    return [(_rotulo(quadro), proprio[quadro] * intervalo, total[quadro] * intervalo)
+            for quadro, _ in proprio.most_common(n)]
+
+
+def _slug(texto: str) -> str:
+    texto = re.sub(r'[^\w-]+', '_', texto, flags=re.UNICODE).strip('_')
+    return texto or 'pagina'
+
+
+@contextmanager
+def perfilar_rerun(pagina: str, data_mode: str, ativo: bool,
+                   diretorio: Optional[str] = None) -> Iterator[Optional[AmostradorPilhas]]:
+    """
+    Perfila o bloco (dispatch da página) e grava os arquivos do rerun
+
+    Args:
+        pagina: Página renderizada (vai no nome dos arquivos)
+        data_mode: 'operacional' ou 'historico'
+        ativo: False → não faz nada (caminho normal)
+        diretorio: Destino (default: DOJO_PROFILE_DIR ou /tmp/dojo_profiles)
+    """
+    if not ativo:
+        yield None
+        return
+
+    intervalo = float(os.getenv('DOJO_PROFILE_INTERVAL', INTERVALO_PADRAO))
+    amostrador = AmostradorPilhas(threading.get_ident(), intervalo)
+    amostrador.iniciar()
+    try:
+        yield amostrador
+    finally:
+        amostrador.parar()
+        try:
+            _gravar(amostrador, pagina, data_mode, diretorio or os.getenv('DOJO_PROFILE_DIR', DIRETORIO_PADRAO))
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao gravar perfil do rerun: {e}")
+
+
+def _gravar(amostrador: AmostradorPilhas, pagina: str, data_mode: str, diretorio: str) -> str:
+    os.makedirs(diretorio, exist_ok=True)
+    carimbo = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+    base = os.path.join(diretorio, f"{carimbo}_{_slug(pagina)}_{data_mode}")
+    nome = f"{pagina} ({data_mode}) {amostrador.duracao:.2f}s"
+
+    with open(f"{base}.speedscope.json", 'w', encoding='utf-8') as arquivo:
+        json.dump(gerar_speedscope(amostrador.amostras, nome, amostrador.intervalo), arquivo)
+    with open(f"{base}.collapsed.txt", 'w', encoding='utf-8') as arquivo:
+        arquivo.write(gerar_collapsed(amostrador.amostras))
+
+    top = gerar_top(amostrador.amostras, amostrador.intervalo)
+    linhas = [f"{nome} - {sum(amostrador.amostras.values())} amostras a cada "
+              f"{amostrador.intervalo * 1000:.0f}ms", "",
+              f"{'próprio (s)':>12} {'total (s)':>10}  função"]
+    linhas += [f"{proprio:>12.3f} {total:>10.3f}  {funcao}" for funcao, proprio, total in top]
+    with open(f"{base}.top.txt", 'w', encoding='utf-8') as arquivo:
+        arquivo.write('\n'.join(linhas) + '\n')
+
+    logger.info(f"🔬 Perfil do rerun salvo em {base}.* ({amostrador.duracao:.2f}s)")
+    for funcao, proprio, total in top[:5]:
+        logger.info(f"   {proprio:>7.3f}s próprio | {total:>7.3f}s total | {funcao}")
+    return base
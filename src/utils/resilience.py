@@ -0,0 +1,300 @@
+"""
+Resilience - Camada de chamadas resiliente ao Firestore
+Prazos por operação, retries com backoff + jitter para erros transitórios e
+circuit breaker que serve o último valor bom (marcado como "stale") enquanto
+o Firestore está degradado.
+"""
+
+import functools
+import json
+import random
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
+
+from src.utils.operational_scope import cache_partition
+
+PRAZO_PADRAO = 10.0  # segundos por operação (somando todas as tentativas)
+TENTATIVAS_PADRAO = 3
+BACKOFF_BASE = 0.2
+BACKOFF_MAX = 2.0
+LIMITE_FALHAS = 5  # falhas transitórias consecutivas para abrir o circuito
+TEMPO_ABERTO = 30.0  # segundos até permitir uma chamada de teste
+MAX_ULTIMOS_VALORES = 512
+# Orçamento do fallback stale em registros (itens de listas), somando todas as
+# entradas: poucas listagens de 1000 documentos não podem fixar a memória do processo
+MAX_REGISTROS_ULTIMOS_VALORES = 5000
+
+# Prazo absoluto da operação em andamento (lido pelas chamadas ao Firestore)
+_prazo_atual: ContextVar[Optional[float]] = ContextVar("dojo_prazo_firestore", default=None)
+
+
+def _codigos_retentaveis():
+    """Exceções do google.api_core tratadas como transitórias"""
+    try:
+        from google.api_core import exceptions as gexc
+    except Exception:
+        return ()
+    return (
+        gexc.ServiceUnavailable,
+        gexc.DeadlineExceeded,
+        gexc.InternalServerError,
+        gexc.TooManyRequests,
+        gexc.ResourceExhausted,
+        gexc.Aborted,
+    )
+
+
+_RETENTAVEIS = _codigos_retentaveis()
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """
+    Verifica se o erro é transitório
+
+    Os serviços re-embrulham erros em Exception(f"Erro ao ..."), então a
+    cadeia __cause__/__context__ é percorrida até o erro original do gRPC.
+    """
+    vistos = set()
+    atual: Optional[BaseException] = exc
+    while atual is not None and id(atual) not in vistos:
+        vistos.add(id(atual))
+        if isinstance(atual, _RETENTAVEIS) or isinstance(atual, (TimeoutError, ConnectionError)):
+            return True
+        atual = atual.__cause__ or atual.__context__
+    return False
+
+
+def timeout_restante(minimo: float = 0.5) -> Optional[float]:
+    """
+    Tempo restante da operação resiliente em andamento
+
+    Passado como `timeout=` para stream()/get() do Firestore. None fora de
+    uma operação decorada (usa o timeout padrão do cliente).
+    """
+    prazo = _prazo_atual.get()
+    if prazo is None:
+        return None
+    return max(minimo, prazo - time.monotonic())
+
+
+class CircuitoAbertoError(Exception):
+    """Firestore degradado: circuito aberto e sem valor anterior para servir"""
+
+
+class ListaStale(list):
+    """Lista servida do último valor bom (Firestore degradado)"""
+    stale = True
+
+
+class DictStale(dict):
+    """Dict servido do último valor bom (Firestore degradado)"""
+    stale = True
+
+
+def is_stale(valor: Any) -> bool:
+    """True se o valor foi servido do último valor bom em vez do Firestore"""
+    return bool(getattr(valor, 'stale', False))
+
+
+def _marcar_stale(valor: Any) -> Any:
+    if isinstance(valor, list):
+        return ListaStale(valor)
+    if isinstance(valor, dict):
+        return DictStale(valor)
+    return valor
+
+
+class CircuitBreaker:
+    """Circuit breaker simples: fechado → aberto → meio-aberto"""
+
+    def __init__(self, nome: str, limite_falhas: int = LIMITE_FALHAS, tempo_aberto: float = TEMPO_ABERTO):
+        self.nome = nome
+        self.limite_falhas = limite_falhas
+        self.tempo_aberto = tempo_aberto
+        self.falhas_consecutivas = 0
+        self.aberto_ate: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def estado(self) -> str:
+        if self.aberto_ate is None:
+            return 'fechado'
+        if time.monotonic() < self.aberto_ate:
+            return 'aberto'
+        return 'meio_aberto'
+
+    def permite_chamada(self) -> bool:
+        with self._lock:
+            estado = self.estado
+            if estado == 'meio_aberto':
+                # Uma única chamada de teste; as demais esperam o resultado dela
+                self.aberto_ate = time.monotonic() + self.tempo_aberto
+                return True
+            return estado == 'fechado'
+
+    def registrar_sucesso(self) -> None:
+        with self._lock:
+            self.falhas_consecutivas = 0
+            self.aberto_ate = None
+
+    def registrar_falha(self) -> None:
+        with self._lock:
+            self.falhas_consecutivas += 1
+            if self.falhas_consecutivas >= self.limite_falhas:
+                if self.aberto_ate is None:
+                    _incrementar('trips', self.nome)
+                self.aberto_ate = time.monotonic() + self.tempo_aberto
+
+
+# ----------------------------------------------------------------------
+# Estado compartilhado (por processo)
+# ----------------------------------------------------------------------
+_circuitos: Dict[str, CircuitBreaker] = {}
+_ultimos_valores: "OrderedDict[str, Any]" = OrderedDict()
+_registros_ultimos: Dict[str, int] = {}
+_total_registros = 0
+_metricas: Dict[str, Dict[str, int]] = {
+    'chamadas': {},
+    'retries': {},
+    'falhas': {},
+    'trips': {},
+    'stale': {},
+}
+_lock = threading.Lock()
+
+
+def _incrementar(metrica: str, nome: str) -> None:
+    with _lock:
+        contadores = _metricas[metrica]
+        contadores[nome] = contadores.get(nome, 0) + 1
+
+
+def get_circuit_breaker(nome: str) -> CircuitBreaker:
+    """Obtém (ou cria) o circuit breaker do grupo informado"""
+    if nome not in _circuitos:
+        with _lock:
+            _circuitos.setdefault(nome, CircuitBreaker(nome))
+    return _circuitos[nome]
+
+
+def obter_metricas() -> Dict[str, Any]:
+    """
+    Métricas da camada resiliente
+
+    Returns:
+        Dict com contadores por operação (chamadas, retries, falhas, stale),
+        trips por circuito e o estado atual de cada circuito
+    """
+    with _lock:
+        metricas = {nome: dict(valores) for nome, valores in _metricas.items()}
+    metricas['circuitos'] = {nome: cb.estado for nome, cb in _circuitos.items()}
+    return metricas
+
+
+def _chave_ultimo_valor(operacao: str, args: tuple, kwargs: dict) -> str:
+    # O escopo (operacional/histórico) muda o resultado das leituras
+    params = json.dumps([args, kwargs], sort_keys=True, default=str)
+    return f"{operacao}:{cache_partition()}:{params}"
+
+
+def _contar_registros(valor: Any) -> int:
+    """Tamanho aproximado do valor em registros (listas e dicts de listas, um nível)"""
+    if isinstance(valor, (list, tuple)):
+        return len(valor) or 1
+    if isinstance(valor, dict):
+        return max(1, len(valor), sum(len(v) for v in valor.values() if isinstance(v, (list, tuple, dict))))
+    return 1
+
+
+def _guardar_ultimo_valor(chave: str, valor: Any) -> None:
+    """Guarda o último valor bom (LRU limitado por entradas e pelo total de registros)"""
+    global _total_registros
+    registros = _contar_registros(valor)
+    with _lock:
+        if chave in _ultimos_valores:
+            del _ultimos_valores[chave]
+            _total_registros -= _registros_ultimos.pop(chave)
+        if registros > MAX_REGISTROS_ULTIMOS_VALORES:
+            return  # sozinho já passa do orçamento: sem fallback para esta leitura
+        _ultimos_valores[chave] = valor
+        _registros_ultimos[chave] = registros
+        _total_registros += registros
+        while (len(_ultimos_valores) > MAX_ULTIMOS_VALORES
+               or _total_registros > MAX_REGISTROS_ULTIMOS_VALORES):
+            antiga, _ = _ultimos_valores.popitem(last=False)
+            _total_registros -= _registros_ultimos.pop(antiga)
+
+
+def resiliente(prazo: float = PRAZO_PADRAO, tentativas: int = TENTATIVAS_PADRAO,
+               circuito: str = 'firestore', servir_stale: bool = True):
+    """
+    Decorador para métodos de leitura dos serviços
+
+    Args:
+        prazo: Prazo total da operação em segundos (todas as tentativas)
+        tentativas: Número máximo de tentativas para erros transitórios
+        circuito: Nome do circuit breaker compartilhado
+        servir_stale: Servir o último valor bom quando o Firestore falhar (listagens
+            e resumos; desligar em leituras que servem de base para escritas,
+            que também deixam de guardar valores)
+    """
+    def decorator(func: Callable):
+        operacao = func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            # Chamada aninhada (ex.: buscar_por_nome → listar_alunos): a operação
+            # externa já controla prazo, retries e circuito
+            if _prazo_atual.get() is not None:
+                return func(self, *args, **kwargs)
+
+            cb = get_circuit_breaker(circuito)
+            chave = _chave_ultimo_valor(operacao, args, kwargs)
+            _incrementar('chamadas', operacao)
+
+            def _fallback(erro: BaseException):
+                if servir_stale and chave in _ultimos_valores:
+                    _incrementar('stale', operacao)
+                    return _marcar_stale(_ultimos_valores[chave])
+                raise erro
+
+            if not cb.permite_chamada():
+                return _fallback(CircuitoAbertoError(
+                    "Firestore indisponível no momento. Tente novamente em instantes."
+                ))
+
+            prazo_final = time.monotonic() + prazo
+            token = _prazo_atual.set(prazo_final)
+            try:
+                tentativa = 0
+                while True:
+                    tentativa += 1
+                    try:
+                        resultado = func(self, *args, **kwargs)
+                    except Exception as e:
+                        if not is_retryable(e):
+                            # Erro de negócio/permissão: não indica Firestore degradado
+                            raise
+                        restante = prazo_final - time.monotonic()
+                        espera = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** (tentativa - 1)))
+                        espera = random.uniform(0, espera)  # full jitter
+                        if tentativa >= tentativas or espera >= restante:
+                            _incrementar('falhas', operacao)
+                            cb.registrar_falha()
+                            return _fallback(e)
+                        _incrementar('retries', operacao)
+                        time.sleep(espera)
+                        continue
+
+                    cb.registrar_sucesso()
+                    if servir_stale:
+                        _guardar_ultimo_valor(chave, resultado)
+                    return resultado
+            finally:
+                _prazo_atual.reset(token)
+
+        return wrapper
+    return decorator
@@ -0,0 +1,175 @@
+"""Profiler de inicialização (cold start).
+
+Mede, dentro do próprio processo do Streamlit, o tempo de cada import no
+formato do `python -X importtime` (self | cumulativo | módulo) e o tempo do
+boot do container até a primeira renderização de cada página. Tudo vai para
+o logger 'DojojApp', o mesmo do log_step do app.py.
+
+O hook de import só é instalado com DOJO_IMPORT_PROFILE=1 (desligado, o custo
+é uma checagem de env por rerun) e reruns que não importam nada novo não geram
+log. Os tempos de renderização são sempre registrados: uma linha por página
+por processo.
+"""
+
+from __future__ import annotations
+
+import builtins
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger('DojojApp')
+
+LIMITE_PADRAO = 25
+
+# (módulo, self_us, cumulativo_us, profundidade) na ordem em que terminaram
+_registros: List[Tuple[str, int, int, int]] = []
+_registros_lock = threading.Lock()
+_pilha = threading.local()
+_import_original = None
+_paginas_renderizadas: Set[str] = set()
+_primeira_renderizacao: Optional[float] = None
+
+
+def _inicio_do_processo() -> float:
+    """Epoch do início do processo (/proc no Linux; senão, o import deste módulo)"""
+    try:
+        with open('/proc/self/stat') as f:
+            # campo 22 (starttime), contado após o nome do executável entre parênteses
+            campos = f.read().rsplit(')', 1)[1].split()
+        ticks_inicio = int(campos[19])
+        with open('/proc/stat') as f:
+            btime = next(int(linha.split()[1]) for linha in f if linha.startswith('btime'))
+        return btime + ticks_inicio / os.sysconf('SC_CLK_TCK')
+    except Exception:
+        return time.time()
+
+
+INICIO_PROCESSO = _inicio_do_processo()
+
+
+def profiler_ativo() -> bool:
+    """Hook de import instalado?"""
+    return _import_original is not None
+
+
+def _import_cronometrado(name, globals=None, locals=None, fromlist=(), level=0):
+    # Só mede imports absolutos que de fato carregam algo (cache de sys.modules é grátis)
+    if level != 0 or name in sys.modules:
+        return _import_original(name, globals, locals, fromlist, level)
+
+    pilha = getattr(_pilha, 'filhos', None)
+    if pilha is None:
+        pilha = _pilha.filhos = []
+    pilha.append(0)
+    inicio = time.perf_counter_ns()
+    try:
+        return _import_original(name, globals, locals, fromlist, level)
+    finally:
+        cumulativo = (time.perf_counter_ns() - inicio) // 1000
+        filhos = pilha.pop()
+        if pilha:
+            pilha[-1] += cumulativo
+        with _registros_lock:
+            _registros.append((name, cumulativo - filhos, cumulativo, len(pilha)))
+
+
+def instalar_profiler_imports(forcar: bool = False) -> bool:
+    """
+    Instala o hook de import (idempotente; uma vez por processo)
+
+    Args:
+        forcar: Instala mesmo sem DOJO_IMPORT_PROFILE (testes)
+
+    Returns:
+        bool: True se o profiler está ativo
+    """
+    global _import_original
+    if _import_original is not None:
+        return True
+    if not forcar and os.getenv('DOJO_IMPORT_PROFILE', '').lower() not in ('1', 'true', 'yes'):
+        return False
+    _import_original = builtins.__import__
+    builtins.__import__ = _import_cronometrado
+    logger.info("⏱️ Profiler de imports ativo (DOJO_IMPORT_PROFILE)")
+    return True
+
+
+def desinstalar_profiler_imports() -> None:
+    """Restaura o __import__ original e descarta as medições"""
+    global _import_original
+    if _import_original is not None:
+        builtins.__import__ = _import_original
+        _import_original = None
+    with _registros_lock:
+        _registros.clear()
+
+
+def formatar_breakdown(registros: List[Tuple[str, int, int, int]],
+                       limite: int = LIMITE_PADRAO) -> List[str]:
+    """
+    Linhas no formato do -X importtime, com os imports mais caros primeiro
+
+    Args:
+        registros: Medições (módulo, self_us, cumulativo_us, profundidade)
+        limite: Máximo de linhas (0 = todas)
+
+    Returns:
+        Lista de linhas (cabeçalho + medições)
+    """
+    ordenados = sorted(registros, key=lambda r: r[2], reverse=True)
+    if limite:
+        ordenados = ordenados[:limite]
+    linhas = ["import time: self [us] | cumulative | imported package"]
+    for nome, proprio, cumulativo, profundidade in ordenados:
+        linhas.append(f"import time: {proprio:>9} | {cumulativo:>10} | {'  ' * profundidade}{nome}")
+    return linhas
+
+
+@contextmanager
+def medir_imports(etapa: str, limite: int = LIMITE_PADRAO) -> Iterator[None]:
+    """
+    Registra no log os imports feitos durante um bloco (ex.: uma etapa do log_step)
+
+    Sem profiler ativo, ou se nada novo foi importado, não escreve nada.
+    """
+    if _import_original is None:
+        yield
+        return
+    with _registros_lock:
+        marca = len(_registros)
+    try:
+        yield
+    finally:
+        with _registros_lock:
+            novos = _registros[marca:]
+        if novos:
+            total_ms = sum(r[2] for r in novos if r[3] == 0) / 1000
+            logger.info(f"📦 Imports em '{etapa}': {len(novos)} módulos, {total_ms:.0f}ms")
+            for linha in formatar_breakdown(novos, limite):
+                logger.info(linha)
+
+
+def marcar_renderizacao(pagina: str, inicio: float) -> None:
+    """
+    Loga o tempo do boot até a primeira renderização do processo e, para as
+    páginas seguintes, a latência da primeira troca (imports ainda frios)
+
+    Args:
+        pagina: Nome da página renderizada
+        inicio: time.time() do início do carregamento da página
+    """
+    global _primeira_renderizacao
+    if pagina in _paginas_renderizadas:
+        return
+    _paginas_renderizadas.add(pagina)
+    agora = time.time()
+    if _primeira_renderizacao is None:
+        _primeira_renderizacao = agora
+        logger.info(f"🚀 Boot até a primeira renderização ({pagina}): {agora - INICIO_PROCESSO:.2f}s")
+    else:
+        logger.info(f"🔀 Primeira troca para {pagina}: {agora - inicio:.2f}s")
@@ -104,3 +104,41 @@ def render_brand_header(
         """,
         unsafe_allow_html=True,
     )
+
+
+@st.fragment
+def render_pay_button(
+    pagamento_id: str,
+    aluno_nome: str,
+    pagamentos_service,
+    *,
+    key_prefix: str = "pagar",
+) -> None:
+    """Renders the "💰 Pago" action for one pending payment as a fragment.
+
+    Clicking it reruns only this fragment: the payment is written, the row
+    switches to "✅ Pago" from session state and the rest of the page (lists,
+    metrics, other rows) is not rebuilt until the next full rerun. The service
+    patches the cached month stats in place, so that rerun does not refetch.
+    Call reset_pay_buttons() on the full run that renders the rows.
+    """
+
+    pagos = st.session_state.setdefault(f"{key_prefix}_marcados_pagos", set())
+    if pagamento_id in pagos:
+        st.success("✅ Pago")
+        return
+
+    if st.button("💰 Pago", key=f"{key_prefix}_{pagamento_id}", use_container_width=True):
+        try:
+            pagamentos_service.marcar_como_pago(pagamento_id)
+            pagos.add(pagamento_id)
+            st.toast(f"✅ {aluno_nome} marcado como pago!")
+            st.rerun(scope="fragment")
+        except Exception as e:
+            st.error(f"Erro: {e}")
+
+
+def reset_pay_buttons(key_prefix: str = "pagar") -> None:
+    """Forgets payments marked by render_pay_button (the list was reloaded)."""
+
+    st.session_state[f"{key_prefix}_marcados_pagos"] = set()
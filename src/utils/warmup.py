@@ -0,0 +1,181 @@
+"""
+Warm-up do processo - aquece conexões e caches antes do primeiro usuário
+Abre o cliente Firestore (parse das credenciais + canal gRPC) e pré-carrega no
+CacheManager o que o dashboard lê no primeiro acesso: lista de alunos,
+estatísticas de pagamentos (mês atual e anterior) e relatório de presenças.
+
+O estado fica em um flag de prontidão por processo (aguardar_pronto /
+estado_warmup), exposto opcionalmente em um endpoint HTTP para o health check
+da plataforma (DOJO_READINESS_PORT).
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import date
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger('DojojApp')
+
+TIMEOUT_TAREFA = 30.0
+
+_pronto = threading.Event()
+_estado: Dict[str, Any] = {'status': 'pendente', 'etapas': {}, 'erros': {}, 'duracao': None}
+_thread: Optional[threading.Thread] = None
+_thread_lock = threading.Lock()
+
+
+def _ym_anterior(ym: str) -> str:
+    ano, mes = map(int, ym.split('-'))
+    return f"{ano - 1}-12" if mes == 1 else f"{ano}-{mes - 1:02d}"
+
+
+def aquecer(data_referencia: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Executa o warm-up (bloqueante) e marca o processo como pronto
+
+    Falhas não impedem a prontidão: o app funciona a frio, só mais lento.
+
+    Args:
+        data_referencia: "Hoje" usado para escolher o mês (default: date.today())
+
+    Returns:
+        Estado final (status, duração por etapa e erros)
+    """
+    from src.utils.request_context import data_de_hoje, request_context
+
+    inicio = time.monotonic()
+    _estado['status'] = 'aquecendo'
+    try:
+        with request_context(data_mode='operacional', data_referencia=data_referencia,
+                             origem='warmup'):
+            # 1) Credenciais + cliente Firestore; a primeira leitura abre o canal gRPC
+            etapa = time.monotonic()
+            from src.services.periodos_service import PeriodosService
+            from src.services.registry import get_service
+            get_service(PeriodosService).obter_periodos()
+            _estado['etapas']['firestore'] = round(time.monotonic() - etapa, 3)
+
+            # 2) Caches do primeiro render do dashboard, em paralelo
+            from src.services.alunos_service import AlunosService
+            from src.services.pagamentos_service import PagamentosService
+            from src.services.presencas_service import PresencasService
+            from src.utils.cache_service import get_cache_manager
+            from src.utils.concurrent_loader import carregar_em_paralelo
+
+            cache_manager = get_cache_manager()
+            pagamentos_service = get_service(PagamentosService)
+            presencas_service = get_service(PresencasService)
+            ym = data_de_hoje().strftime('%Y-%m')
+            resultados = carregar_em_paralelo({
+                'alunos': partial(cache_manager.get_alunos_cached, get_service(AlunosService)),
+                'pagamentos': partial(cache_manager.get_estatisticas_pagamentos_cached,
+                                      pagamentos_service, ym),
+                'pagamentos_anterior': partial(cache_manager.get_estatisticas_pagamentos_cached,
+                                               pagamentos_service, _ym_anterior(ym)),
+                'presencas': partial(cache_manager.get_relatorio_presencas_cached,
+                                     presencas_service, ym),
+            }, timeout_padrao=TIMEOUT_TAREFA)
+            for nome, resultado in resultados.items():
+                _estado['etapas'][nome] = round(resultado.duracao, 3)
+                if not resultado.ok:
+                    _estado['erros'][nome] = str(resultado.erro)
+    except Exception as e:
+        _estado['erros']['firestore'] = str(e)
+
+    _estado['duracao'] = round(time.monotonic() - inicio, 3)
+    _estado['status'] = 'pronto' if not _estado['erros'] else 'pronto_com_erros'
+    _pronto.set()
+
+    if _estado['erros']:
+        logger.warning(f"⚠️ Warm-up concluído com erros em {_estado['duracao']:.2f}s: {_estado['erros']}")
+    else:
+        logger.info(f"🔥 Warm-up concluído em {_estado['duracao']:.2f}s: {_estado['etapas']}")
+    return estado_warmup()
+
+
+def iniciar_warmup() -> threading.Thread:
+    """Dispara o warm-up em uma thread daemon (uma vez por processo)"""
+    global _thread
+    with _thread_lock:
+        if _thread is None:
+            _thread = threading.Thread(target=aquecer, name='dojo-warmup', daemon=True)
+            _thread.start()
+            logger.info("🔄 Warm-up - INICIANDO...")
+    return _thread
+
+
+def esta_pronto() -> bool:
+    """O warm-up terminou (com ou sem erros)?"""
+    return _pronto.is_set()
+
+
+def aguardar_pronto(timeout: Optional[float] = None) -> bool:
+    """
+    Aguarda o fim do warm-up
+
+    Args:
+        timeout: Segundos de espera (None = indefinidamente)
+
+    Returns:
+        bool: True se o processo está pronto
+    """
+    return _pronto.wait(timeout)
+
+
+def estado_warmup() -> Dict[str, Any]:
+    """Cópia do estado do warm-up (para logs e para o endpoint de prontidão)"""
+    return {
+        'status': _estado['status'],
+        'etapas': dict(_estado['etapas']),
+        'erros': dict(_estado['erros']),
+        'duracao': _estado['duracao'],
+    }
+
+
+class _ProntidaoHandler(BaseHTTPRequestHandler):
+    """GET /ready → 200 quando pronto, 503 enquanto aquece"""
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/', '/ready'):
+            self.send_error(404)
+            return
+        corpo = json.dumps(estado_warmup()).encode('utf-8')
+        self.send_response(200 if esta_pronto() else 503)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def do_HEAD(self):
+        self.send_response(200 if esta_pronto() else 503)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass  # health check a cada poucos segundos não deve poluir o log
+
+
+def iniciar_endpoint_prontidao(porta: Optional[int] = None) -> Optional[ThreadingHTTPServer]:
+    """
+    Sobe o endpoint de prontidão em uma thread daemon
+
+    Args:
+        porta: Porta HTTP (default: env DOJO_READINESS_PORT; sem ela, não sobe)
+
+    Returns:
+        Servidor HTTP ou None se desativado
+    """
+    if porta is None:
+        valor = os.getenv('DOJO_READINESS_PORT')
+        if not valor:
+            return None
+        porta = int(valor)
+
+    servidor = ThreadingHTTPServer(('0.0.0.0', porta), _ProntidaoHandler)
+    threading.Thread(target=servidor.serve_forever, name='dojo-readiness', daemon=True).start()
+    logger.info(f"📡 Endpoint de prontidão em :{servidor.server_address[1]}/ready")
+    return servidor
@@ -5,8 +5,8 @@
 
 import os
 import sys
-import subprocess
 import signal
+import threading
 
 # Variável global para controle
 RUNNING = True
@@ -18,11 +18,30 @@ def signal_handler(signum, frame):
     sys.exit(0)
 
 # Registrar handler para sinais (apenas na thread principal)
-import threading
 if threading.current_thread() is threading.main_thread():
     signal.signal(signal.SIGTERM, signal_handler)
     signal.signal(signal.SIGINT, signal_handler)
 
+def aquecer_em_background():
+    """Dispara o warm-up em background e registra o resultado (sem segurar a porta)"""
+    from src.utils.warmup import aguardar_pronto, estado_warmup, iniciar_endpoint_prontidao, iniciar_warmup
+    
+    timeout = float(os.environ.get('DOJO_WARMUP_TIMEOUT', '60'))
+    iniciar_endpoint_prontidao()
+    iniciar_warmup()
+    print(f"🔄 Warm-up em background (log em até {timeout:.0f}s): Firestore + alunos, pagamentos e presenças do mês...")
+    
+    def _registrar_resultado():
+        if aguardar_pronto(timeout):
+            estado = estado_warmup()
+            print(f"✅ Warm-up {estado['status']} em {estado['duracao']:.2f}s - etapas: {estado['etapas']}")
+            for nome, erro in estado['erros'].items():
+                print(f"⚠️ Warm-up {nome}: {erro}")
+        else:
+            print("⚠️ Warm-up não terminou no prazo - continua em background")
+    
+    threading.Thread(target=_registrar_resultado, name='dojo-warmup-log', daemon=True).start()
+
 def main():
     print("🚀 SPIRIT MUAY THAI - Railway Deploy")
     
@@ -39,8 +58,8 @@ def main():
         sys.exit(1)
     
     # Comando otimizado
-    cmd = [
-        sys.executable, '-m', 'streamlit', 'run', entry,
+    args = [
+        'run', entry,
         '--server.port', str(port),
         '--server.address', '0.0.0.0',
         '--server.headless', 'true',
@@ -48,16 +67,26 @@ def main():
         '--server.enableXsrfProtection', 'false'
     ]
     
-    print(f"🔥 Executando: {' '.join(cmd)}")
+    # Streamlit no mesmo processo do start.py: caches, relatório de memória e
+    # warm-up enxergam o mesmo estado do servidor
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from src.utils.memory_report import iniciar_tracemalloc, instalar_dump_sinal
+    iniciar_tracemalloc()
+    if instalar_dump_sinal():
+        print(f"🧠 Relatório de memória: kill -USR1 {os.getpid()}")
     
+    if os.environ.get('DOJO_WARMUP', '1').lower() in ('1', 'true', 'yes'):
+        # A porta abre na hora (o health check em /_stcore/health não espera o
+        # warm-up); o cache esquenta em paralelo e /ready informa quando terminou
+        aquecer_em_background()
+    
+    print(f"🔥 Executando (no processo): streamlit {' '.join(args)}")
+    from streamlit.web import cli as streamlit_cli
+    sys.argv = ['streamlit'] + args
     try:
-        # Executar e manter vivo
-        subprocess.run(cmd, check=True)
+        sys.exit(streamlit_cli.main())
     except KeyboardInterrupt:
         print("🛑 Parando...")
-    except Exception as e:
-        print(f"❌ Erro: {e}")
-        sys.exit(1)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file